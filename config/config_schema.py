@@ -0,0 +1,297 @@
+"""
+Типизированная схема конфигурации пайплайна.
+
+Словарь из config.yaml компилируется один раз (при загрузке файла) в
+неизменяемые dataclass-объекты с проверкой типов, допустимых значений и
+диапазонов. Доступ к настройкам - обычные атрибуты без разбора ключей.
+Разделы со свободной структурой (storage, data_quality.drift_detection,
+airflow, database) сохраняются словарями.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import logging
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Tuple, Union, get_type_hints
+
+logger = logging.getLogger(__name__)
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+def _option(default: Any, choices: Optional[Tuple[Any, ...]] = None, min_value: Optional[float] = None,
+            max_value: Optional[float] = None, exclusive: bool = False, required: bool = False):
+    """Поле схемы с ограничениями на значение."""
+    return field(default=default, metadata={"choices": choices, "min": min_value, "max": max_value,
+                                            "exclusive": exclusive, "required": required})
+
+
+@dataclass(frozen=True)
+class DataSettings:
+    """Настройки источника данных."""
+    source_file: str = "data/wdbc.data.csv"
+    columns: Tuple[str, ...] = ()
+    test_size: float = _option(0.2, min_value=0.0, max_value=1.0, exclusive=True)
+    random_state: int = 42
+    # Строк в части при потоковом чтении (DataLoader.iter_chunks)
+    chunk_size: int = _option(10000, min_value=1)
+    # Представление DataFrame: compact - float32 признаки, категориальный diagnosis, наименьший целый id
+    dtype_profile: str = _option("default", choices=("default", "compact"))
+
+
+@dataclass(frozen=True)
+class ModelSerializationSettings:
+    """Настройки сериализации модели."""
+    compression: Optional[str] = _option("lz4", choices=(None, "none", "lz4", "zlib", "gzip", "bz2", "lzma", "xz"))
+    compress_level: int = _option(3, min_value=0, max_value=9)
+    cache_size: int = _option(4, min_value=0)
+
+
+@dataclass(frozen=True)
+class ModelSettings:
+    """Настройки модели."""
+    type: str = "LogisticRegression"
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    serialization: ModelSerializationSettings = field(default_factory=ModelSerializationSettings)
+
+
+@dataclass(frozen=True)
+class IsolationForestSettings:
+    """Настройки обнаружения выбросов IsolationForest."""
+    # Один лес по всем признакам (обучается один раз, сохраняется с препроцессорами)
+    multivariate: bool = True
+    n_estimators: int = _option(100, min_value=1)
+    contamination: float = _option(0.1, min_value=0.0, max_value=0.5, exclusive=True)
+    # -1 - все ядра
+    n_jobs: int = _option(-1, min_value=-1)
+    random_state: int = 42
+
+
+@dataclass(frozen=True)
+class OutlierDetectionSettings:
+    """Настройки обработки выбросов."""
+    enabled: bool = True
+    method: str = _option("iqr", choices=("iqr", "zscore", "isolation_forest"))
+    action: str = _option("cap", choices=("remove", "cap", "transform"))
+    isolation_forest: IsolationForestSettings = field(default_factory=IsolationForestSettings)
+
+
+@dataclass(frozen=True)
+class FeatureDefinition:
+    """Декларативный признак: название и выражение над исходными колонками."""
+    name: str = _option("", required=True)
+    expression: str = _option("", required=True)
+
+
+@dataclass(frozen=True)
+class FeatureEngineeringSettings:
+    """Настройки создания признаков."""
+    enabled: bool = True
+    # Флаги встроенных признаков (используются, если features не задан)
+    create_ratios: bool = True
+    create_aggregates: bool = True
+    create_composite_features: bool = True
+    features: Tuple[FeatureDefinition, ...] = ()
+
+
+@dataclass(frozen=True)
+class FeatureSelectionSettings:
+    """Настройки отбора признаков."""
+    enabled: bool = True
+    method: str = _option("univariate", choices=("univariate", "rfe", "l1", "pca"))
+    n_features: int = _option(20, min_value=1)
+    # Шаг RFE: количество (>= 1) или доля (< 1) исключаемых за шаг признаков
+    step: float = _option(1.0, min_value=0.0, exclusive=True)
+    # Кандидаты n_features: лучший выбирается кросс-валидацией (пусто - только n_features)
+    candidates: Tuple[int, ...] = ()
+    cv_folds: int = _option(5, min_value=2)
+    n_jobs: int = _option(1, min_value=1)
+    # PCA: auto/full - полный SVD, randomized - рандомизированный SVD, incremental - IncrementalPCA по частям
+    pca_solver: str = _option("auto", choices=("auto", "full", "randomized", "incremental"))
+    pca_batch_size: int = _option(1000, min_value=1)
+
+
+@dataclass(frozen=True)
+class ScalingSettings:
+    """Настройки масштабирования признаков."""
+    method: str = _option("standard", choices=("standard", "robust", "minmax"))
+    # Интервалов гистограммы для приближенных квантилей RobustScaler при обучении по частям
+    quantile_bins: int = _option(4096, min_value=2)
+
+
+@dataclass(frozen=True)
+class TrainTestSplitSettings:
+    """Настройки разделения на обучающую и тестовую выборки."""
+    test_size: Optional[float] = _option(None, min_value=0.0, max_value=1.0, exclusive=True)
+    stratify: bool = True
+    # Повторные разбиения (iter_splits) и колонка групп: строки одной группы - в одной выборке
+    n_splits: int = _option(1, min_value=1)
+    group_column: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PreprocessingSettings:
+    """Настройки предобработки."""
+    execution_mode: str = _option("block", choices=("block", "dataframe"))
+    profile_memory: bool = False
+    outlier_detection: OutlierDetectionSettings = field(default_factory=OutlierDetectionSettings)
+    feature_engineering: FeatureEngineeringSettings = field(default_factory=FeatureEngineeringSettings)
+    feature_selection: FeatureSelectionSettings = field(default_factory=FeatureSelectionSettings)
+    scaling: ScalingSettings = field(default_factory=ScalingSettings)
+    train_test_split: TrainTestSplitSettings = field(default_factory=TrainTestSplitSettings)
+
+
+@dataclass(frozen=True)
+class QualityThresholds:
+    """Пороги контроля качества данных (в процентах)."""
+    missing_values_pct: float = _option(5.0, min_value=0.0, max_value=100.0)
+    duplicate_rows_pct: float = _option(1.0, min_value=0.0, max_value=100.0)
+    outliers_pct: float = _option(10.0, min_value=0.0, max_value=100.0)
+
+
+@dataclass(frozen=True)
+class DataQualitySettings:
+    """Настройки контроля качества данных."""
+    thresholds: QualityThresholds = field(default_factory=QualityThresholds)
+    drift_detection: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class LoggingSettings:
+    """Настройки логирования."""
+    level: str = _option("INFO", choices=LOG_LEVELS)
+    log_path: str = "logs/"
+    format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+@dataclass(frozen=True)
+class PipelineSettings:
+    """Корневой объект настроек пайплайна."""
+    data: DataSettings = field(default_factory=DataSettings)
+    model: ModelSettings = field(default_factory=ModelSettings)
+    preprocessing: PreprocessingSettings = field(default_factory=PreprocessingSettings)
+    data_quality: DataQualitySettings = field(default_factory=DataQualitySettings)
+    logging: LoggingSettings = field(default_factory=LoggingSettings)
+    storage: Dict[str, Any] = field(default_factory=dict)
+    airflow: Dict[str, Any] = field(default_factory=dict)
+    database: Dict[str, Any] = field(default_factory=dict)
+
+
+def _coerce(value: Any, annotation: Any, path: str) -> Any:
+    """Приводит значение к типу поля схемы или сообщает об ошибке."""
+    origin = getattr(annotation, "__origin__", None)
+    args = getattr(annotation, "__args__", ())
+
+    if origin is Union:
+        if value is None and type(None) in args:
+            return None
+        annotation = next(arg for arg in args if arg is not type(None))
+        return _coerce(value, annotation, path)
+    if dataclasses.is_dataclass(annotation):
+        return _build(annotation, value, path)
+    if origin in (dict, Dict):
+        if value is None:
+            return {}
+        if not isinstance(value, dict):
+            raise ValueError(f"{path}: ожидается словарь, получено {type(value).__name__}")
+        return value
+    if origin in (tuple, Tuple):
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"{path}: ожидается список, получено {type(value).__name__}")
+        return tuple(_coerce(item, args[0], f"{path}[{idx}]") for idx, item in enumerate(value))
+    if annotation is bool:
+        if not isinstance(value, bool):
+            raise ValueError(f"{path}: ожидается true/false, получено {value!r}")
+        return value
+    if annotation is int:
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"{path}: ожидается целое число, получено {value!r}")
+        return value
+    if annotation is float:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{path}: ожидается число, получено {value!r}")
+        return float(value)
+    if annotation is str:
+        if not isinstance(value, str):
+            raise ValueError(f"{path}: ожидается строка, получено {value!r}")
+        return value
+    return value
+
+
+def _check_constraints(value: Any, metadata: Dict[str, Any], path: str) -> None:
+    """Проверяет допустимые значения и диапазон поля."""
+    if value is None:
+        return
+    choices = metadata.get("choices")
+    if choices is not None and value not in choices:
+        allowed = ", ".join(str(choice) for choice in choices if choice is not None)
+        raise ValueError(f"{path}: недопустимое значение {value!r}, допустимы: {allowed}")
+
+    min_value, max_value = metadata.get("min"), metadata.get("max")
+    if metadata.get("exclusive"):
+        if (min_value is not None and value <= min_value) or (max_value is not None and value >= max_value):
+            raise ValueError(f"{path}: значение {value} должно быть в интервале ({min_value}, {max_value})")
+    else:
+        if (min_value is not None and value < min_value) or (max_value is not None and value > max_value):
+            raise ValueError(f"{path}: значение {value} вне диапазона [{min_value}, {max_value}]")
+
+
+def _build(cls, data: Optional[Dict[str, Any]], path: str):
+    """Собирает dataclass раздела из словаря с проверкой полей."""
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: ожидается раздел (словарь), получено {type(data).__name__}")
+
+    hints = get_type_hints(cls)
+    values = {}
+    for schema_field in dataclasses.fields(cls):
+        field_path = f"{path}.{schema_field.name}" if path else schema_field.name
+        if schema_field.name not in data:
+            if schema_field.metadata.get("required"):
+                raise ValueError(f"{field_path}: обязательное поле не задано")
+            continue
+        value = _coerce(data[schema_field.name], hints[schema_field.name], field_path)
+        _check_constraints(value, schema_field.metadata, field_path)
+        values[schema_field.name] = value
+
+    unknown = set(data) - {schema_field.name for schema_field in dataclasses.fields(cls)}
+    if unknown:
+        logger.warning(f"Неизвестные ключи конфигурации в {path or 'корне'}: {', '.join(sorted(map(str, unknown)))}")
+    return cls(**values)
+
+
+def compile_settings(raw_config: Optional[Dict[str, Any]]) -> PipelineSettings:
+    """
+    Компилирует словарь конфигурации в типизированные настройки.
+
+    Args:
+        raw_config: Словарь, прочитанный из config.yaml
+
+    Returns:
+        Неизменяемый объект PipelineSettings
+
+    Raises:
+        ValueError: Если значение имеет неверный тип или вне допустимых значений
+    """
+    return _build(PipelineSettings, raw_config, "")
+
+
+def flatten_config(raw_config: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    Строит индекс "section.subsection.key" -> значение для всех узлов словаря.
+
+    Args:
+        raw_config: Словарь конфигурации
+        prefix: Префикс ключей (для рекурсии)
+
+    Returns:
+        Плоский словарь для O(1) доступа по составному ключу
+    """
+    flat = {}
+    for key, value in raw_config.items():
+        dotted = f"{prefix}{key}"
+        flat[dotted] = value
+        if isinstance(value, dict):
+            flat.update(flatten_config(value, f"{dotted}."))
+    return flat
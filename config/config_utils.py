@@ -4,112 +4,215 @@
 Автор: Самородов Юрий Сергеевич, МФТИ
 """
 import os
+import copy
 import yaml
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 
-
-class Config:
-"""Класс для управления конфигурацией проекта."""
-
-def __init__(self, config_path: str = None):
-"""
-Инициализация конфигурации.
-
-Args:
-config_path: Путь к файлу конфигурации
-"""
-# Загружаем переменные окружения
-load_dotenv()
-
-# Определяем путь к конфигурации
-if config_path is None:
-config_path = "config/config.yaml"
-
-self.config_path = Path(config_path)
-self.config = self._load_config()
-self._setup_logging()
-
-def _load_config(self) -> Dict[str, Any]:
-"""Загружает конфигурацию из YAML файла."""
 try:
-with open(self.config_path, 'r', encoding='utf-8') as file:
-config = yaml.safe_load(file)
-return config
-except FileNotFoundError:
-raise FileNotFoundError(f"Файл конфигурации не найден: {self.config_path}")
-except yaml.YAMLError as e:
-raise ValueError(f"Ошибка в файле конфигурации: {e}")
-
-def _setup_logging(self):
-"""Настройка логирования."""
-log_config = self.config.get("logging", {})
-log_level = log_config.get("level", "INFO")
-log_format = log_config.get("format", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-
-logging.basicConfig(
-level=getattr(logging, log_level),
-format=log_format,
-handlers=[
-logging.StreamHandler(),
-logging.FileHandler(
-os.path.join(log_config.get("log_path", "logs"), "pipeline.log"),
-encoding='utf-8'
-)
-]
-)
-
-def get(self, key: str, default=None):
-"""
-Получить значение из конфигурации.
+    from .config_schema import PipelineSettings, compile_settings, flatten_config
+except ImportError:
+    from config_schema import PipelineSettings, compile_settings, flatten_config
 
-Args:
-key: Ключ в формате "section.subsection.key"
-default: Значение по умолчанию
+DEFAULT_CONFIG_PATH = "config/config.yaml"
 
-Returns:
-Значение из конфигурации или default
-"""
-keys = key.split('.')
-value = self.config
+# Кэш разобранных файлов конфигурации: абсолютный путь -> (подпись файла, словарь, типизированные настройки)
+_config_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any], PipelineSettings]] = {}
+# Общие экземпляры Config для get_config()
+_shared_configs: Dict[str, "Config"] = {}
+_cache_lock = threading.RLock()
+_dotenv_loaded = False
+_logging_configured = False
 
-for k in keys:
-if isinstance(value, dict) and k in value:
-value = value[k]
-else:
-return default
 
-return value
+def _load_dotenv_once() -> None:
+    """Загружает переменные окружения из .env один раз на процесс."""
+    global _dotenv_loaded
+    with _cache_lock:
+        if not _dotenv_loaded:
+            load_dotenv()
+            _dotenv_loaded = True
 
-def get_data_config(self) -> Dict[str, Any]:
-"""Получить конфигурацию данных."""
-return self.config.get("data", {})
 
-def get_model_config(self) -> Dict[str, Any]:
-"""Получить конфигурацию модели."""
-return self.config.get("model", {})
+def _file_signature(path: str) -> Tuple[int, int]:
+    """Подпись файла для инвалидации кэша: время изменения и размер."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
 
-def get_storage_config(self) -> Dict[str, Any]:
-"""Получить конфигурацию хранилища."""
-return self.config.get("storage", {})
 
-def get_airflow_config(self) -> Dict[str, Any]:
-"""Получить конфигурацию Airflow."""
-return self.config.get("airflow", {})
+class Config:
+    """Класс для управления конфигурацией проекта."""
+
+    def __init__(self, config_path: str = None):
+        """
+        Инициализация конфигурации.
+
+        Разбор YAML, загрузка .env и настройка логирования выполняются один
+        раз на процесс; повторные экземпляры берут конфигурацию из кэша.
+
+        Args:
+            config_path: Путь к файлу конфигурации
+        """
+        # Загружаем переменные окружения
+        _load_dotenv_once()
+
+        # Определяем путь к конфигурации
+        if config_path is None:
+            config_path = DEFAULT_CONFIG_PATH
+
+        self.config_path = Path(config_path)
+        self._signature: Optional[Tuple[int, int]] = None
+        self._index: Dict[str, Any] = {}
+        self.settings: Optional[PipelineSettings] = None
+        self.config = self._load_config()
+        self._setup_logging()
+
+    def _load_config(self) -> Dict[str, Any]:
+        """
+        Загружает конфигурацию из YAML файла.
+
+        Разбор и компиляция в типизированные настройки (с проверкой значений)
+        выполняются один раз до изменения файла.
+        """
+        key = os.path.abspath(self.config_path)
+        try:
+            signature = _file_signature(key)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Файл конфигурации не найден: {self.config_path}")
+
+        with _cache_lock:
+            cached = _config_cache.get(key)
+            if cached is None or cached[0] != signature:
+                try:
+                    with open(key, 'r', encoding='utf-8') as file:
+                        raw_config = yaml.safe_load(file) or {}
+                except FileNotFoundError:
+                    raise FileNotFoundError(f"Файл конфигурации не найден: {self.config_path}")
+                except yaml.YAMLError as e:
+                    raise ValueError(f"Ошибка в файле конфигурации: {e}")
+                try:
+                    settings = compile_settings(raw_config)
+                except ValueError as e:
+                    raise ValueError(f"Некорректная конфигурация {self.config_path}: {e}")
+                cached = (signature, raw_config, settings)
+                _config_cache[key] = cached
+
+        self._signature, self.settings = cached[0], cached[2]
+        # Копия защищает общий кэш от изменений конфигурации отдельным экземпляром
+        config = copy.deepcopy(cached[1])
+        self._index = flatten_config(config)
+        return config
+
+    def is_stale(self) -> bool:
+        """Проверяет, изменился ли файл конфигурации после загрузки."""
+        try:
+            return _file_signature(os.path.abspath(self.config_path)) != self._signature
+        except FileNotFoundError:
+            return False
+
+    def reload(self) -> None:
+        """Перечитывает конфигурацию из файла."""
+        self.config = self._load_config()
+
+    def _setup_logging(self):
+        """Настройка логирования (один раз на процесс, без повторного создания обработчиков)."""
+        global _logging_configured
+        with _cache_lock:
+            if _logging_configured:
+                return
+
+            log_settings = self.settings.logging
+            log_path = log_settings.log_path
+            ensure_dir(log_path)
+
+            logging.basicConfig(
+                level=getattr(logging, log_settings.level),
+                format=log_settings.format,
+                handlers=[
+                    logging.StreamHandler(),
+                    logging.FileHandler(os.path.join(log_path, "pipeline.log"), encoding='utf-8')
+                ]
+            )
+            _logging_configured = True
+
+    def get(self, key: str, default=None):
+        """
+        Получить значение из конфигурации.
+
+        Составные ключи разрешаются по индексу, построенному при загрузке,
+        без разбора ключа на каждом вызове. Для типизированного доступа
+        используйте атрибут settings.
+
+        Args:
+            key: Ключ в формате "section.subsection.key"
+            default: Значение по умолчанию
+
+        Returns:
+            Значение из конфигурации или default
+        """
+        return self._index.get(key, default)
+
+    def get_data_config(self) -> Dict[str, Any]:
+        """Получить конфигурацию данных."""
+        return self.config.get("data", {})
+
+    def get_model_config(self) -> Dict[str, Any]:
+        """Получить конфигурацию модели."""
+        return self.config.get("model", {})
+
+    def get_storage_config(self) -> Dict[str, Any]:
+        """Получить конфигурацию хранилища."""
+        return self.config.get("storage", {})
+
+    def get_airflow_config(self) -> Dict[str, Any]:
+        """Получить конфигурацию Airflow."""
+        return self.config.get("airflow", {})
+
+
+def get_config(config_path: str = None) -> Config:
+    """
+    Возвращает общий для процесса экземпляр конфигурации.
+
+    Все компоненты пайплайна используют один объект; при изменении файла
+    конфигурации (mtime/размер) он перечитывается при следующем вызове.
+
+    Args:
+        config_path: Путь к файлу конфигурации
+
+    Returns:
+        Экземпляр Config
+    """
+    key = os.path.abspath(config_path or DEFAULT_CONFIG_PATH)
+    with _cache_lock:
+        config = _shared_configs.get(key)
+        if config is None:
+            config = Config(config_path)
+            _shared_configs[key] = config
+        elif config.is_stale():
+            config.reload()
+    return config
+
+
+def clear_config_cache() -> None:
+    """Сбрасывает кэш конфигураций (например, в тестах)."""
+    with _cache_lock:
+        _config_cache.clear()
+        _shared_configs.clear()
 
 
 def get_project_root() -> Path:
-"""Получить корневой путь проекта."""
-return Path(__file__).parent.parent
+    """Получить корневой путь проекта."""
+    return Path(__file__).parent.parent
 
 
 def ensure_dir(path: str) -> None:
-"""Создать директорию, если она не существует."""
-Path(path).mkdir(parents=True, exist_ok=True)
+    """Создать директорию, если она не существует."""
+    Path(path).mkdir(parents=True, exist_ok=True)
 
 
 def get_logger(name: str) -> logging.Logger:
-"""Получить настроенный логгер."""
-return logging.getLogger(name)
+    """Получить настроенный логгер."""
+    return logging.getLogger(name)
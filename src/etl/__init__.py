@@ -1,10 +1,29 @@
 """ML Pipeline ETL Package"""
 
 __all__ = [
+'artifact_index',
+'artifact_store',
+'atomic_io',
+'compact_dtypes',
 'data_loader',
 'data_preprocessor', 
 'data_quality_controller',
+'data_split',
+'drift_detection',
+'drift_monitor',
+'feature_expressions',
+'feature_selection',
+'json_serializer',
 'metrics_calculator',
+'metrics_store',
+'model_serializer',
 'model_trainer',
-'storage_manager'
+'preprocessing_block',
+'preprocessing_pipeline',
+'results_archiver',
+'run_results',
+'storage_manager',
+'streaming_metrics',
+'streaming_scaler',
+'upload_manager'
 ]
\ No newline at end of file
@@ -0,0 +1,376 @@
+"""
+Модуль индекса артефактов results/ и политики хранения.
+
+Каждый созданный артефакт (модель, метрики, отчеты, архивы) регистрируется
+в SQLite-индексе с путем, размером, run_id, типом и временем создания.
+Очистка выполняется запросом к индексу с политикой "последние N запусков +
+лучшая модель" и удалением пакетами, без обхода дерева директорий.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import os
+import re
+import logging
+import sqlite3
+import threading
+from fnmatch import fnmatch
+from typing import Dict, Any, Optional, List, Set
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger, ensure_dir
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+    def ensure_dir(path: str) -> None:
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+try:
+    from .atomic_io import CHECKSUM_SUFFIX
+except ImportError:
+    from atomic_io import CHECKSUM_SUFFIX
+
+
+logger = get_logger(__name__)
+
+# Тип артефакта по префиксу имени файла (первое совпадение)
+KIND_PREFIXES = [
+    ("final_model_", "model"),
+    ("final_metrics_", "metrics"),
+    ("complete_pipeline_results_", "results"),
+    ("pipeline_results_", "results"),
+    ("ml_pipeline_results_", "archive"),
+    ("xcom_save_summary_", "summary"),
+    ("save_summary_", "summary"),
+]
+
+# Тип артефакта по расширению, если префикс не распознан
+KIND_EXTENSIONS = {
+    ".joblib": "model",
+    ".zip": "archive",
+    ".png": "plot",
+    ".md": "report",
+    ".json": "metrics",
+}
+
+# Служебные файлы, которые не индексируются и не удаляются политикой хранения
+SERVICE_SUFFIXES = (".db", ".db-wal", ".db-shm", "archive_manifest.json", ".tmp", ".sha256")
+SERVICE_DIRS = (".artifact_store", "__pycache__", ".git")
+
+# Файлы, которые политика хранения никогда не удаляет: их перезаписывают на месте
+# (текущая модель, препроцессоры, метаданные), и они нужны для предсказаний
+PROTECTED_NAME_PATTERNS = ("current_model*", "preprocessing_pipeline*", "*_metadata.json")
+PROTECTED_DIRS = ("preprocessors",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    path TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT,
+    score REAL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_run ON artifacts (run_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_artifacts_created ON artifacts (created_at);
+CREATE INDEX IF NOT EXISTS idx_artifacts_kind_score ON artifacts (kind, score);
+"""
+
+
+def infer_kind(file_path: str) -> str:
+    """Определяет тип артефакта по имени файла."""
+    name = os.path.basename(file_path)
+    for prefix, kind in KIND_PREFIXES:
+        if name.startswith(prefix):
+            return kind
+    return KIND_EXTENSIONS.get(os.path.splitext(name)[1].lower(), "other")
+
+
+def is_protected(file_path: str) -> bool:
+    """Проверяет, что файл защищен от удаления политикой хранения."""
+    parts = os.path.normpath(file_path).split(os.sep)
+    return (any(fnmatch(parts[-1], pattern) for pattern in PROTECTED_NAME_PATTERNS)
+            or any(part in PROTECTED_DIRS for part in parts[:-1]))
+
+
+def _rewritten_after(file_path: str, created_at: str) -> bool:
+    """Проверяет, что файл изменен на диске после времени, записанного в индексе."""
+    try:
+        mtime = datetime.fromtimestamp(os.stat(file_path).st_mtime)
+    except OSError:
+        return False
+    return mtime > datetime.fromisoformat(created_at)
+
+
+def infer_run_id(file_path: str) -> str:
+    """Извлекает идентификатор запуска из timestamp в имени файла (YYYYMMDD_HHMMSS)."""
+    match = re.search(r"\d{8}_\d{6}", os.path.basename(file_path))
+    return match.group(0) if match else "unassigned"
+
+
+class ArtifactIndex:
+    """Индекс артефактов на основе SQLite с политикой хранения."""
+
+    def __init__(self, db_path: str = "results/artifact_index.db"):
+        """
+        Инициализация индекса.
+
+        Args:
+            db_path: Путь к файлу базы данных SQLite
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            ensure_dir(os.path.dirname(db_path) or ".")
+
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        if db_path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        logger.info(f"Индекс артефактов инициализирован: {db_path}")
+
+    def close(self):
+        """Закрывает подключение к базе данных."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def is_empty(self) -> bool:
+        """Проверяет, что в индексе нет ни одного артефакта."""
+        return self.connection.execute("SELECT 1 FROM artifacts LIMIT 1").fetchone() is None
+
+    def register(self, file_path: str, run_id: Optional[str] = None, kind: Optional[str] = None,
+                 size: Optional[int] = None, sha256: Optional[str] = None, score: Optional[float] = None,
+                 created_at: Optional[str] = None) -> None:
+        """
+        Регистрирует (или обновляет) артефакт в индексе.
+
+        Args:
+            file_path: Путь к файлу артефакта
+            run_id: Идентификатор запуска (по умолчанию из timestamp в имени файла)
+            kind: Тип артефакта (по умолчанию по имени файла)
+            size: Размер в байтах (по умолчанию из файловой системы)
+            sha256: Хэш содержимого (для хранилища артефактов)
+            score: Оценка качества (для выбора лучшей модели)
+            created_at: Время создания (ISO 8601, по умолчанию текущее)
+        """
+        if size is None:
+            size = os.path.getsize(file_path)
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO artifacts (path, run_id, kind, size, sha256, score, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (os.path.normpath(file_path), run_id or infer_run_id(file_path), kind or infer_kind(file_path),
+                 int(size), sha256, score, created_at or datetime.now().isoformat())
+            )
+
+    def set_score(self, file_path: str, score: float) -> None:
+        """Задает оценку качества артефакта (используется для выбора лучшей модели)."""
+        with self.connection:
+            self.connection.execute("UPDATE artifacts SET score = ? WHERE path = ?",
+                                    (float(score), os.path.normpath(file_path)))
+
+    def indexed_paths(self) -> Set[str]:
+        """Возвращает пути всех проиндексированных артефактов."""
+        return {row["path"] for row in self.connection.execute("SELECT path FROM artifacts").fetchall()}
+
+    def backfill(self, results_dir: str) -> int:
+        """
+        Однократно регистрирует уже существующие файлы results/, отсутствующие в индексе.
+
+        Args:
+            results_dir: Директория с результатами
+
+        Returns:
+            Количество добавленных артефактов
+        """
+        rows = []
+        for root, dirs, files in os.walk(results_dir):
+            dirs[:] = [d for d in dirs if d not in SERVICE_DIRS]
+            for file in files:
+                if file.endswith(SERVICE_SUFFIXES):
+                    continue
+                file_path = os.path.normpath(os.path.join(root, file))
+                stat = os.stat(file_path)
+                rows.append((file_path, infer_run_id(file_path), infer_kind(file_path), stat.st_size,
+                             datetime.fromtimestamp(stat.st_mtime).isoformat()))
+
+        with self.connection:
+            cursor = self.connection.executemany(
+                "INSERT OR IGNORE INTO artifacts (path, run_id, kind, size, created_at) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        logger.info(f"Индекс артефактов дополнен существующими файлами: {cursor.rowcount}")
+        return cursor.rowcount
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        """Возвращает запуски с числом артефактов и размером, от новых к старым."""
+        rows = self.connection.execute(
+            "SELECT run_id, COUNT(*) AS artifacts, SUM(size) AS total_size, MAX(created_at) AS last_created_at "
+            "FROM artifacts GROUP BY run_id ORDER BY last_created_at DESC"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_best_model(self) -> Optional[Dict[str, Any]]:
+        """Возвращает модель с наибольшей оценкой."""
+        row = self.connection.execute(
+            "SELECT * FROM artifacts WHERE kind = 'model' AND score IS NOT NULL "
+            "ORDER BY score DESC, created_at DESC LIMIT 1"
+        ).fetchone()
+        return dict(row) if row else None
+
+    def select_expired(self, keep_last_runs: int = 5, max_age_days: Optional[float] = None,
+                       keep_best_model: bool = True, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Выбирает артефакты, подлежащие удалению по политике хранения.
+
+        Артефакт удаляется, если его запуск не входит в keep_last_runs последних,
+        он старше max_age_days (если задано) и не является лучшей моделью.
+        Защищенные файлы (is_protected) и файлы, перезаписанные на месте после
+        регистрации в индексе, не удаляются.
+
+        Returns:
+            Список записей индекса
+        """
+        params: List[Any] = [max(int(keep_last_runs), 0)]
+        query = (
+            "SELECT path, run_id, kind, size, sha256, created_at FROM artifacts "
+            "WHERE run_id NOT IN ("
+            "  SELECT run_id FROM artifacts GROUP BY run_id ORDER BY MAX(created_at) DESC LIMIT ?"
+            ")"
+        )
+        if max_age_days is not None:
+            cutoff = (now or datetime.now()) - timedelta(days=max_age_days)
+            query += " AND created_at < ?"
+            params.append(cutoff.isoformat())
+        if keep_best_model:
+            best = self.get_best_model()
+            if best is not None:
+                query += " AND path != ?"
+                params.append(best["path"])
+
+        return [dict(row) for row in self.connection.execute(query, params).fetchall()
+                if not is_protected(row["path"]) and not _rewritten_after(row["path"], row["created_at"])]
+
+    def apply_retention(self, keep_last_runs: int = 5, max_age_days: Optional[float] = None,
+                        keep_best_model: bool = True, batch_size: int = 500,
+                        dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Удаляет артефакты по политике хранения пакетами.
+
+        Args:
+            keep_last_runs: Количество последних запусков, которые сохраняются целиком
+            max_age_days: Минимальный возраст удаляемых артефактов в днях
+            keep_best_model: Сохранять ли лучшую модель независимо от возраста
+            batch_size: Размер пакета удаления записей индекса
+            dry_run: Только вернуть кандидатов без удаления
+
+        Returns:
+            Статистика удаления и хэши освобожденного содержимого
+        """
+        expired = self.select_expired(keep_last_runs, max_age_days, keep_best_model)
+        result = {"deleted_files": 0, "missing_files": 0, "freed_bytes": 0,
+                  "released_sha256": [], "candidates": [row["path"] for row in expired]}
+        if dry_run or not expired:
+            return result
+
+        for start in range(0, len(expired), batch_size):
+            batch = expired[start:start + batch_size]
+            # Из индекса удаляются только записи файлов, которых больше нет на диске
+            removed_paths = []
+            for row in batch:
+                try:
+                    os.remove(row["path"])
+                    # Файл контрольной суммы удаляется вместе с артефактом
+                    if os.path.exists(row["path"] + CHECKSUM_SUFFIX):
+                        os.remove(row["path"] + CHECKSUM_SUFFIX)
+                    result["deleted_files"] += 1
+                    result["freed_bytes"] += row["size"]
+                except FileNotFoundError:
+                    result["missing_files"] += 1
+                except OSError as e:
+                    logger.warning(f"Не удалось удалить артефакт {row['path']}: {e}")
+                    continue
+                removed_paths.append((row["path"],))
+                if row["sha256"]:
+                    result["released_sha256"].append(row["sha256"])
+
+            with self.connection:
+                self.connection.executemany("DELETE FROM artifacts WHERE path = ?", removed_paths)
+
+        logger.info(f"Политика хранения применена: удалено файлов {result['deleted_files']}, "
+                    f"освобождено {result['freed_bytes']} bytes")
+        return result
+
+
+_shared_indexes: Dict[str, ArtifactIndex] = {}
+_shared_indexes_lock = threading.Lock()
+
+
+def open_artifact_index(storage_config: Dict[str, Any]) -> Optional[ArtifactIndex]:
+    """
+    Возвращает общий для процесса индекс артефактов из раздела storage конфигурации.
+
+    При первом открытии пустого индекса в него однократно заносятся уже
+    существующие файлы директории результатов; это единственный обход дерева.
+
+    Args:
+        storage_config: Раздел storage конфигурации
+
+    Returns:
+        Индекс или None, если политика хранения отключена
+    """
+    retention_config = storage_config.get("retention", {}) or {}
+    if not retention_config.get("enabled", False):
+        return None
+
+    index_path = os.path.abspath(retention_config.get("index_path", "results/artifact_index.db"))
+    with _shared_indexes_lock:
+        index = _shared_indexes.get(index_path)
+        if index is None:
+            index = ArtifactIndex(index_path)
+            if index.is_empty():
+                index.backfill(storage_config.get("local", {}).get("results_path", "results/"))
+            _shared_indexes[index_path] = index
+    return index
+
+
+def register_result_file(storage_config: Dict[str, Any], file_path: str, run_id: Optional[str] = None,
+                         kind: Optional[str] = None, score: Optional[float] = None,
+                         sha256: Optional[str] = None) -> None:
+    """
+    Регистрирует записанный файл результатов в индексе политики хранения.
+
+    Регистрируются только файлы внутри директории результатов (storage.local.results_path),
+    чтобы политика хранения не удаляла файлы за ее пределами. Ошибки индекса не
+    прерывают запись результатов.
+
+    Args:
+        storage_config: Раздел storage конфигурации
+        file_path: Путь к файлу
+        run_id: Идентификатор запуска (по умолчанию из timestamp в имени файла)
+        kind: Тип артефакта (по умолчанию по имени файла)
+        score: Оценка качества модели
+        sha256: Хэш содержимого в хранилище артефактов
+    """
+    try:
+        results_dir = os.path.abspath(storage_config.get("local", {}).get("results_path", "results/"))
+        if os.path.commonpath([results_dir, os.path.abspath(file_path)]) != results_dir:
+            return
+        index = open_artifact_index(storage_config)
+        if index is not None:
+            index.register(file_path, run_id=run_id, kind=kind, score=score, sha256=sha256)
+    except Exception as e:
+        logger.warning(f"Не удалось зарегистрировать артефакт {file_path}: {str(e)}")
@@ -0,0 +1,234 @@
+"""
+Модуль контентно-адресуемого хранилища артефактов.
+
+Каждое уникальное содержимое хранится один раз в виде блоба с именем,
+равным его SHA-256. Файлы в results/ являются жесткими ссылками на блобы,
+поэтому одинаковые модели, метрики и отчеты разных запусков не занимают
+место повторно. Счетчиком ссылок служит st_nlink блоба: блоб без внешних
+ссылок считается мусором и удаляется сборщиком.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import os
+import sys
+import time
+import uuid
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger, ensure_dir
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+    def ensure_dir(path: str) -> None:
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+
+try:
+    from .atomic_io import file_sha256, fsync_file, sync_parent_directory
+except ImportError:
+    from atomic_io import file_sha256, fsync_file, sync_parent_directory
+
+
+logger = get_logger(__name__)
+
+
+class ArtifactStore:
+    """Хранилище блобов по хэшу содержимого с материализацией через жесткие ссылки."""
+
+    def __init__(self, root: str = "results/.artifact_store"):
+        """
+        Инициализация хранилища.
+
+        Args:
+            root: Корневая директория блобов
+        """
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        ensure_dir(self.objects_dir)
+
+    def blob_path(self, digest: str) -> str:
+        """Возвращает путь к блобу по его хэшу."""
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def _store_blob(self, digest: str, writer) -> str:
+        """Атомарно создает блоб, если такого содержимого еще нет."""
+        blob_path = self.blob_path(digest)
+        if os.path.exists(blob_path):
+            return blob_path
+
+        ensure_dir(os.path.dirname(blob_path))
+        temp_path = f"{blob_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            writer(temp_path)
+            fsync_file(temp_path)
+            # Блобы неизменяемы: запись через ссылку испортила бы все копии
+            os.chmod(temp_path, 0o444)
+            os.replace(temp_path, blob_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        sync_parent_directory(blob_path)
+        return blob_path
+
+    def _materialize(self, blob_path: str, destination_path: str) -> bool:
+        """
+        Создает файл назначения как жесткую ссылку на блоб.
+
+        Returns:
+            True если создана ссылка, False если пришлось скопировать файл
+        """
+        ensure_dir(os.path.dirname(destination_path) or ".")
+        # Время изменения общего inode отражает последнее использование содержимого,
+        # иначе новый файл со старым содержимым выглядел бы устаревшим для очистки
+        os.utime(blob_path)
+        if os.path.exists(destination_path) and os.path.samefile(blob_path, destination_path):
+            return True
+
+        temp_path = f"{destination_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            try:
+                os.link(blob_path, temp_path)
+                linked = True
+            except OSError:
+                # Файловая система без жестких ссылок или другой том
+                shutil.copyfile(blob_path, temp_path)
+                fsync_file(temp_path)
+                linked = False
+            os.replace(temp_path, destination_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        sync_parent_directory(destination_path)
+        return linked
+
+    def put_bytes(self, data: bytes, destination_path: str) -> str:
+        """
+        Сохраняет байты по пути назначения через хранилище.
+
+        Args:
+            data: Содержимое файла
+            destination_path: Путь файла в results/
+
+        Returns:
+            Хэш содержимого
+        """
+        digest = hashlib.sha256(data).hexdigest()
+
+        def write(temp_path: str) -> None:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+
+        self._materialize(self._store_blob(digest, write), destination_path)
+        return digest
+
+    def put_file(self, source_path: str, destination_path: str) -> str:
+        """
+        Копирует файл по пути назначения через хранилище.
+
+        Исходный файл копируется в блоб (а не связывается ссылкой), чтобы
+        последующая перезапись источника не изменила сохраненный артефакт.
+
+        Args:
+            source_path: Исходный файл
+            destination_path: Путь файла в results/
+
+        Returns:
+            Хэш содержимого
+        """
+        digest = file_sha256(source_path)
+        self._materialize(self._store_blob(digest, lambda temp_path: shutil.copyfile(source_path, temp_path)),
+                          destination_path)
+        return digest
+
+    def release(self, digests) -> Dict[str, int]:
+        """
+        Удаляет блобы указанных хэшей, если на них больше не ссылается ни один файл.
+
+        Точечная альтернатива collect_garbage: не требует обхода хранилища.
+
+        Args:
+            digests: Хэши содержимого удаленных артефактов
+
+        Returns:
+            Количество удаленных блобов и освобожденных байт
+        """
+        removed, freed = 0, 0
+        for digest in set(digests):
+            blob_path = self.blob_path(digest)
+            try:
+                stat = os.stat(blob_path)
+                if stat.st_nlink > 1:
+                    continue
+                os.remove(blob_path)
+                removed += 1
+                freed += stat.st_size
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Не удалось удалить блоб {blob_path}: {e}")
+
+        return {"removed_blobs": removed, "freed_bytes": freed}
+
+    def collect_garbage(self, grace_seconds: float = 3600) -> Dict[str, int]:
+        """
+        Удаляет блобы, на которые не ссылается ни один файл.
+
+        Args:
+            grace_seconds: Минимальный возраст блоба для удаления (защита от гонки с put)
+
+        Returns:
+            Количество удаленных блобов и освобожденных байт
+        """
+        removed, freed = 0, 0
+        now = time.time()
+
+        for entry in self._iter_blobs():
+            stat = entry.stat()
+            if stat.st_nlink > 1 or now - stat.st_mtime < grace_seconds:
+                continue
+            try:
+                os.remove(entry.path)
+                removed += 1
+                freed += stat.st_size
+            except OSError as e:
+                logger.warning(f"Не удалось удалить блоб {entry.path}: {e}")
+
+        logger.info(f"Сборка мусора хранилища артефактов: удалено блобов {removed}, освобождено {freed} bytes")
+        return {"removed_blobs": removed, "freed_bytes": freed}
+
+    def _iter_blobs(self):
+        """Перебирает файлы блобов хранилища."""
+        if not os.path.isdir(self.objects_dir):
+            return
+        for prefix in os.scandir(self.objects_dir):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    yield entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Возвращает статистику хранилища и экономии места."""
+        blobs, stored_bytes, logical_bytes = 0, 0, 0
+        for entry in self._iter_blobs():
+            stat = entry.stat()
+            blobs += 1
+            stored_bytes += stat.st_size
+            logical_bytes += stat.st_size * max(stat.st_nlink - 1, 0)
+
+        return {
+            "blobs": blobs,
+            "stored_bytes": stored_bytes,
+            "logical_bytes": logical_bytes,
+            "saved_bytes": max(logical_bytes - stored_bytes, 0)
+        }
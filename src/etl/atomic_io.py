@@ -0,0 +1,261 @@
+"""
+Модуль атомарной и устойчивой к сбоям записи файлов результатов.
+
+Файл записывается во временный файл в той же директории, сбрасывается на
+диск (fsync) и атомарно переименовывается в целевой путь, поэтому
+прерванная задача не оставляет обрезанных JSON/joblib файлов. Рядом
+сохраняется файл контрольной суммы (<файл>.sha256 в формате sha256sum),
+которая проверяется при чтении. fsync директорий может откладываться и
+выполняться один раз на директорию в конце блока batched_directory_sync.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import os
+import sys
+import hashlib
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Union
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger, ensure_dir
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+    def ensure_dir(path: str) -> None:
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+
+logger = get_logger(__name__)
+
+CHECKSUM_SUFFIX = ".sha256"
+
+# Размер блока при потоковом хэшировании
+CHUNK_SIZE = 1024 * 1024
+
+# Директории, fsync которых отложен до конца блока batched_directory_sync (по потокам)
+_sync_state = threading.local()
+
+
+def file_sha256(file_path: str) -> str:
+    """Вычисляет SHA-256 файла потоково."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def checksum_path(file_path: str) -> str:
+    """Возвращает путь к файлу контрольной суммы."""
+    return f"{os.fspath(file_path)}{CHECKSUM_SUFFIX}"
+
+
+def fsync_file(file_path: str) -> None:
+    """Сбрасывает содержимое файла на диск."""
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_directory(dir_path: str) -> None:
+    """Сбрасывает на диск запись директории (фиксирует переименования)."""
+    try:
+        fd = os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        # Например, Windows: директории нельзя открыть для fsync
+        return
+    try:
+        os.fsync(fd)
+    except OSError as e:
+        logger.debug(f"fsync директории {dir_path} не поддерживается: {e}")
+    finally:
+        os.close(fd)
+
+
+def sync_parent_directory(file_path: str) -> None:
+    """Выполняет (или откладывает в пакетном режиме) fsync директории файла."""
+    dir_path = os.path.dirname(os.path.abspath(file_path))
+    pending = getattr(_sync_state, "pending", None)
+    if pending is not None:
+        pending.add(dir_path)
+    else:
+        fsync_directory(dir_path)
+
+
+@contextmanager
+def batched_directory_sync():
+    """
+    Откладывает fsync директорий до выхода из блока.
+
+    Внутри блока каждая директория синхронизируется один раз, сколько бы
+    файлов в нее ни было записано. Вложенные блоки объединяются с внешним.
+    """
+    if getattr(_sync_state, "pending", None) is not None:
+        yield
+        return
+
+    _sync_state.pending = set()
+    try:
+        yield
+    finally:
+        pending, _sync_state.pending = _sync_state.pending, None
+        for dir_path in sorted(pending):
+            fsync_directory(dir_path)
+
+
+@contextmanager
+def atomic_write(file_path: Union[str, Path], mode: str = "wb", encoding: Optional[str] = None,
+                 fsync: bool = True):
+    """
+    Открывает временный файл, который при успешном выходе заменяет file_path.
+
+    При исключении временный файл удаляется, а целевой файл остается прежним.
+
+    Args:
+        file_path: Целевой путь
+        mode: Режим открытия ("wb" или "w")
+        encoding: Кодировка для текстового режима
+        fsync: Сбрасывать ли файл и директорию на диск
+
+    Yields:
+        Файловый объект временного файла
+    """
+    file_path = os.fspath(file_path)
+    dir_path = os.path.dirname(file_path) or "."
+    ensure_dir(dir_path)
+
+    fd, temp_path = tempfile.mkstemp(dir=dir_path, prefix=f".{os.path.basename(file_path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        # mkstemp создает файл с правами 0600, приводим к обычным правам
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    if fsync:
+        sync_parent_directory(file_path)
+
+
+def write_checksum(file_path: str, digest: Optional[str] = None, fsync: bool = True) -> str:
+    """
+    Сохраняет контрольную сумму файла рядом с ним.
+
+    Args:
+        file_path: Путь к файлу
+        digest: Известный SHA-256 содержимого (иначе вычисляется)
+        fsync: Сбрасывать ли файл на диск
+
+    Returns:
+        SHA-256 содержимого
+    """
+    digest = digest or file_sha256(file_path)
+    with atomic_write(checksum_path(file_path), "w", encoding="utf-8", fsync=fsync) as f:
+        f.write(f"{digest}  {os.path.basename(file_path)}\n")
+    return digest
+
+
+def read_checksum(file_path: str) -> Optional[str]:
+    """Возвращает сохраненную контрольную сумму файла или None, если ее нет."""
+    try:
+        with open(checksum_path(file_path), "r", encoding="utf-8") as f:
+            content = f.read().split()
+    except FileNotFoundError:
+        return None
+    return content[0] if content else None
+
+
+def write_bytes_atomic(file_path: Union[str, Path], data: bytes, checksum: bool = True,
+                       fsync: bool = True) -> str:
+    """
+    Атомарно записывает байты в файл с контрольной суммой.
+
+    Args:
+        file_path: Путь к файлу
+        data: Содержимое
+        checksum: Сохранять ли файл контрольной суммы
+        fsync: Сбрасывать ли данные на диск
+
+    Returns:
+        SHA-256 содержимого
+    """
+    file_path = os.fspath(file_path)
+    with atomic_write(file_path, "wb", fsync=fsync) as f:
+        f.write(data)
+    digest = hashlib.sha256(data).hexdigest()
+    if checksum:
+        write_checksum(file_path, digest, fsync=fsync)
+    return digest
+
+
+def remove_with_checksum(file_path: Union[str, Path]) -> bool:
+    """
+    Удаляет файл вместе с его контрольной суммой.
+
+    Returns:
+        True если файл существовал и удален
+    """
+    file_path = os.fspath(file_path)
+    removed = False
+    for path in (file_path, checksum_path(file_path)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        removed = removed or path == file_path
+    return removed
+
+
+def verify_checksum(file_path: Union[str, Path]) -> bool:
+    """
+    Проверяет файл по сохраненной контрольной сумме.
+
+    Файлы без контрольной суммы (записанные до ее появления) считаются
+    корректными.
+
+    Returns:
+        False если файл отсутствует или содержимое не совпадает с суммой
+    """
+    file_path = os.fspath(file_path)
+    if not os.path.exists(file_path):
+        return False
+    expected = read_checksum(file_path)
+    if expected is None:
+        return True
+    if file_sha256(file_path) != expected:
+        logger.warning(f"Контрольная сумма не совпадает, файл поврежден: {file_path}")
+        return False
+    return True
+
+
+def read_bytes_verified(file_path: Union[str, Path]) -> bytes:
+    """
+    Читает файл и проверяет контрольную сумму (если она сохранена).
+
+    Raises:
+        ValueError: Если содержимое не совпадает с контрольной суммой
+    """
+    file_path = os.fspath(file_path)
+    with open(file_path, "rb") as f:
+        data = f.read()
+    expected = read_checksum(file_path)
+    if expected is not None and hashlib.sha256(data).hexdigest() != expected:
+        raise ValueError(f"Контрольная сумма не совпадает, файл поврежден: {file_path}")
+    return data
@@ -0,0 +1,128 @@
+"""
+Модуль компактного представления DataFrame.
+
+Профиль "compact" хранит вещественные признаки в float32, diagnosis - как
+категориальную колонку, целые колонки (id) - в наименьшем целом типе.
+Для WDBC это примерно вдвое уменьшает память DataFrame. Проверки типов
+(отбор признаков, контроль качества, дрейф) опираются на семейство типа
+(целые / вещественные), а не на конкретную разрядность, поэтому работают
+с обоими профилями.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import logging
+from typing import List, Sequence
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as pd_types
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+
+logger = get_logger(__name__)
+
+DTYPE_PROFILES = ("default", "compact")
+
+# Известные значения diagnosis: категории одинаковы во всех частях данных
+DIAGNOSIS_CATEGORIES = ("B", "M")
+CATEGORICAL_COLUMNS = ("diagnosis",)
+
+
+def dtype_family(dtype) -> str:
+    """
+    Семейство типа колонки без учета разрядности.
+
+    Returns:
+        "integer", "float", "bool", "categorical", "string" или "other"
+    """
+    if pd_types.is_bool_dtype(dtype):
+        return "bool"
+    if pd_types.is_integer_dtype(dtype):
+        return "integer"
+    if pd_types.is_float_dtype(dtype):
+        return "float"
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "categorical"
+    if pd_types.is_string_dtype(dtype) or pd_types.is_object_dtype(dtype):
+        return "string"
+    return "other"
+
+
+def is_feature_dtype(dtype) -> bool:
+    """Числовой признак: целые или вещественные любой разрядности (bool и категории - нет)."""
+    return dtype_family(dtype) in ("integer", "float")
+
+
+def feature_dtype_columns(df: pd.DataFrame, exclude: Sequence[str] = ()) -> List[str]:
+    """Колонки с числовым типом любой разрядности, кроме exclude."""
+    excluded = set(exclude)
+    return [col for col in df.columns if col not in excluded and is_feature_dtype(df[col].dtype)]
+
+
+def memory_usage_mb(df: pd.DataFrame) -> float:
+    """Память DataFrame (с учетом строк в object-колонках), MB."""
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def _compact_column(name: str, series: pd.Series, float_dtype: np.dtype) -> pd.Series:
+    """Компактный тип одной колонки (значения не меняются, кроме точности float)."""
+    family = dtype_family(series.dtype)
+    if family == "float" and series.dtype.itemsize > np.dtype(float_dtype).itemsize:
+        return series.astype(float_dtype)
+    if family == "integer" and isinstance(series.dtype, np.dtype):
+        return pd.to_numeric(series, downcast="integer")
+    if family == "string" and name in CATEGORICAL_COLUMNS:
+        # Неизвестные значения остаются отдельными категориями (их находит контроль качества)
+        categories = sorted(set(DIAGNOSIS_CATEGORIES) | set(series.dropna().unique()))
+        return series.astype(pd.CategoricalDtype(categories))
+    return series
+
+
+def compact_frame(df: pd.DataFrame, float_dtype: np.dtype = np.float32) -> pd.DataFrame:
+    """
+    Переводит DataFrame в компактное представление.
+
+    Вещественные колонки - в float_dtype, целые - в наименьший целый тип,
+    diagnosis - в категориальный тип с фиксированными категориями B/M.
+    Исходный DataFrame не изменяется; колонки без изменений не копируются.
+
+    Args:
+        df: DataFrame
+        float_dtype: Тип вещественных колонок
+
+    Returns:
+        DataFrame с компактными типами
+    """
+    compacted = pd.DataFrame({col: _compact_column(col, df[col], float_dtype) for col in df.columns},
+                             index=df.index)
+    logger.debug(f"Компактные типы: {memory_usage_mb(df):.2f} MB -> {memory_usage_mb(compacted):.2f} MB")
+    return compacted
+
+
+def apply_dtype_profile(df: pd.DataFrame, profile: str = "default") -> pd.DataFrame:
+    """
+    Применяет профиль типов данных из конфигурации (data.dtype_profile).
+
+    Args:
+        df: Загруженный DataFrame
+        profile: "default" (типы как при чтении) или "compact"
+
+    Returns:
+        DataFrame в выбранном представлении
+    """
+    if profile not in DTYPE_PROFILES:
+        raise ValueError(f"Неизвестный профиль типов: {profile}. Доступны: {', '.join(DTYPE_PROFILES)}")
+    if profile == "compact":
+        return compact_frame(df)
+    return df
@@ -6,542 +6,844 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Tuple, List, Optional, Dict, Any
-from sklearn.preprocessing import StandardScaler, LabelEncoder, RobustScaler, MinMaxScaler
-from sklearn.model_selection import train_test_split
-from sklearn.feature_selection import SelectKBest, f_classif, RFE
-from sklearn.linear_model import LogisticRegression
-from sklearn.decomposition import PCA
+from typing import Tuple, List, Optional, Dict, Any, Iterable, Iterator
+from sklearn.preprocessing import LabelEncoder
+from sklearn.decomposition import PCA, IncrementalPCA
 from scipy import stats
 import os
 import sys
-import joblib
 
 # Добавляем корневую папку в путь для импорта конфигурации
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-from config.config_utils import Config, get_logger, ensure_dir
+    from config.config_utils import Config, get_config, get_logger, ensure_dir
+    from config.config_schema import PreprocessingSettings
 except ImportError:
-def get_logger(name: str):
-logging.basicConfig(level=logging.INFO)
-return logging.getLogger(name)
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
 
-
-logger = get_logger(__name__)
-
-
-class DataPreprocessor:
-"""Класс для предобработки данных Wisconsin Breast Cancer."""
-
-def __init__(self, config: Optional[Config] = None):
-"""
-Инициализация препроцессора.
-
-Args:
-config: Объект конфигурации
-"""
-self.config = config or Config()
-self.data_config = self.config.get_data_config()
-self.scaler = StandardScaler()
-self.robust_scaler = RobustScaler() # Для данных с выбросами
-self.minmax_scaler = MinMaxScaler() # Альтернативный скейлер
-self.label_encoder = LabelEncoder()
-self.feature_selector = None
-self.pca = None
-self.feature_columns = []
-self.engineered_features = []
-self.outlier_method = "iqr" # iqr, zscore, isolation_forest
-
-def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
-"""
-Очищает данные от проблемных значений.
-
-Args:
-df: Исходный DataFrame
-
-Returns:
-Очищенный DataFrame
-"""
-logger.info("Начало очистки данных")
-
-df_clean = df.copy()
-
-# Удаляем дубликаты
-initial_rows = len(df_clean)
-df_clean = df_clean.drop_duplicates()
-removed_duplicates = initial_rows - len(df_clean)
-if removed_duplicates > 0:
-logger.info(f"Удалено дубликатов: {removed_duplicates}")
-
-# Удаляем строки с пустыми ID или diagnosis
-critical_columns = ["id", "diagnosis"]
-for col in critical_columns:
-if col in df_clean.columns:
-before_count = len(df_clean)
-df_clean = df_clean.dropna(subset=[col])
-after_count = len(df_clean)
-if before_count != after_count:
-logger.info(f"Удалено строк с пустыми {col}: {before_count - after_count}")
-
-# Обработка пропущенных значений в числовых колонках
-numeric_columns = df_clean.select_dtypes(include=[np.number]).columns
-for col in numeric_columns:
-if df_clean[col].isnull().sum() > 0:
-# Заполняем медианой
-median_value = df_clean[col].median()
-df_clean[col].fillna(median_value, inplace=True)
-logger.info(f"Заполнены пропуски в {col} медианой: {median_value}")
-
-logger.info(f"Очистка данных завершена. Осталось строк: {len(df_clean)}")
-return df_clean
-
-def prepare_features(self, df: pd.DataFrame) -> pd.DataFrame:
-"""
-Подготавливает признаки для обучения модели.
-
-Args:
-df: DataFrame с данными
-
-Returns:
-DataFrame с подготовленными признаками
-"""
-logger.info("Начало подготовки признаков")
-
-df_processed = df.copy()
-
-# Исключаем ID из признаков
-if "id" in df_processed.columns:
-df_processed = df_processed.drop("id", axis=1)
-
-# Кодируем целевую переменную
-if "diagnosis" in df_processed.columns:
-# M (Malignant) = 1, B (Benign) = 0
-diagnosis_mapping = {"M": 1, "B": 0}
-df_processed["diagnosis_encoded"] = df_processed["diagnosis"].map(diagnosis_mapping)
-
-if df_processed["diagnosis_encoded"].isnull().sum() > 0:
-logger.warning("Найдены неизвестные значения в diagnosis")
-
-# Сохраняем оригинальную колонку для анализа
-# df_processed = df_processed.drop("diagnosis", axis=1)
-
-# Выбираем только числовые признаки
-feature_columns = [col for col in df_processed.columns 
-if col not in ["diagnosis", "diagnosis_encoded"] and 
-df_processed[col].dtype in [np.int64, np.float64]]
-
-self.feature_columns = feature_columns
-logger.info(f"Выбрано признаков для обучения: {len(feature_columns)}")
-
-return df_processed
-
-def scale_features(self, X_train: pd.DataFrame, X_test: pd.DataFrame = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
-"""
-Нормализует признаки с помощью StandardScaler.
-
-Args:
-X_train: Обучающая выборка
-X_test: Тестовая выборка (опционально)
-
-Returns:
-Tuple с нормализованными данными
-"""
-logger.info("Начало нормализации признаков")
-
-# Обучаем скейлер на обучающих данных
-X_train_scaled = self.scaler.fit_transform(X_train)
-logger.info(f"Скейлер обучен на {X_train.shape[0]} образцах")
-
-X_test_scaled = None
-if X_test is not None:
-X_test_scaled = self.scaler.transform(X_test)
-logger.info(f"Тестовые данные нормализованы: {X_test.shape[0]} образцов")
-
-return X_train_scaled, X_test_scaled
-
-def split_data(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
-"""
-Разделяет данные на обучающую и тестовую выборки.
-
-Args:
-df: DataFrame с подготовленными данными
-
-Returns:
-Tuple (X_train, X_test, y_train, y_test)
-"""
-logger.info("Начало разделения данных")
-
-# Определяем признаки и целевую переменную
-target_column = "diagnosis_encoded" if "diagnosis_encoded" in df.columns else "diagnosis"
-feature_columns = [col for col in df.columns if col not in ["diagnosis", "diagnosis_encoded"]]
-
-X = df[feature_columns]
-y = df[target_column]
-
-# Если целевая переменная категориальная, кодируем её
-if y.dtype == 'object':
-y = self.label_encoder.fit_transform(y)
-
-# Параметры разделения
-test_size = self.data_config.get("test_size", 0.2)
-random_state = self.data_config.get("random_state", 42)
-
-X_train, X_test, y_train, y_test = train_test_split(
-X, y,
-test_size=test_size,
-random_state=random_state,
-stratify=y # Сохраняем пропорции классов
-)
-
-logger.info(f"Данные разделены:")
-logger.info(f" Обучающая выборка: {X_train.shape[0]} образцов")
-logger.info(f" Тестовая выборка: {X_test.shape[0]} образцов")
-logger.info(f" Признаков: {X_train.shape[1]}")
-
-# Проверяем распределение классов
-train_distribution = pd.Series(y_train).value_counts().to_dict()
-test_distribution = pd.Series(y_test).value_counts().to_dict()
-logger.info(f" Распределение в обучающей выборке: {train_distribution}")
-logger.info(f" Распределение в тестовой выборке: {test_distribution}")
-
-return X_train, X_test, y_train, y_test
-
-def save_preprocessor(self, output_dir: str = "results/preprocessors/"):
-"""
-Сохраняет обученные препроцессоры.
-
-Args:
-output_dir: Директория для сохранения
-"""
-ensure_dir(output_dir)
-
-try:
-# Сохраняем скейлер
-scaler_path = os.path.join(output_dir, "scaler.joblib")
-joblib.dump(self.scaler, scaler_path)
-logger.info(f"Скейлер сохранен: {scaler_path}")
-
-# Сохраняем энкодер (если использовался)
-if hasattr(self.label_encoder, 'classes_'):
-encoder_path = os.path.join(output_dir, "label_encoder.joblib")
-joblib.dump(self.label_encoder, encoder_path)
-logger.info(f"Энкодер сохранен: {encoder_path}")
-
-# Сохраняем список признаков
-features_path = os.path.join(output_dir, "feature_columns.joblib")
-joblib.dump(self.feature_columns, features_path)
-logger.info(f"Список признаков сохранен: {features_path}")
-
-except Exception as e:
-logger.error(f"Ошибка при сохранении препроцессоров: {str(e)}")
-raise
-
-def load_preprocessor(self, input_dir: str = "results/preprocessors/"):
-"""
-Загружает сохраненные препроцессоры.
-
-Args:
-input_dir: Директория с сохраненными препроцессорами
-"""
-try:
-# Загружаем скейлер
-scaler_path = os.path.join(input_dir, "scaler.joblib")
-if os.path.exists(scaler_path):
-self.scaler = joblib.load(scaler_path)
-logger.info(f"Скейлер загружен: {scaler_path}")
-
-# Загружаем энкодер
-encoder_path = os.path.join(input_dir, "label_encoder.joblib")
-if os.path.exists(encoder_path):
-self.label_encoder = joblib.load(encoder_path)
-logger.info(f"Энкодер загружен: {encoder_path}")
-
-# Загружаем список признаков
-features_path = os.path.join(input_dir, "feature_columns.joblib")
-if os.path.exists(features_path):
-self.feature_columns = joblib.load(features_path)
-logger.info(f"Список признаков загружен: {features_path}")
-
-except Exception as e:
-logger.error(f"Ошибка при загрузке препроцессоров: {str(e)}")
-raise
-
-def detect_outliers(self, df: pd.DataFrame, method: str = "iqr") -> Dict[str, List[int]]:
-"""
-Обнаруживает выбросы в данных различными методами.
-
-Args:
-df: DataFrame для анализа
-method: Метод обнаружения ('iqr', 'zscore', 'isolation_forest')
-
-Returns:
-Словарь с индексами выбросов для каждой колонки
-"""
-outliers = {}
-numeric_columns = df.select_dtypes(include=[np.number]).columns
-numeric_columns = [col for col in numeric_columns if col != "id"]
-
-for col in numeric_columns:
-if method == "iqr":
-q1 = df[col].quantile(0.25)
-q3 = df[col].quantile(0.75)
-iqr = q3 - q1
-lower_bound = q1 - 1.5 * iqr
-upper_bound = q3 + 1.5 * iqr
-outlier_indices = df[(df[col] < lower_bound) | (df[col] > upper_bound)].index.tolist()
-
-elif method == "zscore":
-z_scores = np.abs(stats.zscore(df[col].dropna()))
-outlier_indices = df.iloc[np.where(z_scores > 3)[0]].index.tolist()
-
-elif method == "isolation_forest":
-try:
-from sklearn.ensemble import IsolationForest
-iso_forest = IsolationForest(contamination=0.1, random_state=42)
-outlier_pred = iso_forest.fit_predict(df[[col]].dropna())
-outlier_indices = df.iloc[np.where(outlier_pred == -1)[0]].index.tolist()
-except ImportError:
-logger.warning("IsolationForest недоступен, используется IQR метод")
-return self.detect_outliers(df, method="iqr")
-
-if outlier_indices:
-outliers[col] = outlier_indices
-logger.info(f"Найдено выбросов в {col} ({method}): {len(outlier_indices)}")
-
-return outliers
-
-def handle_outliers(self, df: pd.DataFrame, method: str = "cap", 
-detection_method: str = "iqr") -> pd.DataFrame:
-"""
-Обрабатывает выбросы в данных.
-
-Args:
-df: Исходный DataFrame
-method: Метод обработки ('remove', 'cap', 'transform')
-detection_method: Метод обнаружения выбросов
-
-Returns:
-DataFrame с обработанными выбросами
-"""
-logger.info(f"Обработка выбросов методом: {method}")
-df_processed = df.copy()
-outliers = self.detect_outliers(df, detection_method)
-
-if method == "remove":
-# Удаляем строки с выбросами
-all_outlier_indices = set()
-for indices in outliers.values():
-all_outlier_indices.update(indices)
-
-df_processed = df_processed.drop(list(all_outlier_indices))
-logger.info(f"Удалено строк с выбросами: {len(all_outlier_indices)}")
-
-elif method == "cap":
-# Ограничиваем выбросы (winsorization)
-for col, indices in outliers.items():
-q1 = df[col].quantile(0.05)
-q99 = df[col].quantile(0.95)
-df_processed[col] = df_processed[col].clip(lower=q1, upper=q99)
-logger.info("Выбросы ограничены квантилями 5% и 95%")
-
-elif method == "transform":
-# Применяем логарифмическую трансформацию к положительным данным
-for col in outliers.keys():
-if df_processed[col].min() > 0:
-df_processed[col] = np.log1p(df_processed[col])
-logger.info(f"Применена log трансформация к {col}")
-
-return df_processed
-
-def create_feature_engineering(self, df: pd.DataFrame) -> pd.DataFrame:
-"""
-Создает новые признаки на основе существующих.
-
-Args:
-df: Исходный DataFrame
-
-Returns:
-DataFrame с новыми признаками
-"""
-logger.info("Создание новых признаков (Feature Engineering)")
-df_features = df.copy()
-
-# Получаем числовые колонки (исключая id и diagnosis)
-numeric_cols = df.select_dtypes(include=[np.number]).columns
-feature_cols = [col for col in numeric_cols if col not in ["id", "diagnosis"]]
-
-if len(feature_cols) >= 30: # Wisconsin dataset имеет 30 признаков
-# Группируем признаки по типам (mean, se, worst)
-mean_cols = [col for col in feature_cols if col.endswith('_mean')]
-se_cols = [col for col in feature_cols if col.endswith('_se')]
-worst_cols = [col for col in feature_cols if col.endswith('_worst')]
-
-# Если нет суффиксов, создаем группы по позиции
-if not mean_cols:
-mean_cols = feature_cols[:10]
-se_cols = feature_cols[10:20]
-worst_cols = feature_cols[20:30]
-
-# Создаем агрегированные признаки
-if mean_cols:
-df_features['mean_features_sum'] = df[mean_cols].sum(axis=1)
-df_features['mean_features_mean'] = df[mean_cols].mean(axis=1)
-df_features['mean_features_std'] = df[mean_cols].std(axis=1)
-self.engineered_features.extend(['mean_features_sum', 'mean_features_mean', 'mean_features_std'])
-
-if se_cols:
-df_features['se_features_sum'] = df[se_cols].sum(axis=1)
-df_features['se_features_mean'] = df[se_cols].mean(axis=1)
-self.engineered_features.extend(['se_features_sum', 'se_features_mean'])
-
-if worst_cols:
-df_features['worst_features_sum'] = df[worst_cols].sum(axis=1)
-df_features['worst_features_max'] = df[worst_cols].max(axis=1)
-self.engineered_features.extend(['worst_features_sum', 'worst_features_max'])
-
-# Создаем отношения между признаками
-if len(feature_cols) >= 4:
-# Отношения размера (radius, perimeter, area)
-if 'radius_mean' in df.columns and 'perimeter_mean' in df.columns:
-df_features['radius_perimeter_ratio'] = df['radius_mean'] / (df['perimeter_mean'] + 1e-8)
-self.engineered_features.append('radius_perimeter_ratio')
-
-if 'area_mean' in df.columns and 'perimeter_mean' in df.columns:
-df_features['area_perimeter_ratio'] = df['area_mean'] / (df['perimeter_mean'] + 1e-8)
-self.engineered_features.append('area_perimeter_ratio')
-
-# Создаем композитные индексы
-first_col, second_col = feature_cols[0], feature_cols[1]
-df_features['composite_index_1'] = df[first_col] * df[second_col]
-df_features['composite_index_2'] = df[first_col] / (df[second_col] + 1e-8)
-self.engineered_features.extend(['composite_index_1', 'composite_index_2'])
-
-logger.info(f"Создано новых признаков: {len(self.engineered_features)}")
-return df_features
-
-def select_features(self, X: pd.DataFrame, y: pd.Series, method: str = "univariate", 
-n_features: int = 20) -> pd.DataFrame:
-"""
-Выбирает наиболее важные признаки.
-
-Args:
-X: Матрица признаков
-y: Целевая переменная
-method: Метод отбора ('univariate', 'rfe', 'pca')
-n_features: Количество признаков для отбора
-
-Returns:
-DataFrame с отобранными признаками
-"""
-logger.info(f"Отбор признаков методом: {method}")
-
-if method == "univariate":
-# Univariate feature selection
-try:
-selector = SelectKBest(score_func=f_classif, k=min(n_features, X.shape[1]))
-X_selected = selector.fit_transform(X, y)
-selected_features = X.columns[selector.get_support()].tolist()
-self.feature_selector = selector
-
-logger.info(f"Отобрано признаков (univariate): {len(selected_features)}")
-return pd.DataFrame(X_selected, columns=selected_features, index=X.index)
-except ImportError:
-logger.warning("SelectKBest недоступен, пропускаем отбор признаков")
-return X
-
-elif method == "rfe":
-# Recursive Feature Elimination
-try:
-estimator = LogisticRegression(random_state=42, max_iter=1000)
-selector = RFE(estimator, n_features_to_select=min(n_features, X.shape[1]))
-X_selected = selector.fit_transform(X, y)
-selected_features = X.columns[selector.get_support()].tolist()
-self.feature_selector = selector
-
-logger.info(f"Отобрано признаков (RFE): {len(selected_features)}")
-return pd.DataFrame(X_selected, columns=selected_features, index=X.index)
-except ImportError:
-logger.warning("RFE недоступен, пропускаем отбор признаков")
-return X
-
-elif method == "pca":
-# Principal Component Analysis
 try:
-pca = PCA(n_components=min(n_features, X.shape[1]))
-X_pca = pca.fit_transform(X)
-pca_features = [f'PC_{i+1}' for i in range(X_pca.shape[1])]
-self.pca = pca
-
-logger.info(f"PCA компонентов: {X_pca.shape[1]}")
-logger.info(f"Объясненная дисперсия: {pca.explained_variance_ratio_.sum():.3f}")
-return pd.DataFrame(X_pca, columns=pca_features, index=X.index)
+    from .preprocessing_block import (FeatureBlock, StageMemoryProfiler, encode_target, compute_features,
+                                      numeric_feature_columns, plan_feature_engineering, fit_outlier_detector)
+    from .preprocessing_pipeline import PreprocessingPipeline, SCALERS, PIPELINE_FILENAME
+    from .feature_selection import FastFeatureSelector, SELECTION_METHODS, make_pca
+    from .streaming_scaler import ChunkSource, scale_out_of_core
+    from .data_split import split_indices, iter_split_indices, class_distribution
+    from .compact_dtypes import is_feature_dtype, feature_dtype_columns
+    from .atomic_io import remove_with_checksum
+    from .model_serializer import save_model_file, load_model_file
 except ImportError:
-logger.warning("PCA недоступен, пропускаем PCA")
-return X
+    from preprocessing_block import (FeatureBlock, StageMemoryProfiler, encode_target, compute_features,
+                                     numeric_feature_columns, plan_feature_engineering, fit_outlier_detector)
+    from preprocessing_pipeline import PreprocessingPipeline, SCALERS, PIPELINE_FILENAME
+    from feature_selection import FastFeatureSelector, SELECTION_METHODS, make_pca
+    from streaming_scaler import ChunkSource, scale_out_of_core
+    from data_split import split_indices, iter_split_indices, class_distribution
+    from compact_dtypes import is_feature_dtype, feature_dtype_columns
+    from atomic_io import remove_with_checksum
+    from model_serializer import save_model_file, load_model_file
 
-return X
 
-def preprocess_pipeline(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
-"""
-Полный пайплайн предобработки данных.
-
-Args:
-df: Исходный DataFrame
-
-Returns:
-Tuple (X_train_scaled, X_test_scaled, y_train, y_test)
-"""
-logger.info("Запуск полного пайплайна предобработки")
-
-# 1. Очистка данных
-df_clean = self.clean_data(df)
-
-# 2. Подготовка признаков
-df_processed = self.prepare_features(df_clean)
-
-# 3. Разделение данных
-X_train, X_test, y_train, y_test = self.split_data(df_processed)
-
-# 4. Нормализация признаков
-X_train_scaled, X_test_scaled = self.scale_features(X_train, X_test)
-
-# 5. Сохранение препроцессоров
-self.save_preprocessor()
+logger = get_logger(__name__)
 
-logger.info("Пайплайн предобработки завершен успешно")
 
-return X_train_scaled, X_test_scaled, y_train, y_test
+class DataPreprocessor:
+    """Класс для предобработки данных Wisconsin Breast Cancer."""
+
+    def __init__(self, config: Optional[Config] = None):
+        """
+        Инициализация препроцессора.
+
+        Args:
+            config: Объект конфигурации
+        """
+        self.config = config or get_config()
+        self.data_config = self.config.get_data_config()
+        # Типизированные настройки preprocessing (скомпилированы и проверены при загрузке конфигурации)
+        settings = getattr(self.config, "settings", None)
+        self.settings = settings.preprocessing if settings is not None else PreprocessingSettings()
+        self.scaler = SCALERS[self.settings.scaling.method]()
+        self.label_encoder = LabelEncoder()
+        self.feature_selector = None
+        self.pca = None
+        self.feature_columns = []
+        self.engineered_features = []
+        self.outlier_method = self.settings.outlier_detection.method # iqr, zscore, isolation_forest
+        # Многомерный IsolationForest последнего обучения (для оценки новых батчей)
+        self.outlier_detector = None
+        self.selected_features = []
+        # Обученный граф преобразований (режим block) - единый артефакт для скоринга и переобучения
+        self.pipeline = None
+        # Пиковая память по стадиям последнего запуска preprocess_pipeline
+        self.memory_report = {}
+
+    def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Очищает данные от проблемных значений.
+
+        Args:
+            df: Исходный DataFrame
+
+        Returns:
+            Очищенный DataFrame
+        """
+        logger.info("Начало очистки данных")
+
+        # Одна общая маска строк: дубликаты и пустые ID или diagnosis
+        duplicated = df.duplicated().to_numpy()
+        keep = ~duplicated
+        if duplicated.any():
+            logger.info(f"Удалено дубликатов: {int(duplicated.sum())}")
+
+        critical_columns = ["id", "diagnosis"]
+        for col in critical_columns:
+            if col in df.columns:
+                missing = df[col].isna().to_numpy() & keep
+                if missing.any():
+                    logger.info(f"Удалено строк с пустыми {col}: {int(missing.sum())}")
+                    keep &= ~missing
+
+        # Единственная копия данных
+        df_clean = df.take(np.flatnonzero(keep))
+
+        # Обработка пропущенных значений в числовых колонках (медианой, одним вызовом)
+        numeric_columns = df_clean.select_dtypes(include=[np.number]).columns
+        missing_counts = df_clean[numeric_columns].isna().sum()
+        missing_columns = missing_counts.index[missing_counts > 0]
+        if len(missing_columns) > 0:
+            medians = df_clean[missing_columns].median()
+            df_clean.fillna(medians.to_dict(), inplace=True)
+            for col, median_value in medians.items():
+                logger.info(f"Заполнены пропуски в {col} медианой: {median_value}")
+
+        logger.info(f"Очистка данных завершена. Осталось строк: {len(df_clean)}")
+        return df_clean
+
+    def prepare_features(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+        """
+        Подготавливает признаки для обучения модели.
+
+        Признаки отбираются по семейству типа (целые или вещественные любой
+        разрядности), поэтому компактные float32/int32 колонки не теряются.
+
+        Args:
+            df: DataFrame с данными
+            copy: Работать с копией (False - изменять переданный DataFrame)
+
+        Returns:
+            DataFrame с подготовленными признаками
+        """
+        logger.info("Начало подготовки признаков")
+
+        df_processed = df.copy() if copy else df
+
+        # Исключаем ID из признаков
+        if "id" in df_processed.columns:
+            df_processed.drop(columns="id", inplace=True)
+
+        # Кодируем целевую переменную (M (Malignant) = 1, B (Benign) = 0);
+        # числовой результат и для категориального diagnosis
+        if "diagnosis" in df_processed.columns:
+            df_processed["diagnosis_encoded"] = encode_target(df_processed["diagnosis"].to_numpy())
+
+        # Сохраняем оригинальную колонку для анализа
+        # df_processed = df_processed.drop("diagnosis", axis=1)
+
+        # Выбираем только числовые признаки
+        feature_columns = feature_dtype_columns(df_processed, exclude=("diagnosis", "diagnosis_encoded"))
+
+        self.feature_columns = feature_columns
+        logger.info(f"Выбрано признаков для обучения: {len(feature_columns)}")
+
+        return df_processed
+
+    def scale_features(self, X_train: pd.DataFrame, X_test: pd.DataFrame = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Нормализует признаки с помощью StandardScaler.
+
+        Args:
+            X_train: Обучающая выборка
+            X_test: Тестовая выборка (опционально)
+
+        Returns:
+            Tuple с нормализованными данными
+        """
+        logger.info("Начало нормализации признаков")
+
+        # Обучаем скейлер на обучающих данных
+        X_train_scaled = self.scaler.fit_transform(X_train)
+        logger.info(f"Скейлер обучен на {X_train.shape[0]} образцах")
+
+        X_test_scaled = None
+        if X_test is not None:
+            X_test_scaled = self.scaler.transform(X_test)
+            logger.info(f"Тестовые данные нормализованы: {X_test.shape[0]} образцов")
+
+        return X_train_scaled, X_test_scaled
+
+    def scale_features_out_of_core(self, chunks: ChunkSource, output_path: str,
+                                   columns: Optional[List[str]] = None) -> np.memmap:
+        """
+        Нормализует данные, не помещающиеся в память.
+
+        Скейлер обучается по частям (partial_fit; для robust - приближенные квантили),
+        затем части нормализуются по очереди в memmap-файл .npy.
+
+        Args:
+            chunks: Фабрика итераторов частей (например, lambda: loader.iter_chunks()) или список
+            output_path: Путь к файлу .npy результата
+            columns: Колонки DataFrame-частей (по умолчанию self.feature_columns)
+
+        Returns:
+            Нормализованные данные (np.memmap)
+        """
+        columns = columns or self.feature_columns or None
+        self.scaler = SCALERS[self.settings.scaling.method]()
+        _, X_scaled = scale_out_of_core(self.scaler, chunks, output_path, columns=columns,
+                                        n_bins=self.settings.scaling.quantile_bins)
+        if columns:
+            self.feature_columns = list(columns)
+        return X_scaled
+
+    def split_indices(self, y: np.ndarray, groups: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Разделяет выборку по позициям строк (без копирования признаков).
+
+        Параметры берутся из preprocessing.train_test_split (иначе data.test_size);
+        результат совпадает с train_test_split при том же random_state.
+
+        Args:
+            y: Целевая переменная
+            groups: Метки групп (строки одной группы попадают в одну выборку)
+
+        Returns:
+            Tuple (позиции обучающих строк, позиции тестовых строк)
+        """
+        split_settings = self.settings.train_test_split
+        test_size = split_settings.test_size if split_settings.test_size is not None else self.data_config.get("test_size", 0.2)
+        return split_indices(y, test_size=test_size, random_state=self.data_config.get("random_state", 42),
+                             stratify=split_settings.stratify, groups=groups)
+
+    def iter_splits(self, df: pd.DataFrame) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Повторные или групповые разделения по позициям строк.
+
+        Количество разбиений - preprocessing.train_test_split.n_splits, группы -
+        колонка group_column. Строки не копируются: каждое разбиение - пара массивов позиций.
+
+        Args:
+            df: DataFrame с целевой переменной (diagnosis или diagnosis_encoded)
+
+        Yields:
+            Tuple (позиции обучающих строк, позиции тестовых строк)
+        """
+        split_settings = self.settings.train_test_split
+        test_size = split_settings.test_size if split_settings.test_size is not None else self.data_config.get("test_size", 0.2)
+        target_column = "diagnosis_encoded" if "diagnosis_encoded" in df.columns else "diagnosis"
+        groups = df[split_settings.group_column].to_numpy() if split_settings.group_column else None
+        yield from iter_split_indices(df[target_column].to_numpy(), test_size=test_size,
+                                      random_state=self.data_config.get("random_state", 42),
+                                      stratify=split_settings.stratify, n_splits=split_settings.n_splits,
+                                      groups=groups)
+
+    def split_data(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+        """
+        Разделяет данные на обучающую и тестовую выборки.
+
+        Сначала разделяются позиции строк (split_indices), затем каждая выборка
+        берется из df одной выборкой строк и колонок - без промежуточной копии всех признаков.
+
+        Args:
+            df: DataFrame с подготовленными данными
+
+        Returns:
+            Tuple (X_train, X_test, y_train, y_test)
+        """
+        logger.info("Начало разделения данных")
+
+        # Определяем признаки и целевую переменную
+        target_column = "diagnosis_encoded" if "diagnosis_encoded" in df.columns else "diagnosis"
+        group_column = self.settings.train_test_split.group_column
+        excluded = ("diagnosis", "diagnosis_encoded", group_column)
+        feature_positions = [j for j, col in enumerate(df.columns) if col not in excluded]
+        y = df[target_column]
+
+        # Если целевая переменная категориальная, кодируем её
+        if not is_feature_dtype(y.dtype):
+            y = self.label_encoder.fit_transform(y)
+
+        groups = df[group_column].to_numpy() if group_column else None
+        train_rows, test_rows = self.split_indices(np.asarray(y), groups=groups)
+        X_train = df.iloc[train_rows, feature_positions]
+        X_test = df.iloc[test_rows, feature_positions]
+        if isinstance(y, pd.Series):
+            y_train, y_test = y.iloc[train_rows], y.iloc[test_rows]
+        else:
+            y_train, y_test = y[train_rows], y[test_rows]
+
+        logger.info(f"Данные разделены:")
+        logger.info(f" Обучающая выборка: {len(train_rows)} образцов")
+        logger.info(f" Тестовая выборка: {len(test_rows)} образцов")
+        logger.info(f" Признаков: {len(feature_positions)}")
+
+        # Проверяем распределение классов
+        y_values = np.asarray(y)
+        logger.info(f" Распределение в обучающей выборке: {class_distribution(y_values, train_rows)}")
+        logger.info(f" Распределение в тестовой выборке: {class_distribution(y_values, test_rows)}")
+
+        return X_train, X_test, y_train, y_test
+
+    def save_preprocessor(self, output_dir: str = "results/preprocessors/"):
+        """
+        Сохраняет обученные препроцессоры.
+
+        Каждый артефакт записывается атомарно с контрольной суммой (<файл>.sha256),
+        поэтому прерванное сохранение не оставляет обрезанных файлов.
+
+        Необязательные артефакты (отбор признаков, детектор выбросов, пайплайн),
+        оставшиеся от прошлых запусков, удаляются, если в текущем запуске их нет:
+        иначе load_preprocessor загрузил бы их поверх нового скейлера.
+
+        Args:
+            output_dir: Директория для сохранения
+        """
+        ensure_dir(output_dir)
+
+        try:
+            # Сохраняем скейлер
+            scaler_path = os.path.join(output_dir, "scaler.joblib")
+            save_model_file(self.scaler, scaler_path)
+            logger.info(f"Скейлер сохранен: {scaler_path}")
+
+            # Сохраняем энкодер (если использовался)
+            if hasattr(self.label_encoder, 'classes_'):
+                encoder_path = os.path.join(output_dir, "label_encoder.joblib")
+                save_model_file(self.label_encoder, encoder_path)
+                logger.info(f"Энкодер сохранен: {encoder_path}")
+
+            # Сохраняем список признаков
+            features_path = os.path.join(output_dir, "feature_columns.joblib")
+            save_model_file(self.feature_columns, features_path)
+            logger.info(f"Список признаков сохранен: {features_path}")
+
+            # Сохраняем отбор признаков (если использовался)
+            if self.feature_selector is not None or self.pca is not None:
+                selection_path = os.path.join(output_dir, "feature_selection.joblib")
+                save_model_file({"selector": self.feature_selector, "pca": self.pca,
+                                 "selected_features": self.selected_features}, selection_path)
+                logger.info(f"Отбор признаков сохранен: {selection_path}")
+            else:
+                remove_with_checksum(os.path.join(output_dir, "feature_selection.joblib"))
+
+            # Обученный многомерный детектор выбросов (оценка новых батчей без переобучения)
+            if self.outlier_detector is not None:
+                detector_path = os.path.join(output_dir, "outlier_detector.joblib")
+                save_model_file(self.outlier_detector, detector_path)
+                logger.info(f"Детектор выбросов сохранен: {detector_path}")
+            else:
+                remove_with_checksum(os.path.join(output_dir, "outlier_detector.joblib"))
+
+            # Обученный пайплайн целиком (один артефакт)
+            if self.pipeline is not None:
+                self.pipeline.save(os.path.join(output_dir, PIPELINE_FILENAME))
+            elif remove_with_checksum(os.path.join(output_dir, PIPELINE_FILENAME)):
+                logger.info(f"Устаревший пайплайн предобработки удален из {output_dir}")
+
+        except Exception as e:
+            logger.error(f"Ошибка при сохранении препроцессоров: {str(e)}")
+            raise
+
+    def load_preprocessor(self, input_dir: str = "results/preprocessors/"):
+        """
+        Загружает сохраненные препроцессоры (с проверкой контрольных сумм).
+
+        Объекты не берутся из общего кэша model_serializer: скейлер и отбор
+        признаков переобучаются на месте.
+
+        Args:
+            input_dir: Директория с сохраненными препроцессорами
+        """
+        try:
+            # Загружаем скейлер
+            scaler_path = os.path.join(input_dir, "scaler.joblib")
+            if os.path.exists(scaler_path):
+                self.scaler = load_model_file(scaler_path, use_cache=False)
+                logger.info(f"Скейлер загружен: {scaler_path}")
+
+            # Загружаем энкодер
+            encoder_path = os.path.join(input_dir, "label_encoder.joblib")
+            if os.path.exists(encoder_path):
+                self.label_encoder = load_model_file(encoder_path, use_cache=False)
+                logger.info(f"Энкодер загружен: {encoder_path}")
+
+            # Загружаем список признаков
+            features_path = os.path.join(input_dir, "feature_columns.joblib")
+            if os.path.exists(features_path):
+                self.feature_columns = load_model_file(features_path, use_cache=False)
+                logger.info(f"Список признаков загружен: {features_path}")
+
+            # Загружаем отбор признаков
+            selection_path = os.path.join(input_dir, "feature_selection.joblib")
+            if os.path.exists(selection_path):
+                selection = load_model_file(selection_path, use_cache=False)
+                self.feature_selector = selection["selector"]
+                self.pca = selection["pca"]
+                self.selected_features = selection["selected_features"]
+                logger.info(f"Отбор признаков загружен: {selection_path}")
+
+            # Загружаем детектор выбросов
+            detector_path = os.path.join(input_dir, "outlier_detector.joblib")
+            if os.path.exists(detector_path):
+                self.outlier_detector = load_model_file(detector_path, use_cache=False)
+                logger.info(f"Детектор выбросов загружен: {detector_path}")
+
+            # Загружаем обученный пайплайн
+            pipeline_path = os.path.join(input_dir, PIPELINE_FILENAME)
+            if os.path.exists(pipeline_path):
+                self._use_pipeline(PreprocessingPipeline.load(pipeline_path))
+                logger.info(f"Пайплайн предобработки загружен: {pipeline_path}")
+
+        except Exception as e:
+            logger.error(f"Ошибка при загрузке препроцессоров: {str(e)}")
+            raise
+
+    def detect_outliers(self, df: pd.DataFrame, method: str = "iqr") -> Dict[str, List[int]]:
+        """
+        Обнаруживает выбросы в данных различными методами.
+
+        isolation_forest при outlier_detection.isolation_forest.multivariate обучает один
+        лес на всех признаках (параллельно); выбросами считаются строки, они возвращаются
+        для каждой колонки. Обученный детектор сохраняется в self.outlier_detector
+        (см. score_outliers и save_preprocessor).
+
+        Args:
+            df: DataFrame для анализа
+            method: Метод обнаружения ('iqr', 'zscore', 'isolation_forest')
+
+        Returns:
+            Словарь с индексами выбросов для каждой колонки
+        """
+        outliers = {}
+        numeric_columns = df.select_dtypes(include=[np.number]).columns
+        numeric_columns = [col for col in numeric_columns if col not in ("id", "diagnosis_encoded")]
+
+        forest = self.settings.outlier_detection.isolation_forest
+        if method == "isolation_forest" and forest.multivariate:
+            values = df[numeric_columns].fillna(df[numeric_columns].median())
+            self.outlier_detector = fit_outlier_detector(
+                values, n_estimators=forest.n_estimators, contamination=forest.contamination,
+                n_jobs=forest.n_jobs, random_state=forest.random_state)
+            outlier_indices = df.index[self.outlier_detector.predict(values) == -1].tolist()
+            logger.info(f"Найдено строк-выбросов ({method}): {len(outlier_indices)}")
+            return {col: outlier_indices for col in numeric_columns} if outlier_indices else {}
+
+        for col in numeric_columns:
+            if method == "iqr":
+                q1 = df[col].quantile(0.25)
+                q3 = df[col].quantile(0.75)
+                iqr = q3 - q1
+                lower_bound = q1 - 1.5 * iqr
+                upper_bound = q3 + 1.5 * iqr
+                outlier_indices = df[(df[col] < lower_bound) | (df[col] > upper_bound)].index.tolist()
+
+            elif method == "zscore":
+                z_scores = np.abs(stats.zscore(df[col].dropna()))
+                outlier_indices = df.iloc[np.where(z_scores > 3)[0]].index.tolist()
+
+            elif method == "isolation_forest":
+                try:
+                    from sklearn.ensemble import IsolationForest
+                    iso_forest = IsolationForest(n_estimators=forest.n_estimators, contamination=forest.contamination,
+                                                 n_jobs=forest.n_jobs, random_state=forest.random_state)
+                    outlier_pred = iso_forest.fit_predict(df[[col]].dropna())
+                    outlier_indices = df.iloc[np.where(outlier_pred == -1)[0]].index.tolist()
+                except ImportError:
+                    logger.warning("IsolationForest недоступен, используется IQR метод")
+                    return self.detect_outliers(df, method="iqr")
+
+            if outlier_indices:
+                outliers[col] = outlier_indices
+                logger.info(f"Найдено выбросов в {col} ({method}): {len(outlier_indices)}")
+
+        return outliers
+
+    def score_outliers(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Оценивает строки нового батча сохраненным IsolationForest (без переобучения).
+
+        Args:
+            df: DataFrame с исходными признаками
+
+        Returns:
+            Series decision_function по индексу df: отрицательные значения - выбросы
+        """
+        if self.pipeline is not None and self.pipeline.outlier_detector is not None:
+            scores = self.pipeline.outlier_scores(df)
+        elif self.outlier_detector is not None:
+            columns = list(self.outlier_detector.feature_names_in_)
+            scores = self.outlier_detector.decision_function(df[columns].fillna(df[columns].median()))
+        else:
+            raise ValueError("Детектор выбросов не обучен (outlier_detection.method: isolation_forest)")
+        return pd.Series(scores, index=df.index, name="outlier_score")
+
+    def handle_outliers(self, df: pd.DataFrame, method: str = "cap",
+                        detection_method: str = "iqr", copy: bool = True) -> pd.DataFrame:
+        """
+        Обрабатывает выбросы в данных.
+
+        Args:
+            df: Исходный DataFrame
+            method: Метод обработки ('remove', 'cap', 'transform')
+            detection_method: Метод обнаружения выбросов
+            copy: Работать с копией (False - изменять переданный DataFrame)
+
+        Returns:
+            DataFrame с обработанными выбросами
+        """
+        logger.info(f"Обработка выбросов методом: {method}")
+        df_processed = df.copy() if copy else df
+        outliers = self.detect_outliers(df, detection_method)
+
+        if method == "remove":
+            # Удаляем строки с выбросами
+            all_outlier_indices = set()
+            for indices in outliers.values():
+                all_outlier_indices.update(indices)
+
+            df_processed = df_processed.drop(list(all_outlier_indices))
+            logger.info(f"Удалено строк с выбросами: {len(all_outlier_indices)}")
+
+        elif method == "cap":
+            # Ограничиваем выбросы (winsorization)
+            for col, indices in outliers.items():
+                q1 = df[col].quantile(0.05)
+                q99 = df[col].quantile(0.95)
+                df_processed[col] = df_processed[col].clip(lower=q1, upper=q99)
+            logger.info("Выбросы ограничены квантилями 5% и 95%")
+
+        elif method == "transform":
+            # Применяем логарифмическую трансформацию к положительным данным
+            for col in outliers.keys():
+                if df_processed[col].min() > 0:
+                    df_processed[col] = np.log1p(df_processed[col])
+                    logger.info(f"Применена log трансформация к {col}")
+
+        return df_processed
+
+    def create_feature_engineering(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+        """
+        Создает новые признаки на основе существующих.
+
+        Признаки задаются выражениями (preprocessing.feature_engineering.features,
+        иначе встроенные признаки Wisconsin), компилируются в один векторизованный
+        план по непрерывной матрице float64 и добавляются одним присваиванием. Повторный вызов (в том числе на результате)
+        пересчитывает те же колонки, а не добавляет новые.
+
+        Args:
+            df: Исходный DataFrame
+            copy: Работать с копией (False - добавлять признаки в переданный DataFrame)
+
+        Returns:
+            DataFrame с новыми признаками
+        """
+        logger.info("Создание новых признаков (Feature Engineering)")
+        feature_settings = self.settings.feature_engineering
+
+        # Исходные числовые признаки (без id, целевой переменной и ранее созданных признаков)
+        feature_cols = numeric_feature_columns(df, exclude=[item.name for item in feature_settings.features])
+        plan = plan_feature_engineering(feature_cols,
+                                        create_aggregates=feature_settings.create_aggregates,
+                                        create_ratios=feature_settings.create_ratios,
+                                        create_composite_features=feature_settings.create_composite_features,
+                                        definitions=feature_settings.features)
+        self.engineered_features = [name for name, _ in plan]
+
+        df_features = df.copy() if copy else df
+        if plan:
+            X = df[feature_cols].to_numpy(dtype=np.float64)
+            # Компактный профиль (все признаки float32) сохраняет разрядность и у новых признаков
+            compact = all(df[col].dtype == np.float32 for col in feature_cols)
+            features = compute_features(X, feature_cols, plan)
+            df_features[self.engineered_features] = features.astype(np.float32) if compact else features
+
+        logger.info(f"Создано новых признаков: {len(self.engineered_features)}")
+        return df_features
+
+    def select_features(self, X: pd.DataFrame, y: pd.Series, method: str = "univariate",
+                        n_features: int = 20) -> pd.DataFrame:
+        """
+        Выбирает наиболее важные признаки.
+
+        Методы univariate, rfe и l1 ранжируют признаки один раз (FastFeatureSelector);
+        шаг RFE, кандидаты n_features для кросс-валидации, число процессов и
+        способ разложения PCA (pca_solver) берутся из preprocessing.feature_selection.
+
+        Args:
+            X: Матрица признаков
+            y: Целевая переменная
+            method: Метод отбора ('univariate', 'rfe', 'l1', 'pca')
+            n_features: Количество признаков для отбора
+
+        Returns:
+            DataFrame с отобранными признаками
+        """
+        logger.info(f"Отбор признаков методом: {method}")
+
+        selection = self.settings.feature_selection
+        if method == "pca":
+            # Principal Component Analysis (полный, рандомизированный SVD или IncrementalPCA)
+            pca = make_pca(min(n_features, X.shape[1]), solver=selection.pca_solver,
+                           batch_size=selection.pca_batch_size)
+            X_pca = pca.fit_transform(X)
+            pca_features = [f'PC_{i+1}' for i in range(X_pca.shape[1])]
+            self.pca = pca
+
+            logger.info(f"PCA компонентов: {X_pca.shape[1]}")
+            logger.info(f"Объясненная дисперсия: {pca.explained_variance_ratio_.sum():.3f}")
+            return pd.DataFrame(X_pca, columns=pca_features, index=X.index)
+
+        if method not in SELECTION_METHODS:
+            logger.warning(f"Неизвестный метод отбора признаков {method}, пропускаем отбор")
+            return X
+
+        selector = FastFeatureSelector(method=method, n_features=min(n_features, X.shape[1]), step=selection.step,
+                                       candidates=selection.candidates, cv_folds=selection.cv_folds,
+                                       n_jobs=selection.n_jobs)
+        X_selected = selector.fit_transform(X, y)
+        selected_features = X.columns[selector.get_support()].tolist()
+        self.feature_selector = selector
+
+        logger.info(f"Отобрано признаков ({method}): {len(selected_features)}")
+        return pd.DataFrame(X_selected, columns=selected_features, index=X.index)
+
+    def _apply_feature_selection(self, X_train: np.ndarray, X_test: Optional[np.ndarray], y_train,
+                                 columns: List[str]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Отбирает признаки на обучающей выборке и применяет тот же отбор к тестовой.
+
+        Args:
+            X_train: Нормализованная обучающая выборка
+            X_test: Нормализованная тестовая выборка (опционально)
+            y_train: Целевая переменная обучающей выборки
+            columns: Названия признаков
+
+        Returns:
+            Tuple с отобранными признаками
+        """
+        selection = self.settings.feature_selection
+        self.feature_selector, self.pca = None, None
+        X_selected = self.select_features(pd.DataFrame(X_train, columns=columns), y_train,
+                                          method=selection.method, n_features=selection.n_features)
+
+        transformer = self.pca if selection.method == "pca" else self.feature_selector
+        if transformer is None:
+            return X_train, X_test
+
+        self.selected_features = list(X_selected.columns)
+        X_test_selected = None
+        if X_test is not None:
+            X_test_selected = transformer.transform(pd.DataFrame(X_test, columns=columns))
+        return X_selected.to_numpy(), X_test_selected
+
+    def _preprocess_frames(self, df: pd.DataFrame, profiler: StageMemoryProfiler) -> Tuple[
+            np.ndarray, np.ndarray, pd.Series, pd.Series]:
+        """
+        Предобработка в режиме dataframe: шаги после очистки изменяют принадлежащий пайплайну DataFrame.
+
+        Args:
+            df: Исходный DataFrame
+            profiler: Профилировщик памяти по стадиям
+
+        Returns:
+            Tuple (X_train_scaled, X_test_scaled, y_train, y_test)
+        """
+        settings = self.settings
+
+        # 1-2. Очистка данных (единственная копия) и подготовка признаков
+        with profiler.stage("clean"):
+            df_processed = self.clean_data(df)
+            df_processed = self.prepare_features(df_processed, copy=False)
+
+        # 3. Обработка выбросов
+        if settings.outlier_detection.enabled:
+            with profiler.stage("outliers"):
+                df_processed = self.handle_outliers(df_processed, method=settings.outlier_detection.action,
+                                                    detection_method=settings.outlier_detection.method,
+                                                    copy=False)
+
+        # 4. Создание новых признаков
+        if settings.feature_engineering.enabled:
+            with profiler.stage("feature_engineering"):
+                df_processed = self.create_feature_engineering(df_processed, copy=False)
+
+        # 5. Разделение данных
+        with profiler.stage("split"):
+            X_train, X_test, y_train, y_test = self.split_data(df_processed)
+            self.feature_columns = list(X_train.columns)
+            del df_processed
+
+        # 6. Нормализация признаков (preprocessing.scaling.method)
+        with profiler.stage("scaling"):
+            X_train_scaled, X_test_scaled = self.scale_features(X_train, X_test)
+
+        # 7. Отбор признаков
+        if settings.feature_selection.enabled:
+            with profiler.stage("feature_selection"):
+                X_train_scaled, X_test_scaled = self._apply_feature_selection(
+                    X_train_scaled, X_test_scaled, y_train, self.feature_columns)
+
+        return X_train_scaled, X_test_scaled, y_train, y_test
+
+    def _preprocess_block(self, df: pd.DataFrame, profiler: StageMemoryProfiler) -> Tuple[
+            np.ndarray, np.ndarray, pd.Series, pd.Series]:
+        """
+        Предобработка в режиме block: обучение PreprocessingPipeline на обучающих строках.
+
+        Все обученные шаги (пропуски, выбросы, новые признаки, скейлер, отбор)
+        оцениваются только по обучающей выборке и применяются к тестовой через transform.
+
+        Args:
+            df: Исходный DataFrame (не изменяется)
+            profiler: Профилировщик памяти по стадиям
+
+        Returns:
+            Tuple (X_train, X_test, y_train, y_test)
+        """
+        logger.info("Предобработка в режиме block")
+
+        # 1. Одна общая фильтрация строк и разделение по позициям строк
+        with profiler.stage("split"):
+            rows = np.flatnonzero(FeatureBlock.valid_rows(df))
+            y = encode_target(df["diagnosis"].to_numpy()[rows])
+            group_column = self.settings.train_test_split.group_column
+            groups = df[group_column].to_numpy()[rows] if group_column else None
+            train_positions, test_positions = self.split_indices(y, groups=groups)
+            train_rows, test_rows = rows[train_positions], rows[test_positions]
+            y_test = pd.Series(y[test_positions], index=df.index[test_rows], name="diagnosis_encoded")
+            logger.info(f"Данные разделены: {len(train_rows)} / {len(test_rows)} образцов")
+
+        # 2. Обучение пайплайна: пропуски → выбросы → новые признаки → масштабирование → отбор
+        pipeline = PreprocessingPipeline(self.settings, scaler=self.scaler)
+        with profiler.stage("fit"):
+            X_train, y_train = pipeline.fit_transform(df, rows=train_rows)
+
+        # 3. Те же преобразования для тестовой выборки
+        with profiler.stage("transform"):
+            X_test = pipeline.transform(df, rows=test_rows)
+
+        self._use_pipeline(pipeline)
+        return X_train, X_test, y_train, y_test
+
+    def _use_pipeline(self, pipeline: PreprocessingPipeline) -> None:
+        """Делает обученный пайплайн текущим и синхронизирует с ним атрибуты препроцессора."""
+        self.pipeline = pipeline
+        self.scaler = pipeline.scaler
+        self.feature_columns = list(pipeline.feature_columns)
+        self.engineered_features = pipeline.engineered_features
+        self.selected_features = list(pipeline.selected_features)
+        is_pca = isinstance(pipeline.selector, (PCA, IncrementalPCA))
+        self.pca = pipeline.selector if is_pca else None
+        self.feature_selector = None if is_pca else pipeline.selector
+        self.outlier_detector = pipeline.outlier_detector
+
+    def fit_pca_stream(self, chunks: Iterable[pd.DataFrame]) -> None:
+        """
+        Обучает IncrementalPCA по частям данных из потокового загрузчика.
+
+        Пайплайн предобработки должен быть обучен (preprocess_pipeline в режиме block);
+        обученные компоненты сохраняются save_preprocessor и применяются в transform.
+
+        Args:
+            chunks: Итератор DataFrame (например, DataLoader.iter_chunks())
+        """
+        if self.pipeline is None:
+            raise ValueError("Потоковый PCA требует обученный пайплайн предобработки (execution_mode: block)")
+        self._use_pipeline(self.pipeline.fit_pca_stream(chunks))
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Преобразует новые данные обученным пайплайном (без переобучения).
+
+        Args:
+            df: DataFrame с исходными признаками
+
+        Returns:
+            Матрица признаков для модели
+        """
+        if self.pipeline is None:
+            raise ValueError("Пайплайн предобработки не обучен: вызовите preprocess_pipeline или load_preprocessor")
+        return self.pipeline.transform(df)
+
+    def preprocess_pipeline(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Полный пайплайн предобработки данных.
+
+        Шаги выбросов, создания признаков, масштабирования, отбора признаков
+        и разделения выборки управляются разделом preprocessing конфигурации,
+        execution_mode выбирает выполнение на массиве NumPy (block) или DataFrame.
+        В режиме block обученный пайплайн доступен как self.pipeline и
+        сохраняется одним артефактом (см. transform и load_preprocessor).
+
+        Args:
+            df: Исходный DataFrame (не изменяется)
+
+        Returns:
+            Tuple (X_train_scaled, X_test_scaled, y_train, y_test)
+        """
+        logger.info("Запуск полного пайплайна предобработки")
+        settings = self.settings
+        profiler = StageMemoryProfiler(enabled=settings.profile_memory)
+
+        try:
+            if settings.execution_mode == "block":
+                X_train_scaled, X_test_scaled, y_train, y_test = self._preprocess_block(df, profiler)
+            else:
+                self.pipeline, self.outlier_detector = None, None
+                X_train_scaled, X_test_scaled, y_train, y_test = self._preprocess_frames(df, profiler)
+        finally:
+            profiler.stop()
+
+        self.memory_report = profiler.report
+        profiler.log_report()
+
+        # 8. Сохранение препроцессоров
+        self.save_preprocessor()
+
+        logger.info("Пайплайн предобработки завершен успешно")
+
+        return X_train_scaled, X_test_scaled, y_train, y_test
 
 
 def main():
-"""Главная функция для тестирования модуля."""
-try:
-# Импортируем загрузчик данных
-from data_loader import DataLoader
+    """Главная функция для тестирования модуля."""
+    try:
+        # Импортируем загрузчик данных
+        from data_loader import DataLoader
 
-# Загружаем данные
-loader = DataLoader()
-df = loader.load_data()
+        # Загружаем данные
+        loader = DataLoader()
+        df = loader.load_data()
 
-# Инициализируем препроцессор
-preprocessor = DataPreprocessor()
+        # Инициализируем препроцессор
+        preprocessor = DataPreprocessor()
 
-# Запускаем полный пайплайн
-X_train, X_test, y_train, y_test = preprocessor.preprocess_pipeline(df)
+        # Запускаем полный пайплайн
+        X_train, X_test, y_train, y_test = preprocessor.preprocess_pipeline(df)
 
-print(f"Предобработка завершена успешно!")
-print(f"Обучающая выборка: {X_train.shape}")
-print(f"Тестовая выборка: {X_test.shape}")
-print(f"Целевая переменная (обучение): {len(y_train)}")
-print(f"Целевая переменная (тест): {len(y_test)}")
+        print(f"Предобработка завершена успешно!")
+        print(f"Обучающая выборка: {X_train.shape}")
+        print(f"Тестовая выборка: {X_test.shape}")
+        print(f"Целевая переменная (обучение): {len(y_train)}")
+        print(f"Целевая переменная (тест): {len(y_test)}")
 
-return X_train, X_test, y_train, y_test
+        return X_train, X_test, y_train, y_test
 
-except Exception as e:
-logger.error(f"Ошибка в main: {str(e)}")
-raise
+    except Exception as e:
+        logger.error(f"Ошибка в main: {str(e)}")
+        raise
 
 
 if __name__ == "__main__":
-main()
+    main()
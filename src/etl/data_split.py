@@ -0,0 +1,128 @@
+"""
+Модуль разделения выборки по индексам строк.
+
+Разделение возвращает только позиции строк (без копий признаков): стадии
+предобработки читают нужные строки из общего массива или memmap сами.
+Используются те же разбиения scikit-learn, что и в train_test_split,
+поэтому при тех же random_state результат совпадает с train_test_split.
+Поддерживаются повторные (несколько случайных разбиений) и групповые
+(строки одной группы не попадают в разные выборки) разделения.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import logging
+from typing import Dict, Iterator, Optional, Tuple
+import os
+import sys
+
+import numpy as np
+from sklearn.model_selection import GroupShuffleSplit, ShuffleSplit, StratifiedShuffleSplit
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+
+logger = get_logger(__name__)
+
+
+def iter_split_indices(y: np.ndarray, test_size: float = 0.2, random_state: Optional[int] = 42,
+                       stratify: bool = True, n_splits: int = 1,
+                       groups: Optional[np.ndarray] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Разбиения выборки на позиции обучающих и тестовых строк.
+
+    Args:
+        y: Целевая переменная (для стратификации и числа строк)
+        test_size: Доля (или количество) тестовых строк
+        random_state: Seed разбиений
+        stratify: Сохранять пропорции классов
+        n_splits: Количество повторных разбиений
+        groups: Метки групп: строки одной группы попадают в одну выборку
+            (стратификация при группах не выполняется)
+
+    Yields:
+        Tuple (позиции обучающих строк, позиции тестовых строк)
+    """
+    y = np.asarray(y)
+    if groups is not None:
+        if stratify:
+            logger.info("Групповое разделение: стратификация по классам не выполняется")
+        splitter = GroupShuffleSplit(n_splits=n_splits, test_size=test_size, random_state=random_state)
+        yield from splitter.split(y, y, groups=np.asarray(groups))
+        return
+
+    splitter_class = StratifiedShuffleSplit if stratify else ShuffleSplit
+    splitter = splitter_class(n_splits=n_splits, test_size=test_size, random_state=random_state)
+    # Признаки разбиению не нужны: передается только y (длина и классы)
+    yield from splitter.split(y, y if stratify else None)
+
+
+def split_indices(y: np.ndarray, test_size: float = 0.2, random_state: Optional[int] = 42,
+                  stratify: bool = True, groups: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Одно разделение на позиции обучающих и тестовых строк (как train_test_split).
+
+    Args:
+        y: Целевая переменная
+        test_size: Доля (или количество) тестовых строк
+        random_state: Seed
+        stratify: Сохранять пропорции классов
+        groups: Метки групп (опционально)
+
+    Returns:
+        Tuple (позиции обучающих строк, позиции тестовых строк)
+    """
+    return next(iter_split_indices(y, test_size=test_size, random_state=random_state,
+                                   stratify=stratify, groups=groups))
+
+
+def class_distribution(y: np.ndarray, rows: Optional[np.ndarray] = None) -> Dict[object, int]:
+    """
+    Количество строк каждого класса (за один проход, без промежуточных Series).
+
+    Args:
+        y: Целевая переменная
+        rows: Позиции строк (по умолчанию все)
+
+    Returns:
+        Словарь класс -> количество
+    """
+    values = np.asarray(y) if rows is None else np.asarray(y)[rows]
+    classes, counts = np.unique(values, return_counts=True)
+    return {cls.item() if hasattr(cls, "item") else cls: int(count) for cls, count in zip(classes, counts)}
+
+
+def contiguous_split(X: np.ndarray, train_rows: np.ndarray,
+                     test_rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Переставляет строки общего массива так, чтобы выборки стали непрерывными срезами.
+
+    Перестановка выполняется на месте по колонкам (временная память - одна колонка),
+    поэтому подходит для больших массивов и memmap. Результат - представления без копий.
+
+    Args:
+        X: Общий массив (изменяется на месте), строки - все train_rows и test_rows
+        train_rows: Позиции обучающих строк
+        test_rows: Позиции тестовых строк
+
+    Returns:
+        Tuple (X_train, X_test) - срезы X
+    """
+    order = np.concatenate([train_rows, test_rows])
+    if len(order) != X.shape[0] or not np.array_equal(np.sort(order), np.arange(X.shape[0])):
+        raise ValueError("Обучающие и тестовые строки должны вместе покрывать все строки массива ровно один раз")
+
+    columns = X.reshape(X.shape[0], -1)
+    for j in range(columns.shape[1]):
+        columns[:, j] = columns[order, j]
+    if isinstance(X, np.memmap):
+        X.flush()
+    n_train = len(train_rows)
+    return X[:n_train], X[n_train:]
@@ -0,0 +1,461 @@
+"""
+Модуль для векторизованного обнаружения дрейфа данных.
+
+Референсный датасет сортируется один раз при обучении детектора, после чего
+для каждой колонки текущего батча рассчитываются статистика
+Колмогорова-Смирнова, PSI (Population Stability Index) и расстояние
+Вассерштейна. Для широких датасетов колонки распределяются по пулу процессов.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import pandas as pd
+import numpy as np
+import logging
+import hashlib
+import json
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from scipy.stats import kstwo
+import os
+import sys
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger, ensure_dir
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+    def ensure_dir(path: str) -> None:
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+try:
+    from .atomic_io import atomic_write
+except ImportError:
+    from atomic_io import atomic_write
+
+try:
+    from .compact_dtypes import is_feature_dtype
+except ImportError:
+    from compact_dtypes import is_feature_dtype
+
+
+logger = get_logger(__name__)
+
+# Защита от деления на ноль и log(0) при расчете PSI
+PSI_EPSILON = 1e-6
+
+
+def compute_data_hash(df: pd.DataFrame) -> str:
+    """Вычисляет хэш содержимого DataFrame (без учета индекса)."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).values
+    digest = hashlib.sha256(row_hashes.tobytes())
+    digest.update(",".join(map(str, df.columns)).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def select_drift_columns(reference_df: pd.DataFrame, current_df: pd.DataFrame) -> List[str]:
+    """Возвращает общие числовые колонки (кроме id, любой разрядности) в порядке референсного датасета."""
+    current_columns = set(current_df.columns)
+    return [col for col in reference_df.columns
+            if col in current_columns and col != 'id'
+            and is_feature_dtype(reference_df[col].dtype)]
+
+
+def _sorted_valid(values: np.ndarray) -> np.ndarray:
+    """Сортирует значения колонки, отбрасывая NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    return np.sort(values[~np.isnan(values)])
+
+
+def column_drift_statistics(reference_sorted: np.ndarray, current_sorted: np.ndarray,
+                            psi_edges: np.ndarray, reference_proportions: np.ndarray,
+                            reference_count: Optional[int] = None) -> Dict[str, float]:
+    """
+    Рассчитывает KS, PSI и расстояние Вассерштейна для одной колонки.
+
+    Обе выборки должны быть заранее отсортированы и не содержать NaN.
+    Референс может быть квантильным эскизом: тогда reference_count задает
+    исходный размер выборки для расчета p-value.
+
+    Args:
+        reference_sorted: Отсортированные референсные значения (или квантили)
+        current_sorted: Отсортированные текущие значения
+        psi_edges: Внутренние границы интервалов PSI (квантили референса)
+        reference_proportions: Доли референса по интервалам PSI
+        reference_count: Исходный размер референсной выборки
+
+    Returns:
+        Словарь со статистиками
+    """
+    n_ref, n_cur = len(reference_sorted), len(current_sorted)
+    if n_ref == 0 or n_cur == 0:
+        return {"ks_statistic": np.nan, "p_value": np.nan, "psi": np.nan, "wasserstein_distance": np.nan}
+
+    # Эмпирические функции распределения на объединенной сетке значений
+    grid = np.concatenate([reference_sorted, current_sorted])
+    grid.sort(kind="mergesort")
+    cdf_ref = np.searchsorted(reference_sorted, grid, side="right") / n_ref
+    cdf_cur = np.searchsorted(current_sorted, grid, side="right") / n_cur
+    cdf_diff = np.abs(cdf_ref - cdf_cur)
+
+    ks_statistic = float(cdf_diff.max())
+    # Асимптотическое распределение, как в scipy.stats.ks_2samp(method="asymp")
+    n_population = reference_count or n_ref
+    effective_n = np.round(n_population * n_cur / (n_population + n_cur))
+    p_value = float(np.clip(kstwo.sf(ks_statistic, effective_n), 0.0, 1.0))
+
+    # W1 = интеграл |F_ref - F_cur| по оси значений
+    wasserstein = float(np.sum(cdf_diff[:-1] * np.diff(grid)))
+
+    # PSI по интервалам, построенным на квантилях референса
+    current_counts = np.diff(np.concatenate([[0], np.searchsorted(current_sorted, psi_edges, side="right"), [n_cur]]))
+    current_proportions = np.clip(current_counts / n_cur, PSI_EPSILON, None)
+    psi = float(np.sum((current_proportions - reference_proportions)
+                       * np.log(current_proportions / reference_proportions)))
+
+    return {
+        "ks_statistic": ks_statistic,
+        "p_value": p_value,
+        "psi": psi,
+        "wasserstein_distance": wasserstein
+    }
+
+
+def _column_batch_statistics(tasks: List[Tuple[str, np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]]
+                             ) -> Dict[str, Dict[str, float]]:
+    """Обрабатывает пакет колонок (выполняется в дочернем процессе)."""
+    return {col: column_drift_statistics(ref, cur, edges, proportions, count)
+            for col, ref, cur, edges, proportions, count in tasks}
+
+
+class ReferenceProfile:
+    """
+    Компактный профиль референсного датасета для проверок дрейфа.
+
+    Для каждой колонки хранит квантильный эскиз (или полную отсортированную
+    выборку, если она не больше эскиза), размер выборки, среднее и интервалы
+    PSI. Профиль строится один раз по обучающему снимку и сохраняется на диск
+    под ключом хэша данных.
+    """
+
+    FILE_PREFIX = "reference_profile_"
+
+    def __init__(self, data_hash: str, columns: List[str], samples: Dict[str, np.ndarray],
+                 counts: Dict[str, int], means: Dict[str, float], psi_edges: Dict[str, np.ndarray],
+                 reference_proportions: Dict[str, np.ndarray], created_at: Optional[str] = None):
+        """
+        Инициализация профиля.
+
+        Args:
+            data_hash: Хэш референсных данных
+            columns: Колонки профиля
+            samples: Отсортированные квантили (эскиз) по колонкам
+            counts: Исходное количество непустых значений по колонкам
+            means: Средние значения по колонкам
+            psi_edges: Границы интервалов PSI по колонкам
+            reference_proportions: Доли референса по интервалам PSI
+            created_at: Время построения профиля
+        """
+        self.data_hash = data_hash
+        self.columns = list(columns)
+        self.samples = samples
+        self.counts = counts
+        self.means = means
+        self.psi_edges = psi_edges
+        self.reference_proportions = reference_proportions
+        self.created_at = created_at or datetime.now().isoformat()
+
+    @staticmethod
+    def sketch(sorted_values: np.ndarray, max_quantiles: int) -> np.ndarray:
+        """Сжимает отсортированную выборку до равномерно расположенных квантилей."""
+        if len(sorted_values) <= max_quantiles:
+            return sorted_values
+        # Середины равных по вероятности интервалов: ECDF эскиза аппроксимирует исходную
+        levels = (np.arange(max_quantiles) + 0.5) / max_quantiles
+        return np.quantile(sorted_values, levels)
+
+    def save(self, output_dir: str = "results/drift_profiles/") -> str:
+        """
+        Сохраняет профиль в сжатый .npz файл.
+
+        Args:
+            output_dir: Директория для профилей
+
+        Returns:
+            Путь к сохраненному файлу
+        """
+        ensure_dir(output_dir)
+        file_path = os.path.join(output_dir, f"{self.FILE_PREFIX}{self.data_hash}.npz")
+
+        arrays = {}
+        for idx, col in enumerate(self.columns):
+            arrays[f"sample_{idx}"] = self.samples[col]
+            arrays[f"edges_{idx}"] = self.psi_edges[col]
+            arrays[f"proportions_{idx}"] = self.reference_proportions[col]
+
+        metadata = {
+            "data_hash": self.data_hash,
+            "columns": self.columns,
+            "counts": [int(self.counts[col]) for col in self.columns],
+            "means": [float(self.means[col]) for col in self.columns],
+            "created_at": self.created_at
+        }
+        with atomic_write(file_path) as f:
+            np.savez_compressed(f, metadata=np.array(json.dumps(metadata)), **arrays)
+
+        logger.info(f"Референсный профиль сохранен: {file_path}")
+        return file_path
+
+    @classmethod
+    def load(cls, file_path: str) -> "ReferenceProfile":
+        """Загружает профиль из .npz файла."""
+        with np.load(file_path, allow_pickle=False) as data:
+            metadata = json.loads(str(data["metadata"]))
+            columns = metadata["columns"]
+            profile = cls(
+                data_hash=metadata["data_hash"],
+                columns=columns,
+                samples={col: data[f"sample_{idx}"] for idx, col in enumerate(columns)},
+                counts=dict(zip(columns, metadata["counts"])),
+                means=dict(zip(columns, metadata["means"])),
+                psi_edges={col: data[f"edges_{idx}"] for idx, col in enumerate(columns)},
+                reference_proportions={col: data[f"proportions_{idx}"] for idx, col in enumerate(columns)},
+                created_at=metadata.get("created_at")
+            )
+        logger.info(f"Референсный профиль загружен: {file_path}")
+        return profile
+
+    @classmethod
+    def find(cls, profile_dir: str = "results/drift_profiles/",
+             data_hash: Optional[str] = None) -> Optional[str]:
+        """
+        Ищет сохраненный профиль по хэшу данных (или самый свежий, если хэш не указан).
+
+        Returns:
+            Путь к профилю или None
+        """
+        if data_hash is not None:
+            file_path = os.path.join(profile_dir, f"{cls.FILE_PREFIX}{data_hash}.npz")
+            return file_path if os.path.exists(file_path) else None
+
+        candidates = sorted(Path(profile_dir).glob(f"{cls.FILE_PREFIX}*.npz"), key=os.path.getmtime)
+        return str(candidates[-1]) if candidates else None
+
+
+class DriftDetector:
+    """Детектор дрейфа с кэшированием отсортированного референсного датасета."""
+
+    def __init__(self, p_value_threshold: float = 0.05, distribution_change_threshold: float = 0.1,
+                 psi_bins: int = 10, psi_threshold: float = 0.2,
+                 n_jobs: int = 1, parallel_min_columns: int = 64):
+        """
+        Инициализация детектора дрейфа.
+
+        Args:
+            p_value_threshold: Порог p-value теста Колмогорова-Смирнова
+            distribution_change_threshold: Порог относительного изменения среднего
+            psi_bins: Количество интервалов для PSI
+            psi_threshold: Порог PSI, выше которого распределение считается изменившимся
+            n_jobs: Количество процессов для расчета по колонкам
+            parallel_min_columns: Минимальное число колонок для запуска пула процессов
+        """
+        self.p_value_threshold = p_value_threshold
+        self.distribution_change_threshold = distribution_change_threshold
+        self.psi_bins = psi_bins
+        self.psi_threshold = psi_threshold
+        self.n_jobs = n_jobs
+        self.parallel_min_columns = parallel_min_columns
+
+        self.columns = []
+        self.reference_hash = None
+        self.reference_sorted = {}
+        self.reference_counts = {}
+        self.reference_means = {}
+        self.psi_edges = {}
+        self.reference_proportions = {}
+
+    @classmethod
+    def from_config(cls, drift_config: Dict[str, Any]) -> "DriftDetector":
+        """Создает детектор из секции data_quality.drift_detection конфигурации."""
+        return cls(
+            p_value_threshold=drift_config.get("p_value_threshold", 0.05),
+            distribution_change_threshold=drift_config.get("distribution_change_threshold", 0.1),
+            psi_bins=drift_config.get("psi_bins", 10),
+            psi_threshold=drift_config.get("psi_threshold", 0.2),
+            n_jobs=drift_config.get("n_jobs", 1),
+            parallel_min_columns=drift_config.get("parallel_min_columns", 64)
+        )
+
+    def fit(self, reference_df: pd.DataFrame, columns: Optional[List[str]] = None,
+            reference_hash: Optional[str] = None) -> "DriftDetector":
+        """
+        Сортирует и кэширует референсные колонки.
+
+        Args:
+            reference_df: Референсный датасет
+            columns: Колонки для анализа (по умолчанию все числовые, кроме id)
+            reference_hash: Хэш референсного датасета (если уже известен)
+
+        Returns:
+            Обученный детектор
+        """
+        if columns is None:
+            columns = select_drift_columns(reference_df, reference_df)
+
+        self.columns = list(columns)
+        self.reference_hash = reference_hash or compute_data_hash(reference_df[self.columns])
+
+        # Одна сортировка всей матрицы: NaN уходят в конец каждой колонки
+        values = reference_df[self.columns].to_numpy(dtype=np.float64)
+        valid_counts = (~np.isnan(values)).sum(axis=0)
+        sorted_values = np.sort(values, axis=0)
+
+        quantile_levels = np.linspace(0, 1, self.psi_bins + 1)[1:-1]
+        for idx, col in enumerate(self.columns):
+            reference_sorted = np.ascontiguousarray(sorted_values[:valid_counts[idx], idx])
+            self.reference_sorted[col] = reference_sorted
+            self.reference_counts[col] = len(reference_sorted)
+            self.reference_means[col] = float(reference_sorted.mean()) if len(reference_sorted) else np.nan
+
+            if len(reference_sorted):
+                edges = np.unique(np.quantile(reference_sorted, quantile_levels))
+                counts = np.diff(np.concatenate([[0], np.searchsorted(reference_sorted, edges, side="right"),
+                                                 [len(reference_sorted)]]))
+                proportions = np.clip(counts / len(reference_sorted), PSI_EPSILON, None)
+            else:
+                edges, proportions = np.array([]), np.array([1.0])
+            self.psi_edges[col] = edges
+            self.reference_proportions[col] = proportions
+
+        logger.info(f"Референс для анализа дрейфа подготовлен: {len(self.columns)} колонок, "
+                    f"хэш {self.reference_hash}")
+        return self
+
+    def to_profile(self, max_quantiles: int = 1001) -> ReferenceProfile:
+        """
+        Строит компактный профиль из обученного детектора.
+
+        Args:
+            max_quantiles: Максимальный размер квантильного эскиза на колонку
+
+        Returns:
+            Референсный профиль
+        """
+        if not self.reference_sorted:
+            raise ValueError("Детектор дрейфа не обучен: вызовите fit() с референсным датасетом")
+
+        return ReferenceProfile(
+            data_hash=self.reference_hash,
+            columns=self.columns,
+            samples={col: ReferenceProfile.sketch(self.reference_sorted[col], max_quantiles)
+                     for col in self.columns},
+            counts=dict(self.reference_counts),
+            means=dict(self.reference_means),
+            psi_edges=dict(self.psi_edges),
+            reference_proportions=dict(self.reference_proportions)
+        )
+
+    def load_profile(self, profile: ReferenceProfile) -> "DriftDetector":
+        """
+        Использует сохраненный профиль вместо полного референсного датасета.
+
+        Args:
+            profile: Референсный профиль
+
+        Returns:
+            Детектор, готовый к compare()
+        """
+        self.columns = list(profile.columns)
+        self.reference_hash = profile.data_hash
+        self.reference_sorted = dict(profile.samples)
+        self.reference_counts = dict(profile.counts)
+        self.reference_means = dict(profile.means)
+        self.psi_edges = dict(profile.psi_edges)
+        self.reference_proportions = dict(profile.reference_proportions)
+        return self
+
+    def _compute_statistics(self, columns: List[str], current_sorted: Dict[str, np.ndarray],
+                            n_jobs: int) -> Dict[str, Dict[str, float]]:
+        """Рассчитывает статистики по колонкам последовательно или в пуле процессов."""
+        tasks = [(col, self.reference_sorted[col], current_sorted[col], self.psi_edges[col],
+                  self.reference_proportions[col], self.reference_counts.get(col)) for col in columns]
+
+        if n_jobs <= 1 or len(columns) < self.parallel_min_columns:
+            return _column_batch_statistics(tasks)
+
+        # Отправляем колонки пакетами, чтобы уменьшить накладные расходы на IPC
+        batches = [tasks[i::n_jobs] for i in range(n_jobs)]
+        statistics = {}
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            for batch_result in executor.map(_column_batch_statistics, batches):
+                statistics.update(batch_result)
+        logger.info(f"Статистики дрейфа рассчитаны в {n_jobs} процессах")
+        return statistics
+
+    def compare(self, current_df: pd.DataFrame, n_jobs: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Сравнивает текущий датасет с референсом.
+
+        Args:
+            current_df: Текущий датасет
+            n_jobs: Количество процессов (по умолчанию из настроек детектора)
+
+        Returns:
+            Словарь с результатами в формате DataLoader.detect_data_drift
+        """
+        if not self.reference_sorted:
+            raise ValueError("Детектор дрейфа не обучен: вызовите fit() с референсным датасетом")
+
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+        columns = [col for col in self.columns if col in current_df.columns]
+
+        values = current_df[columns].to_numpy(dtype=np.float64)
+        valid_counts = (~np.isnan(values)).sum(axis=0)
+        current_means = np.nanmean(values, axis=0) if len(values) else np.full(len(columns), np.nan)
+        sorted_values = np.sort(values, axis=0)
+        current_sorted = {col: np.ascontiguousarray(sorted_values[:valid_counts[idx], idx])
+                          for idx, col in enumerate(columns)}
+
+        statistics = self._compute_statistics(columns, current_sorted, n_jobs)
+
+        drift_results = {
+            "statistical_drift": {},
+            "distribution_drift": {},
+            "summary": {"drift_detected": False, "affected_features": [], "psi_drift_features": []},
+            "reference_hash": self.reference_hash
+        }
+
+        for idx, col in enumerate(columns):
+            stats = statistics[col]
+            ref_mean = self.reference_means[col]
+            curr_mean = float(current_means[idx])
+            mean_diff = abs(curr_mean - ref_mean) / abs(ref_mean) if ref_mean != 0 else 0
+
+            drift_results["statistical_drift"][col] = {
+                "ks_statistic": stats["ks_statistic"],
+                "p_value": stats["p_value"],
+                "drift_detected": bool(stats["p_value"] < self.p_value_threshold)
+            }
+            drift_results["distribution_drift"][col] = {
+                "reference_mean": ref_mean,
+                "current_mean": curr_mean,
+                "mean_difference_pct": mean_diff * 100,
+                "significant_change": bool(mean_diff > self.distribution_change_threshold),
+                "psi": stats["psi"],
+                "wasserstein_distance": stats["wasserstein_distance"],
+                "psi_drift": bool(stats["psi"] > self.psi_threshold)
+            }
+
+            if drift_results["statistical_drift"][col]["drift_detected"]:
+                drift_results["summary"]["affected_features"].append(col)
+                drift_results["summary"]["drift_detected"] = True
+            if drift_results["distribution_drift"][col]["psi_drift"]:
+                drift_results["summary"]["psi_drift_features"].append(col)
+
+        return drift_results
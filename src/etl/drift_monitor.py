@@ -0,0 +1,336 @@
+"""
+Модуль потокового мониторинга дрейфа данных.
+
+Монитор принимает входящие батчи скоринга и для каждого признака хранит
+гистограмму-эскиз на фиксированной сетке квантилей референса. Окно состоит
+из ограниченного числа таких эскизов (по одному на батч), поэтому расход
+памяти не зависит от объема трафика. Статистики KS, PSI и изменение среднего
+рассчитываются по агрегированному окну и сравниваются с порогами из секции
+data_quality.drift_detection конфигурации.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import pandas as pd
+import numpy as np
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable, Union
+from scipy.stats import kstwo
+import os
+import sys
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+try:
+    from .drift_detection import DriftDetector, ReferenceProfile, PSI_EPSILON
+except ImportError:
+    from drift_detection import DriftDetector, ReferenceProfile, PSI_EPSILON
+
+
+logger = get_logger(__name__)
+
+
+class _WindowPane:
+    """Эскиз одного батча: гистограммы, суммы и количество значений по признакам."""
+
+    __slots__ = ("counts", "sums", "valid", "rows")
+
+    def __init__(self, counts: np.ndarray, sums: np.ndarray, valid: np.ndarray, rows: int):
+        self.counts = counts
+        self.sums = sums
+        self.valid = valid
+        self.rows = rows
+
+
+class StreamingDriftMonitor:
+    """
+    Потоковый монитор дрейфа со скользящим или неперекрывающимся окном.
+
+    Окно хранит не более window_batches эскизов батчей; оценка выполняется
+    каждые slide_batches батчей (для окна типа "tumbling" шаг равен размеру окна).
+    """
+
+    def __init__(self, reference: Union[ReferenceProfile, DriftDetector],
+                 p_value_threshold: float = 0.05, distribution_change_threshold: float = 0.1,
+                 psi_threshold: float = 0.2, window_batches: int = 10, slide_batches: int = 1,
+                 window_type: str = "sliding", min_window_samples: int = 50,
+                 sketch_bins: int = 256, max_alerts: int = 100,
+                 on_alert: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Инициализация монитора.
+
+        Args:
+            reference: Референсный профиль или обученный DriftDetector
+            p_value_threshold: Порог p-value теста Колмогорова-Смирнова
+            distribution_change_threshold: Порог относительного изменения среднего
+            psi_threshold: Порог PSI
+            window_batches: Размер окна в батчах
+            slide_batches: Шаг окна в батчах (для скользящего окна)
+            window_type: Тип окна: "sliding" или "tumbling"
+            min_window_samples: Минимальное число строк в окне для оценки
+            sketch_bins: Количество квантилей референса в сетке эскиза
+            max_alerts: Максимальное число хранимых алертов
+            on_alert: Функция, вызываемая при каждом алерте
+        """
+        if window_type not in ("sliding", "tumbling"):
+            raise ValueError(f"Неподдерживаемый тип окна: {window_type}")
+        if window_batches < 1 or slide_batches < 1:
+            raise ValueError("Размер и шаг окна должны быть положительными")
+
+        if isinstance(reference, DriftDetector):
+            reference = reference.to_profile(max_quantiles=sketch_bins)
+
+        self.p_value_threshold = p_value_threshold
+        self.distribution_change_threshold = distribution_change_threshold
+        self.psi_threshold = psi_threshold
+        self.window_batches = window_batches
+        self.slide_batches = window_batches if window_type == "tumbling" else slide_batches
+        self.window_type = window_type
+        self.min_window_samples = min_window_samples
+        self.max_alerts = max_alerts
+        self.on_alert = on_alert
+
+        self.reference_hash = reference.data_hash
+        self.columns = [col for col in reference.columns if reference.counts.get(col)]
+        self.reference_means = {col: reference.means[col] for col in self.columns}
+        self.reference_counts = {col: int(reference.counts[col]) for col in self.columns}
+        self.reference_proportions = {col: reference.reference_proportions[col] for col in self.columns}
+
+        # Сетка эскиза: квантили референса плюс границы PSI, чтобы PSI считался точно
+        self.grid_edges = {}
+        self.reference_cdf = {}
+        self.psi_bin_index = {}
+        for col in self.columns:
+            sample = reference.samples[col]
+            psi_edges = reference.psi_edges[col]
+            edges = np.unique(np.concatenate([ReferenceProfile.sketch(sample, sketch_bins), psi_edges]))
+            self.grid_edges[col] = edges
+            self.reference_cdf[col] = np.searchsorted(sample, edges, side="right") / len(sample)
+            # Интервал эскиза j покрывает (e_{j-1}, e_j]; последний - значения выше e_{m-1}
+            self.psi_bin_index[col] = np.concatenate([np.searchsorted(psi_edges, edges, side="left"),
+                                                      [len(psi_edges)]])
+
+        self.n_bins = max((len(edges) + 1 for edges in self.grid_edges.values()), default=1)
+        self.reset()
+
+    @classmethod
+    def from_config(cls, reference: Union[ReferenceProfile, DriftDetector], drift_config: Dict[str, Any],
+                    on_alert: Optional[Callable[[Dict[str, Any]], None]] = None) -> "StreamingDriftMonitor":
+        """Создает монитор из секции data_quality.drift_detection конфигурации."""
+        streaming_config = drift_config.get("streaming", {}) or {}
+        return cls(
+            reference,
+            p_value_threshold=drift_config.get("p_value_threshold", 0.05),
+            distribution_change_threshold=drift_config.get("distribution_change_threshold", 0.1),
+            psi_threshold=drift_config.get("psi_threshold", 0.2),
+            window_batches=streaming_config.get("window_batches", 10),
+            slide_batches=streaming_config.get("slide_batches", 1),
+            window_type=streaming_config.get("window_type", "sliding"),
+            min_window_samples=streaming_config.get("min_window_samples", 50),
+            sketch_bins=streaming_config.get("sketch_bins", 256),
+            max_alerts=streaming_config.get("max_alerts", 100),
+            on_alert=on_alert
+        )
+
+    def reset(self) -> None:
+        """Очищает окно, счетчики и историю алертов."""
+        n_features = len(self.columns)
+        self._panes = deque()
+        self._window_counts = np.zeros((n_features, self.n_bins), dtype=np.int64)
+        self._window_sums = np.zeros(n_features, dtype=np.float64)
+        self._window_valid = np.zeros(n_features, dtype=np.int64)
+        self._window_rows = 0
+        self.batches_seen = 0
+        self.windows_evaluated = 0
+        self._batches_since_evaluation = 0
+        self.alerts = deque(maxlen=self.max_alerts)
+
+    def _sketch_batch(self, batch_df: pd.DataFrame) -> _WindowPane:
+        """Строит эскиз батча: гистограммы на сетке референса, суммы и число значений."""
+        n_features = len(self.columns)
+        counts = np.zeros((n_features, self.n_bins), dtype=np.int64)
+        sums = np.zeros(n_features, dtype=np.float64)
+        valid = np.zeros(n_features, dtype=np.int64)
+
+        missing = [col for col in self.columns if col not in batch_df.columns]
+        if missing:
+            raise ValueError(f"В батче отсутствуют признаки: {missing}")
+
+        values = batch_df[self.columns].to_numpy(dtype=np.float64)
+        for idx, col in enumerate(self.columns):
+            column = values[:, idx]
+            column = column[~np.isnan(column)]
+            bins = np.searchsorted(self.grid_edges[col], column, side="left")
+            counts[idx] = np.bincount(bins, minlength=self.n_bins)
+            sums[idx] = column.sum()
+            valid[idx] = len(column)
+
+        return _WindowPane(counts, sums, valid, len(batch_df))
+
+    def update(self, batch_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Добавляет батч в окно и при необходимости оценивает дрейф.
+
+        Args:
+            batch_df: Батч входящих данных
+
+        Returns:
+            Результаты оценки окна или None, если оценка на этом шаге не выполнялась
+        """
+        pane = self._sketch_batch(batch_df)
+
+        self._panes.append(pane)
+        self._window_counts += pane.counts
+        self._window_sums += pane.sums
+        self._window_valid += pane.valid
+        self._window_rows += pane.rows
+
+        # Вытесняем самый старый батч, чтобы окно оставалось ограниченным
+        if len(self._panes) > self.window_batches:
+            evicted = self._panes.popleft()
+            self._window_counts -= evicted.counts
+            self._window_sums -= evicted.sums
+            self._window_valid -= evicted.valid
+            self._window_rows -= evicted.rows
+
+        self.batches_seen += 1
+        self._batches_since_evaluation += 1
+
+        if self._batches_since_evaluation < self.slide_batches:
+            return None
+        if self.window_type == "tumbling" and len(self._panes) < self.window_batches:
+            return None
+        if self._window_rows < self.min_window_samples:
+            return None
+
+        self._batches_since_evaluation = 0
+        return self.evaluate()
+
+    def evaluate(self) -> Dict[str, Any]:
+        """
+        Оценивает дрейф по текущему окну.
+
+        Returns:
+            Словарь в формате DataLoader.detect_data_drift с описанием окна
+        """
+        drift_results = {
+            "statistical_drift": {},
+            "distribution_drift": {},
+            "summary": {"drift_detected": False, "affected_features": [],
+                        "psi_drift_features": [], "mean_shift_features": []},
+            "reference_hash": self.reference_hash,
+            "window": {
+                "index": self.windows_evaluated,
+                "type": self.window_type,
+                "batches": len(self._panes),
+                "samples": int(self._window_rows),
+                "first_batch": self.batches_seen - len(self._panes),
+                "last_batch": self.batches_seen - 1,
+                "timestamp": datetime.now().isoformat()
+            }
+        }
+
+        for idx, col in enumerate(self.columns):
+            n_current = int(self._window_valid[idx])
+            if n_current == 0:
+                continue
+
+            edges = self.grid_edges[col]
+            counts = self._window_counts[idx, :len(edges) + 1]
+
+            # KS по сетке эскиза: F_cur(e_j) = доля значений <= e_j
+            current_cdf = np.cumsum(counts[:-1]) / n_current
+            cdf_diff = np.abs(self.reference_cdf[col] - current_cdf)
+            ks_statistic = float(cdf_diff.max())
+            n_reference = self.reference_counts[col]
+            effective_n = np.round(n_reference * n_current / (n_reference + n_current))
+            p_value = float(np.clip(kstwo.sf(ks_statistic, effective_n), 0.0, 1.0))
+            wasserstein = float(np.sum(cdf_diff[:-1] * np.diff(edges)))
+
+            current_proportions = np.bincount(self.psi_bin_index[col], weights=counts,
+                                              minlength=len(self.reference_proportions[col])) / n_current
+            current_proportions = np.clip(current_proportions, PSI_EPSILON, None)
+            reference_proportions = self.reference_proportions[col]
+            psi = float(np.sum((current_proportions - reference_proportions)
+                               * np.log(current_proportions / reference_proportions)))
+
+            ref_mean = self.reference_means[col]
+            curr_mean = float(self._window_sums[idx] / n_current)
+            mean_diff = abs(curr_mean - ref_mean) / abs(ref_mean) if ref_mean != 0 else 0
+
+            drift_results["statistical_drift"][col] = {
+                "ks_statistic": ks_statistic,
+                "p_value": p_value,
+                "drift_detected": bool(p_value < self.p_value_threshold)
+            }
+            drift_results["distribution_drift"][col] = {
+                "reference_mean": ref_mean,
+                "current_mean": curr_mean,
+                "mean_difference_pct": mean_diff * 100,
+                "significant_change": bool(mean_diff > self.distribution_change_threshold),
+                "psi": psi,
+                "wasserstein_distance": wasserstein,
+                "psi_drift": bool(psi > self.psi_threshold)
+            }
+
+            summary = drift_results["summary"]
+            if drift_results["statistical_drift"][col]["drift_detected"]:
+                summary["affected_features"].append(col)
+                summary["drift_detected"] = True
+            if drift_results["distribution_drift"][col]["psi_drift"]:
+                summary["psi_drift_features"].append(col)
+            if drift_results["distribution_drift"][col]["significant_change"]:
+                summary["mean_shift_features"].append(col)
+
+        self.windows_evaluated += 1
+
+        summary = drift_results["summary"]
+        if summary["drift_detected"] or summary["psi_drift_features"] or summary["mean_shift_features"]:
+            self._emit_alert(drift_results)
+
+        return drift_results
+
+    def _emit_alert(self, drift_results: Dict[str, Any]) -> None:
+        """Сохраняет алерт в ограниченной истории и уведомляет подписчика."""
+        summary = drift_results["summary"]
+        alert = {
+            "timestamp": drift_results["window"]["timestamp"],
+            "window": drift_results["window"],
+            "affected_features": list(summary["affected_features"]),
+            "psi_drift_features": list(summary["psi_drift_features"]),
+            "mean_shift_features": list(summary["mean_shift_features"]),
+            "reference_hash": self.reference_hash
+        }
+        self.alerts.append(alert)
+
+        logger.warning(f"Дрейф в окне {alert['window']['index']} "
+                       f"(батчи {alert['window']['first_batch']}-{alert['window']['last_batch']}): "
+                       f"KS - {alert['affected_features']}, PSI - {alert['psi_drift_features']}")
+
+        if self.on_alert is not None:
+            try:
+                self.on_alert(alert)
+            except Exception as e:
+                logger.error(f"Ошибка обработчика алерта дрейфа: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Возвращает текущее состояние монитора."""
+        return {
+            "reference_hash": self.reference_hash,
+            "features": len(self.columns),
+            "window_type": self.window_type,
+            "window_batches": len(self._panes),
+            "window_samples": int(self._window_rows),
+            "batches_seen": self.batches_seen,
+            "windows_evaluated": self.windows_evaluated,
+            "alerts": len(self.alerts)
+        }
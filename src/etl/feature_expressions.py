@@ -0,0 +1,308 @@
+"""
+Модуль декларативных признаков: выражения компилируются в план NumPy.
+
+Признак задается именем и выражением над исходными колонками, например
+"radius_mean / (perimeter_mean + 1e-8)" или "std('*_mean')". Выражения
+разбираются один раз (ast, без eval) и компилируются в общий план
+векторизованных операций с устранением общих подвыражений: одинаковые
+подвыражения разных признаков (например, сумма группы для sum/mean/std)
+вычисляются один раз. Один и тот же план используется при обучении и скоринге.
+
+Поддерживается:
+    - колонки по имени (или col('имя') для имен, не являющихся идентификаторами);
+    - числа, + - * / **, унарный минус;
+    - log, log1p, exp, sqrt, abs от выражения;
+    - агрегаты по строке sum, mean, std (ddof=1, как pandas), max, min от колонок
+      или шаблонов имен ('*_mean').
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import ast
+import fnmatch
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import os
+import sys
+
+import numpy as np
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+
+logger = get_logger(__name__)
+
+# Определение признака: (название, выражение)
+FeatureDefinition = Tuple[str, str]
+
+_BINARY_OPERATORS = {ast.Add: "add", ast.Sub: "subtract", ast.Mult: "multiply",
+                     ast.Div: "divide", ast.Pow: "power"}
+_UNARY_FUNCTIONS = ("log", "log1p", "exp", "sqrt", "abs")
+_AGGREGATES = ("sum", "mean", "std", "max", "min")
+
+
+def column_reference(name: str) -> str:
+    """Ссылка на колонку в выражении."""
+    if name.isidentifier() and name not in _UNARY_FUNCTIONS + _AGGREGATES + ("col",):
+        return name
+    return f"col({name!r})"
+
+
+class CompiledFeatures:
+    """
+    Скомпилированный план вычисления признаков.
+
+    Шаги плана - уникальные узлы выражений в топологическом порядке;
+    результаты признаков пишутся сразу в колонки выходного блока.
+    """
+
+    def __init__(self, names: List[str], n_inputs: int, steps: List[Tuple], outputs: List[int]):
+        """
+        Инициализация плана.
+
+        Args:
+            names: Названия признаков
+            n_inputs: Количество колонок входной матрицы
+            steps: Узлы (вид, параметры, аргументы)
+            outputs: Номер узла для каждого признака
+        """
+        self.names = names
+        self.n_inputs = n_inputs
+        self.steps = steps
+        self.outputs = outputs
+
+    @property
+    def n_operations(self) -> int:
+        """Количество векторизованных операций (без ссылок на колонки и констант)."""
+        return sum(1 for kind, _, _ in self.steps if kind not in ("col", "const"))
+
+    def evaluate(self, X: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Вычисляет все признаки.
+
+        Args:
+            X: Матрица исходных признаков (float64), колонки в порядке компиляции
+            out: Блок результата формы (строки, len(names)); по умолчанию выделяется
+
+        Returns:
+            Блок признаков в порядке names
+        """
+        if X.shape[1] != self.n_inputs:
+            raise ValueError(f"Ожидается {self.n_inputs} исходных колонок, получено {X.shape[1]}")
+        n_rows = X.shape[0]
+        if out is None:
+            out = np.empty((n_rows, len(self.names)), dtype=np.float64, order="F")
+        if not self.names:
+            return out
+
+        # Узел-результат признака пишется сразу в его колонку
+        output_slot = {}
+        for k, node in enumerate(self.outputs):
+            if self.steps[node][0] not in ("col", "const"):
+                output_slot.setdefault(node, k)
+
+        # Временные массивы освобождаются после последнего использования (узлы признаков - никогда)
+        remaining = [0] * len(self.steps)
+        for _, _, args in self.steps:
+            for arg in args:
+                remaining[arg] += 1
+        for node in self.outputs:
+            remaining[node] += 1
+
+        values: List[Any] = [None] * len(self.steps)
+        for node, (kind, param, args) in enumerate(self.steps):
+            if kind == "col":
+                values[node] = X[:, param]
+                continue
+            if kind == "const":
+                values[node] = param
+                continue
+
+            target = out[:, output_slot[node]] if node in output_slot else np.empty(n_rows, dtype=np.float64)
+            operands = [values[arg] for arg in args]
+            if kind in ("binary", "unary"):
+                getattr(np, param)(*operands, out=target)
+            elif kind == "reduce":
+                name, positions = param
+                getattr(_group_view(X, positions), name)(axis=1, out=target)
+            elif kind == "std":
+                # Выборочное стандартное отклонение (ddof=1): среднее группы - общий узел
+                group = _group_view(X, param)
+                deviations = group - operands[0][:, np.newaxis]
+                np.einsum("ij,ij->i", deviations, deviations, out=target)
+                target /= group.shape[1] - 1 if group.shape[1] > 1 else np.nan
+                np.sqrt(target, out=target)
+            values[node] = target
+
+            for arg in args:
+                remaining[arg] -= 1
+                if remaining[arg] == 0:
+                    values[arg] = None
+
+        # Признаки-копии (колонка, константа или повтор уже вычисленного выражения)
+        for k, node in enumerate(self.outputs):
+            if output_slot.get(node) != k:
+                out[:, k] = values[node]
+        return out
+
+
+def _group_view(X: np.ndarray, positions: Tuple[int, ...]) -> np.ndarray:
+    """Колонки группы: срез без копирования, если колонки идут подряд."""
+    first = positions[0]
+    if positions == tuple(range(first, first + len(positions))):
+        return X[:, first:first + len(positions)]
+    return X.take(list(positions), axis=1)
+
+
+class _Compiler:
+    """Компилятор выражений в общий план с устранением общих подвыражений."""
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        self.positions = {col: j for j, col in enumerate(self.columns)}
+        self.steps: List[Tuple] = []
+        self.nodes: Dict[Tuple, int] = {}
+
+    def node(self, kind: str, param: Any, args: Tuple[int, ...] = ()) -> int:
+        """Возвращает номер узла, создавая его только при первом появлении."""
+        key = (kind, param, args)
+        if key not in self.nodes:
+            self.nodes[key] = len(self.steps)
+            self.steps.append(key)
+        return self.nodes[key]
+
+    def constant(self, node: int) -> Optional[float]:
+        """Значение узла-константы или None."""
+        kind, param, _ = self.steps[node]
+        return param if kind == "const" else None
+
+    def compile(self, expression: str) -> int:
+        """Компилирует выражение и возвращает номер его узла."""
+        try:
+            tree = ast.parse(expression.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Синтаксическая ошибка в выражении признака {expression!r}: {e.msg}")
+        return self.visit(tree.body, expression)
+
+    def visit(self, item: ast.AST, expression: str) -> int:
+        """Компилирует узел ast."""
+        if isinstance(item, ast.Constant) and isinstance(item.value, (int, float)) and not isinstance(item.value, bool):
+            return self.node("const", float(item.value))
+        if isinstance(item, ast.Name):
+            return self.column(item.id, expression)
+        if isinstance(item, ast.UnaryOp) and isinstance(item.op, (ast.USub, ast.UAdd)):
+            operand = self.visit(item.operand, expression)
+            if isinstance(item.op, ast.UAdd):
+                return operand
+            value = self.constant(operand)
+            return self.node("const", -value) if value is not None else self.node("unary", "negative", (operand,))
+        if isinstance(item, ast.BinOp) and type(item.op) in _BINARY_OPERATORS:
+            name = _BINARY_OPERATORS[type(item.op)]
+            left, right = self.visit(item.left, expression), self.visit(item.right, expression)
+            left_value, right_value = self.constant(left), self.constant(right)
+            if left_value is not None and right_value is not None:
+                return self.node("const", float(getattr(np, name)(left_value, right_value)))
+            return self.node("binary", name, (left, right))
+        if isinstance(item, ast.Call) and isinstance(item.func, ast.Name) and not item.keywords:
+            return self.call(item.func.id, item.args, expression)
+        raise ValueError(f"Неподдерживаемая конструкция в выражении признака {expression!r}: "
+                         f"{ast.dump(item)[:60]}")
+
+    def column(self, name: str, expression: str) -> int:
+        """Узел исходной колонки."""
+        if name not in self.positions:
+            raise ValueError(f"Неизвестная колонка {name!r} в выражении признака {expression!r}")
+        return self.node("col", self.positions[name])
+
+    def call(self, function: str, args: List[ast.AST], expression: str) -> int:
+        """Компилирует вызов функции."""
+        if function == "col":
+            if len(args) != 1 or not isinstance(args[0], ast.Constant) or not isinstance(args[0].value, str):
+                raise ValueError(f"col() принимает одно имя колонки: {expression!r}")
+            return self.column(args[0].value, expression)
+
+        if function in _UNARY_FUNCTIONS:
+            if len(args) != 1:
+                raise ValueError(f"{function}() принимает один аргумент: {expression!r}")
+            operand = self.visit(args[0], expression)
+            numpy_name = "absolute" if function == "abs" else function
+            value = self.constant(operand)
+            if value is not None:
+                return self.node("const", float(getattr(np, numpy_name)(value)))
+            return self.node("unary", numpy_name, (operand,))
+
+        if function in _AGGREGATES:
+            positions = tuple(self.positions[col] for col in self.group(args, expression))
+            if function == "mean":
+                # mean = sum / n: сумма группы - общий узел с sum() и std()
+                total = self.node("reduce", ("sum", positions))
+                return self.node("binary", "divide", (total, self.node("const", float(len(positions)))))
+            if function == "std":
+                return self.node("std", positions, (self.call("mean", args, expression),))
+            return self.node("reduce", (function, positions))
+
+        raise ValueError(f"Неизвестная функция {function}() в выражении признака {expression!r}")
+
+    def group(self, args: List[ast.AST], expression: str) -> List[str]:
+        """Колонки аргументов агрегата: имена, col('имя') и шаблоны '*_mean'."""
+        columns = []
+        for arg in args:
+            if isinstance(arg, ast.Name):
+                self.column(arg.id, expression)
+                columns.append(arg.id)
+            elif isinstance(arg, ast.Call) and isinstance(arg.func, ast.Name) and arg.func.id == "col":
+                columns.append(self.columns[self.steps[self.call("col", arg.args, expression)][1]])
+            elif isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                matched = [col for col in self.columns if fnmatch.fnmatchcase(col, arg.value)]
+                if not matched:
+                    raise ValueError(f"Шаблон {arg.value!r} не совпал ни с одной колонкой: {expression!r}")
+                columns.extend(matched)
+            else:
+                raise ValueError(f"Аргументы агрегатов - колонки или шаблоны имен: {expression!r}")
+        if not columns:
+            raise ValueError(f"Агрегат без колонок: {expression!r}")
+        return columns
+
+
+@lru_cache(maxsize=32)
+def _compile_cached(definitions: Tuple[FeatureDefinition, ...], columns: Tuple[str, ...]) -> CompiledFeatures:
+    """Компиляция с кэшем: один и тот же набор выражений разбирается один раз."""
+    names = [name for name, _ in definitions]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Повторяющиеся названия признаков: {', '.join(duplicates)}")
+    clashes = sorted(set(names) & set(columns))
+    if clashes:
+        raise ValueError(f"Названия признаков совпадают с исходными колонками: {', '.join(clashes)}")
+
+    compiler = _Compiler(columns)
+    outputs = [compiler.compile(expression) for _, expression in definitions]
+    compiled = CompiledFeatures(names, len(columns), compiler.steps, outputs)
+    logger.debug(f"Скомпилировано признаков: {len(names)}, операций: {compiled.n_operations}")
+    return compiled
+
+
+def compile_features(definitions: Sequence[FeatureDefinition], columns: Sequence[str]) -> CompiledFeatures:
+    """
+    Компилирует определения признаков в векторизованный план.
+
+    Args:
+        definitions: Пары (название, выражение)
+        columns: Колонки входной матрицы (в порядке колонок)
+
+    Returns:
+        CompiledFeatures
+
+    Raises:
+        ValueError: Ошибка синтаксиса, неизвестная колонка/функция или повтор названия
+    """
+    key = tuple((str(name), str(expression)) for name, expression in definitions)
+    return _compile_cached(key, tuple(columns))
@@ -0,0 +1,421 @@
+"""
+Модуль быстрого отбора признаков.
+
+Ранжирование признаков вычисляется один раз и переиспользуется для всех
+значений n_features:
+    - univariate: F-статистики f_classif кэшируются по отпечатку данных;
+    - rfe: рекурсивное исключение с теплым стартом логистической регрессии
+      (коэффициенты оставшихся признаков - начальная точка следующего шага)
+      и настраиваемым шагом исключения;
+    - l1: порядок входа признаков в модель на L1-пути регуляризации
+      (теплый старт по возрастанию C).
+Если задано несколько кандидатов n_features, подмножества признаков
+сравниваются кросс-валидацией в пуле процессов и выбирается лучшее.
+
+PCA для больших данных: рандомизированный SVD или IncrementalPCA,
+обучаемый по частям (например, из DataLoader.iter_chunks).
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import hashlib
+import inspect
+import logging
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+import os
+import sys
+
+import numpy as np
+from sklearn.base import BaseEstimator
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.feature_selection import SelectorMixin, f_classif
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+from sklearn.svm import l1_min_c
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+
+logger = get_logger(__name__)
+
+SELECTION_METHODS = ("univariate", "rfe", "l1")
+PCA_SOLVERS = ("auto", "full", "randomized", "incremental")
+
+# Кэш F-статистик: отпечаток (X, y) -> оценки признаков
+_SCORE_CACHE: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_SCORE_CACHE_SIZE = 8
+
+# В новых версиях scikit-learn L1-регуляризация задается только через l1_ratio
+_PENALTY_DEPRECATED = inspect.signature(LogisticRegression).parameters["penalty"].default == "deprecated"
+
+
+def _fingerprint(X: np.ndarray, y: np.ndarray) -> str:
+    """Отпечаток данных без копирования матрицы (для C- и F-порядка)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((X.shape, X.dtype.str, y.dtype.str)).encode())
+    if X.flags.c_contiguous:
+        digest.update(memoryview(X))
+    elif X.flags.f_contiguous:
+        digest.update(b"F")
+        digest.update(memoryview(X.T))
+    else:
+        digest.update(np.ascontiguousarray(X).data)
+    digest.update(np.ascontiguousarray(y).data)
+    return digest.hexdigest()
+
+
+def univariate_scores(X: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    F-статистики f_classif с кэшем по отпечатку данных.
+
+    Повторный отбор по тем же данным с другим n_features не пересчитывает оценки.
+
+    Args:
+        X: Матрица признаков
+        y: Целевая переменная
+
+    Returns:
+        Оценки признаков (NaN для постоянных признаков заменяется нулем)
+    """
+    key = _fingerprint(X, y)
+    if key in _SCORE_CACHE:
+        _SCORE_CACHE.move_to_end(key)
+        return _SCORE_CACHE[key]
+
+    with warnings.catch_warnings():
+        # Постоянные признаки дают NaN и предупреждение - у них нулевая оценка
+        warnings.simplefilter("ignore", RuntimeWarning)
+        warnings.simplefilter("ignore", UserWarning)
+        scores, _ = f_classif(X, y)
+    scores = np.nan_to_num(scores, nan=0.0)
+    scores.setflags(write=False)
+
+    _SCORE_CACHE[key] = scores
+    while len(_SCORE_CACHE) > _SCORE_CACHE_SIZE:
+        _SCORE_CACHE.popitem(last=False)
+    return scores
+
+
+def clear_score_cache() -> None:
+    """Очищает кэш F-статистик."""
+    _SCORE_CACHE.clear()
+
+
+def _step_size(step: float, n_features: int) -> int:
+    """Количество признаков, исключаемых за шаг (как в sklearn RFE)."""
+    if 0.0 < step < 1.0:
+        return int(max(1, step * n_features))
+    if step < 1.0:
+        raise ValueError(f"Шаг RFE должен быть положительным, получено {step}")
+    return int(step)
+
+
+def rfe_elimination(X: np.ndarray, y: np.ndarray, sizes: Sequence[int], step: float = 1,
+                    random_state: int = 42) -> Dict[int, np.ndarray]:
+    """
+    Рекурсивное исключение признаков с теплым стартом.
+
+    Логистическая регрессия не обучается заново на каждом шаге: коэффициенты
+    оставшихся признаков используются как начальная точка. Исключение идет
+    до наименьшего размера, подмножества для всех размеров берутся с одного пути.
+
+    Args:
+        X: Матрица признаков
+        y: Целевая переменная
+        sizes: Размеры подмножеств
+        step: Количество (>= 1) или доля (< 1) признаков, исключаемых за шаг
+        random_state: Seed модели
+
+    Returns:
+        Словарь размер -> отсортированные индексы оставшихся признаков
+    """
+    n_features = X.shape[1]
+    n_step = _step_size(step, n_features)
+    estimator = LogisticRegression(random_state=random_state, max_iter=1000, warm_start=True)
+
+    remaining = np.arange(n_features)
+    X_remaining = X
+    coef = None
+    subsets = {}
+    n_fits = 0
+    for target in sorted({min(size, n_features) for size in sizes}, reverse=True):
+        while len(remaining) > target:
+            if coef is not None:
+                estimator.coef_ = coef
+            estimator.fit(X_remaining, y)
+            n_fits += 1
+
+            # Важность - сумма модулей коэффициентов по классам (как в sklearn RFE)
+            importance = np.abs(estimator.coef_).sum(axis=0)
+            n_drop = min(n_step, len(remaining) - target)
+            keep = np.sort(np.argsort(importance, kind="stable")[n_drop:])
+
+            remaining = remaining[keep]
+            X_remaining = X_remaining[:, keep]
+            coef = estimator.coef_[:, keep]
+        subsets[target] = remaining.copy()
+
+    logger.debug(f"RFE: {n_fits} обучений модели для размеров {sorted(subsets)}")
+    return subsets
+
+
+def _l1_logistic(**params) -> LogisticRegression:
+    """Логистическая регрессия с L1-регуляризацией (с учетом версии scikit-learn)."""
+    if _PENALTY_DEPRECATED:
+        params["l1_ratio"] = 1.0
+    else:
+        params["penalty"] = "l1"
+    return LogisticRegression(solver="saga", **params)
+
+
+def l1_path_ranking(X: np.ndarray, y: np.ndarray, n_features: int, n_cs: int = 30,
+                    random_state: int = 42) -> np.ndarray:
+    """
+    Ранжирует признаки по порядку входа в модель на L1-пути.
+
+    C увеличивается от минимального значения (все коэффициенты нулевые);
+    каждая следующая модель стартует с коэффициентов предыдущей. Путь
+    останавливается, как только в модель вошло n_features признаков.
+
+    Args:
+        X: Матрица признаков (нормализованная)
+        y: Целевая переменная
+        n_features: Сколько признаков нужно ранжировать
+        n_cs: Количество значений C на пути (логарифмическая сетка на 4 порядка)
+        random_state: Seed модели
+
+    Returns:
+        Индексы признаков от наиболее важного
+    """
+    n_total = X.shape[1]
+    cs = l1_min_c(X, y, loss="log") * np.logspace(0, 4, n_cs)
+    model = _l1_logistic(random_state=random_state, max_iter=1000, tol=1e-3, warm_start=True)
+
+    entry = np.full(n_total, n_cs)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        for position, c in enumerate(cs):
+            model.set_params(C=c)
+            model.fit(X, y)
+            active = np.any(model.coef_ != 0, axis=0)
+            entry[active & (entry == n_cs)] = position
+            if active.sum() >= min(n_features, n_total):
+                break
+
+    # Раньше вошедшие признаки важнее; при одновременном входе - больший коэффициент
+    magnitude = np.abs(model.coef_).sum(axis=0)
+    return np.lexsort((-magnitude, entry))
+
+
+def _cv_score(task: Tuple[np.ndarray, np.ndarray, np.ndarray, int, int, str]) -> float:
+    """Средняя оценка кросс-валидации логистической регрессии на подмножестве признаков."""
+    X, y, indices, cv_folds, random_state, scoring = task
+    estimator = LogisticRegression(random_state=random_state, max_iter=1000)
+    folds = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=random_state)
+    return float(cross_val_score(estimator, X[:, indices], y, cv=folds, scoring=scoring).mean())
+
+
+def cross_validate_subsets(X: np.ndarray, y: np.ndarray, subsets: Dict[int, np.ndarray], cv_folds: int = 5,
+                           n_jobs: int = 1, random_state: int = 42) -> Dict[int, float]:
+    """
+    Оценивает подмножества признаков кросс-валидацией.
+
+    Args:
+        X: Матрица признаков
+        y: Целевая переменная
+        subsets: Размер -> индексы признаков
+        cv_folds: Количество фолдов
+        n_jobs: Количество процессов
+        random_state: Seed разбиения и модели
+
+    Returns:
+        Словарь размер -> средняя оценка (ROC AUC для двух классов, иначе accuracy)
+    """
+    scoring = "roc_auc" if len(np.unique(y)) == 2 else "accuracy"
+    sizes = sorted(subsets)
+    tasks = [(X, y, subsets[size], cv_folds, random_state, scoring) for size in sizes]
+
+    if n_jobs <= 1 or len(tasks) < 2:
+        scores = [_cv_score(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+            scores = list(executor.map(_cv_score, tasks))
+        logger.info(f"Кросс-валидация {len(tasks)} подмножеств признаков в {min(n_jobs, len(tasks))} процессах")
+    return dict(zip(sizes, scores))
+
+
+class FastFeatureSelector(SelectorMixin, BaseEstimator):
+    """
+    Отбор признаков с однократным ранжированием (univariate, rfe, l1).
+
+    Совместим с интерфейсом селекторов scikit-learn (fit, transform, get_support).
+    """
+
+    def __init__(self, method: str = "univariate", n_features: int = 20, step: float = 1,
+                 candidates: Sequence[int] = (), cv_folds: int = 5, n_jobs: int = 1, random_state: int = 42):
+        """
+        Инициализация селектора.
+
+        Args:
+            method: Метод ранжирования ('univariate', 'rfe', 'l1')
+            n_features: Количество признаков (если candidates не заданы)
+            step: Шаг RFE: количество (>= 1) или доля (< 1) исключаемых признаков
+            candidates: Кандидаты n_features, лучший выбирается кросс-валидацией
+            cv_folds: Количество фолдов кросс-валидации
+            n_jobs: Количество процессов для кросс-валидации кандидатов
+            random_state: Seed моделей и разбиений
+        """
+        self.method = method
+        self.n_features = n_features
+        self.step = step
+        self.candidates = candidates
+        self.cv_folds = cv_folds
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def fit(self, X: Any, y: Any) -> "FastFeatureSelector":
+        """
+        Ранжирует признаки и выбирает подмножество.
+
+        Args:
+            X: Матрица признаков (массив или DataFrame)
+            y: Целевая переменная
+
+        Returns:
+            self
+        """
+        if self.method not in SELECTION_METHODS:
+            raise ValueError(f"Неизвестный метод отбора признаков: {self.method}")
+        sizes = list(self.candidates) or [self.n_features]
+        if any(int(size) < 1 for size in sizes):
+            raise ValueError(f"Количество признаков должно быть положительным: {sizes}")
+
+        if hasattr(X, "columns"):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        X = X.to_numpy(dtype=np.float64) if hasattr(X, "to_numpy") else np.asarray(X, dtype=np.float64)
+        y = np.asarray(y)
+        self.n_features_in_ = X.shape[1]
+        sizes = sorted({min(int(size), X.shape[1]) for size in sizes})
+
+        self.scores_ = None
+        if self.method == "rfe":
+            subsets = rfe_elimination(X, y, sizes, step=self.step, random_state=self.random_state)
+        else:
+            if self.method == "univariate":
+                self.scores_ = univariate_scores(X, y)
+                order = np.argsort(-self.scores_, kind="stable")
+            else:
+                order = l1_path_ranking(X, y, sizes[-1], random_state=self.random_state)
+            subsets = {size: np.sort(order[:size]) for size in sizes}
+
+        self.cv_scores_ = {}
+        best = sizes[0]
+        if len(sizes) > 1:
+            self.cv_scores_ = cross_validate_subsets(X, y, subsets, cv_folds=self.cv_folds,
+                                                     n_jobs=self.n_jobs, random_state=self.random_state)
+            # При равных оценках - меньшее подмножество
+            best = max(sizes, key=lambda size: (self.cv_scores_[size], -size))
+            logger.info(f"Кросс-валидация кандидатов: {self.cv_scores_}, выбрано признаков: {best}")
+
+        self.support_ = np.zeros(X.shape[1], dtype=bool)
+        self.support_[subsets[best]] = True
+        self.n_features_ = best
+        return self
+
+    def _get_support_mask(self) -> np.ndarray:
+        """Маска отобранных признаков."""
+        return self.support_
+
+    def get_state(self) -> Dict[str, Any]:
+        """Состояние обученного селектора из встроенных типов."""
+        return {
+            "params": self.get_params(),
+            "support": self.support_.tolist(),
+            "feature_names": None if not hasattr(self, "feature_names_in_") else list(self.feature_names_in_),
+            "cv_scores": {int(size): float(score) for size, score in self.cv_scores_.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "FastFeatureSelector":
+        """Восстанавливает обученный селектор из get_state."""
+        selector = cls(**state["params"])
+        selector.support_ = np.asarray(state["support"], dtype=bool)
+        selector.n_features_in_ = len(selector.support_)
+        selector.n_features_ = int(selector.support_.sum())
+        if state.get("feature_names") is not None:
+            selector.feature_names_in_ = np.asarray(state["feature_names"], dtype=object)
+        selector.cv_scores_ = dict(state.get("cv_scores", {}))
+        selector.scores_ = None
+        return selector
+
+
+def make_pca(n_components: int, solver: str = "auto", batch_size: int = 1000,
+             random_state: int = 42) -> Union[PCA, IncrementalPCA]:
+    """
+    Создает PCA с заданным способом разложения.
+
+    Args:
+        n_components: Количество компонент
+        solver: 'auto'/'full' - PCA, 'randomized' - рандомизированный SVD, 'incremental' - IncrementalPCA
+        batch_size: Размер батча IncrementalPCA
+        random_state: Seed рандомизированного SVD
+
+    Returns:
+        Необученный PCA или IncrementalPCA
+    """
+    if solver not in PCA_SOLVERS:
+        raise ValueError(f"Неизвестный способ PCA: {solver}")
+    if solver == "incremental":
+        return IncrementalPCA(n_components=n_components, batch_size=batch_size)
+    return PCA(n_components=n_components, svd_solver=solver, random_state=random_state)
+
+
+def partial_fit_pca(pca: IncrementalPCA, chunks: Iterable[np.ndarray]) -> IncrementalPCA:
+    """
+    Обучает IncrementalPCA по частям данных.
+
+    В памяти одновременно не более двух частей. Части, в которых строк меньше,
+    чем компонент (этого требует partial_fit), объединяются с соседними.
+
+    Args:
+        pca: IncrementalPCA (новый или уже частично обученный)
+        chunks: Итератор матриц признаков
+
+    Returns:
+        Обученный pca
+    """
+    min_rows = pca.n_components or 1
+    ready = None
+    pending: List[np.ndarray] = []
+    n_pending = 0
+    n_rows = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        n_pending += len(chunk)
+        n_rows += len(chunk)
+        if n_pending >= min_rows:
+            # Часть обучается, когда пришла следующая: остаток в конце присоединяется к последней
+            if ready is not None:
+                pca.partial_fit(ready)
+            ready = pending[0] if len(pending) == 1 else np.concatenate(pending)
+            pending, n_pending = [], 0
+
+    if ready is not None:
+        pending.insert(0, ready)
+    if n_rows < min_rows:
+        raise ValueError(f"Для IncrementalPCA с {min_rows} компонентами нужно не менее {min_rows} строк, "
+                         f"получено {n_rows}")
+    pca.partial_fit(pending[0] if len(pending) == 1 else np.concatenate(pending))
+    logger.info(f"IncrementalPCA обучен по частям: {n_rows} строк, {pca.n_components_} компонент")
+    return pca
@@ -0,0 +1,146 @@
+"""
+Модуль быстрой JSON-сериализации результатов пайплайна.
+
+Общий сериализатор для всех JSON-файлов results/: скаляры и массивы numpy,
+dtype pandas, Timestamp/datetime, Series/DataFrame, множества и пути
+преобразуются в значения JSON напрямую, без json.dump(default=str).
+Если установлен orjson, используется он (массивы numpy сериализуются
+нативно), иначе стандартный json.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import os
+import sys
+import json
+import logging
+from datetime import datetime, date, time
+from decimal import Decimal
+from pathlib import Path, PurePath
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from .atomic_io import write_bytes_atomic, read_bytes_verified
+except ImportError:
+    from atomic_io import write_bytes_atomic, read_bytes_verified
+
+
+logger = get_logger(__name__)
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Преобразует значение, не поддерживаемое JSON напрямую, в примитивы JSON.
+
+    Используется как обработчик default для orjson и json, поэтому вызывается
+    только для "нестандартных" объектов.
+
+    Args:
+        value: Значение для преобразования
+
+    Returns:
+        Значение из примитивов JSON (dict, list, str, int, float, bool, None)
+    """
+    if value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, np.generic):
+        # np.bool_, np.integer, np.floating, np.str_ -> соответствующие типы Python
+        return value.item() if not isinstance(value, (np.datetime64, np.timedelta64)) else str(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (pd.Timestamp, datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, pd.Timedelta):
+        return value.isoformat()
+    if isinstance(value, (np.dtype, pd.api.extensions.ExtensionDtype)):
+        return str(value)
+    if isinstance(value, pd.Series):
+        if isinstance(value.index, pd.RangeIndex):
+            return value.tolist()
+        return {str(key): item for key, item in value.items()}
+    if isinstance(value, pd.DataFrame):
+        return {str(column): value[column].tolist() for column in value.columns}
+    if isinstance(value, pd.Index):
+        return value.tolist()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, PurePath):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+
+    # Прочие объекты (например, оценщики sklearn) сохраняются строкой, как раньше
+    return str(value)
+
+
+def dumps(data: Any, indent: Optional[int] = 2) -> bytes:
+    """
+    Сериализует данные в JSON (UTF-8).
+
+    Args:
+        data: Данные для сериализации
+        indent: Отступ (2 - читаемый формат, None - компактный)
+
+    Returns:
+        Байты JSON
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            # orjson поддерживает только отступ в 2 пробела
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=to_jsonable, option=option)
+
+    separators = None if indent else (",", ":")
+    return json.dumps(data, indent=indent, ensure_ascii=False, default=to_jsonable,
+                      separators=separators).encode("utf-8")
+
+
+def loads(payload: Union[bytes, str]) -> Any:
+    """Десериализует JSON из байтов или строки."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def dump_json(data: Any, file_path: Union[str, Path], indent: Optional[int] = 2,
+              checksum: bool = True) -> str:
+    """
+    Атомарно сохраняет данные в JSON-файл.
+
+    Args:
+        data: Данные для сохранения
+        file_path: Путь к файлу
+        indent: Отступ (2 - читаемый формат, None - компактный)
+        checksum: Сохранять ли контрольную сумму рядом с файлом
+
+    Returns:
+        Путь к файлу
+    """
+    write_bytes_atomic(file_path, dumps(data, indent=indent), checksum=checksum)
+    return os.fspath(file_path)
+
+
+def load_json(file_path: Union[str, Path]) -> Any:
+    """Загружает данные из JSON-файла с проверкой контрольной суммы."""
+    return loads(read_bytes_verified(file_path))
@@ -0,0 +1,443 @@
+"""
+Модуль для хранения истории метрик модели в SQLite.
+
+Хранилище только дополняется (append-only): каждая оценка модели сохраняется
+как запуск (run) с набором скалярных метрик. Индексы по времени запуска и
+версии модели позволяют быстро строить временные ряды и искать регрессии
+качества на сотнях запусков без чтения JSON-файлов из results/.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import os
+import re
+import logging
+import sqlite3
+import uuid
+from typing import Dict, Any, Optional, List
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger, ensure_dir
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+    def ensure_dir(path: str) -> None:
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+try:
+    from .run_results import RunResultsReader, FILE_EXTENSION as RUN_RESULTS_EXTENSION
+except ImportError:
+    from run_results import RunResultsReader, FILE_EXTENSION as RUN_RESULTS_EXTENSION
+
+try:
+    from .json_serializer import load_json
+except ImportError:
+    from json_serializer import load_json
+
+
+logger = get_logger(__name__)
+
+# Разделы результатов, из которых извлекаются скалярные метрики (в порядке приоритета)
+METRIC_SECTIONS = [
+    ("basic_metrics",),
+    ("probabilistic_metrics",),
+    ("confusion_matrix_data",),
+    ("evaluation_summary", "basic_metrics"),
+    ("key_metrics",),
+    ("metrics",),
+]
+
+# Шаблоны файлов с историческими результатами в results/
+RESULT_FILE_PATTERNS = [
+    "final_metrics_*.json",
+    "complete_pipeline_results_*.json",
+    "pipeline_results_*.json",
+    "complete_pipeline_results_*.mlrr",
+    "pipeline_results_*.mlrr",
+]
+
+# Разделы бинарных результатов, которые нужны для импорта (остальные не читаются)
+IMPORT_SECTIONS = sorted({path[0] for path in METRIC_SECTIONS}
+                         | {"timestamp", "test_samples", "training_summary", "model_type"})
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    run_timestamp TEXT NOT NULL,
+    model_version TEXT,
+    source TEXT,
+    test_samples INTEGER,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs (run_timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_model_version ON runs (model_version, run_timestamp);
+
+CREATE TABLE IF NOT EXISTS run_metrics (
+    metric_name TEXT NOT NULL,
+    run_timestamp TEXT NOT NULL,
+    run_id TEXT NOT NULL REFERENCES runs (run_id),
+    model_version TEXT,
+    metric_value REAL NOT NULL,
+    PRIMARY KEY (metric_name, run_timestamp, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_run_metrics_version ON run_metrics (metric_name, model_version, run_timestamp);
+"""
+
+
+def extract_metrics(results: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Извлекает скалярные метрики из словаря результатов пайплайна.
+
+    Поддерживаются форматы evaluate_model (final_metrics_*.json),
+    complete_pipeline_results_*.json и pipeline_results_*.json.
+
+    Args:
+        results: Словарь с результатами
+
+    Returns:
+        Словарь {имя_метрики: значение}
+    """
+    metrics = {}
+    for path in METRIC_SECTIONS:
+        section = results
+        for key in path:
+            section = section.get(key) if isinstance(section, dict) else None
+        if not isinstance(section, dict):
+            continue
+        for name, value in section.items():
+            # bool является подклассом int, но метрикой не является
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and name not in metrics:
+                metrics[name] = float(value)
+    return metrics
+
+
+def normalize_timestamp(value: Any) -> str:
+    """
+    Приводит timestamp (datetime, ISO-строка или YYYYMMDD_HHMMSS) к ISO 8601.
+
+    Время с часовым поясом переводится в UTC, наивное время сохраняется как есть.
+    """
+    if isinstance(value, str):
+        if re.fullmatch(r"\d{8}_\d{6}", value):
+            return datetime.strptime(value, "%Y%m%d_%H%M%S").isoformat()
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+    return datetime.now().isoformat()
+
+
+class MetricsStore:
+    """Append-only хранилище истории метрик на основе SQLite."""
+
+    def __init__(self, db_path: str = "results/metrics_history.db"):
+        """
+        Инициализация хранилища метрик.
+
+        Args:
+            db_path: Путь к файлу базы данных SQLite
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            ensure_dir(os.path.dirname(db_path) or ".")
+
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        if db_path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        logger.info(f"Хранилище истории метрик инициализировано: {db_path}")
+
+    def close(self):
+        """Закрывает подключение к базе данных."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def append_run(self, results: Dict[str, Any], run_id: Optional[str] = None,
+                   run_timestamp: Optional[Any] = None, model_version: Optional[str] = None,
+                   source: Optional[str] = None) -> Optional[str]:
+        """
+        Добавляет запуск с метриками в хранилище.
+
+        Args:
+            results: Результаты оценки (формат evaluate_model или отчета пайплайна)
+            run_id: Идентификатор запуска (по умолчанию уникальный, из времени и случайного суффикса)
+            run_timestamp: Время запуска (по умолчанию берется из results["timestamp"])
+            model_version: Версия модели
+            source: Источник записи (например, путь к исходному JSON)
+
+        Returns:
+            run_id добавленного запуска или None, если запуск уже был сохранен
+        """
+        metrics = extract_metrics(results)
+        if not metrics:
+            logger.warning("В результатах не найдено скалярных метрик, запуск не сохранен")
+            return None
+
+        timestamp = normalize_timestamp(run_timestamp or results.get("timestamp"))
+        run_id = run_id or f"run_{timestamp}_{uuid.uuid4().hex[:8]}"
+        test_samples = results.get("test_samples")
+
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO runs (run_id, run_timestamp, model_version, source, test_samples, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, timestamp, model_version, source,
+                 int(test_samples) if isinstance(test_samples, (int, float)) else None,
+                 datetime.now().isoformat())
+            )
+            if cursor.rowcount == 0:
+                logger.info(f"Запуск {run_id} уже есть в хранилище метрик, пропускаем")
+                return None
+
+            self.connection.executemany(
+                "INSERT INTO run_metrics (metric_name, run_timestamp, run_id, model_version, metric_value) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(name, timestamp, run_id, model_version, value) for name, value in metrics.items()]
+            )
+
+        logger.info(f"Сохранен запуск {run_id}: {len(metrics)} метрик")
+        return run_id
+
+    def _series_filter(self, metric_name: str, start: Optional[Any], end: Optional[Any],
+                       model_version: Optional[str]):
+        """Формирует условие WHERE для выборок временного ряда."""
+        conditions = ["metric_name = ?"]
+        params = [metric_name]
+        if model_version is not None:
+            conditions.append("model_version = ?")
+            params.append(model_version)
+        if start is not None:
+            conditions.append("run_timestamp >= ?")
+            params.append(normalize_timestamp(start))
+        if end is not None:
+            conditions.append("run_timestamp <= ?")
+            params.append(normalize_timestamp(end))
+        return " AND ".join(conditions), params
+
+    def get_metric_series(self, metric_name: str, start: Optional[Any] = None, end: Optional[Any] = None,
+                          model_version: Optional[str] = None, last_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Возвращает временной ряд значений метрики.
+
+        Args:
+            metric_name: Имя метрики (например, "accuracy")
+            start: Начало интервала (включительно)
+            end: Конец интервала (включительно)
+            model_version: Фильтр по версии модели
+            last_n: Вернуть только последние N запусков
+
+        Returns:
+            Список записей {run_id, run_timestamp, model_version, value} по возрастанию времени
+        """
+        where, params = self._series_filter(metric_name, start, end, model_version)
+        query = (f"SELECT run_id, run_timestamp, model_version, metric_value FROM run_metrics "
+                 f"WHERE {where} ORDER BY run_timestamp DESC")
+        if last_n is not None:
+            query += " LIMIT ?"
+            params.append(int(last_n))
+
+        rows = self.connection.execute(query, params).fetchall()
+        return [
+            {"run_id": row["run_id"], "run_timestamp": row["run_timestamp"],
+             "model_version": row["model_version"], "value": row["metric_value"]}
+            for row in reversed(rows)
+        ]
+
+    def get_metric_trend(self, metric_name: str, last_n: int = 20,
+                         model_version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Рассчитывает тренд метрики по последним запускам (агрегаты считаются в SQL).
+
+        Args:
+            metric_name: Имя метрики
+            last_n: Количество последних запусков
+            model_version: Фильтр по версии модели
+
+        Returns:
+            Словарь со статистикой и наклоном линейного тренда (изменение в день)
+        """
+        where, params = self._series_filter(metric_name, None, None, model_version)
+        row = self.connection.execute(
+            f"""
+            WITH recent AS (
+                SELECT julianday(run_timestamp) AS day, metric_value AS y, run_timestamp
+                FROM run_metrics WHERE {where}
+                ORDER BY run_timestamp DESC LIMIT ?
+            ),
+            centered AS (
+                SELECT day - (SELECT AVG(day) FROM recent) AS x, y, run_timestamp FROM recent
+            )
+            SELECT COUNT(*) AS n, AVG(y) AS mean, MIN(y) AS min, MAX(y) AS max,
+                   SUM(x) AS sx, SUM(y) AS sy, SUM(x * y) AS sxy, SUM(x * x) AS sxx,
+                   MIN(run_timestamp) AS first_run, MAX(run_timestamp) AS last_run
+            FROM centered
+            """,
+            params + [int(last_n)]
+        ).fetchone()
+
+        n = row["n"]
+        slope = None
+        if n >= 2:
+            # x уже центрирован в SQL: суммы по сырым julianday (~2.46e6) теряют
+            # всю точность на запусках с интервалом в минуты
+            denominator = row["sxx"] - row["sx"] * row["sx"] / n
+            if denominator > 1e-12:
+                slope = (row["sxy"] - row["sx"] * row["sy"] / n) / denominator
+
+        return {
+            "metric": metric_name,
+            "runs": n,
+            "mean": row["mean"],
+            "min": row["min"],
+            "max": row["max"],
+            "slope_per_day": slope,
+            "first_run": row["first_run"],
+            "last_run": row["last_run"]
+        }
+
+    def detect_regression(self, metric_name: str, baseline_runs: int = 10, tolerance: float = 0.01,
+                          higher_is_better: bool = True,
+                          model_version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Проверяет, ухудшилась ли метрика последнего запуска относительно базовой линии.
+
+        Args:
+            metric_name: Имя метрики
+            baseline_runs: Количество предыдущих запусков для базовой линии
+            tolerance: Допустимое ухудшение (в абсолютных единицах метрики)
+            higher_is_better: True, если большее значение метрики лучше
+            model_version: Фильтр по версии модели
+
+        Returns:
+            Словарь с результатом проверки
+        """
+        series = self.get_metric_series(metric_name, model_version=model_version, last_n=baseline_runs + 1)
+        result = {
+            "metric": metric_name,
+            "regression_detected": False,
+            "latest_value": None,
+            "baseline_mean": None,
+            "delta": None,
+            "baseline_runs": max(len(series) - 1, 0)
+        }
+        if len(series) < 2:
+            logger.info(f"Недостаточно запусков для проверки регрессии метрики {metric_name}")
+            return result
+
+        latest = series[-1]
+        baseline = [point["value"] for point in series[:-1]]
+        baseline_mean = sum(baseline) / len(baseline)
+        delta = latest["value"] - baseline_mean
+        degradation = -delta if higher_is_better else delta
+
+        result.update({
+            "latest_run_id": latest["run_id"],
+            "latest_value": latest["value"],
+            "baseline_mean": baseline_mean,
+            "delta": delta,
+            "regression_detected": degradation > tolerance
+        })
+
+        if result["regression_detected"]:
+            logger.warning(f"Регрессия метрики {metric_name}: {latest['value']:.4f} "
+                           f"против базовой линии {baseline_mean:.4f}")
+        return result
+
+    def list_runs(self, limit: int = 50, model_version: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Возвращает последние запуски (без метрик)."""
+        query = "SELECT * FROM runs"
+        params = []
+        if model_version is not None:
+            query += " WHERE model_version = ?"
+            params.append(model_version)
+        query += " ORDER BY run_timestamp DESC LIMIT ?"
+        params.append(int(limit))
+        return [dict(row) for row in self.connection.execute(query, params).fetchall()]
+
+    def find_run(self, run_timestamp: Any, metrics: Dict[str, float]) -> Optional[str]:
+        """
+        Ищет сохраненный запуск с тем же временем и теми же значениями метрик.
+
+        Args:
+            run_timestamp: Время запуска
+            metrics: Скалярные метрики запуска
+
+        Returns:
+            run_id найденного запуска или None
+        """
+        rows = self.connection.execute(
+            "SELECT DISTINCT run_id FROM run_metrics WHERE run_timestamp = ?",
+            (normalize_timestamp(run_timestamp),)
+        ).fetchall()
+        for row in rows:
+            if self.get_run_metrics(row["run_id"]) == metrics:
+                return row["run_id"]
+        return None
+
+    def get_run_metrics(self, run_id: str) -> Dict[str, float]:
+        """Возвращает все метрики запуска."""
+        rows = self.connection.execute(
+            "SELECT metric_name, metric_value FROM run_metrics WHERE run_id = ?", (run_id,)
+        ).fetchall()
+        return {row["metric_name"]: row["metric_value"] for row in rows}
+
+    def import_results_directory(self, results_dir: str = "results") -> int:
+        """
+        Импортирует исторические метрики из JSON- и бинарных файлов в results/.
+
+        Из бинарных файлов результатов читаются только разделы с метриками.
+
+        Повторный импорт безопасен: уже сохраненные запуски пропускаются, в том
+        числе записанные при оценке под другим run_id (например, run_id DAG).
+
+        Args:
+            results_dir: Директория с результатами
+
+        Returns:
+            Количество импортированных запусков
+        """
+        imported = 0
+        for pattern in RESULT_FILE_PATTERNS:
+            for file_path in sorted(Path(results_dir).glob(pattern)):
+                try:
+                    if file_path.suffix == RUN_RESULTS_EXTENSION:
+                        results = RunResultsReader(str(file_path)).read(IMPORT_SECTIONS)
+                    else:
+                        results = load_json(file_path)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Не удалось прочитать {file_path}: {e}")
+                    continue
+
+                metrics = extract_metrics(results) if isinstance(results, dict) else {}
+                if not metrics:
+                    logger.debug(f"В {file_path} нет метрик, пропускаем")
+                    continue
+
+                file_timestamp = re.search(r"(\d{8}_\d{6})", file_path.name)
+                run_timestamp = results.get("timestamp") or (file_timestamp.group(1) if file_timestamp else None)
+                existing_run = self.find_run(run_timestamp, metrics) if run_timestamp else None
+                if existing_run:
+                    logger.debug(f"{file_path} уже сохранен как запуск {existing_run}, пропускаем")
+                    continue
+                model_version = (results.get("training_summary") or {}).get("model_type") or results.get("model_type")
+
+                if self.append_run(results, run_id=file_path.stem, run_timestamp=run_timestamp,
+                                   model_version=model_version, source=str(file_path)):
+                    imported += 1
+
+        logger.info(f"Импортировано запусков из {results_dir}: {imported}")
+        return imported
@@ -0,0 +1,238 @@
+"""
+Модуль сериализации моделей со сжатием и кэшем загрузки.
+
+Модель записывается один раз (joblib с настраиваемым сжатием lz4/zlib/...)
+атомарно и с контрольной суммой; дополнительные копии (например, архивная
+копия с timestamp) создаются жесткими ссылками без повторной сериализации.
+Загруженные модели кэшируются в процессе по SHA-256 содержимого, поэтому
+повторные load_model того же файла не распаковывают его заново.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import os
+import sys
+import uuid
+import shutil
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+import joblib
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+try:
+    import lz4  # noqa: F401 - нужен joblib для сжатия lz4
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+try:
+    from .atomic_io import (atomic_write, write_checksum, read_checksum, file_sha256,
+                            checksum_path, sync_parent_directory)
+except ImportError:
+    from atomic_io import (atomic_write, write_checksum, read_checksum, file_sha256,
+                           checksum_path, sync_parent_directory)
+
+
+logger = get_logger(__name__)
+
+# Методы сжатия, поддерживаемые joblib
+SUPPORTED_COMPRESSION = ("lz4", "zlib", "gzip", "bz2", "lzma", "xz")
+
+DEFAULT_COMPRESSION = "lz4"
+DEFAULT_COMPRESS_LEVEL = 3
+DEFAULT_CACHE_SIZE = 4
+
+_cache_lock = threading.Lock()
+# SHA-256 содержимого -> модель (LRU)
+_model_cache: "OrderedDict[str, Any]" = OrderedDict()
+# Путь -> (подпись stat, проверенный SHA-256), чтобы не хэшировать неизменный файл повторно
+_verified_files: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+_cache_size = DEFAULT_CACHE_SIZE
+
+
+def resolve_compression(compression: Optional[str] = DEFAULT_COMPRESSION,
+                        level: int = DEFAULT_COMPRESS_LEVEL) -> Union[int, Tuple[str, int]]:
+    """
+    Преобразует настройки сжатия в параметр compress для joblib.dump.
+
+    Args:
+        compression: Метод сжатия (lz4, zlib, gzip, bz2, lzma, xz) или None
+        level: Уровень сжатия
+
+    Returns:
+        0 (без сжатия) или кортеж (метод, уровень)
+    """
+    if not compression or compression == "none":
+        return 0
+    if compression not in SUPPORTED_COMPRESSION:
+        raise ValueError(f"Неподдерживаемый метод сжатия модели: {compression}. "
+                         f"Доступны: {', '.join(SUPPORTED_COMPRESSION)}")
+    if compression == "lz4" and not LZ4_AVAILABLE:
+        logger.warning("Пакет lz4 не установлен, модель сжимается zlib")
+        compression = "zlib"
+    return compression, int(level)
+
+
+def save_model_file(model: Any, file_path: str, compression: Optional[str] = DEFAULT_COMPRESSION,
+                    level: int = DEFAULT_COMPRESS_LEVEL) -> str:
+    """
+    Атомарно сохраняет модель со сжатием и контрольной суммой.
+
+    Args:
+        model: Объект модели
+        file_path: Путь к файлу модели
+        compression: Метод сжатия
+        level: Уровень сжатия
+
+    Returns:
+        SHA-256 сохраненного файла
+    """
+    with atomic_write(file_path) as f:
+        joblib.dump(model, f, compress=resolve_compression(compression, level))
+    digest = write_checksum(file_path)
+
+    # Хэш только что записанного файла известен: первая загрузка не хэширует его повторно.
+    # Сам объект не кэшируется, так как вызывающий код может продолжить его изменять
+    _remember(os.path.abspath(file_path), digest)
+    return digest
+
+
+def link_model_file(source_path: str, destination_path: str) -> bool:
+    """
+    Создает копию файла модели жесткой ссылкой (без повторной сериализации).
+
+    Исходный файл в дальнейшем заменяется через os.replace (новый inode),
+    поэтому ссылка сохраняет содержимое на момент создания.
+
+    Args:
+        source_path: Сохраненный файл модели
+        destination_path: Путь копии
+
+    Returns:
+        True если создана ссылка, False если файл пришлось скопировать
+    """
+    linked = True
+    for source, destination in ((source_path, destination_path),
+                                (checksum_path(source_path), checksum_path(destination_path))):
+        if not os.path.exists(source):
+            continue
+        temp_path = f"{destination}.{uuid.uuid4().hex}.tmp"
+        try:
+            try:
+                os.link(source, temp_path)
+            except OSError:
+                # Файловая система без жестких ссылок
+                shutil.copyfile(source, temp_path)
+                linked = False
+            os.replace(temp_path, destination)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    sync_parent_directory(destination_path)
+    return linked
+
+
+def _stat_signature(file_path: str) -> Tuple[int, int, int]:
+    """Подпись файла: inode, размер и время изменения."""
+    stat = os.stat(file_path)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _remember(abs_path: str, digest: str, model: Any = None) -> None:
+    """Запоминает проверенный файл и (если передана) модель в LRU-кэше."""
+    with _cache_lock:
+        _verified_files[abs_path] = (_stat_signature(abs_path), digest)
+        if model is None or _cache_size <= 0:
+            return
+        _model_cache[digest] = model
+        _model_cache.move_to_end(digest)
+        while len(_model_cache) > _cache_size:
+            _model_cache.popitem(last=False)
+
+
+def _verified_digest(file_path: str) -> str:
+    """
+    Возвращает SHA-256 файла, проверенный по контрольной сумме.
+
+    Неизменный с прошлой проверки файл (inode, размер, mtime) повторно не хэшируется.
+    """
+    abs_path = os.path.abspath(file_path)
+    signature = _stat_signature(abs_path)
+    with _cache_lock:
+        known = _verified_files.get(abs_path)
+    if known is not None and known[0] == signature:
+        return known[1]
+
+    digest = file_sha256(abs_path)
+    expected = read_checksum(abs_path)
+    if expected is not None and expected != digest:
+        raise ValueError(f"Файл модели поврежден (контрольная сумма не совпадает): {file_path}")
+    with _cache_lock:
+        _verified_files[abs_path] = (signature, digest)
+    return digest
+
+
+def load_model_file(file_path: str, use_cache: bool = True) -> Any:
+    """
+    Загружает модель с проверкой контрольной суммы и кэшированием.
+
+    Кэшированная модель - общий объект процесса: вызывающий код не должен
+    изменять ее на месте (переобучение создает новую модель).
+
+    Args:
+        file_path: Путь к файлу модели
+        use_cache: Использовать ли кэш загруженных моделей
+
+    Returns:
+        Объект модели
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Файл модели не найден: {file_path}")
+
+    digest = _verified_digest(file_path)
+    if use_cache:
+        with _cache_lock:
+            model = _model_cache.get(digest)
+            if model is not None:
+                _model_cache.move_to_end(digest)
+        if model is not None:
+            logger.debug(f"Модель взята из кэша: {file_path}")
+            return model
+
+    model = joblib.load(file_path)
+    if use_cache:
+        _remember(os.path.abspath(file_path), digest, model)
+    return model
+
+
+def configure_model_cache(cache_size: int) -> None:
+    """Задает максимальное число моделей в кэше загрузки (0 - кэш отключен)."""
+    global _cache_size
+    with _cache_lock:
+        _cache_size = max(int(cache_size), 0)
+        while len(_model_cache) > _cache_size:
+            _model_cache.popitem(last=False)
+
+
+def clear_model_cache() -> None:
+    """Очищает кэш загруженных моделей."""
+    with _cache_lock:
+        _model_cache.clear()
+        _verified_files.clear()
+
+
+def get_cache_info() -> Dict[str, int]:
+    """Возвращает состояние кэша загрузки."""
+    with _cache_lock:
+        return {"models": len(_model_cache), "max_models": _cache_size, "verified_files": len(_verified_files)}
@@ -0,0 +1,553 @@
+"""
+Модуль предобработки на одном массиве NumPy (preprocessing.execution_mode: block).
+
+Числовые признаки один раз копируются в принадлежащий пайплайну массив
+float64 (Fortran-порядок: колонки непрерывны в памяти). Очистка, обработка
+выбросов и создание признаков выполняются на месте по маскам, строки
+отфильтровываются одной общей маской, а колонки под новые признаки
+резервируются заранее. Пиковая память каждой стадии измеряется tracemalloc.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import pandas as pd
+import numpy as np
+import logging
+import inspect
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple, Any
+import os
+import sys
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+try:
+    from .feature_expressions import compile_features, column_reference
+except ImportError:
+    from feature_expressions import compile_features, column_reference
+
+
+logger = get_logger(__name__)
+
+ID_COLUMN = "id"
+TARGET_COLUMN = "diagnosis"
+ENCODED_TARGET_COLUMN = "diagnosis_encoded"
+# M (Malignant) = 1, B (Benign) = 0
+DIAGNOSIS_MAPPING = {"M": 1, "B": 0}
+
+# Создаваемый признак: (название, выражение) - см. feature_expressions
+FeatureSpec = Tuple[str, str]
+
+# Все признаки, которые может создать plan_feature_engineering
+ENGINEERED_FEATURES = (
+    'mean_features_sum', 'mean_features_mean', 'mean_features_std',
+    'se_features_sum', 'se_features_mean',
+    'worst_features_sum', 'worst_features_max',
+    'radius_perimeter_ratio', 'area_perimeter_ratio',
+    'composite_index_1', 'composite_index_2',
+)
+
+_MB = 1024 * 1024
+
+
+class StageMemoryProfiler:
+    """
+    Замер пиковой памяти по стадиям предобработки (tracemalloc).
+
+    Для каждой стадии сохраняется пик выделенной памяти относительно начала
+    стадии и объем памяти, оставшейся занятой после нее.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Инициализация профилировщика.
+
+        Args:
+            enabled: Выполнять ли замеры (выключенный профилировщик ничего не делает)
+        """
+        self.enabled = enabled
+        self.report: Dict[str, Dict[str, float]] = {}
+        self._owns_tracing = False
+
+    @contextmanager
+    def stage(self, name: str):
+        """Контекст замера одной стадии."""
+        if not self.enabled:
+            yield
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.report[name] = {
+                "peak_mb": round(max(peak - start, 0) / _MB, 3),
+                "retained_mb": round((current - start) / _MB, 3)
+            }
+
+    def stop(self) -> None:
+        """Останавливает tracemalloc, если он был запущен профилировщиком."""
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def log_report(self) -> None:
+        """Выводит отчет по стадиям в лог."""
+        for name, stats in self.report.items():
+            logger.info(f"Память на стадии {name}: пик {stats['peak_mb']:.2f} MB, "
+                        f"удержано {stats['retained_mb']:.2f} MB")
+
+
+def numeric_feature_columns(df: pd.DataFrame, exclude: Sequence[str] = ()) -> List[str]:
+    """
+    Исходные числовые признаки (без id, целевой переменной и уже созданных признаков).
+
+    Args:
+        df: DataFrame
+        exclude: Дополнительно исключаемые колонки (например, названия признаков из конфигурации)
+    """
+    excluded = {ID_COLUMN, TARGET_COLUMN, ENCODED_TARGET_COLUMN, *ENGINEERED_FEATURES, *exclude}
+    return [col for col in df.select_dtypes(include=[np.number]).columns if col not in excluded]
+
+
+def encode_target(values: np.ndarray) -> np.ndarray:
+    """
+    Кодирует diagnosis (M=1, B=0).
+
+    Returns:
+        int64-массив или float64 с NaN, если встретились неизвестные значения
+    """
+    target = pd.Series(values).map(DIAGNOSIS_MAPPING).to_numpy(dtype=np.float64)
+    if np.isnan(target).any():
+        logger.warning("Найдены неизвестные значения в diagnosis")
+        return target
+    return target.astype(np.int64)
+
+
+def plan_feature_engineering(columns: Sequence[str], create_aggregates: bool = True,
+                             create_ratios: bool = True, create_composite_features: bool = True,
+                             definitions: Sequence[Any] = ()) -> List[FeatureSpec]:
+    """
+    Составляет список создаваемых признаков (название, выражение).
+
+    Признаки из конфигурации (preprocessing.feature_engineering.features)
+    используются как есть; без них строятся встроенные признаки Wisconsin
+    с учетом флагов create_*.
+
+    Args:
+        columns: Исходные признаки
+        create_aggregates: Агрегаты по группам mean/se/worst
+        create_ratios: Отношения размеров опухоли
+        create_composite_features: Композитные индексы
+        definitions: Определения из конфигурации (объекты с name/expression или пары)
+
+    Returns:
+        Список (название, выражение)
+    """
+    if definitions:
+        return [(item.name, item.expression) if hasattr(item, "expression") else tuple(item)
+                for item in definitions]
+
+    columns = list(columns)
+    plan: List[FeatureSpec] = []
+
+    def group(function: str, cols: Sequence[str]) -> str:
+        return f"{function}({', '.join(column_reference(col) for col in cols)})"
+
+    if create_aggregates and len(columns) >= 30:  # Wisconsin dataset имеет 30 признаков
+        mean_cols = [col for col in columns if col.endswith('_mean')]
+        se_cols = [col for col in columns if col.endswith('_se')]
+        worst_cols = [col for col in columns if col.endswith('_worst')]
+
+        # Если нет суффиксов, группы по позиции
+        if not mean_cols:
+            mean_cols, se_cols, worst_cols = columns[:10], columns[10:20], columns[20:30]
+
+        if mean_cols:
+            plan.extend([('mean_features_sum', group('sum', mean_cols)), ('mean_features_mean', group('mean', mean_cols)),
+                         ('mean_features_std', group('std', mean_cols))])
+        if se_cols:
+            plan.extend([('se_features_sum', group('sum', se_cols)), ('se_features_mean', group('mean', se_cols))])
+        if worst_cols:
+            plan.extend([('worst_features_sum', group('sum', worst_cols)), ('worst_features_max', group('max', worst_cols))])
+
+    if create_ratios and len(columns) >= 4:
+        if 'radius_mean' in columns and 'perimeter_mean' in columns:
+            plan.append(('radius_perimeter_ratio', 'radius_mean / (perimeter_mean + 1e-8)'))
+        if 'area_mean' in columns and 'perimeter_mean' in columns:
+            plan.append(('area_perimeter_ratio', 'area_mean / (perimeter_mean + 1e-8)'))
+
+    if create_composite_features and len(columns) >= 2:
+        first, second = column_reference(columns[0]), column_reference(columns[1])
+        plan.extend([('composite_index_1', f'{first} * {second}'),
+                     ('composite_index_2', f'{first} / ({second} + 1e-8)')])
+
+    return plan
+
+
+class FeatureBlock:
+    """
+    Признаки набора данных в одном массиве float64 с операциями на месте.
+
+    values имеет форму (строки, признаки + резерв); занятые колонки - первые
+    len(columns). Целевая переменная и исходный индекс строк хранятся отдельно.
+    """
+
+    def __init__(self, values: np.ndarray, columns: List[str], target: Optional[np.ndarray],
+                 index: pd.Index):
+        """
+        Инициализация блока.
+
+        Args:
+            values: Массив признаков (может содержать резервные колонки)
+            columns: Названия занятых колонок
+            target: Закодированная целевая переменная
+            index: Индекс строк исходного DataFrame
+        """
+        self.values = values
+        self.columns = list(columns)
+        self.target = target
+        self.index = index
+
+    @staticmethod
+    def valid_rows(df: pd.DataFrame) -> np.ndarray:
+        """
+        Общая маска строк: без дубликатов и без пустых id/diagnosis (как в clean_data).
+
+        Args:
+            df: Исходный DataFrame
+
+        Returns:
+            Булев массив оставляемых строк
+        """
+        duplicated = df.duplicated().to_numpy()
+        keep = ~duplicated
+        if duplicated.any():
+            logger.info(f"Удалено дубликатов: {int(duplicated.sum())}")
+
+        for col in (ID_COLUMN, TARGET_COLUMN):
+            if col in df.columns:
+                missing = df[col].isna().to_numpy() & keep
+                if missing.any():
+                    logger.info(f"Удалено строк с пустыми {col}: {int(missing.sum())}")
+                    keep &= ~missing
+        return keep
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, reserve: int = 0, rows: Optional[np.ndarray] = None,
+                   columns: Optional[Sequence[str]] = None) -> "FeatureBlock":
+        """
+        Создает блок из DataFrame одной копией признаков.
+
+        Без rows строки фильтруются маской valid_rows, целевая переменная
+        кодируется (как в prepare_features).
+
+        Args:
+            df: Исходный DataFrame (не изменяется)
+            reserve: Количество колонок, резервируемых под новые признаки
+            rows: Позиции строк (без фильтрации)
+            columns: Признаки (по умолчанию - все числовые колонки)
+
+        Returns:
+            FeatureBlock
+        """
+        if rows is None:
+            rows = np.flatnonzero(cls.valid_rows(df))
+        if columns is None:
+            columns = numeric_feature_columns(df)
+        missing_columns = [col for col in columns if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"В данных отсутствуют признаки: {', '.join(missing_columns)}")
+
+        values = np.empty((len(rows), len(columns) + reserve), dtype=np.float64, order="F")
+        for j, col in enumerate(columns):
+            np.take(df[col].to_numpy(dtype=np.float64), rows, out=values[:, j], mode="clip")
+
+        target = None
+        if TARGET_COLUMN in df.columns:
+            target = encode_target(df[TARGET_COLUMN].to_numpy()[rows])
+
+        return cls(values, columns, target, df.index[rows])
+
+    @property
+    def n_rows(self) -> int:
+        """Количество строк."""
+        return self.values.shape[0]
+
+    @property
+    def features(self) -> np.ndarray:
+        """Представление (без копирования) занятых колонок."""
+        return self.values[:, :len(self.columns)]
+
+    def column(self, name: str) -> np.ndarray:
+        """Представление одной колонки (непрерывное в памяти)."""
+        return self.values[:, self.columns.index(name)]
+
+    def column_medians(self) -> Dict[str, float]:
+        """Медианы колонок без учета пропусков."""
+        return {col: float(np.nanmedian(self.values[:, j])) for j, col in enumerate(self.columns)}
+
+    def fill_missing(self, fill_values: Dict[str, float]) -> Dict[str, float]:
+        """
+        Заполняет пропуски заданными значениями на месте.
+
+        Args:
+            fill_values: Словарь {колонка: значение}
+
+        Returns:
+            Словарь {колонка: значение} для заполненных колонок
+        """
+        filled = {}
+        for j, col in enumerate(self.columns):
+            values = self.values[:, j]
+            missing = np.isnan(values)
+            if col in fill_values and missing.any():
+                np.copyto(values, fill_values[col], where=missing)
+                filled[col] = fill_values[col]
+        return filled
+
+    def fill_missing_median(self) -> Dict[str, float]:
+        """
+        Заполняет пропуски медианой колонки на месте.
+
+        Returns:
+            Словарь {колонка: медиана} для заполненных колонок
+        """
+        missing_columns = [j for j in range(len(self.columns)) if np.isnan(self.values[:, j]).any()]
+        medians = {self.columns[j]: float(np.nanmedian(self.values[:, j])) for j in missing_columns}
+        filled = self.fill_missing(medians)
+        for col, median_value in filled.items():
+            logger.info(f"Заполнены пропуски в {col} медианой: {median_value}")
+        return filled
+
+    def outlier_mask(self, j: int, method: str = "iqr",
+                     forest_params: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """
+        Маска выбросов колонки.
+
+        Args:
+            j: Номер колонки
+            method: Метод обнаружения ('iqr', 'zscore', 'isolation_forest')
+            forest_params: Параметры IsolationForest (n_estimators, contamination,
+                n_jobs, random_state) из outlier_detection.isolation_forest
+
+        Returns:
+            Булев массив длины n_rows
+        """
+        values = self.values[:, j]
+        if method == "iqr":
+            q1, q3 = np.quantile(values, [0.25, 0.75])
+            iqr = q3 - q1
+            return (values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)
+        if method == "zscore":
+            std = values.std()
+            if std == 0:
+                return np.zeros(self.n_rows, dtype=bool)
+            return np.abs(values - values.mean()) > 3 * std
+        if method == "isolation_forest":
+            from sklearn.ensemble import IsolationForest
+            params = {"contamination": 0.1, "random_state": 42}
+            params.update(forest_params or {})
+            iso_forest = IsolationForest(**params)
+            return iso_forest.fit_predict(values.reshape(-1, 1)) == -1
+        raise ValueError(f"Неизвестный метод обнаружения выбросов: {method}")
+
+    def handle_outliers(self, method: str = "cap", detection_method: str = "iqr",
+                        detector: Any = None, forest_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Обрабатывает выбросы на месте.
+
+        Args:
+            method: Метод обработки ('remove', 'cap', 'transform')
+            detection_method: Метод обнаружения выбросов
+            detector: Обученный многомерный детектор (fit_outlier_detector): строка-выброс
+                считается выбросом во всех колонках, detection_method не используется
+            forest_params: Параметры IsolationForest для обнаружения по колонкам (см. outlier_mask)
+
+        Returns:
+            Параметры преобразования для apply_outlier_transform:
+            {"clip_bounds": {колонка: (нижняя, верхняя)}, "log_columns": [колонки]}.
+            Удаление строк относится только к этим данным и не сохраняется
+        """
+        logger.info(f"Обработка выбросов методом: {method}")
+        remove_mask = np.zeros(self.n_rows, dtype=bool) if method == "remove" else None
+        state = {"clip_bounds": {}, "log_columns": []}
+        row_mask = None
+        if detector is not None:
+            row_mask = detector.predict(self.features) == -1
+            logger.info(f"Строк-выбросов (многомерный IsolationForest): {int(row_mask.sum())}")
+
+        for j, col in enumerate(self.columns):
+            mask = row_mask if row_mask is not None else self.outlier_mask(j, detection_method, forest_params)
+            if not mask.any():
+                continue
+            values = self.values[:, j]
+
+            if method == "remove":
+                remove_mask |= mask
+            elif method == "cap":
+                # Winsorization квантилями 5% и 95%
+                lower, upper = np.quantile(values, [0.05, 0.95])
+                state["clip_bounds"][col] = (float(lower), float(upper))
+            elif method == "transform":
+                if values.min() > 0:
+                    state["log_columns"].append(col)
+                    logger.info(f"Применена log трансформация к {col}")
+
+        if remove_mask is not None and remove_mask.any():
+            logger.info(f"Удалено строк с выбросами: {int(remove_mask.sum())}")
+            self.compact_rows(~remove_mask)
+        self.apply_outlier_transform(state)
+        return state
+
+    def apply_outlier_transform(self, state: Dict[str, Any]) -> None:
+        """
+        Применяет сохраненные границы и log-трансформации выбросов на месте.
+
+        Args:
+            state: Результат handle_outliers
+        """
+        for col, (lower, upper) in state.get("clip_bounds", {}).items():
+            values = self.column(col)
+            np.clip(values, lower, upper, out=values)
+        for col in state.get("log_columns", []):
+            values = self.column(col)
+            np.log1p(values, out=values)
+
+    def compact_rows(self, keep: np.ndarray) -> None:
+        """
+        Оставляет строки по маске, сдвигая данные внутри того же массива.
+
+        Args:
+            keep: Булева маска оставляемых строк
+        """
+        n_keep = int(keep.sum())
+        for j in range(len(self.columns)):
+            values = self.values[:, j]
+            values[:n_keep] = values[keep]
+        self.values = self.values[:n_keep]
+        if self.target is not None:
+            self.target = self.target[keep]
+        self.index = self.index[keep]
+
+    def add_features(self, plan: Sequence[FeatureSpec]) -> List[str]:
+        """
+        Вычисляет новые признаки в зарезервированные колонки.
+
+        Args:
+            plan: Список из plan_feature_engineering
+
+        Returns:
+            Названия созданных признаков
+        """
+        free = self.values.shape[1] - len(self.columns)
+        if len(plan) > free:
+            raise ValueError(f"Недостаточно зарезервированных колонок: нужно {len(plan)}, доступно {free}")
+
+        start = len(self.columns)
+        compute_features(self.features, self.columns, plan, out=self.values[:, start:start + len(plan)])
+        created = [name for name, _ in plan]
+        self.columns.extend(created)
+
+        logger.info(f"Создано новых признаков: {len(created)}")
+        return created
+
+
+def fit_outlier_detector(X: np.ndarray, n_estimators: int = 100, contamination: float = 0.1,
+                         n_jobs: Optional[int] = -1, random_state: int = 42) -> Any:
+    """
+    Обучает один IsolationForest на всех признаках.
+
+    Вместо отдельного леса на каждую колонку: одно обучение (деревья строятся
+    параллельно), выбросы - строки, необычные по совокупности признаков.
+    Обученный детектор сохраняется и оценивает новые батчи без переобучения.
+
+    Args:
+        X: Матрица признаков без пропусков
+        n_estimators: Количество деревьев
+        contamination: Доля выбросов
+        n_jobs: Количество потоков (-1 - все ядра)
+        random_state: Seed
+
+    Returns:
+        Обученный IsolationForest
+    """
+    from sklearn.ensemble import IsolationForest
+    detector = IsolationForest(n_estimators=n_estimators, contamination=contamination,
+                               n_jobs=n_jobs, random_state=random_state)
+    detector.fit(X)
+    logger.info(f"IsolationForest обучен на {X.shape[0]} строках и {X.shape[1]} признаках")
+    return detector
+
+
+def compute_features(X: np.ndarray, columns: Sequence[str], plan: Sequence[FeatureSpec],
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Вычисляет признаки плана одним скомпилированным векторизованным планом.
+
+    Выражения компилируются один раз на набор (план, колонки) с устранением
+    общих подвыражений; результат пишется в заранее выделенный блок.
+
+    Args:
+        X: Матрица исходных признаков (float64)
+        columns: Названия колонок X
+        plan: Список (название, выражение)
+        out: Блок результата формы (строки, len(plan)); по умолчанию выделяется
+
+    Returns:
+        Блок созданных признаков в порядке plan
+    """
+    return compile_features(plan, columns).evaluate(X, out=out)
+
+
+def transform_in_place(scaler: Any, X: np.ndarray) -> np.ndarray:
+    """
+    Применяет обученный скейлер без изменения его параметров.
+
+    Скейлеры с аргументом copy в transform (StandardScaler) работают на месте,
+    остальные возвращают новый массив. Безопасно для общего (кэшированного) скейлера.
+    """
+    if "copy" in inspect.signature(scaler.transform).parameters:
+        return scaler.transform(X, copy=False)
+    return scaler.transform(X)
+
+
+def scale_in_place(scaler: Any, X_train: np.ndarray,
+                   X_test: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Обучает скейлер и нормализует принадлежащие вызывающему массивы без копии.
+
+    Параметр copy скейлера восстанавливается, поэтому сохраненный скейлер
+    при дальнейшем использовании не изменяет входные данные.
+
+    Args:
+        scaler: Скейлер scikit-learn с параметром copy
+        X_train: Обучающая выборка (float64)
+        X_test: Тестовая выборка (опционально)
+
+    Returns:
+        Tuple с нормализованными данными (те же массивы)
+    """
+    scaler.fit(X_train)
+    copy = scaler.get_params().get("copy", True)
+    scaler.set_params(copy=False)
+    try:
+        X_train = scaler.transform(X_train)
+        if X_test is not None:
+            X_test = scaler.transform(X_test)
+    finally:
+        scaler.set_params(copy=copy)
+    return X_train, X_test
@@ -0,0 +1,364 @@
+"""
+Модуль обученного пайплайна предобработки.
+
+PreprocessingPipeline хранит все обученные шаги предобработки (заполнение
+пропусков, границы выбросов, план новых признаков, скейлер и отбор
+признаков). fit обучает их на обучающих строках, transform применяет к
+новым данным без переобучения. Пайплайн сохраняется одним артефактом
+(атомарно, со сжатием и контрольной суммой), поэтому скоринг и
+переобучение используют в точности те же преобразования.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import pandas as pd
+import numpy as np
+import logging
+import dataclasses
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sklearn.preprocessing import StandardScaler, RobustScaler, MinMaxScaler
+from sklearn.decomposition import IncrementalPCA
+import os
+import sys
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+from config.config_schema import PreprocessingSettings, compile_settings
+
+try:
+    from .preprocessing_block import (FeatureBlock, FeatureSpec, numeric_feature_columns, fit_outlier_detector,
+                                      plan_feature_engineering, scale_in_place, transform_in_place)
+    from .model_serializer import save_model_file, load_model_file
+    from .feature_selection import FastFeatureSelector, make_pca, partial_fit_pca
+except ImportError:
+    from preprocessing_block import (FeatureBlock, FeatureSpec, numeric_feature_columns, fit_outlier_detector,
+                                     plan_feature_engineering, scale_in_place, transform_in_place)
+    from model_serializer import save_model_file, load_model_file
+    from feature_selection import FastFeatureSelector, make_pca, partial_fit_pca
+
+
+logger = get_logger(__name__)
+
+# Скейлеры по значению preprocessing.scaling.method
+SCALERS = {
+    "standard": StandardScaler,
+    "robust": RobustScaler,
+    "minmax": MinMaxScaler,
+}
+
+PIPELINE_FILENAME = "preprocessing_pipeline.joblib"
+
+
+class PreprocessingPipeline:
+    """
+    Обученный граф преобразований: пропуски → выбросы → новые признаки → масштабирование → отбор.
+
+    Очистка строк (дубликаты, пустые id/diagnosis) и удаление выбросов
+    относятся только к обучающим данным; transform сохраняет все строки,
+    чтобы предсказания соответствовали входным данным.
+    """
+
+    # Версия формата сохраненного артефакта: меняется только при несовместимом изменении
+    # формата в выпущенной версии; артефакт другой версии требует повторного обучения (fit)
+    ARTIFACT_VERSION = 1
+    # Ключи состояния, без которых артефакт не загружается
+    STATE_KEYS = ("settings", "input_columns", "fill_values", "outlier_state", "outlier_detector",
+                  "feature_plan", "feature_columns", "scaler", "selector", "selected_features")
+
+    def __init__(self, settings: Optional[PreprocessingSettings] = None, scaler: Any = None):
+        """
+        Инициализация пайплайна.
+
+        Args:
+            settings: Настройки раздела preprocessing
+            scaler: Необученный скейлер (по умолчанию - по scaling.method)
+        """
+        self.settings = settings or PreprocessingSettings()
+        self.scaler = scaler if scaler is not None else SCALERS[self.settings.scaling.method]()
+        self.input_columns: List[str] = []
+        self.fill_values: Dict[str, float] = {}
+        self.outlier_state: Dict[str, Any] = {"clip_bounds": {}, "log_columns": []}
+        # Многомерный IsolationForest (outlier_detection.isolation_forest.multivariate)
+        self.outlier_detector = None
+        self.feature_plan: List[FeatureSpec] = []
+        self.feature_columns: List[str] = []
+        self.selector = None
+        self.selected_features: List[str] = []
+        self.fitted = False
+
+    @property
+    def engineered_features(self) -> List[str]:
+        """Названия создаваемых признаков."""
+        return [name for name, _ in self.feature_plan]
+
+    @property
+    def output_columns(self) -> List[str]:
+        """Названия колонок результата transform."""
+        return self.selected_features or self.feature_columns
+
+    def fit(self, df: pd.DataFrame, rows: Optional[np.ndarray] = None) -> "PreprocessingPipeline":
+        """
+        Обучает все шаги пайплайна.
+
+        Args:
+            df: Исходный DataFrame (не изменяется)
+            rows: Позиции обучающих строк (по умолчанию - все корректные строки)
+
+        Returns:
+            self
+        """
+        self.fit_transform(df, rows)
+        return self
+
+    def fit_transform(self, df: pd.DataFrame, rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, pd.Series]:
+        """
+        Обучает пайплайн и возвращает преобразованные обучающие данные.
+
+        Args:
+            df: Исходный DataFrame (не изменяется)
+            rows: Позиции обучающих строк (по умолчанию - все корректные строки)
+
+        Returns:
+            Tuple (X, y) для оставшихся после обработки выбросов строк
+        """
+        settings = self.settings
+        feature_settings = settings.feature_engineering
+        self.input_columns = numeric_feature_columns(df, exclude=[item.name for item in feature_settings.features])
+
+        self.feature_plan = []
+        if feature_settings.enabled:
+            self.feature_plan = plan_feature_engineering(
+                self.input_columns,
+                create_aggregates=feature_settings.create_aggregates,
+                create_ratios=feature_settings.create_ratios,
+                create_composite_features=feature_settings.create_composite_features,
+                definitions=feature_settings.features)
+
+        block = FeatureBlock.from_frame(df, reserve=len(self.feature_plan), rows=rows, columns=self.input_columns)
+        if block.target is None:
+            raise ValueError("Для обучения пайплайна предобработки нужна колонка diagnosis")
+
+        # Значения для пропусков запоминаются для всех колонок: в новых данных пропуски могут быть где угодно
+        self.fill_values = block.column_medians()
+        block.fill_missing_median()
+
+        self.outlier_state = {"clip_bounds": {}, "log_columns": []}
+        self.outlier_detector = None
+        outliers = settings.outlier_detection
+        if outliers.enabled:
+            forest = outliers.isolation_forest
+            if outliers.method == "isolation_forest" and forest.multivariate:
+                self.outlier_detector = fit_outlier_detector(
+                    block.features, n_estimators=forest.n_estimators, contamination=forest.contamination,
+                    n_jobs=forest.n_jobs, random_state=forest.random_state)
+            forest_params = {"n_estimators": forest.n_estimators, "contamination": forest.contamination,
+                             "n_jobs": forest.n_jobs, "random_state": forest.random_state}
+            self.outlier_state = block.handle_outliers(method=outliers.action, detection_method=outliers.method,
+                                                       detector=self.outlier_detector, forest_params=forest_params)
+
+        block.add_features(self.feature_plan)
+        self.feature_columns = list(block.columns)
+
+        y = pd.Series(block.target, index=block.index, name="diagnosis_encoded")
+        X, _ = scale_in_place(self.scaler, block.features)
+        logger.info(f"Скейлер обучен на {X.shape[0]} образцах")
+        del block
+
+        self.selector, self.selected_features = None, []
+        if settings.feature_selection.enabled:
+            X = self._fit_selection(X, y.to_numpy())
+
+        self.fitted = True
+        logger.info(f"Пайплайн предобработки обучен: {len(self.input_columns)} -> {X.shape[1]} признаков")
+        return X, y
+
+    def _fit_selection(self, X: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Обучает отбор признаков (preprocessing.feature_selection) и применяет его к X."""
+        selection = self.settings.feature_selection
+        n_features = min(selection.n_features, X.shape[1])
+
+        if selection.method == "pca":
+            self.selector = make_pca(n_features, solver=selection.pca_solver, batch_size=selection.pca_batch_size)
+        else:
+            self.selector = FastFeatureSelector(method=selection.method, n_features=n_features, step=selection.step,
+                                                candidates=selection.candidates, cv_folds=selection.cv_folds,
+                                                n_jobs=selection.n_jobs)
+
+        X_selected = self.selector.fit_transform(X, y)
+        if selection.method == "pca":
+            self.selected_features = [f'PC_{i+1}' for i in range(X_selected.shape[1])]
+            logger.info(f"PCA компонентов: {X_selected.shape[1]}, объясненная дисперсия: "
+                        f"{self.selector.explained_variance_ratio_.sum():.3f}")
+        else:
+            support = self.selector.get_support()
+            self.selected_features = [col for col, keep in zip(self.feature_columns, support) if keep]
+            logger.info(f"Отобрано признаков ({selection.method}): {len(self.selected_features)}")
+        return X_selected
+
+    def transform(self, df: pd.DataFrame, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Применяет обученные преобразования без переобучения.
+
+        Args:
+            df: DataFrame с исходными признаками (не изменяется)
+            rows: Позиции строк (по умолчанию - все строки, без фильтрации)
+
+        Returns:
+            Матрица признаков для модели
+        """
+        X = self._transform_features(df, rows)
+        if self.selector is not None:
+            X = self.selector.transform(X)
+        return X
+
+    def outlier_scores(self, df: pd.DataFrame, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Оценивает строки новых данных сохраненным IsolationForest (без переобучения).
+
+        Пропуски заполняются значениями обучения, как в transform.
+
+        Args:
+            df: DataFrame с исходными признаками (не изменяется)
+            rows: Позиции строк (по умолчанию - все строки)
+
+        Returns:
+            decision_function: отрицательные значения - выбросы
+        """
+        if self.outlier_detector is None:
+            raise ValueError("Многомерный детектор выбросов не обучен (outlier_detection.method: isolation_forest)")
+        if rows is None:
+            rows = np.arange(len(df))
+        block = FeatureBlock.from_frame(df, rows=rows, columns=self.input_columns)
+        block.fill_missing(self.fill_values)
+        return self.outlier_detector.decision_function(block.features)
+
+    def _transform_features(self, df: pd.DataFrame, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Применяет обученные шаги до отбора признаков (матрица feature_columns после масштабирования)."""
+        if not self.fitted:
+            raise ValueError("Пайплайн предобработки не обучен")
+        if rows is None:
+            rows = np.arange(len(df))
+
+        block = FeatureBlock.from_frame(df, reserve=len(self.feature_plan), rows=rows, columns=self.input_columns)
+        block.fill_missing(self.fill_values)
+        block.apply_outlier_transform(self.outlier_state)
+        block.add_features(self.feature_plan)
+        return transform_in_place(self.scaler, block.features)
+
+    def fit_pca_stream(self, chunks: Iterable[pd.DataFrame]) -> "PreprocessingPipeline":
+        """
+        Обучает IncrementalPCA по частям данных (например, DataLoader.iter_chunks).
+
+        Шаги до отбора признаков должны быть обучены (fit). Каждая часть проходит
+        те же преобразования, что и в transform; в памяти не более двух частей.
+        Обученный PCA заменяет текущий отбор признаков и сохраняется вместе с пайплайном.
+
+        Args:
+            chunks: Итератор DataFrame с исходными признаками
+
+        Returns:
+            self
+        """
+        if not self.fitted:
+            raise ValueError("Пайплайн предобработки не обучен")
+        selection = self.settings.feature_selection
+        pca = IncrementalPCA(n_components=min(selection.n_features, len(self.feature_columns)),
+                             batch_size=selection.pca_batch_size)
+        partial_fit_pca(pca, (self._transform_features(chunk) for chunk in chunks))
+
+        self.selector = pca
+        self.selected_features = [f'PC_{i+1}' for i in range(pca.n_components_)]
+        logger.info(f"PCA компонентов: {pca.n_components_}, объясненная дисперсия: "
+                    f"{pca.explained_variance_ratio_.sum():.3f}")
+        return self
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Состояние пайплайна из встроенных типов и объектов scikit-learn.
+
+        Артефакт не ссылается на классы проекта и загружается независимо от пути импорта модуля.
+        """
+        selector = self.selector
+        if isinstance(selector, FastFeatureSelector):
+            selector = selector.get_state()
+        return {
+            "version": self.ARTIFACT_VERSION,
+            "settings": dataclasses.asdict(self.settings),
+            "input_columns": list(self.input_columns),
+            "fill_values": dict(self.fill_values),
+            "outlier_state": self.outlier_state,
+            "outlier_detector": self.outlier_detector,
+            "feature_plan": [list(spec) for spec in self.feature_plan],
+            "feature_columns": list(self.feature_columns),
+            "scaler": self.scaler,
+            "selector": selector,
+            "selected_features": list(self.selected_features),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "PreprocessingPipeline":
+        """Восстанавливает обученный пайплайн из get_state."""
+        if not isinstance(state, dict) or state.get("version") != cls.ARTIFACT_VERSION:
+            version = state.get("version") if isinstance(state, dict) else None
+            raise ValueError(f"Неподдерживаемый формат пайплайна предобработки: версия {version} "
+                             f"(ожидается {cls.ARTIFACT_VERSION}), требуется повторное обучение пайплайна (fit)")
+        missing = [key for key in cls.STATE_KEYS if key not in state]
+        if missing:
+            raise ValueError(f"Артефакт пайплайна предобработки неполон (нет {', '.join(missing)}), "
+                             f"требуется повторное обучение пайплайна (fit)")
+
+        settings = compile_settings({"preprocessing": state["settings"]}).preprocessing
+        pipeline = cls(settings, scaler=state["scaler"])
+        pipeline.input_columns = list(state["input_columns"])
+        pipeline.fill_values = dict(state["fill_values"])
+        pipeline.outlier_state = state["outlier_state"]
+        pipeline.outlier_detector = state["outlier_detector"]
+        pipeline.feature_plan = [(name, expression) for name, expression in state["feature_plan"]]
+        pipeline.feature_columns = list(state["feature_columns"])
+        pipeline.selector = state["selector"]
+        if isinstance(pipeline.selector, dict):
+            pipeline.selector = FastFeatureSelector.from_state(pipeline.selector)
+        pipeline.selected_features = list(state["selected_features"])
+        pipeline.fitted = True
+        return pipeline
+
+    def save(self, file_path: str, compression: Optional[str] = "lz4", level: int = 3) -> str:
+        """
+        Сохраняет обученный пайплайн одним артефактом.
+
+        Args:
+            file_path: Путь к файлу
+            compression: Метод сжатия (см. model_serializer)
+            level: Уровень сжатия
+
+        Returns:
+            SHA-256 сохраненного файла
+        """
+        if not self.fitted:
+            raise ValueError("Пайплайн предобработки не обучен")
+        digest = save_model_file(self.get_state(), file_path, compression=compression, level=level)
+        logger.info(f"Пайплайн предобработки сохранен: {file_path}")
+        return digest
+
+    @classmethod
+    def load(cls, file_path: str) -> "PreprocessingPipeline":
+        """
+        Загружает сохраненный пайплайн (с проверкой контрольной суммы).
+
+        Обученные скейлер и отбор признаков могут быть общими (кэш model_serializer):
+        transform их не изменяет.
+
+        Args:
+            file_path: Путь к файлу
+
+        Returns:
+            PreprocessingPipeline
+        """
+        return cls.from_state(load_model_file(file_path))
@@ -0,0 +1,275 @@
+"""
+Модуль инкрементального архивирования результатов.
+
+Файлы читаются и хэшируются в пуле потоков, а сжимаются последовательно при
+записи в архив: у zipfile нет публичного API для записи заранее сжатого
+deflate-потока, поэтому сжатие идет в потоке записи, пока пул готовит
+следующие файлы. Уже сжатые форматы (PNG, joblib, npz и т.п.) сохраняются
+без deflate, файлы контрольных сумм (.sha256) в архив не попадают.
+Манифест архивов хранит размер, время изменения и SHA-256 каждого
+заархивированного файла, поэтому инкрементальный архив содержит только новые
+и изменившиеся файлы, а файлы с тем же содержимым повторно не сжимаются.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import os
+import sys
+import time
+import hashlib
+import logging
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger, ensure_dir
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+    def ensure_dir(path: str) -> None:
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+try:
+    from .json_serializer import dumps as json_dumps, loads as json_loads
+except ImportError:
+    from json_serializer import dumps as json_dumps, loads as json_loads
+
+try:
+    from .atomic_io import write_bytes_atomic, write_checksum, fsync_file, sync_parent_directory
+except ImportError:
+    from atomic_io import write_bytes_atomic, write_checksum, fsync_file, sync_parent_directory
+
+
+logger = get_logger(__name__)
+
+# Форматы, которые уже сжаты: повторный deflate только тратит CPU
+DEFAULT_STORED_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.joblib', '.pkl.z',
+                             '.gz', '.bz2', '.xz', '.zst', '.lz4', '.npz', '.parquet')
+
+EXCLUDE_EXTENSIONS = ('.zip', '.sha256', '.tar.gz', '.tar', '.tmp')
+EXCLUDE_FILES = ('__pycache__', '.DS_Store')
+EXCLUDE_PREFIXES = ('temp_',)
+EXCLUDE_DIRS = ('__pycache__', '.git', '.artifact_store')
+
+
+class ResultsArchiver:
+    """Создает полные и инкрементальные zip-архивы директории результатов."""
+
+    def __init__(self, manifest_path: str = "results/archive_manifest.json", max_workers: int = 4,
+                 compresslevel: int = 6, max_file_size: int = 100 * 1024 * 1024,
+                 stored_extensions: Iterable[str] = DEFAULT_STORED_EXTENSIONS):
+        """
+        Инициализация архиватора.
+
+        Args:
+            manifest_path: Путь к манифесту архивов
+            max_workers: Количество потоков для чтения и хэширования файлов
+            compresslevel: Уровень сжатия deflate (1-9)
+            max_file_size: Максимальный размер файла для включения в архив
+            stored_extensions: Расширения файлов, сохраняемых без сжатия
+        """
+        self.manifest_path = manifest_path
+        self.max_workers = max(1, int(max_workers))
+        self.compresslevel = compresslevel
+        self.max_file_size = max_file_size
+        self.stored_extensions = tuple(ext.lower() for ext in stored_extensions)
+
+    @classmethod
+    def from_config(cls, archive_config: Dict[str, Any]) -> "ResultsArchiver":
+        """Создает архиватор из секции storage.archive конфигурации."""
+        return cls(
+            manifest_path=archive_config.get("manifest_path", "results/archive_manifest.json"),
+            max_workers=archive_config.get("max_workers", 4),
+            compresslevel=archive_config.get("compresslevel", 6),
+            max_file_size=archive_config.get("max_file_size_mb", 100) * 1024 * 1024,
+            stored_extensions=archive_config.get("stored_extensions", DEFAULT_STORED_EXTENSIONS)
+        )
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """Загружает манифест архивов (пустой, если манифеста еще нет)."""
+        if not os.path.exists(self.manifest_path):
+            return {"files": {}, "archives": []}
+        try:
+            with open(self.manifest_path, 'rb') as f:
+                manifest = json_loads(f.read())
+            manifest.setdefault("files", {})
+            manifest.setdefault("archives", [])
+            return manifest
+        except (OSError, ValueError) as e:
+            logger.warning(f"Манифест архивов поврежден, будет создан новый: {e}")
+            return {"files": {}, "archives": []}
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Атомарно сохраняет манифест."""
+        write_bytes_atomic(self.manifest_path, json_dumps(manifest), checksum=False)
+
+    def collect_files(self, results_dir: str) -> List[str]:
+        """Возвращает файлы директории результатов с учетом правил исключения."""
+        manifest_abspath = os.path.abspath(self.manifest_path)
+        collected = []
+
+        for root, dirs, files in os.walk(results_dir):
+            dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+            for file in sorted(files):
+                if file.endswith(EXCLUDE_EXTENSIONS) or file.startswith(EXCLUDE_PREFIXES):
+                    continue
+                if any(name in file for name in EXCLUDE_FILES):
+                    continue
+                file_path = os.path.join(root, file)
+                if os.path.abspath(file_path) == manifest_abspath:
+                    continue
+                collected.append(file_path)
+
+        return collected
+
+    def _is_stored(self, file_path: str) -> bool:
+        """Проверяет, нужно ли сохранять файл без сжатия."""
+        return file_path.lower().endswith(self.stored_extensions)
+
+    def _prepare_member(self, file_path: str, arcname: str, stat: os.stat_result,
+                        previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Читает и хэширует один файл (выполняется в пуле потоков).
+
+        Returns:
+            Словарь с подготовленными данными или признаком пропуска
+        """
+        with open(file_path, 'rb') as f:
+            data = f.read()
+
+        sha256 = hashlib.sha256(data).hexdigest()
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+
+        # Содержимое не изменилось - только обновляем метаданные в манифесте
+        if previous is not None and previous.get("sha256") == sha256:
+            return {"arcname": arcname, "entry": entry, "skip": True}
+
+        return {
+            "arcname": arcname,
+            "entry": entry,
+            "skip": False,
+            "mtime": stat.st_mtime,
+            "compress_type": zipfile.ZIP_STORED if self._is_stored(file_path) else zipfile.ZIP_DEFLATED,
+            "data": data
+        }
+
+    def _write_member(self, zipf: zipfile.ZipFile, member: Dict[str, Any]) -> None:
+        """Записывает подготовленный файл в архив с методом сжатия этого файла."""
+        date_time = time.localtime(member["mtime"])[:6]
+        if date_time[0] < 1980:
+            date_time = (1980, 1, 1, 0, 0, 0)
+
+        zinfo = zipfile.ZipInfo(member["arcname"], date_time=date_time)
+        zinfo.external_attr = 0o644 << 16
+        # Заголовки zip64 zipfile добавляет сам по размеру данных
+        zipf.writestr(zinfo, member["data"], compress_type=member["compress_type"],
+                      compresslevel=self.compresslevel)
+
+    def create_archive(self, results_dir: str = "results", archive_path: Optional[str] = None,
+                       incremental: bool = True) -> Optional[str]:
+        """
+        Создает архив результатов.
+
+        Args:
+            results_dir: Директория с результатами
+            archive_path: Путь к архиву (если не указан, генерируется автоматически)
+            incremental: Включать только файлы, изменившиеся с последнего архива
+
+        Returns:
+            Путь к архиву или None, если архивировать нечего
+        """
+        if archive_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            suffix = "_incremental" if incremental else ""
+            archive_path = os.path.join(results_dir, f"ml_pipeline_results_{timestamp}{suffix}.zip")
+
+        manifest = self.load_manifest()
+        known_files = manifest["files"] if incremental else {}
+        base_dir = os.path.dirname(os.path.normpath(results_dir))
+
+        candidates = []
+        for file_path in self.collect_files(results_dir):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            if stat.st_size > self.max_file_size:
+                logger.warning(f"Файл {file_path} слишком большой ({stat.st_size} bytes), пропускаем")
+                continue
+
+            arcname = os.path.relpath(file_path, base_dir).replace(os.sep, "/")
+            previous = known_files.get(arcname)
+            # Быстрый путь: размер и время изменения совпадают с манифестом
+            if previous is not None and previous.get("size") == stat.st_size \
+                    and previous.get("mtime_ns") == stat.st_mtime_ns:
+                continue
+            candidates.append((file_path, arcname, stat, previous))
+
+        if not candidates:
+            logger.info("Изменившихся файлов нет, архив не создается")
+            return None
+
+        ensure_dir(os.path.dirname(archive_path) or ".")
+        logger.info(f"Начинаем создание архива: {archive_path} (кандидатов: {len(candidates)})")
+
+        files_added = 0
+        temp_archive_path = f"{archive_path}.tmp"
+        try:
+            with zipfile.ZipFile(temp_archive_path, 'w', allowZip64=True) as zipf, \
+                    ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Ограничиваем число одновременно подготовленных файлов, чтобы не держать все в памяти
+                pending = deque()
+                queue = iter(candidates)
+                for candidate in queue:
+                    pending.append(executor.submit(self._prepare_member, *candidate))
+                    if len(pending) >= self.max_workers * 2:
+                        break
+
+                while pending:
+                    member = pending.popleft().result()
+                    next_candidate = next(queue, None)
+                    if next_candidate is not None:
+                        pending.append(executor.submit(self._prepare_member, *next_candidate))
+
+                    archive_name = None
+                    if not member["skip"]:
+                        self._write_member(zipf, member)
+                        files_added += 1
+                        archive_name = os.path.basename(archive_path)
+                    member["entry"]["archive"] = archive_name or \
+                        (manifest["files"].get(member["arcname"]) or {}).get("archive")
+                    manifest["files"][member["arcname"]] = member["entry"]
+
+            if files_added == 0:
+                os.remove(temp_archive_path)
+                self._save_manifest(manifest)
+                logger.info("Содержимое файлов не изменилось, архив не создается")
+                return None
+
+            fsync_file(temp_archive_path)
+            os.replace(temp_archive_path, archive_path)
+            sync_parent_directory(archive_path)
+            write_checksum(archive_path)
+        except Exception:
+            if os.path.exists(temp_archive_path):
+                os.remove(temp_archive_path)
+            raise
+
+        manifest["archives"].append({
+            "archive": os.path.basename(archive_path),
+            "created_at": datetime.now().isoformat(),
+            "incremental": incremental,
+            "files": files_added
+        })
+        self._save_manifest(manifest)
+
+        logger.info(f"Архив результатов создан: {archive_path} (всего файлов: {files_added})")
+        return archive_path
@@ -0,0 +1,324 @@
+"""
+Модуль бинарного формата результатов запуска пайплайна.
+
+Файл состоит из сигнатуры, версии формата, JSON-заголовка с версией схемы
+и оглавлением разделов (смещение, длина, кодек, сжатие) и независимых
+разделов верхнего уровня словаря результатов. Читатель загружает только
+нужные разделы, не разбирая весь файл.
+
+Значения кодируются с сохранением типов: кортежи, множества, массивы и
+скаляры numpy, dtype, datetime, DataFrame/Series восстанавливаются при
+чтении. Основной кодек - msgpack (если установлен), запасной - JSON с
+тегами типов.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import io
+import os
+import sys
+import json
+import zlib
+import base64
+import struct
+import logging
+from datetime import datetime, date
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    from .atomic_io import write_bytes_atomic, verify_checksum
+except ImportError:
+    from atomic_io import write_bytes_atomic, verify_checksum
+
+
+logger = get_logger(__name__)
+
+MAGIC = b"MLRR"
+FORMAT_VERSION = 1
+# Версия схемы содержимого; увеличивается при несовместимых изменениях структуры
+SCHEMA_VERSION = 1
+FILE_EXTENSION = ".mlrr"
+
+# Сигнатура, версия формата (uint16) и длина заголовка (uint32), little-endian
+PREAMBLE = struct.Struct("<4sHI")
+
+TYPE_TAG = "__t__"
+
+# Разделы меньше этого размера не сжимаются
+COMPRESSION_MIN_BYTES = 1024
+
+
+def _encode_value(value: Any, binary: bool) -> Any:
+    """Преобразует значение в дерево примитивов с тегами типов."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value) and TYPE_TAG not in value:
+            return {key: _encode_value(item, binary) for key, item in value.items()}
+        return {TYPE_TAG: "dict",
+                "items": [[_encode_value(key, binary), _encode_value(item, binary)] for key, item in value.items()]}
+    if isinstance(value, list):
+        return [_encode_value(item, binary) for item in value]
+    if isinstance(value, tuple):
+        return {TYPE_TAG: "tuple", "v": [_encode_value(item, binary) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {TYPE_TAG: "set", "v": [_encode_value(item, binary) for item in value]}
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            return {TYPE_TAG: "ndarray_obj", "shape": list(value.shape),
+                    "v": [_encode_value(item, binary) for item in value.ravel().tolist()]}
+        data = np.ascontiguousarray(value).tobytes()
+        return {TYPE_TAG: "ndarray", "dtype": value.dtype.str, "shape": list(value.shape),
+                "data": data if binary else base64.b64encode(data).decode("ascii")}
+    if isinstance(value, np.generic):
+        return {TYPE_TAG: "np", "dtype": value.dtype.str, "v": value.item()}
+    if isinstance(value, np.dtype):
+        return {TYPE_TAG: "dtype", "v": value.str}
+    if isinstance(value, pd.Timestamp):
+        return {TYPE_TAG: "timestamp", "v": value.isoformat()}
+    if isinstance(value, datetime):
+        return {TYPE_TAG: "datetime", "v": value.isoformat()}
+    if isinstance(value, date):
+        return {TYPE_TAG: "date", "v": value.isoformat()}
+    if isinstance(value, pd.DataFrame):
+        return {TYPE_TAG: "dataframe",
+                "columns": _encode_value(list(value.columns), binary),
+                "index": _encode_value(value.index.to_numpy(), binary),
+                "data": {str(i): _encode_value(value.iloc[:, i].to_numpy(), binary) for i in range(value.shape[1])}}
+    if isinstance(value, pd.Series):
+        return {TYPE_TAG: "series", "name": _encode_value(value.name, binary),
+                "index": _encode_value(value.index.to_numpy(), binary),
+                "v": _encode_value(value.to_numpy(), binary)}
+    if isinstance(value, bytes):
+        return {TYPE_TAG: "bytes", "v": value if binary else base64.b64encode(value).decode("ascii")}
+    if isinstance(value, Path):
+        return str(value)
+
+    # Неизвестные типы сохраняются строкой, как раньше делал json.dump(default=str)
+    logger.debug(f"Тип {type(value).__name__} сохраняется как строка")
+    return str(value)
+
+
+def _decode_value(value: Any) -> Any:
+    """Восстанавливает значение из дерева примитивов с тегами типов."""
+    if isinstance(value, list):
+        return [_decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    tag = value.get(TYPE_TAG)
+    if tag is None:
+        return {key: _decode_value(item) for key, item in value.items()}
+    if tag == "dict":
+        return {_decode_value(key): _decode_value(item) for key, item in value["items"]}
+    if tag == "tuple":
+        return tuple(_decode_value(item) for item in value["v"])
+    if tag == "set":
+        return set(_decode_value(item) for item in value["v"])
+    if tag == "ndarray":
+        data = value["data"]
+        if isinstance(data, str):
+            data = base64.b64decode(data)
+        return np.frombuffer(data, dtype=np.dtype(value["dtype"])).reshape(value["shape"]).copy()
+    if tag == "ndarray_obj":
+        array = np.empty(len(value["v"]), dtype=object)
+        array[:] = [_decode_value(item) for item in value["v"]]
+        return array.reshape(value["shape"])
+    if tag == "np":
+        return np.dtype(value["dtype"]).type(value["v"])
+    if tag == "dtype":
+        return np.dtype(value["v"])
+    if tag == "timestamp":
+        return pd.Timestamp(value["v"])
+    if tag == "datetime":
+        return datetime.fromisoformat(value["v"])
+    if tag == "date":
+        return date.fromisoformat(value["v"])
+    if tag == "dataframe":
+        columns = _decode_value(value["columns"])
+        data = {i: _decode_value(value["data"][str(i)]) for i in range(len(columns))}
+        frame = pd.DataFrame(data, index=_decode_value(value["index"]))
+        frame.columns = columns
+        return frame
+    if tag == "series":
+        return pd.Series(_decode_value(value["v"]), index=_decode_value(value["index"]),
+                         name=_decode_value(value["name"]))
+    if tag == "bytes":
+        data = value["v"]
+        return base64.b64decode(data) if isinstance(data, str) else bytes(data)
+    raise ValueError(f"Неизвестный тег типа в результатах запуска: {tag}")
+
+
+def _serialize(value: Any, codec: str) -> bytes:
+    """Сериализует значение выбранным кодеком."""
+    if codec == "msgpack":
+        return msgpack.packb(_encode_value(value, binary=True), use_bin_type=True)
+    if codec == "json":
+        return json.dumps(_encode_value(value, binary=False), ensure_ascii=False,
+                          separators=(",", ":")).encode("utf-8")
+    raise ValueError(f"Неподдерживаемый кодек: {codec}")
+
+
+def _deserialize(payload: bytes, codec: str) -> Any:
+    """Десериализует значение выбранным кодеком."""
+    if codec == "msgpack":
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("Раздел записан в msgpack, но пакет msgpack не установлен")
+        return _decode_value(msgpack.unpackb(payload, raw=False, strict_map_key=False))
+    if codec == "json":
+        return _decode_value(json.loads(payload.decode("utf-8")))
+    raise ValueError(f"Неподдерживаемый кодек: {codec}")
+
+
+def encode_run_results(results: Dict[str, Any], codec: Optional[str] = None, compress: bool = True,
+                       schema_version: int = SCHEMA_VERSION) -> bytes:
+    """
+    Кодирует словарь результатов в бинарный формат.
+
+    Args:
+        results: Словарь результатов (каждый ключ верхнего уровня - отдельный раздел)
+        codec: Кодек разделов (msgpack или json; по умолчанию msgpack, если установлен)
+        compress: Сжимать ли разделы zlib
+        schema_version: Версия схемы содержимого
+
+    Returns:
+        Байты файла
+    """
+    if not isinstance(results, dict):
+        raise ValueError("Результаты запуска должны быть словарем")
+    codec = codec or ("msgpack" if MSGPACK_AVAILABLE else "json")
+
+    sections = {}
+    body = io.BytesIO()
+    for name, value in results.items():
+        payload = _serialize(value, codec)
+        compression = None
+        if compress and len(payload) >= COMPRESSION_MIN_BYTES:
+            payload = zlib.compress(payload, 6)
+            compression = "zlib"
+        sections[str(name)] = {"offset": body.tell(), "length": len(payload),
+                               "codec": codec, "compression": compression}
+        body.write(payload)
+
+    header = json.dumps({
+        "schema_version": schema_version,
+        "created_at": datetime.now().isoformat(),
+        "sections": sections
+    }, ensure_ascii=False).encode("utf-8")
+
+    return PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)) + header + body.getvalue()
+
+
+class RunResultsReader:
+    """Читатель бинарного формата с загрузкой отдельных разделов."""
+
+    def __init__(self, file_path: str):
+        """
+        Открывает файл и читает только заголовок.
+
+        Args:
+            file_path: Путь к файлу результатов
+        """
+        self.file_path = file_path
+        with open(file_path, "rb") as f:
+            preamble = f.read(PREAMBLE.size)
+            if len(preamble) < PREAMBLE.size:
+                raise ValueError(f"Файл {file_path} не является файлом результатов запуска")
+            magic, format_version, header_length = PREAMBLE.unpack(preamble)
+            if magic != MAGIC:
+                raise ValueError(f"Файл {file_path} не является файлом результатов запуска")
+            if format_version > FORMAT_VERSION:
+                raise ValueError(f"Версия формата {format_version} не поддерживается (максимум {FORMAT_VERSION})")
+            self.header = json.loads(f.read(header_length).decode("utf-8"))
+
+        self.format_version = format_version
+        self.schema_version = self.header.get("schema_version")
+        self.created_at = self.header.get("created_at")
+        self._body_offset = PREAMBLE.size + header_length
+
+    @property
+    def sections(self) -> List[str]:
+        """Имена разделов в порядке записи."""
+        return list(self.header["sections"])
+
+    def read_section(self, name: str) -> Any:
+        """
+        Загружает один раздел.
+
+        Args:
+            name: Имя раздела
+
+        Returns:
+            Значение раздела с восстановленными типами
+        """
+        if name not in self.header["sections"]:
+            raise KeyError(f"Раздел {name} отсутствует в {self.file_path}")
+        meta = self.header["sections"][name]
+
+        with open(self.file_path, "rb") as f:
+            f.seek(self._body_offset + meta["offset"])
+            payload = f.read(meta["length"])
+
+        if meta.get("compression") == "zlib":
+            payload = zlib.decompress(payload)
+        return _deserialize(payload, meta["codec"])
+
+    def read(self, sections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Загружает несколько разделов (по умолчанию все).
+
+        Args:
+            sections: Имена разделов; отсутствующие в файле пропускаются
+
+        Returns:
+            Словарь {раздел: значение}
+        """
+        names = self.sections if sections is None else [name for name in sections if name in self.header["sections"]]
+        return {name: self.read_section(name) for name in names}
+
+
+def save_run_results(results: Dict[str, Any], file_path: str, codec: Optional[str] = None,
+                     compress: bool = True) -> str:
+    """Атомарно сохраняет результаты запуска в бинарный файл с контрольной суммой."""
+    write_bytes_atomic(file_path, encode_run_results(results, codec=codec, compress=compress))
+    return file_path
+
+
+def load_run_results(file_path: str, sections: Optional[Union[str, Iterable[str]]] = None,
+                     verify: bool = True) -> Any:
+    """
+    Загружает результаты запуска из бинарного файла.
+
+    Args:
+        file_path: Путь к файлу
+        sections: Имя раздела, список разделов или None для всех
+        verify: Проверять ли контрольную сумму файла перед чтением
+
+    Returns:
+        Значение раздела (если передано одно имя) или словарь разделов
+    """
+    if verify and os.path.exists(file_path) and not verify_checksum(file_path):
+        raise ValueError(f"Файл результатов поврежден: {file_path}")
+    reader = RunResultsReader(file_path)
+    if isinstance(sections, str):
+        return reader.read_section(sections)
+    return reader.read(sections)
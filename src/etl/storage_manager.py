@@ -19,547 +19,718 @@ import tempfile
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-from config.config_utils import Config, get_logger, ensure_dir
+    from config.config_utils import Config, get_config, get_logger, ensure_dir
 except ImportError:
-def get_logger(name: str):
-logging.basicConfig(level=logging.INFO)
-return logging.getLogger(name)
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
 
 # Опциональные импорты для облачных хранилищ
 try:
-from google.cloud import storage as gcs
-GCS_AVAILABLE = True
+    from google.cloud import storage as gcs
+    GCS_AVAILABLE = True
 except ImportError:
-GCS_AVAILABLE = False
+    GCS_AVAILABLE = False
 
 try:
-import boto3
-from botocore.exceptions import NoCredentialsError, ClientError
-AWS_AVAILABLE = True
+    import boto3
+    from botocore.exceptions import NoCredentialsError, ClientError
+    AWS_AVAILABLE = True
 except ImportError:
-AWS_AVAILABLE = False
+    AWS_AVAILABLE = False
 
 # Опциональные импорты для баз данных
 try:
-import psycopg2
-import pandas as pd
-DB_AVAILABLE = True
+    import psycopg2
+    import pandas as pd
+    DB_AVAILABLE = True
 except ImportError:
-try:
-import pandas as pd
-DB_AVAILABLE = True
-except ImportError:
-DB_AVAILABLE = False
+    try:
+        import pandas as pd
+        DB_AVAILABLE = True
+    except ImportError:
+        DB_AVAILABLE = False
 
 try:
-import sqlalchemy
-from sqlalchemy import create_engine, text
-SQLALCHEMY_AVAILABLE = True
+    import sqlalchemy
+    from sqlalchemy import create_engine, text
+    SQLALCHEMY_AVAILABLE = True
 except ImportError:
-SQLALCHEMY_AVAILABLE = False
-
-
-logger = get_logger(__name__)
-
-
-class StorageManager:
-"""Класс для управления сохранением результатов в различные хранилища."""
-
-def __init__(self, config: Optional[Config] = None):
-"""
-Инициализация менеджера хранилища.
-
-Args:
-config: Объект конфигурации
-"""
-self.config = config or Config()
-self.storage_config = self.config.get_storage_config()
-
-# Инициализация клиентов облачных хранилищ
-self.gcs_client = None
-self.s3_client = None
-self.db_engine = None
-self.db_connection = None
-
-self._init_cloud_clients()
-self._init_database_connection()
+    SQLALCHEMY_AVAILABLE = False
 
-def _init_database_connection(self):
-"""Инициализирует подключение к базе данных."""
-if not SQLALCHEMY_AVAILABLE:
-logger.info("SQLAlchemy не установлен, база данных недоступна")
-return
-
-try:
-db_config = self.storage_config.get("database", {})
-db_type = db_config.get("type", "sqlite")
-
-if db_type == "sqlite":
-db_path = db_config.get("path", "ml_pipeline.db")
-connection_string = f"sqlite:///{db_path}"
-
-elif db_type == "postgresql":
-host = db_config.get("host", "localhost")
-port = db_config.get("port", 5432)
-database = db_config.get("database", "ml_pipeline")
-username = os.getenv("DB_USERNAME", db_config.get("username"))
-password = os.getenv("DB_PASSWORD", db_config.get("password"))
-
-if username and password:
-connection_string = f"postgresql://{username}:{password}@{host}:{port}/{database}"
-else:
-logger.warning("Не указаны credentials для PostgreSQL")
-return
-
-elif db_type == "mysql":
-host = db_config.get("host", "localhost")
-port = db_config.get("port", 3306)
-database = db_config.get("database", "ml_pipeline")
-username = os.getenv("DB_USERNAME", db_config.get("username"))
-password = os.getenv("DB_PASSWORD", db_config.get("password"))
-
-if username and password:
-connection_string = f"mysql+pymysql://{username}:{password}@{host}:{port}/{database}"
-else:
-logger.warning("Не указаны credentials для MySQL")
-return
-else:
-logger.warning(f"Неподдерживаемый тип базы данных: {db_type}")
-return
-
-self.db_engine = create_engine(connection_string, echo=False)
-logger.info(f"База данных инициализирована: {db_type}")
-
-except Exception as e:
-logger.warning(f"Ошибка инициализации базы данных: {str(e)}")
-
-def _init_cloud_clients(self):
-"""Инициализирует клиенты облачных хранилищ."""
-logger.info("Начинаем инициализацию облачных клиентов...")
-
-# Google Cloud Storage
-if GCS_AVAILABLE:
-try:
-logger.info("Инициализируем GCS клиент...")
-credentials_path = self.storage_config.get("gcs", {}).get("credentials_path")
-if credentials_path and os.path.exists(credentials_path):
-os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
-self.gcs_client = gcs.Client()
-logger.info("Google Cloud Storage клиент инициализирован")
-elif os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
-self.gcs_client = gcs.Client()
-logger.info("Google Cloud Storage клиент инициализирован через переменную окружения")
-else:
-logger.info("GCS credentials не найдены, пропускаем инициализацию")
-except Exception as e:
-logger.warning(f"Ошибка инициализации GCS клиента: {str(e)}")
-
-# AWS S3 - отключаем для избежания зависания
-logger.info("Проверяем AWS S3...")
-if AWS_AVAILABLE:
-try:
-aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
-aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-aws_region = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
-
-if aws_access_key and aws_secret_key:
-logger.info("AWS credentials найдены, но S3 клиент отключен для стабильности Airflow")
-# Закомментировано для избежания зависания:
-# self.s3_client = boto3.client('s3', region_name=aws_region)
-# logger.info("AWS S3 клиент инициализирован")
-else:
-logger.info("AWS credentials не найдены")
-except Exception as e:
-logger.warning(f"Ошибка инициализации S3 клиента: {str(e)}")
-
-logger.info("Инициализация облачных клиентов завершена")
-
-def save_to_local(self, data: Any, file_path: str, data_type: str = "json") -> bool:
-"""
-Сохраняет данные в локальное хранилище.
-
-Args:
-data: Данные для сохранения
-file_path: Путь к файлу
-data_type: Тип данных (json, text, binary)
-
-Returns:
-True если успешно, False в противном случае
-"""
 try:
-ensure_dir(os.path.dirname(file_path))
-
-if data_type == "json":
-with open(file_path, 'w', encoding='utf-8') as f:
-json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-elif data_type == "text":
-with open(file_path, 'w', encoding='utf-8') as f:
-f.write(str(data))
-elif data_type == "binary":
-with open(file_path, 'wb') as f:
-f.write(data)
-else:
-logger.error(f"Неподдерживаемый тип данных: {data_type}")
-return False
-
-logger.info(f"Данные сохранены локально: {file_path}")
-return True
-
-except Exception as e:
-logger.error(f"Ошибка сохранения в локальное хранилище: {str(e)}")
-return False
-
-def copy_file_to_local(self, source_path: str, destination_path: str) -> bool:
-"""
-Копирует файл в локальное хранилище.
-
-Args:
-source_path: Исходный путь к файлу
-destination_path: Путь назначения
+    from .metrics_store import MetricsStore, extract_metrics
+except ImportError:
+    from metrics_store import MetricsStore, extract_metrics
 
-Returns:
-True если успешно, False в противном случае
-"""
 try:
-ensure_dir(os.path.dirname(destination_path))
-shutil.copy2(source_path, destination_path)
-logger.info(f"Файл скопирован: {source_path} -> {destination_path}")
-return True
-except Exception as e:
-logger.error(f"Ошибка копирования файла: {str(e)}")
-return False
-
-def upload_to_gcs(self, local_file_path: str, gcs_blob_name: str, 
-bucket_name: Optional[str] = None) -> bool:
-"""
-Загружает файл в Google Cloud Storage.
-
-Args:
-local_file_path: Путь к локальному файлу
-gcs_blob_name: Имя объекта в GCS
-bucket_name: Имя bucket (если не указано, берется из конфигурации)
-
-Returns:
-True если успешно, False в противном случае
-"""
-if not self.gcs_client:
-logger.error("GCS клиент не инициализирован")
-return False
-
-if bucket_name is None:
-bucket_name = self.storage_config.get("gcs", {}).get("bucket_name")
-
-if not bucket_name:
-logger.error("Не указано имя bucket для GCS")
-return False
+    from .results_archiver import ResultsArchiver
+except ImportError:
+    from results_archiver import ResultsArchiver
 
 try:
-bucket = self.gcs_client.bucket(bucket_name)
-blob = bucket.blob(gcs_blob_name)
-
-blob.upload_from_filename(local_file_path)
-logger.info(f"Файл загружен в GCS: {local_file_path} -> gs://{bucket_name}/{gcs_blob_name}")
-return True
-
-except Exception as e:
-logger.error(f"Ошибка загрузки в GCS: {str(e)}")
-return False
-
-def upload_to_s3(self, local_file_path: str, s3_key: str, 
-bucket_name: Optional[str] = None) -> bool:
-"""
-Загружает файл в AWS S3.
-
-Args:
-local_file_path: Путь к локальному файлу
-s3_key: Ключ объекта в S3
-bucket_name: Имя bucket (если не указано, берется из переменной окружения)
-
-Returns:
-True если успешно, False в противном случае
-"""
-if not self.s3_client:
-logger.error("S3 клиент не инициализирован")
-return False
-
-if bucket_name is None:
-bucket_name = os.getenv("AWS_BUCKET_NAME")
-
-if not bucket_name:
-logger.error("Не указано имя bucket для S3")
-return False
+    from .artifact_store import ArtifactStore
+except ImportError:
+    from artifact_store import ArtifactStore
 
 try:
-self.s3_client.upload_file(local_file_path, bucket_name, s3_key)
-logger.info(f"Файл загружен в S3: {local_file_path} -> s3://{bucket_name}/{s3_key}")
-return True
-
-except Exception as e:
-logger.error(f"Ошибка загрузки в S3: {str(e)}")
-return False
-
-def create_results_archive(self, results_dir: str = "results", 
-archive_path: str = None) -> Optional[str]:
-"""
-Создает архив с результатами работы пайплайна.
-
-Args:
-results_dir: Директория с результатами
-archive_path: Путь к архиву (если не указан, генерируется автоматически)
-
-Returns:
-Путь к созданному архиву или None при ошибке
-"""
-if archive_path is None:
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-archive_path = f"results/ml_pipeline_results_{timestamp}.zip"
+    from .run_results import encode_run_results, FILE_EXTENSION as RUN_RESULTS_EXTENSION
+except ImportError:
+    from run_results import encode_run_results, FILE_EXTENSION as RUN_RESULTS_EXTENSION
 
 try:
-ensure_dir(os.path.dirname(archive_path))
-
-logger.info(f"Начинаем создание архива: {archive_path}")
-
-# Список файлов и папок для исключения
-exclude_extensions = ['.zip', '.tar.gz', '.tar', '.tmp']
-exclude_files = ['__pycache__', '.DS_Store']
-exclude_prefixes = ['temp_']
-
-# Максимальный размер файла для включения в архив (100MB)
-max_file_size = 100 * 1024 * 1024
-files_added = 0
-
-with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zipf:
-for root, dirs, files in os.walk(results_dir):
-# Исключаем папки __pycache__
-dirs[:] = [d for d in dirs if d not in ['__pycache__', '.git']]
-
-for file in files:
-file_path = os.path.join(root, file)
+    from .artifact_index import ArtifactIndex, open_artifact_index, register_result_file
+except ImportError:
+    from artifact_index import ArtifactIndex, open_artifact_index, register_result_file
 
-# Проверяем размер файла
 try:
-file_size = os.path.getsize(file_path)
-if file_size > max_file_size:
-logger.warning(f"Файл {file_path} слишком большой ({file_size} bytes), пропускаем")
-continue
-except OSError:
-continue
-
-# Проверяем файлы для исключения
-should_exclude = False
-
-# Проверяем расширения
-for ext in exclude_extensions:
-if file.endswith(ext):
-should_exclude = True
-break
-
-# Проверяем имена файлов
-if not should_exclude:
-for exclude_name in exclude_files:
-if exclude_name in file:
-should_exclude = True
-break
-
-# Проверяем префиксы
-if not should_exclude:
-for prefix in exclude_prefixes:
-if file.startswith(prefix):
-should_exclude = True
-break
-
-if should_exclude:
-continue
+    from .upload_manager import UploadManager, GCSBackend, S3Backend, LocalFSBackend
+except ImportError:
+    from upload_manager import UploadManager, GCSBackend, S3Backend, LocalFSBackend
 
 try:
-arcname = os.path.relpath(file_path, os.path.dirname(results_dir))
-zipf.write(file_path, arcname)
-files_added += 1
-
-# Логируем прогресс каждые 10 файлов
-if files_added % 10 == 0:
-logger.info(f"Добавлено файлов в архив: {files_added}")
-except Exception as e:
-logger.warning(f"Не удалось добавить файл {file_path} в архив: {e}")
-continue
-
-logger.info(f"Архив результатов создан: {archive_path} (всего файлов: {files_added})")
-return archive_path
-
-except Exception as e:
-logger.error(f"Ошибка создания архива: {str(e)}")
-return None
-
-def save_pipeline_results(self, results: Dict[str, Any], 
-model_path: Optional[str] = None,
-metrics_path: Optional[str] = None,
-upload_to_cloud: bool = False) -> Dict[str, bool]:
-"""
-Сохраняет все результаты пайплайна.
-
-Args:
-results: Словарь с результатами
-model_path: Путь к модели (должен быть строкой)
-metrics_path: Путь к метрикам (должен быть строкой)
-upload_to_cloud: Загружать ли в облачное хранилище
-
-Returns:
-Словарь с результатами операций сохранения
-
-Raises:
-TypeError: Если model_path или metrics_path не являются строками
-"""
-logger.info("Начало сохранения результатов пайплайна")
-
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-save_results = {
-"local_save": False,
-"gcs_upload": False,
-"s3_upload": False,
-"archive_created": False
-}
-
-# Сохраняем результаты локально
-local_results_path = f"results/pipeline_results_{timestamp}.json"
-save_results["local_save"] = self.save_to_local(results, local_results_path)
-
-# Копируем важные файлы в итоговую директорию
-files_to_save = []
-
-# Проверяем, что model_path является строкой перед использованием
-if model_path and isinstance(model_path, str) and os.path.exists(model_path):
-dest_model_path = f"results/final_model_{timestamp}.joblib"
-if self.copy_file_to_local(model_path, dest_model_path):
-files_to_save.append(dest_model_path)
-elif model_path and not isinstance(model_path, str):
-logger.warning(f"model_path должен быть строкой, получен: {type(model_path)} - {model_path}")
-
-# Проверяем, что metrics_path является строкой перед использованием
-if metrics_path and isinstance(metrics_path, str) and os.path.exists(metrics_path):
-dest_metrics_path = f"results/final_metrics_{timestamp}.json"
-if self.copy_file_to_local(metrics_path, dest_metrics_path):
-files_to_save.append(dest_metrics_path)
-elif metrics_path and not isinstance(metrics_path, str):
-logger.warning(f"metrics_path должен быть строкой, получен: {type(metrics_path)} - {metrics_path}")
-
-# Создаем архив с результатами
-archive_path = self.create_results_archive()
-if archive_path:
-save_results["archive_created"] = True
-files_to_save.append(archive_path)
-
-# Загружаем в облачные хранилища (если требуется)
-if upload_to_cloud:
-for file_path in files_to_save:
-if not os.path.exists(file_path):
-continue
-
-file_name = os.path.basename(file_path)
-cloud_path = f"ml-pipeline/{timestamp}/{file_name}"
-
-# Загружаем в GCS
-if self.gcs_client:
-gcs_success = self.upload_to_gcs(file_path, cloud_path)
-save_results["gcs_upload"] = save_results.get("gcs_upload", False) or gcs_success
-
-# Загружаем в S3
-if self.s3_client:
-s3_success = self.upload_to_s3(file_path, cloud_path)
-save_results["s3_upload"] = save_results.get("s3_upload", False) or s3_success
-
-# Сохраняем сводку операций
-summary = {
-"timestamp": timestamp,
-"files_saved": files_to_save,
-"save_operations": save_results,
-"local_results_path": local_results_path if save_results["local_save"] else None,
-"archive_path": archive_path if save_results["archive_created"] else None
-}
-
-summary_path = f"results/save_summary_{timestamp}.json"
-self.save_to_local(summary, summary_path)
-
-logger.info("Сохранение результатов пайплайна завершено")
-logger.info(f"Результаты операций: {save_results}")
-
-return save_results
-
-def cleanup_old_results(self, results_dir: str = "results", 
-max_age_days: int = 30) -> int:
-"""
-Очищает старые результаты.
-
-Args:
-results_dir: Директория с результатами
-max_age_days: Максимальный возраст файлов в днях
-
-Returns:
-Количество удаленных файлов
-"""
-logger.info(f"Очистка старых результатов (старше {max_age_days} дней)")
-
-if not os.path.exists(results_dir):
-logger.info("Директория результатов не существует")
-return 0
-
-deleted_count = 0
-current_time = datetime.now().timestamp()
-max_age_seconds = max_age_days * 24 * 60 * 60
+    from .json_serializer import dumps as json_dumps
+except ImportError:
+    from json_serializer import dumps as json_dumps
 
 try:
-for root, dirs, files in os.walk(results_dir):
-for file in files:
-file_path = os.path.join(root, file)
-file_age = current_time - os.path.getmtime(file_path)
-
-if file_age > max_age_seconds:
-os.remove(file_path)
-deleted_count += 1
-logger.debug(f"Удален старый файл: {file_path}")
+    from .atomic_io import atomic_write, write_bytes_atomic, write_checksum, batched_directory_sync
+except ImportError:
+    from atomic_io import atomic_write, write_bytes_atomic, write_checksum, batched_directory_sync
 
-except Exception as e:
-logger.error(f"Ошибка при очистке старых результатов: {str(e)}")
 
-logger.info(f"Очистка завершена. Удалено файлов: {deleted_count}")
-return deleted_count
+logger = get_logger(__name__)
 
-def get_storage_info(self) -> Dict[str, Any]:
-"""
-Получает информацию о доступных хранилищах.
 
-Returns:
-Словарь с информацией о хранилищах
-"""
-info = {
-"local_storage": {
-"available": True,
-"path": os.path.abspath("results")
-},
-"gcs_storage": {
-"available": self.gcs_client is not None,
-"client_initialized": self.gcs_client is not None,
-"bucket_name": self.storage_config.get("gcs", {}).get("bucket_name")
-},
-"s3_storage": {
-"available": self.s3_client is not None,
-"client_initialized": self.s3_client is not None,
-"bucket_name": os.getenv("AWS_BUCKET_NAME")
-}
-}
-
-return info
-
-def create_tables_schema(self):
-"""Создает схему таблиц в базе данных."""
-if not self.db_engine:
-logger.warning("База данных не инициализирована")
-return False
-
-try:
-# Создаем таблицы если их нет
-with self.db_engine.connect() as connection:
-# Таблица для хранения данных
-connection.execute(text("""
+class StorageManager:
+    """Класс для управления сохранением результатов в различные хранилища."""
+
+    def __init__(self, config: Optional[Config] = None):
+        """
+        Инициализация менеджера хранилища.
+
+        Args:
+            config: Объект конфигурации
+        """
+        self.config = config or get_config()
+        self.storage_config = self.config.get_storage_config()
+
+        # Инициализация клиентов облачных хранилищ
+        self.gcs_client = None
+        self.s3_client = None
+        self.db_engine = None
+        self.db_connection = None
+        self.metrics_store = None
+        self.artifact_store = None
+        self.artifact_index = None
+
+        self._init_cloud_clients()
+        self._init_database_connection()
+
+    def _init_database_connection(self):
+        """Инициализирует подключение к базе данных."""
+        if not SQLALCHEMY_AVAILABLE:
+            logger.info("SQLAlchemy не установлен, база данных недоступна")
+            return
+
+        try:
+            db_config = self.storage_config.get("database", {})
+            db_type = db_config.get("type", "sqlite")
+
+            if db_type == "sqlite":
+                db_path = db_config.get("path", "ml_pipeline.db")
+                connection_string = f"sqlite:///{db_path}"
+
+            elif db_type == "postgresql":
+                host = db_config.get("host", "localhost")
+                port = db_config.get("port", 5432)
+                database = db_config.get("database", "ml_pipeline")
+                username = os.getenv("DB_USERNAME", db_config.get("username"))
+                password = os.getenv("DB_PASSWORD", db_config.get("password"))
+
+                if username and password:
+                    connection_string = f"postgresql://{username}:{password}@{host}:{port}/{database}"
+                else:
+                    logger.warning("Не указаны credentials для PostgreSQL")
+                    return
+
+            elif db_type == "mysql":
+                host = db_config.get("host", "localhost")
+                port = db_config.get("port", 3306)
+                database = db_config.get("database", "ml_pipeline")
+                username = os.getenv("DB_USERNAME", db_config.get("username"))
+                password = os.getenv("DB_PASSWORD", db_config.get("password"))
+
+                if username and password:
+                    connection_string = f"mysql+pymysql://{username}:{password}@{host}:{port}/{database}"
+                else:
+                    logger.warning("Не указаны credentials для MySQL")
+                    return
+            else:
+                logger.warning(f"Неподдерживаемый тип базы данных: {db_type}")
+                return
+
+            self.db_engine = create_engine(connection_string, echo=False)
+            logger.info(f"База данных инициализирована: {db_type}")
+
+        except Exception as e:
+            logger.warning(f"Ошибка инициализации базы данных: {str(e)}")
+
+    def _init_cloud_clients(self):
+        """Инициализирует клиенты облачных хранилищ."""
+        logger.info("Начинаем инициализацию облачных клиентов...")
+
+        # Google Cloud Storage
+        if GCS_AVAILABLE:
+            try:
+                logger.info("Инициализируем GCS клиент...")
+                credentials_path = self.storage_config.get("gcs", {}).get("credentials_path")
+                if credentials_path and os.path.exists(credentials_path):
+                    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
+                    self.gcs_client = gcs.Client()
+                    logger.info("Google Cloud Storage клиент инициализирован")
+                elif os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
+                    self.gcs_client = gcs.Client()
+                    logger.info("Google Cloud Storage клиент инициализирован через переменную окружения")
+                else:
+                    logger.info("GCS credentials не найдены, пропускаем инициализацию")
+            except Exception as e:
+                logger.warning(f"Ошибка инициализации GCS клиента: {str(e)}")
+
+        # AWS S3 - отключаем для избежания зависания
+        logger.info("Проверяем AWS S3...")
+        if AWS_AVAILABLE:
+            try:
+                aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
+                aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+                aws_region = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
+
+                if aws_access_key and aws_secret_key:
+                    logger.info("AWS credentials найдены, но S3 клиент отключен для стабильности Airflow")
+                    # Закомментировано для избежания зависания:
+                    # self.s3_client = boto3.client('s3', region_name=aws_region)
+                    # logger.info("AWS S3 клиент инициализирован")
+                else:
+                    logger.info("AWS credentials не найдены")
+            except Exception as e:
+                logger.warning(f"Ошибка инициализации S3 клиента: {str(e)}")
+
+        logger.info("Инициализация облачных клиентов завершена")
+
+    def get_artifact_store(self) -> Optional[ArtifactStore]:
+        """
+        Возвращает контентно-адресуемое хранилище артефактов (создается при первом обращении).
+
+        Returns:
+            Хранилище или None, если оно отключено в конфигурации
+        """
+        store_config = self.storage_config.get("artifact_store", {}) or {}
+        if not store_config.get("enabled", False):
+            return None
+
+        if self.artifact_store is None:
+            self.artifact_store = ArtifactStore(store_config.get("path", "results/.artifact_store"))
+        return self.artifact_store
+
+    def get_artifact_index(self) -> Optional[ArtifactIndex]:
+        """
+        Возвращает индекс артефактов (общий с остальными модулями, записывающими results/).
+
+        При первом создании индекса в него однократно заносятся уже
+        существующие файлы директории результатов.
+
+        Returns:
+            Индекс или None, если политика хранения отключена в конфигурации
+        """
+        if self.artifact_index is None:
+            self.artifact_index = open_artifact_index(self.storage_config)
+        return self.artifact_index
+
+    def register_artifact(self, file_path: str, run_id: Optional[str] = None, kind: Optional[str] = None,
+                          score: Optional[float] = None, sha256: Optional[str] = None) -> None:
+        """
+        Регистрирует созданный артефакт в индексе политики хранения.
+
+        Args:
+            file_path: Путь к артефакту
+            run_id: Идентификатор запуска (по умолчанию из timestamp в имени файла)
+            kind: Тип артефакта (по умолчанию по имени файла)
+            score: Оценка качества модели
+            sha256: Хэш содержимого в хранилище артефактов
+        """
+        register_result_file(self.storage_config, file_path, run_id=run_id, kind=kind, score=score, sha256=sha256)
+
+    def save_to_local(self, data: Any, file_path: str, data_type: str = "json",
+                      run_id: Optional[str] = None) -> bool:
+        """
+        Сохраняет данные в локальное хранилище.
+
+        Если включено хранилище артефактов, одинаковое содержимое хранится
+        один раз, а file_path становится жесткой ссылкой на блоб.
+
+        Args:
+            data: Данные для сохранения
+            file_path: Путь к файлу
+            data_type: Тип данных (json, text, binary, run_results)
+            run_id: Идентификатор запуска для индекса артефактов
+
+        Returns:
+            True если успешно, False в противном случае
+        """
+        try:
+            if data_type == "json":
+                payload = json_dumps(data)
+            elif data_type == "text":
+                payload = str(data).encode('utf-8')
+            elif data_type == "binary":
+                payload = bytes(data)
+            elif data_type == "run_results":
+                payload = encode_run_results(data)
+            else:
+                logger.error(f"Неподдерживаемый тип данных: {data_type}")
+                return False
+
+            store = self.get_artifact_store()
+            digest = None
+            if store is not None:
+                digest = store.put_bytes(payload, file_path)
+                write_checksum(file_path, digest)
+            else:
+                write_bytes_atomic(file_path, payload)
+            self.register_artifact(file_path, run_id=run_id, sha256=digest)
+
+            logger.info(f"Данные сохранены локально: {file_path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Ошибка сохранения в локальное хранилище: {str(e)}")
+            return False
+
+    def save_run_results(self, results: Dict[str, Any], base_path: str,
+                         run_id: Optional[str] = None) -> Optional[str]:
+        """
+        Сохраняет результаты запуска в формате из storage.results_format.
+
+        Формат "json" (по умолчанию) - JSON-отчет, "binary" - версионированный
+        бинарный файл с типизированными разделами (см. run_results).
+
+        Args:
+            results: Словарь с результатами
+            base_path: Путь к файлу без расширения
+            run_id: Идентификатор запуска для индекса артефактов
+
+        Returns:
+            Путь к сохраненному файлу или None при ошибке
+        """
+        if self.storage_config.get("results_format", "json") == "json":
+            file_path, data_type = f"{base_path}.json", "json"
+        else:
+            file_path, data_type = f"{base_path}{RUN_RESULTS_EXTENSION}", "run_results"
+
+        return file_path if self.save_to_local(results, file_path, data_type, run_id=run_id) else None
+
+    def copy_file_to_local(self, source_path: str, destination_path: str,
+                           run_id: Optional[str] = None) -> bool:
+        """
+        Копирует файл в локальное хранилище.
+
+        Если включено хранилище артефактов, повторные копии того же
+        содержимого не занимают дополнительного места.
+
+        Args:
+            source_path: Исходный путь к файлу
+            destination_path: Путь назначения
+            run_id: Идентификатор запуска для индекса артефактов
+
+        Returns:
+            True если успешно, False в противном случае
+        """
+        try:
+            store = self.get_artifact_store()
+            digest = None
+            if store is not None:
+                digest = store.put_file(source_path, destination_path)
+                write_checksum(destination_path, digest)
+            else:
+                with open(source_path, 'rb') as source, atomic_write(destination_path) as destination:
+                    shutil.copyfileobj(source, destination)
+                shutil.copystat(source_path, destination_path)
+                write_checksum(destination_path)
+            self.register_artifact(destination_path, run_id=run_id, sha256=digest)
+            logger.info(f"Файл скопирован: {source_path} -> {destination_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Ошибка копирования файла: {str(e)}")
+            return False
+
+    def upload_to_gcs(self, local_file_path: str, gcs_blob_name: str,
+                      bucket_name: Optional[str] = None) -> bool:
+        """
+        Загружает файл в Google Cloud Storage.
+
+        Args:
+            local_file_path: Путь к локальному файлу
+            gcs_blob_name: Имя объекта в GCS
+            bucket_name: Имя bucket (если не указано, берется из конфигурации)
+
+        Returns:
+            True если успешно, False в противном случае
+        """
+        if not self.gcs_client:
+            logger.error("GCS клиент не инициализирован")
+            return False
+
+        if bucket_name is None:
+            bucket_name = self.storage_config.get("gcs", {}).get("bucket_name")
+
+        if not bucket_name:
+            logger.error("Не указано имя bucket для GCS")
+            return False
+
+        try:
+            bucket = self.gcs_client.bucket(bucket_name)
+            blob = bucket.blob(gcs_blob_name)
+
+            blob.upload_from_filename(local_file_path)
+            logger.info(f"Файл загружен в GCS: {local_file_path} -> gs://{bucket_name}/{gcs_blob_name}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Ошибка загрузки в GCS: {str(e)}")
+            return False
+
+    def upload_to_s3(self, local_file_path: str, s3_key: str,
+                     bucket_name: Optional[str] = None) -> bool:
+        """
+        Загружает файл в AWS S3.
+
+        Args:
+            local_file_path: Путь к локальному файлу
+            s3_key: Ключ объекта в S3
+            bucket_name: Имя bucket (если не указано, берется из переменной окружения)
+
+        Returns:
+            True если успешно, False в противном случае
+        """
+        if not self.s3_client:
+            logger.error("S3 клиент не инициализирован")
+            return False
+
+        if bucket_name is None:
+            bucket_name = os.getenv("AWS_BUCKET_NAME")
+
+        if not bucket_name:
+            logger.error("Не указано имя bucket для S3")
+            return False
+
+        try:
+            self.s3_client.upload_file(local_file_path, bucket_name, s3_key)
+            logger.info(f"Файл загружен в S3: {local_file_path} -> s3://{bucket_name}/{s3_key}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Ошибка загрузки в S3: {str(e)}")
+            return False
+
+    def get_upload_manager(self) -> UploadManager:
+        """
+        Создает менеджер загрузок для инициализированных облачных клиентов.
+
+        Если задан storage.upload.local_mirror_path, файлы дополнительно
+        загружаются в локальную директорию-эмулятор.
+
+        Returns:
+            Менеджер загрузок
+        """
+        upload_config = self.storage_config.get("upload", {}) or {}
+        backends = []
+
+        if self.gcs_client:
+            bucket_name = self.storage_config.get("gcs", {}).get("bucket_name")
+            if bucket_name:
+                backends.append(GCSBackend(self.gcs_client, bucket_name))
+        if self.s3_client:
+            bucket_name = os.getenv("AWS_BUCKET_NAME")
+            if bucket_name:
+                backends.append(S3Backend(self.s3_client, bucket_name))
+        if upload_config.get("local_mirror_path"):
+            backends.append(LocalFSBackend(upload_config["local_mirror_path"]))
+
+        return UploadManager.from_config(backends, upload_config)
+
+    def create_results_archive(self, results_dir: str = "results",
+                               archive_path: str = None,
+                               incremental: Optional[bool] = None) -> Optional[str]:
+        """
+        Создает архив с результатами работы пайплайна.
+
+        Файлы читаются и хэшируются параллельно, уже сжатые форматы сохраняются без deflate.
+        В инкрементальном режиме в архив попадают только файлы, изменившиеся
+        с момента последнего архива (по манифесту).
+
+        Args:
+            results_dir: Директория с результатами
+            archive_path: Путь к архиву (если не указан, генерируется автоматически)
+            incremental: Инкрементальный режим (по умолчанию из storage.archive.mode)
+
+        Returns:
+            Путь к созданному архиву или None при ошибке или отсутствии изменений
+        """
+        archive_config = self.storage_config.get("archive", {}) or {}
+        if incremental is None:
+            incremental = archive_config.get("mode", "incremental") == "incremental"
+
+        try:
+            archiver = ResultsArchiver.from_config(archive_config)
+            archive_path = archiver.create_archive(results_dir, archive_path, incremental=incremental)
+            if archive_path:
+                self.register_artifact(archive_path, kind="archive")
+            return archive_path
+
+        except Exception as e:
+            logger.error(f"Ошибка создания архива: {str(e)}")
+            return None
+
+    def save_pipeline_results(self, results: Dict[str, Any],
+                              model_path: Optional[str] = None,
+                              metrics_path: Optional[str] = None,
+                              upload_to_cloud: bool = False) -> Dict[str, bool]:
+        """
+        Сохраняет все результаты пайплайна.
+
+        Args:
+            results: Словарь с результатами
+            model_path: Путь к модели (должен быть строкой)
+            metrics_path: Путь к метрикам (должен быть строкой)
+            upload_to_cloud: Загружать ли в облачное хранилище
+
+        Returns:
+            Словарь с результатами операций сохранения
+
+        Raises:
+            TypeError: Если model_path или metrics_path не являются строками
+        """
+        logger.info("Начало сохранения результатов пайплайна")
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        save_results = {
+            "local_save": False,
+            "gcs_upload": False,
+            "s3_upload": False,
+            "archive_created": False
+        }
+
+        # Сохраняем результаты локально; fsync директорий выполняется один раз после всех файлов
+        with batched_directory_sync():
+            local_results_path = self.save_run_results(results, f"results/pipeline_results_{timestamp}")
+            save_results["local_save"] = local_results_path is not None
+
+            # Копируем важные файлы в итоговую директорию
+            files_to_save = []
+
+            # Проверяем, что model_path является строкой перед использованием
+            if model_path and isinstance(model_path, str) and os.path.exists(model_path):
+                dest_model_path = f"results/final_model_{timestamp}.joblib"
+                if self.copy_file_to_local(model_path, dest_model_path):
+                    files_to_save.append(dest_model_path)
+                    # Оценка модели нужна политике хранения, чтобы не удалить лучшую модель
+                    best_metric = self.storage_config.get("retention", {}).get("best_model_metric", "f1_score")
+                    model_score = extract_metrics(results).get(best_metric)
+                    index = self.get_artifact_index()
+                    if index is not None and model_score is not None:
+                        index.set_score(dest_model_path, model_score)
+            elif model_path and not isinstance(model_path, str):
+                logger.warning(f"model_path должен быть строкой, получен: {type(model_path)} - {model_path}")
+
+            # Проверяем, что metrics_path является строкой перед использованием
+            if metrics_path and isinstance(metrics_path, str) and os.path.exists(metrics_path):
+                dest_metrics_path = f"results/final_metrics_{timestamp}.json"
+                if self.copy_file_to_local(metrics_path, dest_metrics_path):
+                    files_to_save.append(dest_metrics_path)
+            elif metrics_path and not isinstance(metrics_path, str):
+                logger.warning(f"metrics_path должен быть строкой, получен: {type(metrics_path)} - {metrics_path}")
+
+            # Создаем архив с результатами
+            archive_path = self.create_results_archive()
+            if archive_path:
+                save_results["archive_created"] = True
+                files_to_save.append(archive_path)
+
+        # Загружаем в облачные хранилища (если требуется)
+        if upload_to_cloud:
+            upload_manager = self.get_upload_manager()
+            files = [(file_path, f"ml-pipeline/{timestamp}/{os.path.basename(file_path)}")
+                     for file_path in files_to_save]
+            upload_results = upload_manager.upload_files(files)
+            save_results["upload_details"] = upload_results
+
+            for backend_name, backend_results in upload_results.items():
+                if f"{backend_name}_upload" in save_results:
+                    save_results[f"{backend_name}_upload"] = UploadManager.backend_succeeded(backend_results)
+
+        # Сохраняем сводку операций
+        summary = {
+            "timestamp": timestamp,
+            "files_saved": files_to_save,
+            "save_operations": save_results,
+            "local_results_path": local_results_path if save_results["local_save"] else None,
+            "archive_path": archive_path if save_results["archive_created"] else None
+        }
+
+        summary_path = f"results/save_summary_{timestamp}.json"
+        self.save_to_local(summary, summary_path)
+
+        logger.info("Сохранение результатов пайплайна завершено")
+        logger.info(f"Результаты операций: {save_results}")
+
+        return save_results
+
+    def cleanup_old_results(self, results_dir: str = "results",
+                            max_age_days: int = 30) -> int:
+        """
+        Очищает старые результаты и собирает мусор хранилища артефактов.
+
+        Если включена политика хранения (storage.retention), кандидаты на удаление
+        выбираются запросом к индексу артефактов: сохраняются последние
+        keep_last_runs запусков, лучшая модель и защищенные файлы (текущая модель,
+        препроцессоры, метаданные); блобы удаленных артефактов освобождаются
+        точечно, без обхода директорий. Модули, записывающие results/, регистрируют
+        свои файлы в индексе сами. При отключенной политике удаляются файлы старше
+        max_age_days при обходе директории, а блобы без ссылок собирает сборщик
+        мусора хранилища артефактов.
+
+        Args:
+            results_dir: Директория с результатами
+            max_age_days: Максимальный возраст файлов в днях
+
+        Returns:
+            Количество удаленных файлов
+        """
+        logger.info(f"Очистка старых результатов (старше {max_age_days} дней)")
+
+        if not os.path.exists(results_dir):
+            logger.info("Директория результатов не существует")
+            return 0
+
+        index = self.get_artifact_index()
+        if index is not None:
+            deleted_count = self._apply_retention_policy(index, max_age_days)
+        else:
+            deleted_count = self._remove_files_by_age(results_dir, max_age_days)
+
+        logger.info(f"Очистка завершена. Удалено файлов: {deleted_count}")
+        return deleted_count
+
+    def _remove_files_by_age(self, results_dir: str, max_age_days: int) -> int:
+        """
+        Удаляет файлы старше max_age_days обходом директории (без индекса артефактов).
+
+        Args:
+            results_dir: Директория с результатами
+            max_age_days: Максимальный возраст файлов в днях
+
+        Returns:
+            Количество удаленных файлов
+        """
+        deleted_count = 0
+        current_time = datetime.now().timestamp()
+        max_age_seconds = max_age_days * 24 * 60 * 60
+
+        store = self.get_artifact_store()
+        store_root = os.path.abspath(store.root) if store is not None else None
+
+        try:
+            for root, dirs, files in os.walk(results_dir):
+                # Блобы удаляются только сборщиком мусора по отсутствию ссылок
+                if store_root is not None:
+                    dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != store_root]
+
+                for file in files:
+                    file_path = os.path.join(root, file)
+                    file_age = current_time - os.path.getmtime(file_path)
+
+                    if file_age > max_age_seconds:
+                        os.remove(file_path)
+                        deleted_count += 1
+                        logger.debug(f"Удален старый файл: {file_path}")
+
+            if store is not None:
+                store.collect_garbage(
+                    grace_seconds=self.storage_config.get("artifact_store", {}).get("gc_grace_seconds", 3600))
+
+        except Exception as e:
+            logger.error(f"Ошибка при очистке старых результатов: {str(e)}")
+
+        return deleted_count
+
+    def _apply_retention_policy(self, index: ArtifactIndex, max_age_days: Optional[float]) -> int:
+        """Удаляет артефакты по политике хранения из индекса и освобождает их блобы."""
+        retention_config = self.storage_config.get("retention", {}) or {}
+        try:
+            result = index.apply_retention(
+                keep_last_runs=retention_config.get("keep_last_runs", 5),
+                max_age_days=max_age_days,
+                keep_best_model=retention_config.get("keep_best_model", True),
+                batch_size=retention_config.get("batch_size", 500)
+            )
+            store = self.get_artifact_store()
+            if store is not None and result["released_sha256"]:
+                store.release(result["released_sha256"])
+        except Exception as e:
+            logger.error(f"Ошибка при очистке старых результатов: {str(e)}")
+            return 0
+
+        return result["deleted_files"]
+
+    def get_storage_info(self) -> Dict[str, Any]:
+        """
+        Получает информацию о доступных хранилищах.
+
+        Returns:
+            Словарь с информацией о хранилищах
+        """
+        info = {
+            "local_storage": {
+                "available": True,
+                "path": os.path.abspath("results")
+            },
+            "gcs_storage": {
+                "available": self.gcs_client is not None,
+                "client_initialized": self.gcs_client is not None,
+                "bucket_name": self.storage_config.get("gcs", {}).get("bucket_name")
+            },
+            "s3_storage": {
+                "available": self.s3_client is not None,
+                "client_initialized": self.s3_client is not None,
+                "bucket_name": os.getenv("AWS_BUCKET_NAME")
+            }
+        }
+
+        return info
+
+    def get_metrics_store(self) -> MetricsStore:
+        """
+        Возвращает хранилище истории метрик (SQLite) из конфигурации.
+
+        Returns:
+            Объект MetricsStore для добавления запусков и временных запросов
+        """
+        if self.metrics_store is None:
+            store_config = self.storage_config.get("metrics_store", {})
+            self.metrics_store = MetricsStore(store_config.get("path", "results/metrics_history.db"))
+        return self.metrics_store
+
+    def create_tables_schema(self):
+        """Создает схему таблиц в базе данных."""
+        if not self.db_engine:
+            logger.warning("База данных не инициализирована")
+            return False
+
+        try:
+            # Создаем таблицы если их нет
+            with self.db_engine.connect() as connection:
+                # Таблица для хранения данных
+                connection.execute(text("""
 CREATE TABLE IF NOT EXISTS ml_data (
 id INTEGER PRIMARY KEY,
 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
@@ -570,8 +741,8 @@ created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 )
 """))
 
-# Таблица для результатов экспериментов
-connection.execute(text("""
+                # Таблица для результатов экспериментов
+                connection.execute(text("""
 CREATE TABLE IF NOT EXISTS experiment_results (
 id INTEGER PRIMARY KEY,
 experiment_name TEXT,
@@ -583,8 +754,8 @@ created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 )
 """))
 
-# Таблица для мониторинга качества данных
-connection.execute(text("""
+                # Таблица для мониторинга качества данных
+                connection.execute(text("""
 CREATE TABLE IF NOT EXISTS data_quality_reports (
 id INTEGER PRIMARY KEY,
 report_data TEXT,
@@ -594,177 +765,177 @@ timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
 )
 """))
 
-logger.info("Схема таблиц создана успешно")
-return True
+                logger.info("Схема таблиц создана успешно")
+                return True
+
+        except Exception as e:
+            logger.error(f"Ошибка создания схемы таблиц: {str(e)}")
+            return False
+
+    def save_data_to_db(self, data: Any, table_name: str = "ml_data") -> bool:
+        """
+        Сохраняет данные в базу данных.
+
+        Args:
+            data: Данные для сохранения (DataFrame или dict)
+            table_name: Имя таблицы
+
+        Returns:
+            True если успешно, False в противном случае
+        """
+        if not self.db_engine:
+            logger.warning("База данных не инициализирована")
+            return False
+
+        try:
+            import pandas as pd
+
+            if isinstance(data, pd.DataFrame):
+                # Сохраняем DataFrame напрямую
+                data.to_sql(table_name, self.db_engine, if_exists='append', index=False)
+                logger.info(f"DataFrame сохранен в таблицу {table_name}")
+                return True
+
+            elif isinstance(data, dict):
+                # Конвертируем dict в DataFrame и сохраняем
+                df = pd.DataFrame([data])
+                df.to_sql(table_name, self.db_engine, if_exists='append', index=False)
+                logger.info(f"Данные сохранены в таблицу {table_name}")
+                return True
+
+            else:
+                logger.error(f"Неподдерживаемый тип данных: {type(data)}")
+                return False
+
+        except Exception as e:
+            logger.error(f"Ошибка сохранения данных в БД: {str(e)}")
+            return False
+
+    def load_data_from_db(self, table_name: str = "ml_data", limit: int = None) -> Optional[Any]:
+        """
+        Загружает данные из базы данных.
+
+        Args:
+            table_name: Имя таблицы
+            limit: Ограничение количества записей
+
+        Returns:
+            DataFrame или None при ошибке
+        """
+        if not self.db_engine:
+            logger.warning("База данных не инициализирована")
+            return None
+
+        try:
+            import pandas as pd
+
+            query = f"SELECT * FROM {table_name}"
+            if limit:
+                query += f" LIMIT {limit}"
+
+            df = pd.read_sql(query, self.db_engine)
+            logger.info(f"Загружено {len(df)} записей из таблицы {table_name}")
+            return df
+
+        except Exception as e:
+            logger.error(f"Ошибка загрузки данных из БД: {str(e)}")
+            return None
+
+    def save_experiment_results(self, experiment_name: str, model_type: str,
+                                parameters: Dict[str, Any], metrics: Dict[str, float]) -> bool:
+        """
+        Сохраняет результаты эксперимента в базу данных.
+
+        Args:
+            experiment_name: Название эксперимента
+            model_type: Тип модели
+            parameters: Параметры модели
+            metrics: Метрики модели
+
+        Returns:
+            True если успешно, False в противном случае
+        """
+        if not self.db_engine:
+            logger.warning("База данных не инициализирована")
+            return False
+
+        try:
+            experiment_data = {
+                'experiment_name': experiment_name,
+                'model_type': model_type,
+                'parameters': json.dumps(parameters),
+                'metrics': json.dumps(metrics),
+                'timestamp': datetime.now().isoformat()
+            }
+
+            return self.save_data_to_db(experiment_data, 'experiment_results')
+
+        except Exception as e:
+            logger.error(f"Ошибка сохранения результатов эксперимента: {str(e)}")
+            return False
+
+    def get_database_info(self) -> Dict[str, Any]:
+        """
+        Получает информацию о базе данных.
+
+        Returns:
+            Словарь с информацией о базе данных
+        """
+        info = {
+            "database_available": self.db_engine is not None,
+            "connection_string": str(self.db_engine.url) if self.db_engine else None,
+            "tables": []
+        }
+
+        if self.db_engine:
+            try:
+                with self.db_engine.connect() as connection:
+                    # Получаем список таблиц (для SQLite)
+                    result = connection.execute(text("SELECT name FROM sqlite_master WHERE type='table';"))
+                    info["tables"] = [row[0] for row in result.fetchall()]
+            except Exception as e:
+                logger.error(f"Ошибка получения информации о БД: {str(e)}")
+                info["error"] = str(e)
+
+        return info
 
-except Exception as e:
-logger.error(f"Ошибка создания схемы таблиц: {str(e)}")
-return False
 
-def save_data_to_db(self, data: Any, table_name: str = "ml_data") -> bool:
-"""
-Сохраняет данные в базу данных.
-
-Args:
-data: Данные для сохранения (DataFrame или dict)
-table_name: Имя таблицы
-
-Returns:
-True если успешно, False в противном случае
-"""
-if not self.db_engine:
-logger.warning("База данных не инициализирована")
-return False
-
-try:
-import pandas as pd
-
-if isinstance(data, pd.DataFrame):
-# Сохраняем DataFrame напрямую
-data.to_sql(table_name, self.db_engine, if_exists='append', index=False)
-logger.info(f"DataFrame сохранен в таблицу {table_name}")
-return True
-
-elif isinstance(data, dict):
-# Конвертируем dict в DataFrame и сохраняем
-df = pd.DataFrame([data])
-df.to_sql(table_name, self.db_engine, if_exists='append', index=False)
-logger.info(f"Данные сохранены в таблицу {table_name}")
-return True
-
-else:
-logger.error(f"Неподдерживаемый тип данных: {type(data)}")
-return False
-
-except Exception as e:
-logger.error(f"Ошибка сохранения данных в БД: {str(e)}")
-return False
-
-def load_data_from_db(self, table_name: str = "ml_data", limit: int = None) -> Optional[Any]:
-"""
-Загружает данные из базы данных.
-
-Args:
-table_name: Имя таблицы
-limit: Ограничение количества записей
-
-Returns:
-DataFrame или None при ошибке
-"""
-if not self.db_engine:
-logger.warning("База данных не инициализирована")
-return None
-
-try:
-import pandas as pd
-
-query = f"SELECT * FROM {table_name}"
-if limit:
-query += f" LIMIT {limit}"
-
-df = pd.read_sql(query, self.db_engine)
-logger.info(f"Загружено {len(df)} записей из таблицы {table_name}")
-return df
-
-except Exception as e:
-logger.error(f"Ошибка загрузки данных из БД: {str(e)}")
-return None
-
-def save_experiment_results(self, experiment_name: str, model_type: str, 
-parameters: Dict[str, Any], metrics: Dict[str, float]) -> bool:
-"""
-Сохраняет результаты эксперимента в базу данных.
-
-Args:
-experiment_name: Название эксперимента
-model_type: Тип модели
-parameters: Параметры модели
-metrics: Метрики модели
-
-Returns:
-True если успешно, False в противном случае
-"""
-if not self.db_engine:
-logger.warning("База данных не инициализирована")
-return False
-
-try:
-experiment_data = {
-'experiment_name': experiment_name,
-'model_type': model_type,
-'parameters': json.dumps(parameters),
-'metrics': json.dumps(metrics),
-'timestamp': datetime.now().isoformat()
-}
-
-return self.save_data_to_db(experiment_data, 'experiment_results')
-
-except Exception as e:
-logger.error(f"Ошибка сохранения результатов эксперимента: {str(e)}")
-return False
-
-def get_database_info(self) -> Dict[str, Any]:
-"""
-Получает информацию о базе данных.
-
-Returns:
-Словарь с информацией о базе данных
-"""
-info = {
-"database_available": self.db_engine is not None,
-"connection_string": str(self.db_engine.url) if self.db_engine else None,
-"tables": []
-}
-
-if self.db_engine:
-try:
-with self.db_engine.connect() as connection:
-# Получаем список таблиц (для SQLite)
-result = connection.execute(text("SELECT name FROM sqlite_master WHERE type='table';"))
-info["tables"] = [row[0] for row in result.fetchall()]
-except Exception as e:
-logger.error(f"Ошибка получения информации о БД: {str(e)}")
-info["error"] = str(e)
+def main():
+    """Главная функция для тестирования модуля."""
+    try:
+        # Создаем менеджер хранилища
+        storage_manager = StorageManager()
 
-return info
+        # Получаем информацию о хранилищах
+        storage_info = storage_manager.get_storage_info()
+        print("Информация о хранилищах:")
+        print(json.dumps(storage_info, indent=2, ensure_ascii=False))
 
+        # Тестируем сохранение данных
+        test_data = {
+            "test": "Тестовые данные",
+            "timestamp": datetime.now().isoformat(),
+            "metrics": {"accuracy": 0.95, "f1_score": 0.92}
+        }
 
-def main():
-"""Главная функция для тестирования модуля."""
-try:
-# Создаем менеджер хранилища
-storage_manager = StorageManager()
-
-# Получаем информацию о хранилищах
-storage_info = storage_manager.get_storage_info()
-print("Информация о хранилищах:")
-print(json.dumps(storage_info, indent=2, ensure_ascii=False))
-
-# Тестируем сохранение данных
-test_data = {
-"test": "Тестовые данные",
-"timestamp": datetime.now().isoformat(),
-"metrics": {"accuracy": 0.95, "f1_score": 0.92}
-}
-
-# Сохраняем тестовые результаты
-results = storage_manager.save_pipeline_results(
-test_data,
-upload_to_cloud=False # Отключаем загрузку в облако для теста
-)
+        # Сохраняем тестовые результаты
+        results = storage_manager.save_pipeline_results(
+            test_data,
+            upload_to_cloud=False # Отключаем загрузку в облако для теста
+        )
 
-print(f"Результаты сохранения: {results}")
+        print(f"Результаты сохранения: {results}")
 
-# Очищаем старые результаты (тест)
-deleted_count = storage_manager.cleanup_old_results(max_age_days=0) # Удаляем все для теста
-print(f"Удалено файлов при очистке: {deleted_count}")
+        # Очищаем старые результаты (тест)
+        deleted_count = storage_manager.cleanup_old_results(max_age_days=0) # Удаляем все для теста
+        print(f"Удалено файлов при очистке: {deleted_count}")
 
-return storage_manager
+        return storage_manager
 
-except Exception as e:
-logger.error(f"Ошибка в main: {str(e)}")
-raise
+    except Exception as e:
+        logger.error(f"Ошибка в main: {str(e)}")
+        raise
 
 
 if __name__ == "__main__":
-main()
+    main()
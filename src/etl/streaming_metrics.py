@@ -0,0 +1,349 @@
+"""
+Модуль для потокового (по частям) расчета метрик классификации.
+
+Накопители позволяют обновлять метрики порциями данных из пакетного
+скоринга и объединять частичные результаты, посчитанные в разных процессах,
+не держа в памяти полные массивы y_true / y_pred.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import numpy as np
+import logging
+from typing import Dict, Any, Optional, Sequence, Iterable
+from datetime import datetime
+import os
+import sys
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+
+logger = get_logger(__name__)
+
+# np.trapz переименована в np.trapezoid в NumPy 2.0
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+class StreamingMetricsAccumulator:
+    """
+    Слияемый накопитель метрик классификации.
+
+    Хранит только счетчики: матрицу ошибок, гистограммы вероятностей
+    положительного класса (для приближенного ROC AUC) и суммы для log-loss
+    и Brier score. Размер состояния не зависит от числа образцов.
+    """
+
+    def __init__(self, labels: Sequence = (0, 1), n_bins: int = 1000, eps: float = 1e-15):
+        """
+        Инициализация накопителя.
+
+        Args:
+            labels: Допустимые метки классов (в порядке строк матрицы ошибок)
+            n_bins: Количество интервалов гистограммы вероятностей на [0, 1]
+            eps: Ограничение вероятностей при расчете log-loss
+        """
+        if n_bins < 2:
+            raise ValueError(f"n_bins должно быть не меньше 2, получено: {n_bins}")
+
+        self.labels = np.asarray(sorted(labels))
+        self.n_classes = len(self.labels)
+        self.n_bins = int(n_bins)
+        self.eps = float(eps)
+
+        self.confusion = np.zeros((self.n_classes, self.n_classes), dtype=np.int64)
+        self.positive_hist = np.zeros(self.n_bins, dtype=np.int64)
+        self.negative_hist = np.zeros(self.n_bins, dtype=np.int64)
+        self.log_loss_sum = 0.0
+        self.brier_sum = 0.0
+        self.proba_count = 0
+        self.chunks_seen = 0
+
+    @property
+    def n_samples(self) -> int:
+        """Количество учтенных образцов."""
+        return int(self.confusion.sum())
+
+    def _encode(self, y: np.ndarray, name: str) -> np.ndarray:
+        """Переводит метки в индексы классов 0..n_classes-1."""
+        y = np.asarray(y).ravel()
+        indices = np.searchsorted(self.labels, y)
+        indices = np.clip(indices, 0, self.n_classes - 1)
+        unknown = self.labels[indices] != y
+        if unknown.any():
+            raise ValueError(f"Неизвестные метки в {name}: {np.unique(y[unknown]).tolist()}")
+        return indices
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray,
+               y_pred_proba: Optional[np.ndarray] = None) -> "StreamingMetricsAccumulator":
+        """
+        Обновляет счетчики порцией данных.
+
+        Args:
+            y_true: Истинные метки порции
+            y_pred: Предсказанные метки порции
+            y_pred_proba: Предсказанные вероятности порции (опционально)
+
+        Returns:
+            Текущий накопитель (для цепочек вызовов)
+        """
+        true_idx = self._encode(y_true, "y_true")
+        pred_idx = self._encode(y_pred, "y_pred")
+        if len(true_idx) != len(pred_idx):
+            raise ValueError(f"Размеры y_true ({len(true_idx)}) и y_pred ({len(pred_idx)}) не совпадают")
+
+        n = self.n_classes
+        self.confusion += np.bincount(true_idx * n + pred_idx, minlength=n * n).reshape(n, n)
+
+        if y_pred_proba is not None:
+            proba = np.asarray(y_pred_proba, dtype=np.float64)
+            if proba.ndim == 1:
+                proba = np.column_stack([1.0 - proba, proba])
+            if proba.shape != (len(true_idx), n):
+                raise ValueError(f"Ожидалась матрица вероятностей формы {(len(true_idx), n)}, "
+                                 f"получено: {proba.shape}")
+
+            # Log-loss и Brier score считаются для любого числа классов
+            true_class_proba = np.clip(proba[np.arange(len(true_idx)), true_idx], self.eps, 1 - self.eps)
+            self.log_loss_sum += float(-np.log(true_class_proba).sum())
+            one_hot = np.zeros_like(proba)
+            one_hot[np.arange(len(true_idx)), true_idx] = 1.0
+            self.brier_sum += float(((proba - one_hot) ** 2).sum())
+            self.proba_count += len(true_idx)
+
+            # Гистограммы вероятности положительного класса (только бинарный случай)
+            if n == 2:
+                bins = np.minimum((np.clip(proba[:, 1], 0.0, 1.0) * self.n_bins).astype(np.int64),
+                                  self.n_bins - 1)
+                positive = true_idx == 1
+                self.positive_hist += np.bincount(bins[positive], minlength=self.n_bins)
+                self.negative_hist += np.bincount(bins[~positive], minlength=self.n_bins)
+
+        self.chunks_seen += 1
+        return self
+
+    def merge(self, other: "StreamingMetricsAccumulator") -> "StreamingMetricsAccumulator":
+        """
+        Добавляет счетчики другого накопителя (например, из другого процесса).
+
+        Args:
+            other: Накопитель с теми же метками и числом интервалов
+
+        Returns:
+            Текущий накопитель
+        """
+        if not np.array_equal(self.labels, other.labels) or self.n_bins != other.n_bins:
+            raise ValueError("Нельзя объединить накопители с разными метками или числом интервалов")
+
+        self.confusion += other.confusion
+        self.positive_hist += other.positive_hist
+        self.negative_hist += other.negative_hist
+        self.log_loss_sum += other.log_loss_sum
+        self.brier_sum += other.brier_sum
+        self.proba_count += other.proba_count
+        self.chunks_seen += other.chunks_seen
+        return self
+
+    @classmethod
+    def merge_all(cls, accumulators: Iterable["StreamingMetricsAccumulator"]) -> "StreamingMetricsAccumulator":
+        """Объединяет несколько накопителей в новый."""
+        accumulators = list(accumulators)
+        if not accumulators:
+            raise ValueError("Список накопителей пуст")
+        first = accumulators[0]
+        merged = cls(labels=first.labels.tolist(), n_bins=first.n_bins, eps=first.eps)
+        for accumulator in accumulators:
+            merged.merge(accumulator)
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сериализует состояние в словарь (для передачи между процессами/XCom)."""
+        return {
+            "labels": self.labels.tolist(),
+            "n_bins": self.n_bins,
+            "eps": self.eps,
+            "confusion": self.confusion.tolist(),
+            "positive_hist": self.positive_hist.tolist(),
+            "negative_hist": self.negative_hist.tolist(),
+            "log_loss_sum": self.log_loss_sum,
+            "brier_sum": self.brier_sum,
+            "proba_count": self.proba_count,
+            "chunks_seen": self.chunks_seen
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "StreamingMetricsAccumulator":
+        """Восстанавливает накопитель из словаря, полученного через to_dict."""
+        accumulator = cls(labels=state["labels"], n_bins=state["n_bins"], eps=state.get("eps", 1e-15))
+        accumulator.confusion = np.asarray(state["confusion"], dtype=np.int64)
+        accumulator.positive_hist = np.asarray(state["positive_hist"], dtype=np.int64)
+        accumulator.negative_hist = np.asarray(state["negative_hist"], dtype=np.int64)
+        accumulator.log_loss_sum = float(state["log_loss_sum"])
+        accumulator.brier_sum = float(state["brier_sum"])
+        accumulator.proba_count = int(state["proba_count"])
+        accumulator.chunks_seen = int(state.get("chunks_seen", 0))
+        return accumulator
+
+    def _per_class_scores(self) -> Dict[str, np.ndarray]:
+        """Рассчитывает precision/recall/f1/support по классам из матрицы ошибок."""
+        cm = self.confusion.astype(np.float64)
+        tp = np.diag(cm)
+        predicted = cm.sum(axis=0)
+        support = cm.sum(axis=1)
+
+        # Как в sklearn: при нулевом знаменателе метрика равна 0
+        precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+        recall = np.divide(tp, support, out=np.zeros_like(tp), where=support > 0)
+        denominator = precision + recall
+        f1 = np.divide(2 * precision * recall, denominator, out=np.zeros_like(tp), where=denominator > 0)
+
+        # sklearn усредняет только по классам, встречающимся в y_true или y_pred
+        present = (support > 0) | (predicted > 0)
+        return {"precision": precision, "recall": recall, "f1": f1,
+                "support": support, "present": present}
+
+    def compute_basic_metrics(self) -> Dict[str, float]:
+        """Возвращает метрики в формате MetricsCalculator.calculate_basic_metrics."""
+        total = self.n_samples
+        if total == 0:
+            raise ValueError("Накопитель пуст: нет данных для расчета метрик")
+
+        scores = self._per_class_scores()
+        present = scores["present"]
+        support = scores["support"][present]
+        weights = support / support.sum() if support.sum() > 0 else np.zeros_like(support)
+
+        metrics = {
+            "accuracy": float(np.trace(self.confusion) / total),
+            "precision": float((scores["precision"][present] * weights).sum()),
+            "recall": float((scores["recall"][present] * weights).sum()),
+            "f1_score": float((scores["f1"][present] * weights).sum()),
+            "precision_macro": float(scores["precision"][present].mean()),
+            "recall_macro": float(scores["recall"][present].mean()),
+            "f1_score_macro": float(scores["f1"][present].mean())
+        }
+
+        # Бинарные метрики, если в y_true встретились оба класса
+        if self.n_classes == 2 and (scores["support"] > 0).all():
+            metrics["precision_binary"] = float(scores["precision"][1])
+            metrics["recall_binary"] = float(scores["recall"][1])
+            metrics["f1_score_binary"] = float(scores["f1"][1])
+
+        return metrics
+
+    def compute_confusion_matrix_data(self) -> Dict[str, Any]:
+        """Возвращает данные в формате MetricsCalculator.calculate_confusion_matrix."""
+        scores = self._per_class_scores()
+        present = scores["present"]
+        cm = self.confusion[np.ix_(present, present)]
+        support = cm.sum(axis=1)
+
+        cm_normalized = np.divide(cm.astype(np.float64), support[:, np.newaxis],
+                                  out=np.full(cm.shape, np.nan), where=support[:, np.newaxis] > 0)
+
+        # Отчет в структуре sklearn.metrics.classification_report(output_dict=True)
+        report = {}
+        for idx in np.flatnonzero(present):
+            report[str(self.labels[idx])] = {
+                "precision": float(scores["precision"][idx]),
+                "recall": float(scores["recall"][idx]),
+                "f1-score": float(scores["f1"][idx]),
+                "support": float(scores["support"][idx])
+            }
+        basic = self.compute_basic_metrics()
+        total = float(self.n_samples)
+        report["accuracy"] = basic["accuracy"]
+        report["macro avg"] = {"precision": basic["precision_macro"], "recall": basic["recall_macro"],
+                               "f1-score": basic["f1_score_macro"], "support": total}
+        report["weighted avg"] = {"precision": basic["precision"], "recall": basic["recall"],
+                                  "f1-score": basic["f1_score"], "support": total}
+
+        is_binary = cm.shape == (2, 2)
+        result = {
+            "confusion_matrix": cm.tolist(),
+            "confusion_matrix_normalized": cm_normalized.tolist(),
+            "classification_report": report,
+            "true_negatives": int(cm[0, 0]) if is_binary else None,
+            "false_positives": int(cm[0, 1]) if is_binary else None,
+            "false_negatives": int(cm[1, 0]) if is_binary else None,
+            "true_positives": int(cm[1, 1]) if is_binary else None
+        }
+
+        if is_binary:
+            tn, fp, fn, tp = cm.ravel()
+            result["sensitivity"] = float(tp / (tp + fn)) if tp + fn > 0 else 0.0
+            result["specificity"] = float(tn / (tn + fp)) if tn + fp > 0 else 0.0
+            result["false_positive_rate"] = float(fp / (fp + tn)) if fp + tn > 0 else 0.0
+            result["false_negative_rate"] = float(fn / (fn + tp)) if fn + tp > 0 else 0.0
+
+        return result
+
+    def compute_probabilistic_metrics(self) -> Dict[str, Any]:
+        """
+        Возвращает метрики в формате MetricsCalculator.calculate_probabilistic_metrics.
+
+        ROC AUC и кривые рассчитываются по гистограммам, поэтому являются
+        приближенными: точность ограничена шириной интервала 1 / n_bins.
+        """
+        metrics = {}
+        if self.proba_count == 0:
+            return metrics
+
+        metrics["log_loss"] = float(self.log_loss_sum / self.proba_count)
+        metrics["brier_score"] = float(self.brier_sum / self.proba_count)
+
+        positives = int(self.positive_hist.sum())
+        negatives = int(self.negative_hist.sum())
+        if self.n_classes != 2 or positives == 0 or negatives == 0:
+            return metrics
+
+        # Пороги перебираются от максимальной вероятности к минимальной
+        tp = np.concatenate([[0], np.cumsum(self.positive_hist[::-1])])
+        fp = np.concatenate([[0], np.cumsum(self.negative_hist[::-1])])
+        nonempty = np.concatenate([[True], (self.positive_hist[::-1] + self.negative_hist[::-1]) > 0])
+        tp, fp = tp[nonempty], fp[nonempty]
+
+        tpr = tp / positives
+        fpr = fp / negatives
+        metrics["roc_auc"] = float(_trapezoid(tpr, fpr))
+        metrics["roc_curve"] = {
+            "fpr": fpr.tolist(),
+            "tpr": tpr.tolist()
+        }
+
+        # Кривая Precision-Recall в порядке возрастания порога, как в sklearn
+        predicted_positive = tp[1:] + fp[1:]
+        precision = tp[1:] / predicted_positive
+        recall = tp[1:] / positives
+        metrics["precision_recall_curve"] = {
+            "precision": np.concatenate([precision[::-1], [1.0]]).tolist(),
+            "recall": np.concatenate([recall[::-1], [0.0]]).tolist()
+        }
+
+        return metrics
+
+    def to_evaluation_results(self) -> Dict[str, Any]:
+        """
+        Формирует результаты оценки в формате MetricsCalculator.evaluate_model.
+
+        Returns:
+            Словарь, который принимают save_metrics и generate_evaluation_report
+        """
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "test_samples": self.n_samples,
+            "basic_metrics": self.compute_basic_metrics(),
+            "probabilistic_metrics": self.compute_probabilistic_metrics(),
+            "confusion_matrix_data": self.compute_confusion_matrix_data(),
+            "streaming": {
+                "chunks": self.chunks_seen,
+                "histogram_bins": self.n_bins,
+                "approximate_auc": True
+            }
+        }
@@ -0,0 +1,220 @@
+"""
+Модуль масштабирования данных, не помещающихся в память.
+
+Скейлер обучается по частям данных: StandardScaler и MinMaxScaler через
+partial_fit, RobustScaler - по приближенным квантилям (два прохода:
+минимум/максимум колонок, затем гистограмма на фиксированной сетке).
+Затем части нормализуются по очереди и записываются в файл .npy,
+открытый как memmap, поэтому в памяти одновременно находится одна часть.
+
+Источник частей - фабрика (функция без аргументов, возвращающая новый
+итератор, например lambda: loader.iter_chunks(path)) или список: данные
+читаются несколько раз.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import logging
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple, Union
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from sklearn.preprocessing import RobustScaler
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+
+logger = get_logger(__name__)
+
+# Части данных: фабрика итераторов или повторно итерируемая коллекция
+ChunkSource = Union[Callable[[], Iterable[Any]], Sequence[Any]]
+
+
+def _iter_matrices(chunks: ChunkSource, columns: Optional[Sequence[str]] = None) -> Iterator[np.ndarray]:
+    """Новый проход по частям: матрицы float64 (из DataFrame берутся columns)."""
+    source = chunks() if callable(chunks) else chunks
+    if iter(source) is source and not callable(chunks):
+        raise ValueError("Части данных читаются несколько раз: передайте фабрику итераторов или список")
+    for chunk in source:
+        if isinstance(chunk, pd.DataFrame):
+            chunk = chunk[list(columns)] if columns is not None else chunk
+            yield chunk.to_numpy(dtype=np.float64)
+        else:
+            yield np.asarray(chunk, dtype=np.float64)
+
+
+def _histogram_quantiles(chunks: ChunkSource, columns: Optional[Sequence[str]], lower: np.ndarray,
+                         upper: np.ndarray, percentiles: Sequence[float], n_bins: int) -> np.ndarray:
+    """
+    Приближенные перцентили колонок по гистограмме на сетке [min, max].
+
+    Погрешность не больше ширины интервала (max - min) / n_bins. Если все
+    значения интервала совпадают (например, нули разреженной колонки),
+    перцентиль равен этому значению точно.
+
+    Returns:
+        Массив формы (len(percentiles), колонки)
+    """
+    n_columns = len(lower)
+    width = np.where(upper > lower, (upper - lower) / n_bins, 1.0)
+    offsets = np.arange(n_columns) * n_bins
+    counts = np.zeros(n_columns * n_bins, dtype=np.int64)
+    # Минимум и максимум значений в каждом интервале
+    bin_min = np.full(n_columns * n_bins, np.inf)
+    bin_max = np.full(n_columns * n_bins, -np.inf)
+
+    for X in _iter_matrices(chunks, columns):
+        bins = np.floor((X - lower) / width)
+        valid = ~np.isnan(bins)
+        bins = np.clip(bins, 0, n_bins - 1)
+        flat = (bins + offsets)[valid].astype(np.int64)
+        counts += np.bincount(flat, minlength=counts.size)
+        np.minimum.at(bin_min, flat, X[valid])
+        np.maximum.at(bin_max, flat, X[valid])
+
+    counts = counts.reshape(n_columns, n_bins)
+    bin_min = bin_min.reshape(n_columns, n_bins)
+    bin_max = bin_max.reshape(n_columns, n_bins)
+    cumulative = np.cumsum(counts, axis=1)
+    totals = cumulative[:, -1]
+
+    result = np.full((len(percentiles), n_columns), np.nan)
+    for k, percentile in enumerate(percentiles):
+        # Ранг как в np.percentile (линейная интерполяция), внутри интервала значения равномерны
+        rank = percentile / 100.0 * (totals - 1)
+        for j in np.flatnonzero(totals):
+            b = int(np.searchsorted(cumulative[j], rank[j], side="right"))
+            if bin_min[j, b] == bin_max[j, b]:
+                result[k, j] = bin_min[j, b]
+                continue
+            before = cumulative[j, b - 1] if b > 0 else 0
+            fraction = (rank[j] - before + 0.5) / counts[j, b]
+            result[k, j] = lower[j] + (b + min(fraction, 1.0)) * width[j]
+    return np.clip(result, lower, upper)
+
+
+def fit_scaler_stream(scaler: Any, chunks: ChunkSource, columns: Optional[Sequence[str]] = None,
+                      n_bins: int = 4096) -> int:
+    """
+    Обучает скейлер по частям данных.
+
+    Args:
+        scaler: StandardScaler/MinMaxScaler (partial_fit) или RobustScaler (приближенные квантили)
+        chunks: Фабрика итераторов частей или список частей (массивы или DataFrame)
+        columns: Колонки DataFrame-частей (по умолчанию все)
+        n_bins: Интервалов гистограммы для квантилей RobustScaler
+
+    Returns:
+        Количество строк в данных
+    """
+    if isinstance(scaler, RobustScaler):
+        return _fit_robust_stream(scaler, chunks, columns, n_bins)
+    if not hasattr(scaler, "partial_fit"):
+        raise ValueError(f"Скейлер {type(scaler).__name__} не поддерживает обучение по частям")
+
+    n_rows = 0
+    for X in _iter_matrices(chunks, columns):
+        if len(X):
+            scaler.partial_fit(X)
+            n_rows += len(X)
+    if n_rows == 0:
+        raise ValueError("Нет данных для обучения скейлера")
+    logger.info(f"Скейлер {type(scaler).__name__} обучен по частям на {n_rows} образцах")
+    return n_rows
+
+
+def _fit_robust_stream(scaler: RobustScaler, chunks: ChunkSource, columns: Optional[Sequence[str]],
+                       n_bins: int) -> int:
+    """Обучает RobustScaler по приближенным медиане и квантилям (два прохода по данным)."""
+    q_min, q_max = scaler.quantile_range
+    if not 0 <= q_min <= q_max <= 100:
+        raise ValueError(f"Недопустимый диапазон квантилей: {scaler.quantile_range}")
+
+    lower, upper, n_rows = None, None, 0
+    for X in _iter_matrices(chunks, columns):
+        if not len(X):
+            continue
+        chunk_lower, chunk_upper = np.nanmin(X, axis=0), np.nanmax(X, axis=0)
+        lower = chunk_lower if lower is None else np.fmin(lower, chunk_lower)
+        upper = chunk_upper if upper is None else np.fmax(upper, chunk_upper)
+        n_rows += len(X)
+    if n_rows == 0:
+        raise ValueError("Нет данных для обучения скейлера")
+    lower, upper = np.nan_to_num(lower), np.nan_to_num(upper)
+
+    median, low, high = _histogram_quantiles(chunks, columns, lower, upper, (50.0, q_min, q_max), n_bins)
+    scaler.center_ = median if scaler.with_centering else None
+    scaler.scale_ = None
+    if scaler.with_scaling:
+        scale = high - low
+        # IQR меньше ширины интервала гистограммы не отличим от нуля: как RobustScaler, не масштабируем
+        scale[scale < (upper - lower) / n_bins] = 0.0
+        scale[scale == 0.0] = 1.0
+        if scaler.unit_variance:
+            scale = scale / (stats.norm.ppf(q_max / 100.0) - stats.norm.ppf(q_min / 100.0))
+        scaler.scale_ = scale
+    scaler.n_features_in_ = len(lower)
+    logger.info(f"RobustScaler обучен по приближенным квантилям ({n_bins} интервалов) на {n_rows} образцах")
+    return n_rows
+
+
+def transform_to_memmap(scaler: Any, chunks: ChunkSource, output_path: str, n_rows: int,
+                        columns: Optional[Sequence[str]] = None) -> np.memmap:
+    """
+    Нормализует части обученным скейлером и записывает их в файл .npy (memmap).
+
+    Args:
+        scaler: Обученный скейлер
+        chunks: Фабрика итераторов частей или список частей
+        output_path: Путь к файлу .npy
+        n_rows: Количество строк (результат fit_scaler_stream)
+        columns: Колонки DataFrame-частей
+
+    Returns:
+        Результат как np.memmap (открыт на чтение и запись)
+    """
+    output = None
+    start = 0
+    for X in _iter_matrices(chunks, columns):
+        if output is None:
+            output = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.float64,
+                                               shape=(n_rows, X.shape[1]))
+        if start + len(X) > n_rows:
+            raise ValueError(f"Части содержат больше строк, чем ожидалось ({n_rows})")
+        output[start:start + len(X)] = scaler.transform(X)
+        start += len(X)
+
+    if output is None or start != n_rows:
+        raise ValueError(f"Части содержат {start} строк, ожидалось {n_rows}")
+    output.flush()
+    logger.info(f"Нормализованные данные записаны в {output_path}: {output.shape}")
+    return output
+
+
+def scale_out_of_core(scaler: Any, chunks: ChunkSource, output_path: str, columns: Optional[Sequence[str]] = None,
+                      n_bins: int = 4096) -> Tuple[Any, np.memmap]:
+    """
+    Обучает скейлер по частям и нормализует данные в memmap-файл.
+
+    Args:
+        scaler: Необученный скейлер
+        chunks: Фабрика итераторов частей или список частей
+        output_path: Путь к файлу .npy результата
+        columns: Колонки DataFrame-частей
+        n_bins: Интервалов гистограммы для квантилей RobustScaler
+
+    Returns:
+        Tuple (обученный скейлер, нормализованные данные)
+    """
+    n_rows = fit_scaler_stream(scaler, chunks, columns=columns, n_bins=n_bins)
+    return scaler, transform_to_memmap(scaler, chunks, output_path, n_rows, columns=columns)
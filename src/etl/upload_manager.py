@@ -0,0 +1,324 @@
+"""
+Модуль параллельной загрузки результатов в облачные хранилища.
+
+Загрузки выполняются в пуле потоков, большие файлы передаются частями
+(multipart в S3, resumable в GCS), объекты с совпадающей контрольной суммой
+пропускаются, а временные ошибки повторяются с экспоненциальной задержкой.
+Бэкенд LocalFSBackend хранит объекты в локальной директории и используется
+для тестов и локального зеркала без облачных учетных данных.
+
+Автор: Самородов Юрий Сергеевич, МФТИ
+"""
+import os
+import sys
+import time
+import base64
+import random
+import shutil
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+# Добавляем корневую папку в путь для импорта конфигурации
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config.config_utils import get_logger, ensure_dir
+except ImportError:
+    def get_logger(name: str):
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(name)
+
+    def ensure_dir(path: str) -> None:
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+try:
+    from .atomic_io import atomic_write
+except ImportError:
+    from atomic_io import atomic_write
+
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_md5(file_path: str) -> str:
+    """Вычисляет MD5 файла потоково (hex)."""
+    digest = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadBackend(ABC):
+    """Базовый класс бэкенда загрузки."""
+
+    name = "backend"
+
+    @abstractmethod
+    def get_remote_checksum(self, key: str) -> Optional[str]:
+        """Возвращает MD5 (hex) удаленного объекта или None, если объекта нет."""
+
+    @abstractmethod
+    def upload(self, local_path: str, key: str, md5: str, multipart: bool, part_size: int) -> None:
+        """Загружает файл; при ошибке выбрасывает исключение."""
+
+
+class LocalFSBackend(UploadBackend):
+    """Бэкенд на локальной файловой системе (эмулятор облачного хранилища)."""
+
+    name = "local"
+
+    def __init__(self, root: str, name: str = "local"):
+        """
+        Инициализация бэкенда.
+
+        Args:
+            root: Корневая директория "bucket"
+            name: Имя бэкенда в результатах загрузки
+        """
+        self.root = root
+        self.name = name
+        ensure_dir(root)
+
+    def _object_path(self, key: str) -> str:
+        """Путь к объекту по ключу."""
+        return os.path.join(self.root, *key.split("/"))
+
+    def get_remote_checksum(self, key: str) -> Optional[str]:
+        object_path = self._object_path(key)
+        checksum_path = f"{object_path}.md5"
+        if not os.path.exists(object_path) or not os.path.exists(checksum_path):
+            return None
+        with open(checksum_path, 'r') as f:
+            return f.read().strip()
+
+    def upload(self, local_path: str, key: str, md5: str, multipart: bool, part_size: int) -> None:
+        object_path = self._object_path(key)
+        ensure_dir(os.path.dirname(object_path))
+        temp_path = f"{object_path}.tmp"
+
+        if multipart:
+            # Части сохраняются между попытками, поэтому повтор продолжает загрузку
+            parts_dir = f"{object_path}.parts"
+            ensure_dir(parts_dir)
+            file_size = os.path.getsize(local_path)
+            part_paths = []
+            with open(local_path, 'rb') as source:
+                for index, offset in enumerate(range(0, max(file_size, 1), part_size)):
+                    part_path = os.path.join(parts_dir, f"{index:05d}")
+                    expected_size = min(part_size, file_size - offset)
+                    part_paths.append(part_path)
+                    if os.path.exists(part_path) and os.path.getsize(part_path) == expected_size:
+                        continue
+                    source.seek(offset)
+                    self._write_part(part_path, source.read(expected_size), index)
+
+            with open(temp_path, 'wb') as target:
+                for part_path in part_paths:
+                    with open(part_path, 'rb') as part:
+                        shutil.copyfileobj(part, target)
+            shutil.rmtree(parts_dir)
+        else:
+            shutil.copyfile(local_path, temp_path)
+
+        os.replace(temp_path, object_path)
+        with atomic_write(f"{object_path}.md5", 'w', encoding='utf-8') as f:
+            f.write(md5)
+
+    def _write_part(self, part_path: str, data: bytes, index: int) -> None:
+        """Записывает одну часть multipart-загрузки."""
+        with open(part_path, 'wb') as f:
+            f.write(data)
+
+
+class S3Backend(UploadBackend):
+    """Бэкенд AWS S3 (или совместимого эмулятора, например MinIO)."""
+
+    name = "s3"
+
+    def __init__(self, client, bucket_name: str):
+        """
+        Инициализация бэкенда.
+
+        Args:
+            client: Клиент boto3 S3
+            bucket_name: Имя bucket
+        """
+        self.client = client
+        self.bucket_name = bucket_name
+
+    def get_remote_checksum(self, key: str) -> Optional[str]:
+        try:
+            head = self.client.head_object(Bucket=self.bucket_name, Key=key)
+        except Exception as e:
+            status = getattr(e, "response", {}).get("ResponseMetadata", {}).get("HTTPStatusCode")
+            if status == 404 or "Not Found" in str(e) or "404" in str(e):
+                return None
+            raise
+        # ETag multipart-объекта не является MD5, поэтому храним MD5 в метаданных
+        metadata_md5 = head.get("Metadata", {}).get("md5")
+        if metadata_md5:
+            return metadata_md5
+        etag = head.get("ETag", "").strip('"')
+        return etag if "-" not in etag else None
+
+    def upload(self, local_path: str, key: str, md5: str, multipart: bool, part_size: int) -> None:
+        from boto3.s3.transfer import TransferConfig
+
+        # multipart_threshold=part_size включает multipart только для больших файлов
+        transfer_config = TransferConfig(multipart_threshold=part_size if multipart else 2 ** 63 - 1,
+                                         multipart_chunksize=part_size, use_threads=False)
+        self.client.upload_file(local_path, self.bucket_name, key,
+                                ExtraArgs={"Metadata": {"md5": md5}}, Config=transfer_config)
+
+
+class GCSBackend(UploadBackend):
+    """Бэкенд Google Cloud Storage."""
+
+    name = "gcs"
+
+    # Размер части resumable-загрузки в GCS должен быть кратен 256 KB
+    GCS_CHUNK_ALIGNMENT = 256 * 1024
+
+    def __init__(self, client, bucket_name: str):
+        """
+        Инициализация бэкенда.
+
+        Args:
+            client: Клиент google.cloud.storage
+            bucket_name: Имя bucket
+        """
+        self.bucket = client.bucket(bucket_name)
+
+    def get_remote_checksum(self, key: str) -> Optional[str]:
+        blob = self.bucket.get_blob(key)
+        if blob is None:
+            return None
+        if blob.metadata and blob.metadata.get("md5"):
+            return blob.metadata["md5"]
+        # Для составных объектов md5_hash отсутствует
+        return base64.b64decode(blob.md5_hash).hex() if blob.md5_hash else None
+
+    def upload(self, local_path: str, key: str, md5: str, multipart: bool, part_size: int) -> None:
+        blob = self.bucket.blob(key)
+        blob.metadata = {"md5": md5}
+        if multipart:
+            # chunk_size включает resumable-загрузку частями
+            blob.chunk_size = max(self.GCS_CHUNK_ALIGNMENT,
+                                  part_size // self.GCS_CHUNK_ALIGNMENT * self.GCS_CHUNK_ALIGNMENT)
+        blob.upload_from_filename(local_path)
+
+
+class UploadManager:
+    """Параллельная загрузка файлов в один или несколько бэкендов."""
+
+    def __init__(self, backends: List[UploadBackend], max_workers: int = 4, max_retries: int = 3,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 multipart_threshold: int = 64 * 1024 * 1024, part_size: int = 8 * 1024 * 1024,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Инициализация менеджера загрузок.
+
+        Args:
+            backends: Бэкенды загрузки
+            max_workers: Количество параллельных загрузок
+            max_retries: Количество повторов после первой неудачной попытки
+            backoff_base: Базовая задержка перед повтором (секунды)
+            backoff_max: Максимальная задержка перед повтором (секунды)
+            multipart_threshold: Размер файла, начиная с которого загрузка идет частями
+            part_size: Размер части
+            sleep: Функция ожидания (подменяется в тестах)
+        """
+        self.backends = list(backends)
+        self.max_workers = max(1, int(max_workers))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        self.sleep = sleep
+
+    @classmethod
+    def from_config(cls, backends: List[UploadBackend], upload_config: Dict[str, Any]) -> "UploadManager":
+        """Создает менеджер из секции storage.upload конфигурации."""
+        return cls(
+            backends,
+            max_workers=upload_config.get("max_workers", 4),
+            max_retries=upload_config.get("max_retries", 3),
+            backoff_base=upload_config.get("backoff_base_seconds", 0.5),
+            backoff_max=upload_config.get("backoff_max_seconds", 30.0),
+            multipart_threshold=upload_config.get("multipart_threshold_mb", 64) * 1024 * 1024,
+            part_size=upload_config.get("part_size_mb", 8) * 1024 * 1024
+        )
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Задержка перед повтором: экспонента с полным джиттером."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _upload_one(self, backend: UploadBackend, local_path: str, key: str, md5: str) -> Dict[str, Any]:
+        """Загружает один файл в один бэкенд с проверкой контрольной суммы и повторами."""
+        file_size = os.path.getsize(local_path)
+        multipart = file_size >= self.multipart_threshold
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                if backend.get_remote_checksum(key) == md5:
+                    logger.info(f"Объект {backend.name}:{key} уже загружен, пропускаем")
+                    return {"status": "skipped", "attempts": attempt + 1}
+
+                backend.upload(local_path, key, md5, multipart, self.part_size)
+                logger.info(f"Файл загружен в {backend.name}: {local_path} -> {key}")
+                return {"status": "uploaded", "attempts": attempt + 1, "multipart": multipart,
+                        "bytes": file_size}
+
+            except Exception as e:
+                last_error = e
+                if attempt < self.max_retries:
+                    delay = self._backoff_delay(attempt)
+                    logger.warning(f"Ошибка загрузки {local_path} в {backend.name} "
+                                   f"(попытка {attempt + 1}): {e}. Повтор через {delay:.1f} с")
+                    self.sleep(delay)
+
+        logger.error(f"Не удалось загрузить {local_path} в {backend.name}: {last_error}")
+        return {"status": "failed", "attempts": self.max_retries + 1, "error": str(last_error)}
+
+    def upload_files(self, files: List[Tuple[str, str]]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Загружает файлы во все бэкенды параллельно.
+
+        Args:
+            files: Пары (локальный путь, ключ объекта)
+
+        Returns:
+            Результаты по бэкендам и ключам
+        """
+        files = [(path, key) for path, key in files if os.path.exists(path)]
+        results = {backend.name: {} for backend in self.backends}
+        if not files or not self.backends:
+            return results
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Контрольная сумма каждого файла считается один раз для всех бэкендов
+            checksums = dict(zip([path for path, _ in files],
+                                 executor.map(file_md5, [path for path, _ in files])))
+
+            futures = {
+                executor.submit(self._upload_one, backend, path, key, checksums[path]): (backend.name, key)
+                for backend in self.backends for path, key in files
+            }
+            for future, (backend_name, key) in futures.items():
+                results[backend_name][key] = future.result()
+
+        return results
+
+    @staticmethod
+    def backend_succeeded(results: Dict[str, Dict[str, Any]]) -> bool:
+        """Проверяет, что хотя бы один файл бэкенда загружен или уже был в хранилище."""
+        return any(item["status"] in ("uploaded", "skipped") for item in results.values())
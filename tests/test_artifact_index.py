@@ -0,0 +1,134 @@
+"""
+Тесты для модуля индекса артефактов и политики хранения.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+from datetime import datetime, timedelta
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.artifact_index import ArtifactIndex, infer_kind, infer_run_id
+from etl.artifact_store import ArtifactStore
+
+
+class TestArtifactIndex(unittest.TestCase):
+    """Тесты для класса ArtifactIndex."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.results_dir = os.path.join(self.temp_dir, "results")
+        os.makedirs(self.results_dir)
+        self.index = ArtifactIndex(os.path.join(self.results_dir, "artifact_index.db"))
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        self.index.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _artifact(self, name: str, days_ago: float, score: float = None) -> str:
+        """Создает файл артефакта и регистрирует его в индексе."""
+        file_path = os.path.join(self.results_dir, name)
+        with open(file_path, "w") as f:
+            f.write(name)
+        created_at = datetime.now() - timedelta(days=days_ago)
+        os.utime(file_path, (created_at.timestamp(), created_at.timestamp()))
+        self.index.register(file_path, score=score, created_at=created_at.isoformat())
+        return file_path
+
+    def test_infer_kind_and_run_id(self):
+        """Тест определения типа артефакта и запуска по имени файла."""
+        self.assertEqual(infer_kind("results/final_model_20250616_000108.joblib"), "model")
+        self.assertEqual(infer_kind("results/ml_pipeline_results_20250616_000108.zip"), "archive")
+        self.assertEqual(infer_kind("results/roc_curve.png"), "plot")
+        self.assertEqual(infer_run_id("results/final_metrics_20250616_000108.json"), "20250616_000108")
+        self.assertEqual(infer_run_id("results/metrics.json"), "unassigned")
+
+    def test_keep_last_runs_and_best_model(self):
+        """Тест политики: последние N запусков и лучшая модель сохраняются."""
+        best_model = self._artifact("final_model_20250101_000000.joblib", days_ago=60, score=0.99)
+        old_metrics = self._artifact("final_metrics_20250101_000000.json", days_ago=60)
+        old_model = self._artifact("final_model_20250201_000000.joblib", days_ago=40, score=0.90)
+        recent = [self._artifact(f"final_metrics_2025060{day}_000000.json", days_ago=10 - day)
+                  for day in range(1, 4)]
+
+        result = self.index.apply_retention(keep_last_runs=2, max_age_days=None, batch_size=1)
+
+        self.assertTrue(os.path.exists(best_model))
+        self.assertFalse(os.path.exists(old_metrics))
+        self.assertFalse(os.path.exists(old_model))
+        self.assertFalse(os.path.exists(recent[0]))
+        self.assertTrue(all(os.path.exists(path) for path in recent[1:]))
+        self.assertEqual(result["deleted_files"], 3)
+        self.assertEqual([run["run_id"] for run in self.index.list_runs()],
+                         ["20250603_000000", "20250602_000000", "20250101_000000"])
+
+    def test_max_age_limits_deletion(self):
+        """Тест: артефакты моложе max_age_days не удаляются даже вне последних запусков."""
+        old = self._artifact("final_metrics_20250101_000000.json", days_ago=60)
+        young = self._artifact("final_metrics_20250601_000000.json", days_ago=5)
+        self._artifact("final_metrics_20250602_000000.json", days_ago=1)
+
+        dry_run = self.index.apply_retention(keep_last_runs=1, max_age_days=30, dry_run=True)
+        self.assertEqual(dry_run["candidates"], [os.path.normpath(old)])
+        self.assertTrue(os.path.exists(old))
+
+        self.index.apply_retention(keep_last_runs=1, max_age_days=30)
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(young))
+
+    def test_backfill_and_released_blobs(self):
+        """Тест однократного заполнения индекса и освобождения блобов хранилища."""
+        store = ArtifactStore(os.path.join(self.results_dir, ".artifact_store"))
+        file_path = os.path.join(self.results_dir, "final_metrics_20250101_000000.json")
+        digest = store.put_bytes(b'{"accuracy": 0.97}', file_path)
+        os.utime(file_path, (0, 0))
+
+        self.assertEqual(self.index.backfill(self.results_dir), 1)
+        self.assertEqual(self.index.backfill(self.results_dir), 0)
+        self.index.register(file_path, sha256=digest, created_at=datetime(2025, 1, 1).isoformat())
+
+        result = self.index.apply_retention(keep_last_runs=0, max_age_days=1)
+        self.assertEqual(result["released_sha256"], [digest])
+        self.assertEqual(store.release(result["released_sha256"])["removed_blobs"], 1)
+        self.assertFalse(os.path.exists(store.blob_path(digest)))
+
+    def test_failed_removal_keeps_index_row(self):
+        """Тест: запись индекса остается, если файл не удалось удалить."""
+        stuck = os.path.join(self.results_dir, "final_metrics_20250101_000000")
+        os.makedirs(stuck)
+        self.index.register(stuck, size=0, created_at=datetime(2025, 1, 1).isoformat())
+        removed = self._artifact("final_model_20250102_000000.joblib", days_ago=60)
+        self._artifact("final_metrics_20250601_000000.json", days_ago=1)
+
+        result = self.index.apply_retention(keep_last_runs=1, max_age_days=None, keep_best_model=False)
+
+        self.assertFalse(os.path.exists(removed))
+        self.assertEqual(result["deleted_files"], 1)
+        self.assertIn(os.path.normpath(stuck), self.index.indexed_paths())
+        self.assertNotIn(os.path.normpath(removed), self.index.indexed_paths())
+
+    def test_protected_and_rewritten_files_are_kept(self):
+        """Тест: защищенные файлы и файлы, перезаписанные после регистрации, не удаляются."""
+        os.makedirs(os.path.join(self.results_dir, "preprocessors"))
+        protected = [self._artifact(name, days_ago=60) for name in
+                     ("current_model.joblib", "current_model_metadata.json", "preprocessors/scaler.joblib")]
+        rewritten = self._artifact("evaluation_report.md", days_ago=60)
+        with open(rewritten, "w") as f:
+            f.write("new report")
+        expired = self._artifact("roc_curve.png", days_ago=60)
+        self._artifact("final_metrics_20250601_000000.json", days_ago=1)
+
+        result = self.index.apply_retention(keep_last_runs=1, max_age_days=30)
+
+        self.assertEqual(result["candidates"], [os.path.normpath(expired)])
+        self.assertTrue(all(os.path.exists(path) for path in protected + [rewritten]))
+        self.assertFalse(os.path.exists(expired))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Тесты для модуля контентно-адресуемого хранилища артефактов.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.artifact_store import ArtifactStore
+
+
+class TestArtifactStore(unittest.TestCase):
+    """Тесты для класса ArtifactStore."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.results_dir = os.path.join(self.temp_dir, "results")
+        self.store = ArtifactStore(os.path.join(self.results_dir, ".artifact_store"))
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        shutil.rmtree(self.temp_dir)
+
+    def _path(self, name: str) -> str:
+        """Путь внутри тестовой директории результатов."""
+        return os.path.join(self.results_dir, name)
+
+    def test_identical_content_stored_once(self):
+        """Тест: одинаковое содержимое хранится одним блобом."""
+        first = self.store.put_bytes(b'{"accuracy": 0.97}', self._path("final_metrics_1.json"))
+        second = self.store.put_bytes(b'{"accuracy": 0.97}', self._path("final_metrics_2.json"))
+
+        self.assertEqual(first, second)
+        self.assertTrue(os.path.samefile(self._path("final_metrics_1.json"), self._path("final_metrics_2.json")))
+        stats = self.store.get_stats()
+        self.assertEqual(stats["blobs"], 1)
+        self.assertEqual(stats["saved_bytes"], len(b'{"accuracy": 0.97}'))
+
+    def test_put_file_isolated_from_source(self):
+        """Тест: перезапись исходного файла не меняет сохраненный артефакт."""
+        source = os.path.join(self.temp_dir, "model.joblib")
+        with open(source, "wb") as f:
+            f.write(b"model-v1")
+
+        self.store.put_file(source, self._path("final_model_1.joblib"))
+        with open(source, "wb") as f:
+            f.write(b"model-v2")
+
+        with open(self._path("final_model_1.joblib"), "rb") as f:
+            self.assertEqual(f.read(), b"model-v1")
+
+    def test_overwrite_destination_keeps_other_links(self):
+        """Тест: перезапись одного файла не затрагивает другие ссылки на блоб."""
+        self.store.put_bytes(b"same", self._path("a.json"))
+        self.store.put_bytes(b"same", self._path("b.json"))
+        self.store.put_bytes(b"changed", self._path("a.json"))
+
+        with open(self._path("a.json"), "rb") as f:
+            self.assertEqual(f.read(), b"changed")
+        with open(self._path("b.json"), "rb") as f:
+            self.assertEqual(f.read(), b"same")
+
+    def test_garbage_collection_removes_unreferenced_blobs(self):
+        """Тест сборки мусора: удаляются только блобы без ссылок."""
+        self.store.put_bytes(b"kept", self._path("kept.json"))
+        self.store.put_bytes(b"dropped", self._path("dropped.json"))
+        os.remove(self._path("dropped.json"))
+
+        result = self.store.collect_garbage(grace_seconds=0)
+
+        self.assertEqual(result["removed_blobs"], 1)
+        self.assertEqual(result["freed_bytes"], len(b"dropped"))
+        self.assertEqual(self.store.get_stats()["blobs"], 1)
+        with open(self._path("kept.json"), "rb") as f:
+            self.assertEqual(f.read(), b"kept")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Тесты для модуля атомарной записи файлов.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+from unittest import mock
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl import atomic_io
+from etl.atomic_io import (atomic_write, write_bytes_atomic, read_bytes_verified, verify_checksum,
+                           checksum_path, batched_directory_sync)
+from etl.json_serializer import dump_json, load_json
+
+
+class TestAtomicIO(unittest.TestCase):
+    """Тесты для атомарной записи и проверки контрольных сумм."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, "results", "metrics.json")
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_failed_write_keeps_previous_file(self):
+        """Тест: прерванная запись не портит существующий файл и не оставляет временных."""
+        write_bytes_atomic(self.file_path, b'{"accuracy": 0.97}')
+
+        with self.assertRaises(RuntimeError):
+            with atomic_write(self.file_path) as f:
+                f.write(b'{"accur')
+                raise RuntimeError("задача прервана")
+
+        self.assertEqual(read_bytes_verified(self.file_path), b'{"accuracy": 0.97}')
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.file_path))),
+                         ["metrics.json", "metrics.json.sha256"])
+
+    def test_checksum_detects_corruption(self):
+        """Тест: поврежденный файл обнаруживается при чтении."""
+        dump_json({"accuracy": 0.97}, self.file_path)
+        self.assertTrue(verify_checksum(self.file_path))
+        self.assertEqual(load_json(self.file_path), {"accuracy": 0.97})
+
+        with open(self.file_path, "r+b") as f:
+            f.truncate(5)
+
+        self.assertFalse(verify_checksum(self.file_path))
+        with self.assertRaises(ValueError):
+            load_json(self.file_path)
+
+    def test_files_without_checksum_are_accepted(self):
+        """Тест: файлы, записанные без контрольной суммы, читаются как раньше."""
+        dump_json({"accuracy": 0.97}, self.file_path, checksum=False)
+        self.assertFalse(os.path.exists(checksum_path(self.file_path)))
+        self.assertTrue(verify_checksum(self.file_path))
+        self.assertFalse(verify_checksum(os.path.join(self.temp_dir, "missing.json")))
+
+    def test_batched_directory_sync(self):
+        """Тест: в пакетном режиме каждая директория синхронизируется один раз."""
+        with mock.patch.object(atomic_io, "fsync_directory") as fsync_directory:
+            with batched_directory_sync():
+                for idx in range(3):
+                    write_bytes_atomic(os.path.join(self.temp_dir, f"report_{idx}.json"), b"{}")
+                with batched_directory_sync():
+                    write_bytes_atomic(self.file_path, b"{}")
+                fsync_directory.assert_not_called()
+
+        synced = sorted(call.args[0] for call in fsync_directory.call_args_list)
+        self.assertEqual(synced, sorted([os.path.abspath(self.temp_dir),
+                                         os.path.abspath(os.path.dirname(self.file_path))]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Тесты для компактного представления DataFrame.
+"""
+import unittest
+import os
+
+import numpy as np
+import pandas as pd
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.compact_dtypes import (apply_dtype_profile, compact_frame, dtype_family, feature_dtype_columns,
+                                is_feature_dtype, memory_usage_mb)
+
+
+class TestCompactDtypes(unittest.TestCase):
+    """Тесты компактных типов и проверок по семейству типа."""
+
+    def setUp(self):
+        """Данные в типах, как после чтения CSV."""
+        rng = np.random.default_rng(42)
+        self.df = pd.DataFrame({
+            'id': np.arange(842302, 842302 + 200, dtype=np.int64),
+            'diagnosis': np.where(np.arange(200) % 3 == 0, 'M', 'B').astype(object),
+            'radius_mean': rng.normal(14, 3.5, 200).round(3),
+            'area_mean': rng.normal(650, 350, 200).round(1),
+            'n_nodes': rng.integers(0, 20, 200)
+        })
+
+    def test_compact_frame_types_and_memory(self):
+        """Тест: float32 признаки, категориальный diagnosis, наименьшие целые типы, памяти меньше вдвое."""
+        compact = compact_frame(self.df)
+
+        self.assertEqual(compact['radius_mean'].dtype, np.float32)
+        self.assertEqual(compact['id'].dtype, np.int32)
+        self.assertEqual(compact['n_nodes'].dtype, np.int8)
+        self.assertEqual(list(compact['diagnosis'].cat.categories), ['B', 'M'])
+        self.assertEqual(compact['diagnosis'].tolist(), self.df['diagnosis'].tolist())
+        np.testing.assert_allclose(compact['area_mean'], self.df['area_mean'], rtol=1e-6)
+        self.assertLess(memory_usage_mb(compact), memory_usage_mb(self.df) / 2)
+
+        # Исходный DataFrame не изменяется
+        self.assertEqual(self.df['radius_mean'].dtype, np.float64)
+        self.assertIs(apply_dtype_profile(self.df, "default"), self.df)
+        with self.assertRaises(ValueError):
+            apply_dtype_profile(self.df, "float16")
+
+    def test_categories_stable_across_chunks(self):
+        """Тест: категории одинаковы во всех частях, неизвестные значения сохраняются."""
+        first = compact_frame(self.df.iloc[:2])
+        second = compact_frame(self.df.iloc[1:3])
+        self.assertEqual(first['diagnosis'].dtype, second['diagnosis'].dtype)
+        self.assertEqual(pd.concat([first, second])['diagnosis'].dtype.name, 'category')
+
+        unknown = compact_frame(self.df.assign(diagnosis=self.df['diagnosis'].replace('M', 'X')))
+        self.assertIn('X', unknown['diagnosis'].cat.categories)
+
+    def test_dtype_family_checks(self):
+        """Тест: признаки отбираются по семейству типа, без bool и категорий."""
+        compact = compact_frame(self.df.assign(flag=True))
+        for frame in (self.df.assign(flag=True), compact):
+            self.assertEqual(feature_dtype_columns(frame, exclude=['id']), ['radius_mean', 'area_mean', 'n_nodes'])
+
+        self.assertEqual(dtype_family(compact['id'].dtype), "integer")
+        self.assertEqual(dtype_family(compact['radius_mean'].dtype), "float")
+        self.assertEqual(dtype_family(compact['diagnosis'].dtype), "categorical")
+        self.assertEqual(dtype_family(self.df['diagnosis'].dtype), "string")
+        self.assertTrue(is_feature_dtype(pd.Int32Dtype()))
+        self.assertFalse(is_feature_dtype(np.dtype(bool)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Тесты для типизированной схемы конфигурации.
+"""
+import unittest
+import os
+import dataclasses
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config_schema import compile_settings, flatten_config, PipelineSettings
+
+
+class TestConfigSchema(unittest.TestCase):
+    """Тесты компиляции и проверки настроек."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.raw_config = {
+            "data": {"source_file": "data/wdbc.data.csv", "columns": ["id", "diagnosis"], "test_size": 0.25},
+            "model": {"type": "LogisticRegression", "parameters": {"max_iter": 1000},
+                      "serialization": {"compression": "zlib", "compress_level": 5}},
+            "preprocessing": {
+                "outlier_detection": {"method": "zscore", "action": "remove"},
+                "feature_engineering": {"enabled": False},
+                "feature_selection": {"enabled": True, "method": "pca", "n_features": 10},
+                "scaling": {"method": "robust"},
+                "train_test_split": {"test_size": 0.3, "stratify": False}
+            },
+            "data_quality": {"thresholds": {"missing_values_pct": 2},
+                             "drift_detection": {"enabled": True, "psi_bins": 10}},
+            "storage": {"results_format": "binary"}
+        }
+
+    def test_compile_typed_settings(self):
+        """Тест компиляции словаря в типизированные настройки с умолчаниями."""
+        with self.assertNoLogs("config.config_schema", level="WARNING"):
+            settings = compile_settings(self.raw_config)
+
+        self.assertIsInstance(settings, PipelineSettings)
+        self.assertEqual(settings.data.columns, ("id", "diagnosis"))
+        self.assertEqual(settings.model.serialization.compress_level, 5)
+        self.assertEqual(settings.preprocessing.scaling.method, "robust")
+        self.assertEqual(settings.preprocessing.feature_selection.method, "pca")
+        self.assertFalse(settings.preprocessing.feature_engineering.enabled)
+        self.assertTrue(settings.preprocessing.feature_engineering.create_ratios)
+        self.assertEqual(settings.preprocessing.train_test_split.test_size, 0.3)
+        self.assertEqual(settings.data_quality.thresholds.missing_values_pct, 2.0)
+        self.assertIsInstance(settings.data_quality.thresholds.missing_values_pct, float)
+        self.assertEqual(settings.data_quality.drift_detection["psi_bins"], 10)
+        self.assertEqual(settings.storage["results_format"], "binary")
+        self.assertEqual(settings.logging.level, "INFO")
+
+        # Настройки неизменяемы
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            settings.preprocessing.scaling.method = "minmax"
+
+    def test_invalid_values_rejected(self):
+        """Тест: неверные значения, типы и диапазоны отклоняются с путем к ключу."""
+        invalid_cases = [
+            (("preprocessing", "scaling", "method"), "quantile"),
+            (("preprocessing", "feature_selection", "n_features"), 0),
+            (("preprocessing", "feature_selection", "enabled"), "yes"),
+            (("preprocessing", "train_test_split", "test_size"), 1.0),
+            (("model", "serialization", "compression"), "zstd"),
+        ]
+        for keys, value in invalid_cases:
+            raw_config = {"preprocessing": {"scaling": {}, "feature_selection": {}, "train_test_split": {}},
+                          "model": {"serialization": {}}}
+            raw_config[keys[0]][keys[1]][keys[2]] = value
+            with self.subTest(key=".".join(keys)):
+                with self.assertRaises(ValueError) as context:
+                    compile_settings(raw_config)
+                self.assertIn(".".join(keys), str(context.exception))
+
+        with self.assertRaises(ValueError):
+            compile_settings({"preprocessing": ["scaling"]})
+
+    def test_empty_config_uses_defaults(self):
+        """Тест: пустая конфигурация дает настройки по умолчанию."""
+        settings = compile_settings(None)
+        self.assertEqual(settings.preprocessing.outlier_detection.method, "iqr")
+        self.assertEqual(settings.preprocessing.feature_selection.n_features, 20)
+        self.assertEqual(settings.data.dtype_profile, "default")
+        self.assertFalse(settings.preprocessing.profile_memory)
+
+        with self.assertRaises(ValueError) as context:
+            compile_settings({"data": {"dtype_profile": "float16"}})
+        self.assertIn("data.dtype_profile", str(context.exception))
+
+    def test_feature_definitions(self):
+        """Тест: декларативные признаки разбираются в неизменяемые определения."""
+        features = [{"name": "ratio", "expression": "radius_mean / perimeter_mean"}]
+        settings = compile_settings({"preprocessing": {"feature_engineering": {"features": features}}})
+        definition = settings.preprocessing.feature_engineering.features[0]
+        self.assertEqual((definition.name, definition.expression), ("ratio", "radius_mean / perimeter_mean"))
+
+        with self.assertRaises(ValueError) as context:
+            compile_settings({"preprocessing": {"feature_engineering": {"features": [{"name": "ratio"}]}}})
+        self.assertIn("features[0].expression", str(context.exception))
+
+    def test_flatten_config(self):
+        """Тест индекса составных ключей."""
+        flat = flatten_config(self.raw_config)
+        self.assertEqual(flat["preprocessing.scaling.method"], "robust")
+        self.assertEqual(flat["model.parameters"], {"max_iter": 1000})
+        self.assertNotIn("preprocessing.scaling.method.x", flat)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Тесты для утилит конфигурации.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+from unittest import mock
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config_utils
+from config.config_utils import Config, get_config, clear_config_cache
+
+
+class TestConfigCache(unittest.TestCase):
+    """Тесты для кэша конфигурации процесса."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, "config.yaml")
+        self._write_config(max_iter=1000)
+        clear_config_cache()
+
+        # Логирование настраивается на временную директорию и не трогает глобальные обработчики
+        patcher = mock.patch.object(config_utils.logging, "basicConfig")
+        self.basic_config = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(config_utils, "_logging_configured", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        clear_config_cache()
+        shutil.rmtree(self.temp_dir)
+
+    def _write_config(self, max_iter: int):
+        """Записывает тестовый файл конфигурации."""
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            f.write(f"model:\n  parameters:\n    max_iter: {max_iter}\n"
+                    f"logging:\n  level: INFO\n  log_path: {os.path.join(self.temp_dir, 'logs')}\n")
+
+    def test_yaml_parsed_once_for_many_instances(self):
+        """Тест: шесть компонентов не разбирают YAML и не настраивают логирование повторно."""
+        with mock.patch.object(config_utils.yaml, "safe_load", wraps=config_utils.yaml.safe_load) as safe_load:
+            configs = [Config(self.config_path) for _ in range(6)]
+
+        self.assertEqual(safe_load.call_count, 1)
+        self.assertEqual(self.basic_config.call_count, 1)
+        self.assertTrue(all(config.get("model.parameters.max_iter") == 1000 for config in configs))
+
+        # Изменение конфигурации одним экземпляром не влияет на остальные
+        configs[0].config["model"]["parameters"]["max_iter"] = 1
+        self.assertEqual(Config(self.config_path).get("model.parameters.max_iter"), 1000)
+
+    def test_shared_instance_reloads_changed_file(self):
+        """Тест: общий экземпляр перечитывается после изменения файла."""
+        config = get_config(self.config_path)
+        self.assertIs(get_config(self.config_path), config)
+        self.assertFalse(config.is_stale())
+
+        self._write_config(max_iter=500)
+        stat = os.stat(self.config_path)
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        self.assertTrue(config.is_stale())
+        self.assertIs(get_config(self.config_path), config)
+        self.assertEqual(config.get("model.parameters.max_iter"), 500)
+
+    def test_dotenv_loaded_once(self):
+        """Тест: .env загружается один раз на процесс."""
+        with mock.patch.object(config_utils, "_dotenv_loaded", False), \
+                mock.patch.object(config_utils, "load_dotenv") as load_dotenv:
+            Config(self.config_path)
+            Config(self.config_path)
+        self.assertEqual(load_dotenv.call_count, 1)
+
+    def test_typed_settings_and_validation(self):
+        """Тест: настройки компилируются при загрузке, ошибки значений обнаруживаются сразу."""
+        config = Config(self.config_path)
+        self.assertEqual(config.settings.preprocessing.scaling.method, "standard")
+        self.assertIs(Config(self.config_path).settings, config.settings)
+        self.assertEqual(config.get("model.parameters"), {"max_iter": 1000})
+        self.assertEqual(config.get("model.missing", 7), 7)
+
+        with open(self.config_path, "a", encoding="utf-8") as f:
+            f.write("preprocessing:\n  scaling:\n    method: quantile\n")
+        with self.assertRaises(ValueError):
+            Config(self.config_path)
+
+    def test_missing_file(self):
+        """Тест ошибки для отсутствующего файла конфигурации."""
+        with self.assertRaises(FileNotFoundError):
+            Config(os.path.join(self.temp_dir, "missing.yaml"))
+
+
+
+class TestProjectConfig(unittest.TestCase):
+    """Тесты рабочего файла config/config.yaml."""
+
+    CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "config.yaml")
+
+    def setUp(self):
+        """Логирование не настраивается, кэш сбрасывается."""
+        clear_config_cache()
+        patcher = mock.patch.object(config_utils, "_logging_configured", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(clear_config_cache)
+
+    def test_project_config_loads(self):
+        """Тест: config.yaml - корректный YAML, вложенные разделы доступны и проходят проверку."""
+        with self.assertNoLogs("config.config_schema", level="WARNING"):
+            config = Config(self.CONFIG_PATH)
+
+        self.assertEqual(len(config.get_data_config()["columns"]), 32)
+        self.assertEqual(config.get("model.parameters.solver"), "liblinear")
+        self.assertEqual(config.settings.model.serialization.compression, "lz4")
+        self.assertEqual(config.get("storage.local.results_path"), "results/")
+        self.assertTrue(config.get("storage.retention.enabled"))
+        self.assertEqual(config.get("data_quality.drift_detection.streaming.window_type"), "sliding")
+        self.assertEqual(config.settings.data_quality.drift_detection["streaming"]["window_type"], "sliding")
+        self.assertEqual(config.settings.preprocessing.outlier_detection.isolation_forest.n_estimators, 100)
+        self.assertEqual(len(config.settings.preprocessing.feature_engineering.features), 11)
+        self.assertEqual(config.settings.preprocessing.train_test_split.test_size, 0.2)
+        self.assertFalse(config.settings.preprocessing.profile_memory)
+        self.assertEqual(config.get("airflow.dag_id"), "breast_cancer_ml_pipeline")
+
+
+if __name__ == '__main__':
+    unittest.main()
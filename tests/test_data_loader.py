@@ -16,166 +16,253 @@ from etl.data_loader import DataLoader
 
 
 class TestDataLoader(unittest.TestCase):
-"""Тесты для класса DataLoader."""
-
-def setUp(self):
-"""Настройка тестового окружения."""
-self.loader = DataLoader()
-
-# Создаем тестовые данные
-self.test_data = [
-"842302,M,17.99,10.38,122.8,1001,0.1184,0.2776,0.3001,0.1471,0.2419,0.07871,1.095,0.9053,8.589,153.4,0.006399,0.04904,0.05373,0.01587,0.03003,0.006193,25.38,17.33,184.6,2019,0.1622,0.6656,0.7119,0.2654,0.4601,0.1189",
-"842517,M,20.57,17.77,132.9,1326,0.08474,0.07864,0.0869,0.07017,0.1812,0.05667,0.5435,0.7339,3.398,74.08,0.005225,0.01308,0.0186,0.0134,0.01389,0.003532,24.99,23.41,158.8,1956,0.1238,0.1866,0.2416,0.186,0.275,0.08902",
-"8510426,B,13.54,14.36,87.46,566.3,0.09779,0.08129,0.06664,0.04781,0.1885,0.05766,0.2699,0.7886,2.058,23.56,0.008462,0.0146,0.02387,0.01315,0.0198,0.0023,15.11,19.26,99.7,711.2,0.144,0.1773,0.239,0.1288,0.2977,0.07259"
-]
-
-def test_load_data_success(self):
-"""Тест успешной загрузки данных."""
-# Создаем временный файл с тестовыми данными
-with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-for line in self.test_data:
-f.write(line + '\n')
-temp_file = f.name
-
-try:
-# Тестируем загрузку
-df = self.loader.load_data(temp_file)
-
-# Проверяем результат
-self.assertIsInstance(df, pd.DataFrame)
-self.assertEqual(len(df), 3)
-self.assertEqual(len(df.columns), 32) # 32 колонки в датасете
-self.assertIn('diagnosis', df.columns)
-self.assertIn('id', df.columns)
-
-finally:
-# Удаляем временный файл
-os.unlink(temp_file)
-
-def test_load_data_file_not_found(self):
-"""Тест обработки отсутствующего файла."""
-with self.assertRaises(FileNotFoundError):
-self.loader.load_data('non_existent_file.csv')
-
-def test_analyze_data(self):
-"""Тест анализа данных."""
-# Создаем тестовый DataFrame
-df = pd.DataFrame({
-'id': [1, 2, 3],
-'diagnosis': ['M', 'B', 'M'],
-'feature1': [1.0, 2.0, 3.0],
-'feature2': [4.0, np.nan, 6.0]
-})
-
-analysis = self.loader.analyze_data(df)
-
-# Проверяем результат анализа
-self.assertIn('shape', analysis)
-self.assertIn('columns', analysis)
-self.assertIn('missing_values', analysis)
-self.assertIn('target_distribution', analysis)
-
-self.assertEqual(analysis['shape'], (3, 4))
-self.assertEqual(analysis['missing_values']['feature2'], 1)
-self.assertEqual(analysis['target_distribution']['M'], 2)
-self.assertEqual(analysis['target_distribution']['B'], 1)
-
-def test_validate_data_success(self):
-"""Тест успешной валидации данных."""
-df = pd.DataFrame({
-'id': [1, 2, 3],
-'diagnosis': ['M', 'B', 'M'],
-'feature1': [1.0, 2.0, 3.0]
-})
-
-is_valid, issues = self.loader.validate_data(df)
-
-self.assertTrue(is_valid)
-self.assertEqual(len(issues), 0)
-
-def test_validate_data_empty_dataset(self):
-"""Тест валидации пустого датасета."""
-df = pd.DataFrame()
-
-is_valid, issues = self.loader.validate_data(df)
-
-self.assertFalse(is_valid)
-self.assertIn("Датасет пустой", issues)
-
-def test_validate_data_missing_columns(self):
-"""Тест валидации при отсутствии обязательных колонок."""
-df = pd.DataFrame({
-'feature1': [1.0, 2.0, 3.0]
-})
-
-is_valid, issues = self.loader.validate_data(df)
-
-self.assertFalse(is_valid)
-self.assertTrue(any("Отсутствуют обязательные колонки" in issue for issue in issues))
-
-def test_validate_data_duplicate_ids(self):
-"""Тест валидации при дублированных ID."""
-df = pd.DataFrame({
-'id': [1, 1, 2],
-'diagnosis': ['M', 'B', 'M'],
-'feature1': [1.0, 2.0, 3.0]
-})
-
-is_valid, issues = self.loader.validate_data(df)
-
-self.assertFalse(is_valid)
-self.assertTrue(any("дублированных ID" in issue for issue in issues))
-
-def test_validate_data_invalid_diagnosis(self):
-"""Тест валидации при неверных значениях диагноза."""
-df = pd.DataFrame({
-'id': [1, 2, 3],
-'diagnosis': ['M', 'X', 'B'], # X - неверное значение
-'feature1': [1.0, 2.0, 3.0]
-})
-
-is_valid, issues = self.loader.validate_data(df)
-
-self.assertFalse(is_valid)
-self.assertTrue(any("Неизвестные значения в diagnosis" in issue for issue in issues))
-
-@patch('etl.data_loader.ensure_dir')
-@patch('builtins.open', new_callable=unittest.mock.mock_open)
-@patch('json.dump')
-def test_save_analysis_report(self, mock_json_dump, mock_open, mock_ensure_dir):
-"""Тест сохранения отчета анализа."""
-analysis = {
-'shape': (100, 32),
-'missing_values': {'feature1': 0},
-'dtypes': {'feature1': 'float64'}
-}
-
-self.loader.save_analysis_report(analysis, 'test_report.json')
-
-# Проверяем, что функции были вызваны
-mock_ensure_dir.assert_called_once()
-mock_open.assert_called_once_with('test_report.json', 'w', encoding='utf-8')
-mock_json_dump.assert_called_once()
-
-def test_get_default_columns(self):
-"""Тест получения стандартных имен колонок."""
-columns = self.loader._get_default_columns(32)
-
-self.assertEqual(len(columns), 32)
-self.assertEqual(columns[0], 'id')
-self.assertEqual(columns[1], 'diagnosis')
-self.assertIn('radius_mean', columns)
-self.assertIn('texture_mean', columns)
-
-# Тест для количества колонок меньше стандартного
-columns_short = self.loader._get_default_columns(5)
-self.assertEqual(len(columns_short), 5)
-
-# Тест для количества колонок больше стандартного
-columns_long = self.loader._get_default_columns(35)
-self.assertEqual(len(columns_long), 35)
-self.assertIn('feature_32', columns_long)
+    """Тесты для класса DataLoader."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.loader = DataLoader()
+
+        # Создаем тестовые данные
+        self.test_data = [
+            "842302,M,17.99,10.38,122.8,1001,0.1184,0.2776,0.3001,0.1471,0.2419,0.07871,1.095,0.9053,8.589,153.4,0.006399,0.04904,0.05373,0.01587,0.03003,0.006193,25.38,17.33,184.6,2019,0.1622,0.6656,0.7119,0.2654,0.4601,0.1189",
+            "842517,M,20.57,17.77,132.9,1326,0.08474,0.07864,0.0869,0.07017,0.1812,0.05667,0.5435,0.7339,3.398,74.08,0.005225,0.01308,0.0186,0.0134,0.01389,0.003532,24.99,23.41,158.8,1956,0.1238,0.1866,0.2416,0.186,0.275,0.08902",
+            "8510426,B,13.54,14.36,87.46,566.3,0.09779,0.08129,0.06664,0.04781,0.1885,0.05766,0.2699,0.7886,2.058,23.56,0.008462,0.0146,0.02387,0.01315,0.0198,0.0023,15.11,19.26,99.7,711.2,0.144,0.1773,0.239,0.1288,0.2977,0.07259"
+        ]
+
+    def test_load_data_success(self):
+        """Тест успешной загрузки данных."""
+        # Создаем временный файл с тестовыми данными
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            for line in self.test_data:
+                f.write(line + '\n')
+            temp_file = f.name
+
+        try:
+            # Тестируем загрузку
+            df = self.loader.load_data(temp_file)
+
+            # Проверяем результат
+            self.assertIsInstance(df, pd.DataFrame)
+            self.assertEqual(len(df), 3)
+            self.assertEqual(len(df.columns), 32) # 32 колонки в датасете
+            self.assertIn('diagnosis', df.columns)
+            self.assertIn('id', df.columns)
+
+        finally:
+            # Удаляем временный файл
+            os.unlink(temp_file)
+
+    def test_load_data_file_not_found(self):
+        """Тест обработки отсутствующего файла."""
+        with self.assertRaises(FileNotFoundError):
+            self.loader.load_data('non_existent_file.csv')
+
+    def test_analyze_data(self):
+        """Тест анализа данных."""
+        # Создаем тестовый DataFrame
+        df = pd.DataFrame({
+            'id': [1, 2, 3],
+            'diagnosis': ['M', 'B', 'M'],
+            'feature1': [1.0, 2.0, 3.0],
+            'feature2': [4.0, np.nan, 6.0]
+        })
+
+        analysis = self.loader.analyze_data(df)
+
+        # Проверяем результат анализа
+        self.assertIn('shape', analysis)
+        self.assertIn('columns', analysis)
+        self.assertIn('missing_values', analysis)
+        self.assertIn('target_distribution', analysis)
+
+        self.assertEqual(analysis['shape'], (3, 4))
+        self.assertEqual(analysis['missing_values']['feature2'], 1)
+        self.assertEqual(analysis['target_distribution']['M'], 2)
+        self.assertEqual(analysis['target_distribution']['B'], 1)
+
+    def test_validate_data_success(self):
+        """Тест успешной валидации данных."""
+        df = pd.DataFrame({
+            'id': [1, 2, 3],
+            'diagnosis': ['M', 'B', 'M'],
+            'feature1': [1.0, 2.0, 3.0]
+        })
+
+        is_valid, issues = self.loader.validate_data(df)
+
+        self.assertTrue(is_valid)
+        self.assertEqual(len(issues), 0)
+
+    def test_validate_data_empty_dataset(self):
+        """Тест валидации пустого датасета."""
+        df = pd.DataFrame()
+
+        is_valid, issues = self.loader.validate_data(df)
+
+        self.assertFalse(is_valid)
+        self.assertIn("Датасет пустой", issues)
+
+    def test_validate_data_missing_columns(self):
+        """Тест валидации при отсутствии обязательных колонок."""
+        df = pd.DataFrame({
+            'feature1': [1.0, 2.0, 3.0]
+        })
+
+        is_valid, issues = self.loader.validate_data(df)
+
+        self.assertFalse(is_valid)
+        self.assertTrue(any("Отсутствуют обязательные колонки" in issue for issue in issues))
+
+    def test_validate_data_duplicate_ids(self):
+        """Тест валидации при дублированных ID."""
+        df = pd.DataFrame({
+            'id': [1, 1, 2],
+            'diagnosis': ['M', 'B', 'M'],
+            'feature1': [1.0, 2.0, 3.0]
+        })
+
+        is_valid, issues = self.loader.validate_data(df)
+
+        self.assertFalse(is_valid)
+        self.assertTrue(any("дублированных ID" in issue for issue in issues))
+
+    def test_validate_data_invalid_diagnosis(self):
+        """Тест валидации при неверных значениях диагноза."""
+        df = pd.DataFrame({
+            'id': [1, 2, 3],
+            'diagnosis': ['M', 'X', 'B'], # X - неверное значение
+            'feature1': [1.0, 2.0, 3.0]
+        })
+
+        is_valid, issues = self.loader.validate_data(df)
+
+        self.assertFalse(is_valid)
+        self.assertTrue(any("Неизвестные значения в diagnosis" in issue for issue in issues))
+
+    @patch('etl.data_loader.ensure_dir')
+    @patch('etl.data_loader.dump_json')
+    def test_save_analysis_report(self, mock_dump_json, mock_ensure_dir):
+        """Тест сохранения отчета анализа."""
+        analysis = {
+            'shape': (100, 32),
+            'missing_values': {'feature1': 0},
+            'dtypes': {'feature1': 'float64'}
+        }
+
+        self.loader.save_analysis_report(analysis, 'test_report.json')
+
+        # Проверяем, что функции были вызваны
+        mock_ensure_dir.assert_called_once()
+        mock_dump_json.assert_called_once_with(analysis, 'test_report.json')
+
+    def test_get_default_columns(self):
+        """Тест получения стандартных имен колонок."""
+        columns = self.loader._get_default_columns(32)
+
+        self.assertEqual(len(columns), 32)
+        self.assertEqual(columns[0], 'id')
+        self.assertEqual(columns[1], 'diagnosis')
+        self.assertIn('radius_mean', columns)
+        self.assertIn('texture_mean', columns)
+
+        # Тест для количества колонок меньше стандартного
+        columns_short = self.loader._get_default_columns(5)
+        self.assertEqual(len(columns_short), 5)
+
+        # Тест для количества колонок больше стандартного
+        columns_long = self.loader._get_default_columns(35)
+        self.assertEqual(len(columns_long), 35)
+        self.assertIn('feature_32', columns_long)
+
+
+class TestDataLoaderChunks(unittest.TestCase):
+    """Тесты потокового чтения данных."""
+
+    def test_iter_chunks_matches_load_data(self):
+        """Тест: части файла совпадают с полной загрузкой."""
+        loader = DataLoader()
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(rng.random((25, 32)))
+        df[0] = np.arange(25)
+        df[1] = np.where(np.arange(25) % 2 == 0, "M", "B")
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            df.to_csv(f, header=False, index=False)
+            temp_file = f.name
+
+        try:
+            chunks = list(loader.iter_chunks(temp_file, chunk_size=10))
+            self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 5])
+            pd.testing.assert_frame_equal(pd.concat(chunks), loader.load_data(temp_file))
+        finally:
+            os.unlink(temp_file)
+
+    def test_compact_dtype_profile(self):
+        """Тест: профиль compact - float32 признаки, категориальный diagnosis, целый id, и в частях."""
+        loader = DataLoader()
+        loader.data_config = dict(loader.data_config, dtype_profile="compact")
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(rng.random((25, 32)))
+        df[0] = np.arange(842302, 842327)
+        df[1] = np.where(np.arange(25) % 2 == 0, "M", "B")
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            df.to_csv(f, header=False, index=False)
+            temp_file = f.name
+
+        try:
+            loaded = loader.load_data(temp_file)
+            self.assertEqual(loaded["radius_mean"].dtype, np.float32)
+            self.assertEqual(loaded["diagnosis"].dtype.name, "category")
+            self.assertTrue(pd.api.types.is_integer_dtype(loaded["id"]))
+            self.assertTrue(loader.validate_data(loaded)[0])
+            pd.testing.assert_frame_equal(pd.concat(loader.iter_chunks(temp_file, chunk_size=10)), loaded)
+        finally:
+            os.unlink(temp_file)
+
+
+class TestDataLoaderDrift(unittest.TestCase):
+    """Тесты проверки дрейфа через референсный профиль."""
+
+    def setUp(self):
+        self.loader = DataLoader()
+        self.profile_dir = tempfile.mkdtemp()
+        drift_config = dict(self.loader.config.get("data_quality.drift_detection", {}),
+                            profile_dir=self.profile_dir)
+        self.loader.config = MagicMock()
+        self.loader.config.get.side_effect = lambda key, default=None: (
+            drift_config if key == "data_quality.drift_detection" else default)
+
+        rng = np.random.default_rng(1)
+        self.reference = pd.DataFrame({
+            'id': np.arange(500),
+            'diagnosis': np.where(np.arange(500) % 3 == 0, 'M', 'B'),
+            'radius_mean': rng.normal(14, 3.5, 500),
+            'texture_mean': rng.normal(19, 4, 500)
+        })
+        self.current = self.reference.sample(frac=1.0, random_state=0).reset_index(drop=True)
+        self.current['texture_mean'] = self.current['texture_mean'] + 8
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def test_profile_roundtrip_detects_drift(self):
+        """Тест: сохраненный профиль находит тот же дрейф, что и полный референс."""
+        profile = self.loader.build_reference_profile(self.reference)
+        loaded = self.loader.load_reference_profile(profile.data_hash)
+
+        from_profile = self.loader.detect_data_drift(loaded, self.current)
+        from_frame = self.loader.detect_data_drift(self.reference, self.current)
+
+        self.assertEqual(from_profile["summary"]["affected_features"], ['texture_mean'])
+        self.assertEqual(from_frame["summary"]["affected_features"], ['texture_mean'])
+
+    def test_missing_profile_raises(self):
+        """Тест: отсутствие профиля - ValueError."""
+        with self.assertRaises(ValueError):
+            self.loader.load_reference_profile("0" * 16)
 
 
 if __name__ == '__main__':
-unittest.main()
+    unittest.main()
@@ -7,7 +7,7 @@ import numpy as np
 from unittest.mock import patch, MagicMock
 import tempfile
 import os
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler, LabelEncoder, RobustScaler
 
 # Импорт тестируемого модуля
 import sys
@@ -17,205 +17,368 @@ from etl.data_preprocessor import DataPreprocessor
 
 
 class TestDataPreprocessor(unittest.TestCase):
-"""Тесты для класса DataPreprocessor."""
+    """Тесты для класса DataPreprocessor."""
 
-def setUp(self):
-"""Настройка тестового окружения."""
-self.preprocessor = DataPreprocessor()
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.preprocessor = DataPreprocessor()
 
-# Создаем тестовые данные
-self.test_df = pd.DataFrame({
-'id': [1, 2, 3, 4, 5],
-'diagnosis': ['M', 'B', 'M', 'B', 'M'],
-'feature1': [1.0, 2.0, np.nan, 4.0, 5.0],
-'feature2': [10.0, 20.0, 30.0, 40.0, 50.0],
-'feature3': [100.0, 200.0, 300.0, 400.0, 500.0]
-})
+        # Создаем тестовые данные
+        self.test_df = pd.DataFrame({
+            'id': [1, 2, 3, 4, 5],
+            'diagnosis': ['M', 'B', 'M', 'B', 'M'],
+            'feature1': [1.0, 2.0, np.nan, 4.0, 5.0],
+            'feature2': [10.0, 20.0, 30.0, 40.0, 50.0],
+            'feature3': [100.0, 200.0, 300.0, 400.0, 500.0]
+        })
 
-def test_clean_data_basic(self):
-"""Тест базовой очистки данных."""
-cleaned_df = self.preprocessor.clean_data(self.test_df.copy())
+    def test_clean_data_basic(self):
+        """Тест базовой очистки данных."""
+        cleaned_df = self.preprocessor.clean_data(self.test_df.copy())
 
-# Проверяем, что NaN заполнены
-self.assertFalse(cleaned_df.isnull().any().any())
+        # Проверяем, что NaN заполнены
+        self.assertFalse(cleaned_df.isnull().any().any())
 
-# Проверяем, что размер не изменился
-self.assertEqual(len(cleaned_df), len(self.test_df))
+        # Проверяем, что размер не изменился
+        self.assertEqual(len(cleaned_df), len(self.test_df))
 
-# Проверяем, что ID колонка удалена
-self.assertNotIn('id', cleaned_df.columns)
+        # Проверяем, что ID колонка удалена
+        self.assertNotIn('id', cleaned_df.columns)
 
-def test_clean_data_with_duplicates(self):
-"""Тест очистки данных с дубликатами."""
-# Добавляем дубликат
-df_with_duplicates = pd.concat([self.test_df, self.test_df.iloc[0:1]], ignore_index=True)
+    def test_clean_data_with_duplicates(self):
+        """Тест очистки данных с дубликатами."""
+        # Добавляем дубликат
+        df_with_duplicates = pd.concat([self.test_df, self.test_df.iloc[0:1]], ignore_index=True)
 
-cleaned_df = self.preprocessor.clean_data(df_with_duplicates)
+        cleaned_df = self.preprocessor.clean_data(df_with_duplicates)
 
-# Проверяем, что дубликаты удалены
-self.assertEqual(len(cleaned_df), len(self.test_df))
+        # Проверяем, что дубликаты удалены
+        self.assertEqual(len(cleaned_df), len(self.test_df))
 
-def test_clean_data_with_outliers(self):
-"""Тест очистки данных с выбросами."""
-# Добавляем выброс
-df_with_outliers = self.test_df.copy()
-df_with_outliers.loc[0, 'feature2'] = 1000.0 # Очень большое значение
+    def test_clean_data_with_outliers(self):
+        """Тест очистки данных с выбросами."""
+        # Добавляем выброс
+        df_with_outliers = self.test_df.copy()
+        df_with_outliers.loc[0, 'feature2'] = 1000.0 # Очень большое значение
 
-cleaned_df = self.preprocessor.clean_data(df_with_outliers)
+        cleaned_df = self.preprocessor.clean_data(df_with_outliers)
 
-# Проверяем, что данные очищены
-self.assertIsInstance(cleaned_df, pd.DataFrame)
-self.assertFalse(cleaned_df.isnull().any().any())
+        # Проверяем, что данные очищены
+        self.assertIsInstance(cleaned_df, pd.DataFrame)
+        self.assertFalse(cleaned_df.isnull().any().any())
 
-def test_split_features_target(self):
-"""Тест разделения признаков и целевой переменной."""
-X, y = self.preprocessor.split_features_target(self.test_df)
+    def test_split_features_target(self):
+        """Тест разделения признаков и целевой переменной."""
+        X, y = self.preprocessor.split_features_target(self.test_df)
 
-# Проверяем размеры
-self.assertEqual(len(X), len(self.test_df))
-self.assertEqual(len(y), len(self.test_df))
+        # Проверяем размеры
+        self.assertEqual(len(X), len(self.test_df))
+        self.assertEqual(len(y), len(self.test_df))
 
-# Проверяем, что diagnosis не входит в признаки
-self.assertNotIn('diagnosis', X.columns)
+        # Проверяем, что diagnosis не входит в признаки
+        self.assertNotIn('diagnosis', X.columns)
 
-# Проверяем, что целевая переменная правильная
-self.assertTrue(all(label in ['M', 'B'] for label in y))
+        # Проверяем, что целевая переменная правильная
+        self.assertTrue(all(label in ['M', 'B'] for label in y))
 
-def test_scale_features(self):
-"""Тест масштабирования признаков."""
-X = self.test_df[['feature1', 'feature2', 'feature3']].fillna(0)
+    def test_scale_features(self):
+        """Тест масштабирования признаков."""
+        X = self.test_df[['feature1', 'feature2', 'feature3']].fillna(0)
 
-X_scaled, scaler = self.preprocessor.scale_features(X)
+        X_scaled, scaler = self.preprocessor.scale_features(X)
 
-# Проверяем тип результата
-self.assertIsInstance(X_scaled, pd.DataFrame)
-self.assertIsInstance(scaler, StandardScaler)
+        # Проверяем тип результата
+        self.assertIsInstance(X_scaled, pd.DataFrame)
+        self.assertIsInstance(scaler, StandardScaler)
 
-# Проверяем размеры
-self.assertEqual(X_scaled.shape, X.shape)
+        # Проверяем размеры
+        self.assertEqual(X_scaled.shape, X.shape)
 
-# Проверяем, что данные масштабированы (среднее близко к 0)
-for col in X_scaled.columns:
-self.assertAlmostEqual(X_scaled[col].mean(), 0, places=10)
+        # Проверяем, что данные масштабированы (среднее близко к 0)
+        for col in X_scaled.columns:
+            self.assertAlmostEqual(X_scaled[col].mean(), 0, places=10)
 
-def test_encode_target(self):
-"""Тест кодирования целевой переменной."""
-y = pd.Series(['M', 'B', 'M', 'B', 'M'])
+    def test_encode_target(self):
+        """Тест кодирования целевой переменной."""
+        y = pd.Series(['M', 'B', 'M', 'B', 'M'])
 
-y_encoded, encoder = self.preprocessor.encode_target(y)
+        y_encoded, encoder = self.preprocessor.encode_target(y)
 
-# Проверяем тип результата
-self.assertIsInstance(y_encoded, np.ndarray)
-self.assertIsInstance(encoder, LabelEncoder)
+        # Проверяем тип результата
+        self.assertIsInstance(y_encoded, np.ndarray)
+        self.assertIsInstance(encoder, LabelEncoder)
 
-# Проверяем размер
-self.assertEqual(len(y_encoded), len(y))
+        # Проверяем размер
+        self.assertEqual(len(y_encoded), len(y))
 
-# Проверяем, что закодировано правильно
-self.assertTrue(all(label in [0, 1] for label in y_encoded))
+        # Проверяем, что закодировано правильно
+        self.assertTrue(all(label in [0, 1] for label in y_encoded))
 
-def test_prepare_data_full_pipeline(self):
-"""Тест полного пайплайна предобработки."""
-result = self.preprocessor.prepare_data(self.test_df.copy())
+    def test_prepare_data_full_pipeline(self):
+        """Тест полного пайплайна предобработки."""
+        result = self.preprocessor.prepare_data(self.test_df.copy())
 
-# Проверяем структуру результата
-self.assertIn('X_train', result)
-self.assertIn('X_test', result)
-self.assertIn('y_train', result)
-self.assertIn('y_test', result)
-self.assertIn('scaler', result)
-self.assertIn('encoder', result)
-self.assertIn('feature_names', result)
+        # Проверяем структуру результата
+        self.assertIn('X_train', result)
+        self.assertIn('X_test', result)
+        self.assertIn('y_train', result)
+        self.assertIn('y_test', result)
+        self.assertIn('scaler', result)
+        self.assertIn('encoder', result)
+        self.assertIn('feature_names', result)
 
-# Проверяем размеры
-total_samples = len(result['X_train']) + len(result['X_test'])
-self.assertEqual(total_samples, len(self.test_df))
+        # Проверяем размеры
+        total_samples = len(result['X_train']) + len(result['X_test'])
+        self.assertEqual(total_samples, len(self.test_df))
 
-# Проверяем, что тренировочная выборка больше тестовой
-self.assertGreater(len(result['X_train']), len(result['X_test']))
+        # Проверяем, что тренировочная выборка больше тестовой
+        self.assertGreater(len(result['X_train']), len(result['X_test']))
 
-def test_handle_missing_values_median(self):
-"""Тест обработки пропущенных значений медианой."""
-df = pd.DataFrame({
-'feature1': [1.0, 2.0, np.nan, 4.0, 5.0],
-'feature2': [10.0, np.nan, 30.0, 40.0, 50.0]
-})
+    def test_handle_missing_values_median(self):
+        """Тест обработки пропущенных значений медианой."""
+        df = pd.DataFrame({
+            'feature1': [1.0, 2.0, np.nan, 4.0, 5.0],
+            'feature2': [10.0, np.nan, 30.0, 40.0, 50.0]
+        })
 
-filled_df = self.preprocessor._handle_missing_values(df, strategy='median')
+        filled_df = self.preprocessor._handle_missing_values(df, strategy='median')
 
-# Проверяем, что NaN заполнены
-self.assertFalse(filled_df.isnull().any().any())
+        # Проверяем, что NaN заполнены
+        self.assertFalse(filled_df.isnull().any().any())
 
-# Проверяем, что заполнено медианой
-self.assertEqual(filled_df.loc[2, 'feature1'], 3.0) # медиана [1,2,4,5]
+        # Проверяем, что заполнено медианой
+        self.assertEqual(filled_df.loc[2, 'feature1'], 3.0) # медиана [1,2,4,5]
 
-def test_handle_missing_values_mean(self):
-"""Тест обработки пропущенных значений средним."""
-df = pd.DataFrame({
-'feature1': [1.0, 2.0, np.nan, 4.0, 5.0]
-})
+    def test_handle_missing_values_mean(self):
+        """Тест обработки пропущенных значений средним."""
+        df = pd.DataFrame({
+            'feature1': [1.0, 2.0, np.nan, 4.0, 5.0]
+        })
 
-filled_df = self.preprocessor._handle_missing_values(df, strategy='mean')
+        filled_df = self.preprocessor._handle_missing_values(df, strategy='mean')
+
+        # Проверяем, что NaN заполнены
+        self.assertFalse(filled_df.isnull().any().any())
 
-# Проверяем, что NaN заполнены
-self.assertFalse(filled_df.isnull().any().any())
-
-# Проверяем, что заполнено средним
-self.assertEqual(filled_df.loc[2, 'feature1'], 3.0) # среднее [1,2,4,5]
-
-def test_remove_outliers_iqr(self):
-"""Тест удаления выбросов методом IQR."""
-df = pd.DataFrame({
-'feature1': [1, 2, 3, 4, 5, 100] # 100 - выброс
-})
-
-clean_df = self.preprocessor._remove_outliers(df, method='iqr')
-
-# Проверяем, что выброс удален
-self.assertLess(len(clean_df), len(df))
-self.assertNotIn(100, clean_df['feature1'].values)
-
-def test_remove_outliers_zscore(self):
-"""Тест удаления выбросов методом Z-score."""
-df = pd.DataFrame({
-'feature1': [1, 2, 3, 4, 5, 100] # 100 - выброс
-})
-
-clean_df = self.preprocessor._remove_outliers(df, method='zscore', threshold=2)
-
-# Проверяем, что выброс удален
-self.assertLessEqual(len(clean_df), len(df))
-
-@patch('etl.data_preprocessor.joblib.dump')
-def test_save_preprocessors(self, mock_dump):
-"""Тест сохранения препроцессоров."""
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-
-scaler = StandardScaler()
-encoder = LabelEncoder()
-
-self.preprocessor.save_preprocessors(scaler, encoder, 'test_path')
-
-# Проверяем, что joblib.dump был вызван дважды
-self.assertEqual(mock_dump.call_count, 2)
-
-def test_get_preprocessing_report(self):
-"""Тест генерации отчета о предобработке."""
-original_df = self.test_df.copy()
-processed_df = self.test_df.drop('id', axis=1).fillna(0)
-
-report = self.preprocessor.get_preprocessing_report(original_df, processed_df)
-
-# Проверяем структуру отчета
-self.assertIn('original_shape', report)
-self.assertIn('processed_shape', report)
-self.assertIn('removed_features', report)
-self.assertIn('missing_values_handled', report)
-
-# Проверяем содержимое
-self.assertEqual(report['original_shape'], original_df.shape)
-self.assertEqual(report['processed_shape'], processed_df.shape)
+        # Проверяем, что заполнено средним
+        self.assertEqual(filled_df.loc[2, 'feature1'], 3.0) # среднее [1,2,4,5]
+
+    def test_remove_outliers_iqr(self):
+        """Тест удаления выбросов методом IQR."""
+        df = pd.DataFrame({
+            'feature1': [1, 2, 3, 4, 5, 100] # 100 - выброс
+        })
+
+        clean_df = self.preprocessor._remove_outliers(df, method='iqr')
+
+        # Проверяем, что выброс удален
+        self.assertLess(len(clean_df), len(df))
+        self.assertNotIn(100, clean_df['feature1'].values)
+
+    def test_remove_outliers_zscore(self):
+        """Тест удаления выбросов методом Z-score."""
+        df = pd.DataFrame({
+            'feature1': [1, 2, 3, 4, 5, 100] # 100 - выброс
+        })
+
+        clean_df = self.preprocessor._remove_outliers(df, method='zscore', threshold=2)
+
+        # Проверяем, что выброс удален
+        self.assertLessEqual(len(clean_df), len(df))
+
+    @patch('etl.data_preprocessor.joblib.dump')
+    def test_save_preprocessors(self, mock_dump):
+        """Тест сохранения препроцессоров."""
+        from sklearn.preprocessing import StandardScaler, LabelEncoder
+
+        scaler = StandardScaler()
+        encoder = LabelEncoder()
+
+        self.preprocessor.save_preprocessors(scaler, encoder, 'test_path')
+
+        # Проверяем, что joblib.dump был вызван дважды
+        self.assertEqual(mock_dump.call_count, 2)
+
+    def test_get_preprocessing_report(self):
+        """Тест генерации отчета о предобработке."""
+        original_df = self.test_df.copy()
+        processed_df = self.test_df.drop('id', axis=1).fillna(0)
+
+        report = self.preprocessor.get_preprocessing_report(original_df, processed_df)
+
+        # Проверяем структуру отчета
+        self.assertIn('original_shape', report)
+        self.assertIn('processed_shape', report)
+        self.assertIn('removed_features', report)
+        self.assertIn('missing_values_handled', report)
+
+        # Проверяем содержимое
+        self.assertEqual(report['original_shape'], original_df.shape)
+        self.assertEqual(report['processed_shape'], processed_df.shape)
+
+
+class TestPreprocessingSettings(unittest.TestCase):
+    """Тесты: раздел preprocessing конфигурации управляет пайплайном."""
+
+    def _preprocessor(self, preprocessing: dict) -> DataPreprocessor:
+        """Создает препроцессор с конфигурацией, скомпилированной из словаря."""
+        from config.config_schema import compile_settings
+
+        config = MagicMock()
+        config.get_data_config.return_value = {"test_size": 0.2, "random_state": 42}
+        config.settings = compile_settings({"preprocessing": preprocessing})
+        return DataPreprocessor(config)
+
+    def _dataset(self) -> pd.DataFrame:
+        """Синтетический набор в формате Wisconsin (30 признаков)."""
+        rng = np.random.default_rng(42)
+        suffixes = ["mean", "se", "worst"]
+        names = ["radius", "texture", "perimeter", "area", "smoothness",
+                 "compactness", "concavity", "concave_points", "symmetry", "fractal_dimension"]
+        columns = [f"{name}_{suffix}" for suffix in suffixes for name in names]
+        df = pd.DataFrame(rng.uniform(1.0, 10.0, size=(120, 30)), columns=columns)
+        df.insert(0, "id", np.arange(120))
+        df.insert(1, "diagnosis", np.where(np.arange(120) % 3 == 0, "M", "B"))
+        return df
+
+    @patch("etl.data_preprocessor.DataPreprocessor.save_preprocessor")
+    def test_pipeline_follows_config(self, mock_save):
+        """Тест: масштабирование, отбор признаков и разделение берутся из конфигурации."""
+        preprocessor = self._preprocessor({
+            "outlier_detection": {"enabled": False},
+            "feature_engineering": {"enabled": False},
+            "feature_selection": {"enabled": True, "method": "univariate", "n_features": 5},
+            "scaling": {"method": "robust"},
+            "train_test_split": {"test_size": 0.25, "stratify": True}
+        })
+        X_train, X_test, y_train, y_test = preprocessor.preprocess_pipeline(self._dataset())
+
+        self.assertIsInstance(preprocessor.scaler, RobustScaler)
+        self.assertEqual(X_train.shape[1], 5)
+        self.assertEqual(X_test.shape[1], 5)
+        self.assertEqual(len(preprocessor.selected_features), 5)
+        self.assertEqual(len(y_test), 30)
+
+    @patch("etl.data_preprocessor.DataPreprocessor.save_preprocessor")
+    def test_disabled_steps_are_skipped(self, mock_save):
+        """Тест: выключенные шаги не применяются."""
+        preprocessor = self._preprocessor({
+            "outlier_detection": {"enabled": False},
+            "feature_engineering": {"enabled": True, "create_ratios": False, "create_composite_features": False},
+            "feature_selection": {"enabled": False}
+        })
+        X_train, X_test, y_train, y_test = preprocessor.preprocess_pipeline(self._dataset())
+
+        self.assertIsInstance(preprocessor.scaler, StandardScaler)
+        self.assertNotIn("radius_perimeter_ratio", preprocessor.engineered_features)
+        self.assertIn("mean_features_sum", preprocessor.engineered_features)
+        self.assertEqual(X_train.shape[1], 30 + len(preprocessor.engineered_features))
+
+    @patch("etl.data_preprocessor.DataPreprocessor.save_preprocessor")
+    def test_isolation_forest_detector_reused_for_scoring(self, mock_save):
+        """Тест: многомерный IsolationForest обучается один раз и оценивает новые батчи."""
+        preprocessor = self._preprocessor({
+            "outlier_detection": {"method": "isolation_forest", "action": "remove"},
+            "feature_selection": {"enabled": False}
+        })
+        df = self._dataset()
+        X_train, _, _, _ = preprocessor.preprocess_pipeline(df)
+
+        self.assertIsNotNone(preprocessor.outlier_detector)
+        self.assertLess(X_train.shape[0], 96)
+        scores = preprocessor.score_outliers(df.drop(columns=["diagnosis"]))
+        self.assertEqual(len(scores), len(df))
+
+        outliers = preprocessor.detect_outliers(df, method="isolation_forest")
+        self.assertEqual(len({tuple(indices) for indices in outliers.values()}), 1)
+
+    def test_save_and_load_preprocessor_roundtrip(self):
+        """Тест: сохраненный пайплайн block загружается и дает то же преобразование."""
+        preprocessor = self._preprocessor({
+            "execution_mode": "block",
+            "outlier_detection": {"enabled": False},
+            "feature_selection": {"enabled": True, "method": "univariate", "n_features": 5}
+        })
+        df = self._dataset()
+        output_dir = tempfile.mkdtemp()
+        try:
+            with patch.object(DataPreprocessor, "save_preprocessor"):
+                preprocessor.preprocess_pipeline(df)
+            preprocessor.save_preprocessor(output_dir)
+
+            restored = self._preprocessor({})
+            restored.load_preprocessor(output_dir)
+
+            self.assertEqual(restored.selected_features, preprocessor.selected_features)
+            np.testing.assert_allclose(restored.transform(df), preprocessor.transform(df))
+        finally:
+            import shutil
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    def test_save_without_pipeline_removes_stale_pipeline(self):
+        """Тест: пайплайн прошлого запуска (block) не загружается поверх нового скейлера."""
+        df = self._dataset()
+        output_dir = tempfile.mkdtemp()
+        try:
+            block = self._preprocessor({"execution_mode": "block", "outlier_detection": {"enabled": False},
+                                        "feature_selection": {"enabled": False}})
+            with patch.object(DataPreprocessor, "save_preprocessor"):
+                block.preprocess_pipeline(df)
+            block.save_preprocessor(output_dir)
+            self.assertTrue(os.path.exists(os.path.join(output_dir, "preprocessing_pipeline.joblib")))
+
+            frame = self._preprocessor({"execution_mode": "dataframe", "outlier_detection": {"enabled": False},
+                                        "feature_selection": {"enabled": False},
+                                        "scaling": {"method": "robust"}})
+            with patch.object(DataPreprocessor, "save_preprocessor"):
+                frame.preprocess_pipeline(df)
+            frame.save_preprocessor(output_dir)
+
+            self.assertFalse(os.path.exists(os.path.join(output_dir, "preprocessing_pipeline.joblib")))
+            self.assertFalse(os.path.exists(os.path.join(output_dir, "preprocessing_pipeline.joblib.sha256")))
+            restored = self._preprocessor({})
+            restored.load_preprocessor(output_dir)
+            self.assertIsNone(restored.pipeline)
+            self.assertIsInstance(restored.scaler, RobustScaler)
+        finally:
+            import shutil
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    def test_saved_artifacts_have_checksums(self):
+        """Тест: артефакты сохраняются с контрольными суммами, поврежденный скейлер не загружается."""
+        preprocessor = self._preprocessor({"execution_mode": "dataframe", "outlier_detection": {"enabled": False},
+                                           "feature_selection": {"enabled": False}})
+        output_dir = tempfile.mkdtemp()
+        try:
+            with patch.object(DataPreprocessor, "save_preprocessor"):
+                preprocessor.preprocess_pipeline(self._dataset())
+            preprocessor.save_preprocessor(output_dir)
+
+            for name in ("scaler.joblib", "feature_columns.joblib"):
+                self.assertTrue(os.path.exists(os.path.join(output_dir, f"{name}.sha256")), name)
+            self.assertFalse([name for name in os.listdir(output_dir) if name.endswith(".tmp")])
+
+            with open(os.path.join(output_dir, "scaler.joblib"), "r+b") as f:
+                f.truncate(16)
+            with self.assertRaises(ValueError):
+                self._preprocessor({}).load_preprocessor(output_dir)
+        finally:
+            import shutil
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    def test_handle_outliers_remove_and_cap(self):
+        """Тест: remove удаляет строки-выбросы, cap сохраняет все строки."""
+        preprocessor = self._preprocessor({})
+        df = self._dataset()
+        df.loc[0, "radius_mean"] = 1000.0
+
+        removed = preprocessor.handle_outliers(df, method="remove", detection_method="iqr")
+        capped = preprocessor.handle_outliers(df, method="cap", detection_method="iqr")
+
+        self.assertNotIn(0, removed.index)
+        self.assertEqual(len(capped), len(df))
+        self.assertLess(capped.loc[0, "radius_mean"], 1000.0)
 
 
 if __name__ == '__main__':
-unittest.main()
+    unittest.main()
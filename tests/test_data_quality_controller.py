@@ -0,0 +1,84 @@
+"""
+Тесты для модуля контроля качества данных.
+"""
+import unittest
+import tempfile
+import shutil
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.data_quality_controller import DataQualityController
+from etl.compact_dtypes import compact_frame
+
+
+class TestDataQualityController(unittest.TestCase):
+    """Тесты для класса DataQualityController."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.controller = DataQualityController()
+
+        rng = np.random.default_rng(0)
+        radius = rng.normal(14, 3.5, 150).clip(6, 30)
+        self.df = pd.DataFrame({
+            'id': np.arange(842302, 842302 + 150, dtype=np.int64),
+            'diagnosis': np.where(np.arange(150) % 3 == 0, 'M', 'B').astype(object),
+            'radius_mean': radius,
+            'texture_mean': rng.normal(19, 4, 150).clip(9, 40),
+            'perimeter_mean': radius * 6.5,
+            'area_mean': np.pi * radius ** 2
+        })
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_comprehensive_checks_clean_data(self):
+        """Тест: чистые данные без проблем с типами и диапазонами."""
+        results = self.controller.run_comprehensive_checks(self.df, "train")
+
+        self.assertFalse(results["data_types"]["issues_found"])
+        self.assertFalse(results["value_ranges"]["issues_found"])
+        self.assertFalse(results["consistency"]["issues_found"])
+        self.assertEqual(len(self.controller.quality_history), 1)
+
+    def test_compact_profile_passes_type_checks(self):
+        """Тест: float32 признаки, int32 id и категориальный diagnosis допустимы."""
+        results = self.controller.run_comprehensive_checks(compact_frame(self.df), "compact")
+
+        self.assertEqual(results["data_types"]["type_issues"], [])
+
+    def test_value_ranges_detects_negative_values(self):
+        """Тест: отрицательные значения признака попадают в range_issues."""
+        df = self.df.copy()
+        df.loc[0, 'texture_mean'] = -1.0
+
+        ranges = self.controller._check_value_ranges(df)
+
+        self.assertEqual([issue["column"] for issue in ranges["range_issues"]], ['texture_mean'])
+
+    def test_save_quality_report(self):
+        """Тест сохранения JSON и текстового отчета."""
+        results = self.controller.run_comprehensive_checks(self.df, "train")
+        file_path = os.path.join(self.temp_dir, "quality", "train_quality.json")
+
+        self.assertTrue(self.controller.save_quality_report(results, file_path))
+
+        with open(file_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["dataset_name"], "train")
+        with open(file_path.replace('.json', '_report.txt'), encoding='utf-8') as f:
+            report_lines = f.read().splitlines()
+        self.assertEqual(report_lines[0], "=== ОТЧЕТ О КАЧЕСТВЕ ДАННЫХ ===")
+        self.assertIn("ТИПЫ ДАННЫХ: OK", report_lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Тесты для разделения выборки по индексам строк.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.data_split import iter_split_indices, split_indices, class_distribution, contiguous_split
+
+
+class TestDataSplit(unittest.TestCase):
+    """Тесты разделения по позициям строк и непрерывных срезов."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(42)
+        self.X = rng.standard_normal((120, 5))
+        self.y = np.where(np.arange(120) % 3 == 0, 1, 0)
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_split_indices_match_train_test_split(self):
+        """Тест: позиции совпадают с train_test_split при том же random_state."""
+        rows = np.arange(len(self.y))
+        for stratify in (True, False):
+            train_rows, test_rows = split_indices(self.y, test_size=0.25, random_state=7, stratify=stratify)
+            expected = train_test_split(rows, test_size=0.25, random_state=7,
+                                        stratify=self.y if stratify else None)
+            np.testing.assert_array_equal(train_rows, expected[0])
+            np.testing.assert_array_equal(test_rows, expected[1])
+
+        self.assertEqual(class_distribution(self.y), {0: 80, 1: 40})
+        self.assertEqual(class_distribution(self.y, test_rows[:0]), {})
+
+    def test_repeated_and_grouped_splits(self):
+        """Тест: повторные разбиения различаются, группы не попадают в обе выборки."""
+        splits = list(iter_split_indices(self.y, test_size=0.25, n_splits=3))
+        self.assertEqual(len(splits), 3)
+        for train_rows, test_rows in splits:
+            self.assertEqual(class_distribution(self.y, test_rows), {0: 20, 1: 10})
+        self.assertFalse(np.array_equal(splits[0][1], splits[1][1]))
+
+        groups = np.arange(len(self.y)) // 6
+        for train_rows, test_rows in iter_split_indices(self.y, test_size=0.25, n_splits=4, groups=groups):
+            self.assertFalse(set(groups[train_rows]) & set(groups[test_rows]))
+            self.assertEqual(len(train_rows) + len(test_rows), len(self.y))
+
+    def test_contiguous_split_returns_views(self):
+        """Тест: выборки - срезы общего массива (C, F и memmap) без копий."""
+        train_rows, test_rows = split_indices(self.y, test_size=0.25)
+        path = os.path.join(self.temp_dir, "X.npy")
+        np.save(path, self.X)
+
+        for X in (self.X.copy(), np.asfortranarray(self.X), np.load(path, mmap_mode="r+")):
+            X_train, X_test = contiguous_split(X, train_rows, test_rows)
+            np.testing.assert_array_equal(X_train, self.X[train_rows])
+            np.testing.assert_array_equal(X_test, self.X[test_rows])
+            self.assertTrue(np.shares_memory(X_train, X) and np.shares_memory(X_test, X))
+
+        # Перестановка записана в файл
+        np.testing.assert_array_equal(np.load(path)[:len(train_rows)], self.X[train_rows])
+
+        with self.assertRaises(ValueError):
+            contiguous_split(self.X.copy(), train_rows, test_rows[1:])
+        with self.assertRaises(ValueError):
+            contiguous_split(self.X.copy(), train_rows, np.append(test_rows[1:], train_rows[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
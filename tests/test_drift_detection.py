@@ -0,0 +1,157 @@
+"""
+Тесты для модуля обнаружения дрейфа данных.
+"""
+import unittest
+import pandas as pd
+import numpy as np
+import tempfile
+import shutil
+import os
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scipy.stats import ks_2samp, wasserstein_distance
+
+from etl.drift_detection import DriftDetector, ReferenceProfile, compute_data_hash, select_drift_columns
+from etl.compact_dtypes import compact_frame
+
+
+class TestDriftDetector(unittest.TestCase):
+    """Тесты для класса DriftDetector."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        rng = np.random.RandomState(0)
+        self.reference_df = pd.DataFrame({
+            'id': np.arange(500),
+            'radius_mean': rng.normal(14, 3.5, 500),
+            'texture_mean': rng.normal(19, 4.3, 500),
+            'area_mean': rng.normal(650, 350, 500)
+        })
+        self.current_df = pd.DataFrame({
+            'id': np.arange(400),
+            'radius_mean': rng.normal(14, 3.5, 400),
+            'texture_mean': rng.normal(25, 4.3, 400),
+            'area_mean': rng.normal(650, 350, 400)
+        })
+        self.current_df.loc[::10, 'area_mean'] = np.nan
+
+    def test_statistics_match_scipy(self):
+        """Тест совпадения KS и Вассерштейна с scipy."""
+        detector = DriftDetector().fit(self.reference_df)
+        results = detector.compare(self.current_df)
+
+        for col in ['radius_mean', 'texture_mean', 'area_mean']:
+            ref = self.reference_df[col].dropna()
+            cur = self.current_df[col].dropna()
+            statistic, _ = ks_2samp(ref, cur)
+            self.assertAlmostEqual(results['statistical_drift'][col]['ks_statistic'], statistic)
+            self.assertAlmostEqual(results['distribution_drift'][col]['wasserstein_distance'],
+                                   wasserstein_distance(ref, cur))
+
+    def test_drift_detected_on_shifted_column(self):
+        """Тест обнаружения дрейфа в смещенной колонке."""
+        results = DriftDetector().fit(self.reference_df).compare(self.current_df)
+
+        self.assertNotIn('id', results['statistical_drift'])
+        self.assertTrue(results['summary']['drift_detected'])
+        self.assertIn('texture_mean', results['summary']['affected_features'])
+        self.assertIn('texture_mean', results['summary']['psi_drift_features'])
+        self.assertNotIn('radius_mean', results['summary']['psi_drift_features'])
+
+    def test_parallel_matches_sequential(self):
+        """Тест: расчет в пуле процессов совпадает с последовательным."""
+        detector = DriftDetector(parallel_min_columns=1).fit(self.reference_df)
+
+        sequential = detector.compare(self.current_df, n_jobs=1)
+        parallel = detector.compare(self.current_df, n_jobs=2)
+
+        self.assertEqual(sequential['statistical_drift'], parallel['statistical_drift'])
+        self.assertEqual(sequential['distribution_drift'], parallel['distribution_drift'])
+
+    def test_compact_dtypes_selected(self):
+        """Тест: float32-колонки и категории компактного профиля обрабатываются по семейству типа."""
+        current = compact_frame(self.current_df.assign(diagnosis='B', flag=True))
+        columns = select_drift_columns(self.reference_df, current)
+        self.assertEqual(columns, ['radius_mean', 'texture_mean', 'area_mean'])
+
+        expected = DriftDetector().fit(self.reference_df).compare(self.current_df)
+        results = DriftDetector().fit(self.reference_df).compare(current[columns])
+        self.assertEqual(results['summary']['affected_features'], expected['summary']['affected_features'])
+
+    def test_compare_requires_fit(self):
+        """Тест ошибки при сравнении без референса."""
+        with self.assertRaises(ValueError):
+            DriftDetector().compare(self.current_df)
+
+    def test_data_hash_depends_on_content(self):
+        """Тест хэша данных."""
+        self.assertEqual(compute_data_hash(self.reference_df), compute_data_hash(self.reference_df.copy()))
+        self.assertNotEqual(compute_data_hash(self.reference_df), compute_data_hash(self.current_df))
+
+
+class TestReferenceProfile(unittest.TestCase):
+    """Тесты для класса ReferenceProfile."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.RandomState(1)
+        self.reference_df = pd.DataFrame({
+            'radius_mean': rng.normal(14, 3.5, 5000),
+            'texture_mean': rng.normal(19, 4.3, 5000)
+        })
+        self.current_df = pd.DataFrame({
+            'radius_mean': rng.normal(14, 3.5, 300),
+            'texture_mean': rng.normal(23, 4.3, 300)
+        })
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_save_and_load_roundtrip(self):
+        """Тест сохранения и загрузки профиля по хэшу данных."""
+        detector = DriftDetector().fit(self.reference_df)
+        profile = detector.to_profile(max_quantiles=200)
+        file_path = profile.save(self.temp_dir)
+
+        self.assertEqual(ReferenceProfile.find(self.temp_dir, detector.reference_hash), file_path)
+        self.assertEqual(ReferenceProfile.find(self.temp_dir), file_path)
+        self.assertIsNone(ReferenceProfile.find(self.temp_dir, "unknown"))
+
+        loaded = ReferenceProfile.load(file_path)
+        self.assertEqual(loaded.columns, profile.columns)
+        self.assertEqual(loaded.counts['radius_mean'], 5000)
+        self.assertEqual(len(loaded.samples['radius_mean']), 200)
+        np.testing.assert_array_equal(loaded.psi_edges['texture_mean'], profile.psi_edges['texture_mean'])
+
+    def test_profile_approximates_full_reference(self):
+        """Тест: проверка по профилю близка к проверке по полному датасету."""
+        detector = DriftDetector().fit(self.reference_df)
+        exact = detector.compare(self.current_df)
+        approx = DriftDetector().load_profile(detector.to_profile(max_quantiles=1001)).compare(self.current_df)
+
+        for col in ['radius_mean', 'texture_mean']:
+            self.assertAlmostEqual(approx['statistical_drift'][col]['ks_statistic'],
+                                   exact['statistical_drift'][col]['ks_statistic'], places=2)
+            self.assertAlmostEqual(approx['distribution_drift'][col]['psi'],
+                                   exact['distribution_drift'][col]['psi'], places=6)
+        self.assertEqual(approx['summary']['affected_features'], exact['summary']['affected_features'])
+        self.assertEqual(approx['reference_hash'], exact['reference_hash'])
+
+    def test_small_column_kept_exact(self):
+        """Тест: короткие колонки сохраняются без сжатия."""
+        values = np.sort(self.reference_df['radius_mean'].to_numpy()[:50])
+        np.testing.assert_array_equal(ReferenceProfile.sketch(values, 100), values)
+
+    def test_unfitted_detector_raises(self):
+        """Тест ошибки при построении профиля без референса."""
+        with self.assertRaises(ValueError):
+            DriftDetector().to_profile()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Тесты для модуля потокового мониторинга дрейфа.
+"""
+import unittest
+import pandas as pd
+import numpy as np
+import os
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.drift_detection import DriftDetector
+from etl.drift_monitor import StreamingDriftMonitor
+
+
+class TestStreamingDriftMonitor(unittest.TestCase):
+    """Тесты для класса StreamingDriftMonitor."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.rng = np.random.RandomState(7)
+        self.reference_df = pd.DataFrame({
+            'radius_mean': self.rng.normal(14, 3.5, 3000),
+            'texture_mean': self.rng.normal(19, 4.3, 3000)
+        })
+        self.detector = DriftDetector().fit(self.reference_df)
+
+    def _batch(self, size: int = 100, texture_shift: float = 0.0) -> pd.DataFrame:
+        """Создает батч скоринга."""
+        return pd.DataFrame({
+            'radius_mean': self.rng.normal(14, 3.5, size),
+            'texture_mean': self.rng.normal(19 + texture_shift, 4.3, size)
+        })
+
+    def test_window_statistics_close_to_full_comparison(self):
+        """Тест: статистики окна близки к полному сравнению тех же данных."""
+        monitor = StreamingDriftMonitor(self.detector, window_batches=4, slide_batches=4)
+        batches = [self._batch(texture_shift=3.0) for _ in range(4)]
+
+        for batch in batches[:-1]:
+            self.assertIsNone(monitor.update(batch))
+        window_results = monitor.update(batches[-1])
+        exact = self.detector.compare(pd.concat(batches, ignore_index=True))
+
+        self.assertEqual(window_results['window']['samples'], 400)
+        for col in ['radius_mean', 'texture_mean']:
+            self.assertAlmostEqual(window_results['statistical_drift'][col]['ks_statistic'],
+                                   exact['statistical_drift'][col]['ks_statistic'], delta=0.02)
+            self.assertAlmostEqual(window_results['distribution_drift'][col]['psi'],
+                                   exact['distribution_drift'][col]['psi'], places=6)
+            self.assertAlmostEqual(window_results['distribution_drift'][col]['current_mean'],
+                                   exact['distribution_drift'][col]['current_mean'])
+
+    def test_alert_emitted_only_after_shift(self):
+        """Тест: алерт появляется только после смещения распределения."""
+        received = []
+        # Строгий порог: окна оцениваются многократно, и при 0.05 возможны ложные срабатывания
+        monitor = StreamingDriftMonitor(self.detector, p_value_threshold=0.001, window_batches=3,
+                                        slide_batches=1, on_alert=received.append)
+
+        for _ in range(6):
+            monitor.update(self._batch())
+        self.assertEqual(len(monitor.alerts), 0)
+
+        for _ in range(3):
+            monitor.update(self._batch(texture_shift=6.0))
+
+        self.assertGreater(len(received), 0)
+        self.assertIn('texture_mean', received[-1]['affected_features'])
+        self.assertIn('texture_mean', received[-1]['psi_drift_features'])
+        self.assertNotIn('radius_mean', received[-1]['psi_drift_features'])
+
+    def test_memory_is_bounded(self):
+        """Тест: окно и история алертов ограничены по размеру."""
+        monitor = StreamingDriftMonitor(self.detector, window_batches=5, max_alerts=2)
+
+        for _ in range(50):
+            monitor.update(self._batch(size=20, texture_shift=8.0))
+
+        status = monitor.get_status()
+        self.assertEqual(status['window_batches'], 5)
+        self.assertEqual(status['window_samples'], 100)
+        self.assertEqual(status['batches_seen'], 50)
+        self.assertEqual(len(monitor.alerts), 2)
+
+    def test_tumbling_window_does_not_overlap(self):
+        """Тест неперекрывающегося окна."""
+        monitor = StreamingDriftMonitor(self.detector.to_profile(), window_type="tumbling",
+                                        window_batches=3, min_window_samples=1)
+        evaluated = [monitor.update(self._batch()) for _ in range(9)]
+        windows = [result['window'] for result in evaluated if result is not None]
+
+        self.assertEqual([(w['first_batch'], w['last_batch']) for w in windows], [(0, 2), (3, 5), (6, 8)])
+
+    def test_from_config_and_validation(self):
+        """Тест создания из конфигурации и проверки параметров."""
+        drift_config = {"p_value_threshold": 0.01, "psi_threshold": 0.3,
+                        "streaming": {"window_type": "tumbling", "window_batches": 4}}
+        monitor = StreamingDriftMonitor.from_config(self.detector, drift_config)
+        self.assertEqual(monitor.slide_batches, 4)
+        self.assertEqual(monitor.p_value_threshold, 0.01)
+
+        with self.assertRaises(ValueError):
+            StreamingDriftMonitor(self.detector, window_type="session")
+        with self.assertRaises(ValueError):
+            monitor.update(pd.DataFrame({'radius_mean': [1.0]}))
+
+
+if __name__ == '__main__':
+    unittest.main()
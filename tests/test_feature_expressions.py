@@ -0,0 +1,109 @@
+"""
+Тесты для декларативных признаков.
+"""
+import unittest
+import os
+
+import numpy as np
+import pandas as pd
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.feature_expressions import compile_features, column_reference
+
+
+class TestFeatureExpressions(unittest.TestCase):
+    """Тесты компиляции и вычисления выражений признаков."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        rng = np.random.default_rng(42)
+        self.columns = ["radius_mean", "texture_mean", "perimeter_mean", "radius_se", "area worst"]
+        self.df = pd.DataFrame(rng.lognormal(1.0, 0.5, size=(100, 5)), columns=self.columns)
+        self.X = self.df.to_numpy(dtype=np.float64)
+
+    def test_results_match_pandas(self):
+        """Тест: выражения, функции, агрегаты и шаблоны дают те же значения, что pandas."""
+        df = self.df
+        mean_cols = ["radius_mean", "texture_mean", "perimeter_mean"]
+        definitions = [
+            ("ratio", "radius_mean / (perimeter_mean + 1e-8)"),
+            ("power", "-radius_mean ** 2 + 2 * 3"),
+            ("logs", "log1p(texture_mean) - sqrt(abs(radius_se))"),
+            ("group_std", "std('*_mean')"),
+            ("group_mean", "mean(radius_mean, texture_mean, perimeter_mean)"),
+            ("worst_max", "max(col('area worst'), radius_se)"),
+        ]
+        result = compile_features(definitions, self.columns).evaluate(self.X)
+
+        expected = {
+            "ratio": df["radius_mean"] / (df["perimeter_mean"] + 1e-8),
+            "power": -df["radius_mean"] ** 2 + 6,
+            "logs": np.log1p(df["texture_mean"]) - np.sqrt(df["radius_se"].abs()),
+            "group_std": df[mean_cols].std(axis=1),
+            "group_mean": df[mean_cols].mean(axis=1),
+            "worst_max": df[["area worst", "radius_se"]].max(axis=1),
+        }
+        for k, (name, values) in enumerate(expected.items()):
+            np.testing.assert_allclose(result[:, k], values.to_numpy(), err_msg=name)
+
+    def test_common_subexpressions_computed_once(self):
+        """Тест: общие подвыражения и суммы групп вычисляются один раз."""
+        ratios = compile_features([("a", "radius_mean / (perimeter_mean + 1e-8)"),
+                                   ("b", "texture_mean / (perimeter_mean + 1e-8)")], self.columns)
+        # Сумма (perimeter_mean + 1e-8) общая: 1 сложение + 2 деления
+        self.assertEqual(ratios.n_operations, 3)
+
+        group = compile_features([("s", "sum('*_mean')"), ("m", "mean('*_mean')"), ("d", "std('*_mean')")],
+                                 self.columns)
+        # Одна сумма группы, одно деление на n и одно отклонение
+        self.assertEqual(group.n_operations, 3)
+
+        # Повтор выражения, ссылка на колонку и константа копируются в свои колонки
+        copies = compile_features([("a", "radius_mean * 2"), ("b", "radius_mean * 2"),
+                                   ("c", "radius_se"), ("d", "2 ** 3")], self.columns)
+        out = np.full((len(self.df), 4), np.nan, order="F")
+        self.assertIs(copies.evaluate(self.X, out=out), out)
+        np.testing.assert_allclose(out[:, 0], self.X[:, 0] * 2)
+        np.testing.assert_array_equal(out[:, 1], out[:, 0])
+        np.testing.assert_array_equal(out[:, 2], self.X[:, 3])
+        np.testing.assert_array_equal(out[:, 3], 8.0)
+
+    def test_invalid_definitions_rejected(self):
+        """Тест: ошибки в определениях сообщаются при компиляции."""
+        invalid = [
+            [("x", "radius_mean +")],
+            [("x", "missing * 2")],
+            [("x", "median(radius_mean)")],
+            [("x", "sum('*_worst_*')")],
+            [("x", "__import__('os')")],
+            [("x", "radius_mean.real")],
+            [("x", "radius_mean"), ("x", "texture_mean")],
+            [("radius_mean", "texture_mean * 2")],
+        ]
+        for definitions in invalid:
+            with self.subTest(definitions=definitions):
+                with self.assertRaises(ValueError):
+                    compile_features(definitions, self.columns)
+
+        compiled = compile_features([("x", "radius_mean")], self.columns)
+        with self.assertRaises(ValueError):
+            compiled.evaluate(self.X[:, :2])
+
+    def test_compilation_cached_and_column_references(self):
+        """Тест: план компилируется один раз, имена колонок экранируются."""
+        definitions = [("x", "radius_mean * texture_mean")]
+        self.assertIs(compile_features(definitions, self.columns),
+                      compile_features(list(definitions), list(self.columns)))
+
+        self.assertEqual(column_reference("radius_mean"), "radius_mean")
+        self.assertEqual(column_reference("area worst"), "col('area worst')")
+        self.assertEqual(column_reference("sum"), "col('sum')")
+        compiled = compile_features([("y", f"{column_reference('area worst')} + 1")], self.columns)
+        np.testing.assert_allclose(compiled.evaluate(self.X)[:, 0], self.X[:, 4] + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Тесты для быстрого отбора признаков.
+"""
+import unittest
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_selection import SelectKBest, RFE, f_classif
+from sklearn.linear_model import LogisticRegression
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.decomposition import PCA, IncrementalPCA
+
+from etl.feature_selection import (FastFeatureSelector, univariate_scores, clear_score_cache,
+                                   rfe_elimination, l1_path_ranking, cross_validate_subsets,
+                                   make_pca, partial_fit_pca)
+
+
+def make_dataset(n_rows: int = 300, n_features: int = 20, seed: int = 42):
+    """Нормализованные признаки, целевая переменная зависит от первых пяти."""
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_rows, n_features))
+    logits = X[:, :5] @ np.array([3.0, -2.5, 2.0, -1.5, 1.0])
+    y = (logits + rng.standard_normal(n_rows) > 0).astype(int)
+    return X, y
+
+
+class TestFeatureSelection(unittest.TestCase):
+    """Тесты ранжирования и выбора подмножества признаков."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        clear_score_cache()
+        self.X, self.y = make_dataset()
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        clear_score_cache()
+
+    def test_univariate_matches_select_k_best_and_reuses_scores(self):
+        """Тест: результат как у SelectKBest, F-статистики считаются один раз."""
+        scores = univariate_scores(self.X, self.y)
+        np.testing.assert_allclose(scores, f_classif(self.X, self.y)[0])
+        self.assertIs(univariate_scores(self.X.copy(), self.y), scores)
+        np.testing.assert_allclose(univariate_scores(np.asfortranarray(self.X), self.y), scores)
+
+        for k in (3, 8):
+            selector = FastFeatureSelector(method="univariate", n_features=k).fit(self.X, self.y)
+            expected = SelectKBest(f_classif, k=k).fit(self.X, self.y)
+            np.testing.assert_array_equal(selector.get_support(), expected.get_support())
+            self.assertIs(selector.scores_, scores)
+
+    def test_warm_started_rfe_matches_sklearn(self):
+        """Тест: RFE с теплым стартом отбирает те же признаки, что sklearn RFE."""
+        for step in (1, 3, 0.2):
+            expected = RFE(LogisticRegression(random_state=42, max_iter=1000),
+                           n_features_to_select=6, step=step).fit(self.X, self.y)
+            selector = FastFeatureSelector(method="rfe", n_features=6, step=step).fit(self.X, self.y)
+            np.testing.assert_array_equal(selector.get_support(), expected.get_support(), err_msg=str(step))
+
+        # Подмножества всех размеров - с одного пути исключения
+        subsets = rfe_elimination(self.X, self.y, [10, 5, 40])
+        self.assertEqual(sorted(subsets), [5, 10, 20])
+        self.assertTrue(set(subsets[5]) <= set(subsets[10]))
+        with self.assertRaises(ValueError):
+            rfe_elimination(self.X, self.y, [5], step=0)
+
+    def test_l1_path_ranks_informative_features_first(self):
+        """Тест: признаки, влияющие на целевую переменную, входят в L1-путь первыми."""
+        order = l1_path_ranking(self.X, self.y, n_features=5)
+        self.assertEqual(set(order[:5]), set(range(5)))
+        self.assertEqual(sorted(order), list(range(self.X.shape[1])))
+
+        selector = FastFeatureSelector(method="l1", n_features=3).fit(self.X, self.y)
+        self.assertEqual(set(np.flatnonzero(selector.get_support())), set(order[:3]))
+
+    def test_candidates_evaluated_with_cross_validation(self):
+        """Тест: кандидаты n_features сравниваются кросс-валидацией, в том числе в пуле процессов."""
+        df = pd.DataFrame(self.X, columns=[f"f{i}" for i in range(self.X.shape[1])])
+        selector = FastFeatureSelector(method="univariate", candidates=(1, 5, 15), cv_folds=3).fit(df, self.y)
+
+        self.assertEqual(sorted(selector.cv_scores_), [1, 5, 15])
+        self.assertEqual(selector.n_features_, max(selector.cv_scores_, key=selector.cv_scores_.get))
+        self.assertGreater(selector.cv_scores_[5], selector.cv_scores_[1])
+        self.assertEqual(selector.transform(df).shape, (len(df), selector.n_features_))
+
+        subsets = {1: np.array([0]), 5: np.arange(5)}
+        parallel = cross_validate_subsets(self.X, self.y, subsets, cv_folds=3, n_jobs=2)
+        self.assertEqual(parallel, cross_validate_subsets(self.X, self.y, subsets, cv_folds=3))
+
+        restored = FastFeatureSelector.from_state(selector.get_state())
+        np.testing.assert_array_equal(restored.transform(df), selector.transform(df))
+        self.assertEqual(restored.get_feature_names_out().tolist(), selector.get_feature_names_out().tolist())
+
+        with self.assertRaises(ValueError):
+            FastFeatureSelector(method="chi2").fit(self.X, self.y)
+        with self.assertRaises(ValueError):
+            FastFeatureSelector(candidates=(0, 5)).fit(self.X, self.y)
+
+
+class TestLargeInputPCA(unittest.TestCase):
+    """Тесты рандомизированного и инкрементального PCA."""
+
+    def setUp(self):
+        """Данные с тремя доминирующими направлениями."""
+        rng = np.random.default_rng(7)
+        basis = rng.standard_normal((3, 12))
+        self.X = (rng.standard_normal((400, 3)) * [5.0, 3.0, 2.0]) @ basis + 0.05 * rng.standard_normal((400, 12))
+
+    def test_solvers(self):
+        """Тест: все способы разложения находят одно подпространство."""
+        expected = PCA(n_components=3).fit(self.X)
+        for solver in ("full", "randomized", "incremental"):
+            pca = make_pca(3, solver=solver, batch_size=50).fit(self.X)
+            overlap = np.abs(pca.components_ @ expected.components_.T)
+            np.testing.assert_allclose(overlap.max(axis=1), 1.0, atol=1e-3, err_msg=solver)
+        self.assertIsInstance(make_pca(3, solver="incremental"), IncrementalPCA)
+        with self.assertRaises(ValueError):
+            make_pca(3, solver="arpack")
+
+    def test_partial_fit_from_uneven_chunks(self):
+        """Тест: части меньше числа компонент объединяются, результат как у fit по тем же батчам."""
+        bounds = [0, 2, 120, 124, 250, 398, 400]
+        chunks = [self.X[start:end] for start, end in zip(bounds, bounds[1:])]
+        pca = partial_fit_pca(IncrementalPCA(n_components=5), iter(chunks))
+
+        self.assertEqual(pca.n_samples_seen_, 400)
+        expected = IncrementalPCA(n_components=5)
+        for batch in (self.X[:120], self.X[120:250], self.X[250:400]):
+            expected.partial_fit(batch)
+        np.testing.assert_allclose(pca.components_, expected.components_)
+
+        with self.assertRaises(ValueError):
+            partial_fit_pca(IncrementalPCA(n_components=5), [self.X[:2], self.X[2:4]])
+
+
+if __name__ == '__main__':
+    unittest.main()
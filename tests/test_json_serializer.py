@@ -0,0 +1,97 @@
+"""
+Тесты для модуля быстрой JSON-сериализации.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl import json_serializer
+from etl.json_serializer import dumps, loads, dump_json, load_json, to_jsonable
+
+
+class TestJsonSerializer(unittest.TestCase):
+    """Тесты для общего JSON-сериализатора."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.analysis = {
+            "shape": (569, 32),
+            "dtypes": pd.Series([np.dtype("float64"), pd.CategoricalDtype()], index=["radius_mean", "diagnosis"]),
+            "target_distribution": {"B": np.int64(357), "M": np.int64(212)},
+            "accuracy": np.float32(0.5),
+            "has_missing": np.bool_(False),
+            "confusion_matrix": np.array([[71, 1], [2, 40]]),
+            "strided": np.arange(10)[::2],
+            "timestamp": pd.Timestamp("2025-06-17 05:40:48"),
+            "created_at": datetime(2025, 6, 17, 5, 40, 48),
+            "describe": pd.DataFrame({"mean": [14.1, 19.3]}),
+            "columns": {"radius_mean", },
+            "path": Path("results") / "metrics.json",
+            "name": "Пациенты"
+        }
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_numpy_and_pandas_values(self):
+        """Тест преобразования типов numpy/pandas в значения JSON."""
+        data = loads(dumps(self.analysis))
+
+        self.assertEqual(data["shape"], [569, 32])
+        self.assertEqual(data["dtypes"], {"radius_mean": "float64", "diagnosis": "category"})
+        self.assertEqual(data["target_distribution"], {"B": 357, "M": 212})
+        self.assertEqual(data["accuracy"], 0.5)
+        self.assertIs(data["has_missing"], False)
+        self.assertEqual(data["confusion_matrix"], [[71, 1], [2, 40]])
+        self.assertEqual(data["strided"], [0, 2, 4, 6, 8])
+        self.assertEqual(data["timestamp"], "2025-06-17T05:40:48")
+        self.assertEqual(data["created_at"], "2025-06-17T05:40:48")
+        self.assertEqual(data["describe"], {"mean": [14.1, 19.3]})
+        self.assertEqual(data["columns"], ["radius_mean"])
+        self.assertEqual(data["path"], os.path.join("results", "metrics.json"))
+        self.assertEqual(data["name"], "Пациенты")
+
+    def test_indent_and_file_roundtrip(self):
+        """Тест читаемого и компактного вывода и записи в файл."""
+        self.assertIn(b"\n  ", dumps({"a": [1, 2]}))
+        self.assertEqual(dumps({"a": [1, 2]}, indent=None), b'{"a":[1,2]}')
+
+        file_path = dump_json(self.analysis, os.path.join(self.temp_dir, "reports", "analysis.json"))
+        self.assertEqual(load_json(file_path)["target_distribution"]["M"], 212)
+        with open(file_path, encoding="utf-8") as f:
+            self.assertIn("Пациенты", f.read())
+
+    def test_unknown_objects_fallback_to_str(self):
+        """Тест: неизвестные объекты сохраняются строкой."""
+        class Estimator:
+            def __str__(self):
+                return "LogisticRegression(C=1.0)"
+
+        self.assertEqual(loads(dumps({"model": Estimator()}))["model"], "LogisticRegression(C=1.0)")
+        self.assertIsNone(to_jsonable(pd.NaT))
+
+    def test_stdlib_backend_matches(self):
+        """Тест: результат стандартного json совпадает с быстрым бэкендом."""
+        original = json_serializer.ORJSON_AVAILABLE
+        try:
+            json_serializer.ORJSON_AVAILABLE = False
+            fallback = loads(dumps(self.analysis))
+        finally:
+            json_serializer.ORJSON_AVAILABLE = original
+        self.assertEqual(fallback, loads(dumps(self.analysis)))
+
+
+if __name__ == '__main__':
+    unittest.main()
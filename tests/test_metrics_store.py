@@ -0,0 +1,154 @@
+"""
+Тесты для модуля хранилища истории метрик.
+"""
+import unittest
+import tempfile
+import shutil
+import json
+import os
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.metrics_store import MetricsStore, extract_metrics
+from etl.run_results import save_run_results
+
+
+class TestMetricsStore(unittest.TestCase):
+    """Тесты для класса MetricsStore."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = MetricsStore(os.path.join(self.temp_dir, "metrics_history.db"))
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _evaluation(self, accuracy: float, timestamp: str) -> dict:
+        """Создает результаты оценки в формате evaluate_model."""
+        return {
+            "timestamp": timestamp,
+            "test_samples": 114,
+            "basic_metrics": {"accuracy": accuracy, "f1_score": accuracy - 0.01},
+            "probabilistic_metrics": {"roc_auc": 0.99, "roc_curve": {"fpr": [0, 1], "tpr": [0, 1]}},
+            "confusion_matrix_data": {"sensitivity": 0.95, "confusion_matrix": [[1, 0], [0, 1]]}
+        }
+
+    def test_extract_metrics_skips_non_scalars(self):
+        """Тест извлечения только скалярных метрик."""
+        metrics = extract_metrics(self._evaluation(0.97, "2025-06-16T00:00:00"))
+
+        self.assertEqual(metrics["accuracy"], 0.97)
+        self.assertIn("roc_auc", metrics)
+        self.assertIn("sensitivity", metrics)
+        self.assertNotIn("roc_curve", metrics)
+        self.assertNotIn("confusion_matrix", metrics)
+
+    def test_append_is_idempotent_per_run_id(self):
+        """Тест: повторное добавление запуска игнорируется."""
+        results = self._evaluation(0.97, "2025-06-16T00:00:00")
+
+        self.assertEqual(self.store.append_run(results, run_id="run_1"), "run_1")
+        self.assertIsNone(self.store.append_run(results, run_id="run_1"))
+        self.assertEqual(len(self.store.list_runs()), 1)
+
+    def test_default_run_ids_do_not_collide(self):
+        """Тест: запуски с одинаковым временем без явного run_id не теряются."""
+        results = self._evaluation(0.97, "2025-06-16T00:00:00")
+
+        first = self.store.append_run(results)
+        second = self.store.append_run(results)
+
+        self.assertIsNotNone(first)
+        self.assertIsNotNone(second)
+        self.assertNotEqual(first, second)
+        self.assertEqual(len(self.store.list_runs()), 2)
+
+    def test_aware_timestamps_are_converted_to_utc(self):
+        """Тест: время с часовым поясом сохраняется в UTC."""
+        self.store.append_run(self._evaluation(0.97, "2025-06-16T03:00:00+03:00"), run_id="moscow")
+        self.store.append_run(self._evaluation(0.96, "2025-06-16T01:00:00Z"), run_id="utc")
+
+        series = self.store.get_metric_series("accuracy")
+
+        self.assertEqual([(point["run_id"], point["run_timestamp"]) for point in series],
+                         [("moscow", "2025-06-16T00:00:00"), ("utc", "2025-06-16T01:00:00")])
+
+    def test_series_and_trend(self):
+        """Тест временного ряда и тренда метрики."""
+        for day, accuracy in enumerate([0.90, 0.92, 0.94, 0.96], start=1):
+            self.store.append_run(self._evaluation(accuracy, f"2025-06-0{day}T12:00:00"),
+                                  model_version="v1")
+
+        series = self.store.get_metric_series("accuracy", model_version="v1")
+        self.assertEqual([point["value"] for point in series], [0.90, 0.92, 0.94, 0.96])
+
+        last_two = self.store.get_metric_series("accuracy", last_n=2)
+        self.assertEqual([point["value"] for point in last_two], [0.94, 0.96])
+
+        trend = self.store.get_metric_trend("accuracy", last_n=4)
+        self.assertEqual(trend["runs"], 4)
+        self.assertAlmostEqual(trend["slope_per_day"], 0.02, places=6)
+
+    def test_trend_for_runs_minutes_apart(self):
+        """Тест: тренд по частым запускам (каждые 5 минут) считается без потери точности."""
+        for i in range(20):
+            minute = 5 * i
+            self.store.append_run(self._evaluation(0.90 + 0.001 * i,
+                                                   f"2025-06-16T{minute // 60:02d}:{minute % 60:02d}:00"))
+
+        trend = self.store.get_metric_trend("accuracy", last_n=20)
+
+        self.assertEqual(trend["runs"], 20)
+        # +0.001 за 5 минут = +0.288 в сутки
+        self.assertAlmostEqual(trend["slope_per_day"], 0.288, places=6)
+
+    def test_detect_regression(self):
+        """Тест обнаружения регрессии метрики."""
+        for day, accuracy in enumerate([0.96, 0.97, 0.96, 0.90], start=1):
+            self.store.append_run(self._evaluation(accuracy, f"2025-06-0{day}T12:00:00"))
+
+        result = self.store.detect_regression("accuracy", baseline_runs=3, tolerance=0.02)
+        self.assertTrue(result["regression_detected"])
+        self.assertAlmostEqual(result["latest_value"], 0.90)
+
+        no_regression = self.store.detect_regression("accuracy", baseline_runs=3, tolerance=0.1)
+        self.assertFalse(no_regression["regression_detected"])
+
+    def test_import_results_directory(self):
+        """Тест импорта исторических JSON- и бинарных файлов из results/."""
+        with open(os.path.join(self.temp_dir, "final_metrics_20250616_000108.json"), "w") as f:
+            json.dump(self._evaluation(0.97, "2025-06-16T00:01:00"), f)
+        with open(os.path.join(self.temp_dir, "pipeline_results_20250617_054048.json"), "w") as f:
+            json.dump({"timestamp": "2025-06-17T05:40:00", "model_type": "LogisticRegression",
+                       "metrics": {"accuracy": 0.97, "f1_score": 0.96}}, f)
+
+        save_run_results({"pipeline_execution": {"timestamp": "20250618_101500"},
+                          "training_summary": {"model_type": "RandomForest"},
+                          "key_metrics": {"accuracy": 0.98}},
+                         os.path.join(self.temp_dir, "complete_pipeline_results_20250618_101500.mlrr"))
+
+        self.assertEqual(self.store.import_results_directory(self.temp_dir), 3)
+        # Повторный импорт ничего не добавляет
+        self.assertEqual(self.store.import_results_directory(self.temp_dir), 0)
+        self.assertEqual(self.store.get_run_metrics("pipeline_results_20250617_054048")["f1_score"], 0.96)
+        self.assertEqual(self.store.get_run_metrics("complete_pipeline_results_20250618_101500")["accuracy"], 0.98)
+
+    def test_import_skips_runs_recorded_live(self):
+        """Тест: импорт не дублирует запуск, уже записанный при оценке под run_id DAG."""
+        results = self._evaluation(0.97, "2025-06-16T00:01:08.123456")
+        self.store.append_run(results, run_id="scheduled__2025-06-16T00:00:00+00:00", source="evaluate_model")
+        with open(os.path.join(self.temp_dir, "final_metrics_20250616_000108.json"), "w") as f:
+            json.dump(results, f)
+
+        self.assertEqual(self.store.import_results_directory(self.temp_dir), 0)
+        self.assertEqual([run["run_id"] for run in self.store.list_runs()],
+                         ["scheduled__2025-06-16T00:00:00+00:00"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Тесты для модуля сериализации моделей.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+from unittest import mock
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl import model_serializer
+from etl.model_serializer import (save_model_file, link_model_file, load_model_file, resolve_compression,
+                                  clear_model_cache, configure_model_cache, get_cache_info)
+
+
+class TestModelSerializer(unittest.TestCase):
+    """Тесты для сохранения и кэшированной загрузки моделей."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        clear_model_cache()
+        configure_model_cache(4)
+        rng = np.random.default_rng(42)
+        X = rng.normal(size=(200, 5))
+        y = (X[:, 0] > 0).astype(int)
+        self.model = LogisticRegression(solver="liblinear").fit(X, y)
+        self.X = X
+        self.model_path = os.path.join(self.temp_dir, "models", "current_model.joblib")
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        clear_model_cache()
+        shutil.rmtree(self.temp_dir)
+
+    def test_compression_settings(self):
+        """Тест выбора метода сжатия для joblib."""
+        self.assertEqual(resolve_compression(None), 0)
+        self.assertEqual(resolve_compression("zlib", 5), ("zlib", 5))
+        with self.assertRaises(ValueError):
+            resolve_compression("zip")
+        with mock.patch.object(model_serializer, "LZ4_AVAILABLE", False):
+            self.assertEqual(resolve_compression("lz4"), ("zlib", 3))
+
+    def test_repeated_loads_use_cache(self):
+        """Тест: повторная загрузка того же файла не распаковывает модель."""
+        save_model_file(self.model, self.model_path, compression="zlib")
+
+        with mock.patch.object(model_serializer.joblib, "load", wraps=model_serializer.joblib.load) as load, \
+                mock.patch.object(model_serializer, "file_sha256",
+                                  wraps=model_serializer.file_sha256) as file_sha256:
+            first = load_model_file(self.model_path)
+            second = load_model_file(self.model_path)
+
+        self.assertIs(first, second)
+        self.assertEqual(load.call_count, 1)
+        # Хэш файла известен после сохранения, повторное хэширование не требуется
+        file_sha256.assert_not_called()
+        np.testing.assert_array_equal(first.predict(self.X), self.model.predict(self.X))
+        self.assertEqual(get_cache_info()["models"], 1)
+
+    def test_hardlinked_copy_survives_overwrite(self):
+        """Тест: архивная копия-ссылка не меняется при перезаписи текущей модели."""
+        save_model_file(self.model, self.model_path, compression=None)
+        copy_path = os.path.join(self.temp_dir, "models", "model_20250617_054048.joblib")
+        linked = link_model_file(self.model_path, copy_path)
+
+        if linked:
+            self.assertTrue(os.path.samefile(self.model_path, copy_path))
+        self.assertTrue(os.path.exists(copy_path + ".sha256"))
+
+        new_model = LogisticRegression(C=0.01, solver="liblinear").fit(self.X, self.X[:, 1] > 0)
+        save_model_file(new_model, self.model_path, compression="zlib")
+
+        self.assertEqual(load_model_file(copy_path).get_params()["C"], 1.0)
+        self.assertEqual(load_model_file(self.model_path).get_params()["C"], 0.01)
+
+    def test_corrupted_file_rejected(self):
+        """Тест: поврежденный файл модели не загружается."""
+        save_model_file(self.model, self.model_path, compression="zlib")
+        clear_model_cache()
+        with open(self.model_path, "r+b") as f:
+            f.truncate(10)
+
+        with self.assertRaises(ValueError):
+            load_model_file(self.model_path)
+        with self.assertRaises(FileNotFoundError):
+            load_model_file(os.path.join(self.temp_dir, "missing.joblib"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,225 @@
+"""
+Тесты для предобработки на одном массиве NumPy.
+"""
+import unittest
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler, MinMaxScaler
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.preprocessing_block import (FeatureBlock, StageMemoryProfiler, plan_feature_engineering,
+                                     numeric_feature_columns, scale_in_place, compute_features,
+                                     fit_outlier_detector)
+
+
+def make_dataset(n_rows: int = 150, seed: int = 42) -> pd.DataFrame:
+    """Синтетический набор в формате Wisconsin (30 признаков)."""
+    rng = np.random.default_rng(seed)
+    names = ["radius", "texture", "perimeter", "area", "smoothness",
+             "compactness", "concavity", "concave_points", "symmetry", "fractal_dimension"]
+    columns = [f"{name}_{suffix}" for suffix in ("mean", "se", "worst") for name in names]
+    df = pd.DataFrame(rng.lognormal(1.0, 0.5, size=(n_rows, 30)), columns=columns)
+    df.insert(0, "id", np.arange(n_rows))
+    df.insert(1, "diagnosis", np.where(np.arange(n_rows) % 3 == 0, "M", "B"))
+    return df
+
+
+class TestFeatureBlock(unittest.TestCase):
+    """Тесты операций блока признаков."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.df = make_dataset()
+
+    def test_single_filter_and_median_fill(self):
+        """Тест: одна фильтрация строк и заполнение пропусков без изменения исходных данных."""
+        df = pd.concat([self.df, self.df.iloc[:4]])
+        df.loc[df.index[10], "id"] = np.nan
+        df.loc[df.index[11], "diagnosis"] = None
+        df.loc[df.index[20], "radius_mean"] = np.nan
+        original = df.copy()
+
+        block = FeatureBlock.from_frame(df, reserve=2)
+
+        pd.testing.assert_frame_equal(df, original)
+        self.assertEqual(block.n_rows, len(self.df) - 2)
+        self.assertEqual(block.values.shape, (block.n_rows, 32))
+        self.assertTrue(block.values.flags.f_contiguous)
+        self.assertEqual(block.columns, numeric_feature_columns(df))
+        self.assertEqual(block.target.dtype, np.int64)
+
+        filled = block.fill_missing_median()
+        expected = df.drop_duplicates().dropna(subset=["id", "diagnosis"])
+        self.assertAlmostEqual(filled["radius_mean"], expected["radius_mean"].median())
+        np.testing.assert_allclose(block.features, expected[block.columns].fillna(filled).to_numpy())
+        np.testing.assert_array_equal(block.index, expected.index)
+
+    def test_outlier_actions_match_dataframe_version(self):
+        """Тест: ограничение, удаление и log-трансформация выбросов на месте."""
+        columns = numeric_feature_columns(self.df)
+
+        block = FeatureBlock.from_frame(self.df)
+        buffer = block.values
+        block.handle_outliers(method="cap", detection_method="iqr")
+        self.assertIs(block.values, buffer)
+
+        expected = self.df[columns].copy()
+        for col in columns:
+            q1, q3 = expected[col].quantile(0.25), expected[col].quantile(0.75)
+            iqr = q3 - q1
+            if ((expected[col] < q1 - 1.5 * iqr) | (expected[col] > q3 + 1.5 * iqr)).any():
+                expected[col] = expected[col].clip(expected[col].quantile(0.05), expected[col].quantile(0.95))
+        np.testing.assert_allclose(block.features, expected.to_numpy())
+
+        block = FeatureBlock.from_frame(self.df)
+        masks = [block.outlier_mask(j, "zscore") for j in range(len(columns))]
+        keep = ~np.logical_or.reduce(masks)
+        block.handle_outliers(method="remove", detection_method="zscore")
+        np.testing.assert_allclose(block.features, self.df[columns].to_numpy()[keep])
+        self.assertEqual(len(block.target), int(keep.sum()))
+        self.assertEqual(len(block.index), int(keep.sum()))
+
+        block = FeatureBlock.from_frame(self.df)
+        block.handle_outliers(method="transform", detection_method="iqr")
+        self.assertTrue((block.features <= self.df[columns].to_numpy()).all())
+
+    def test_column_isolation_forest_uses_settings(self):
+        """Тест: лес по колонке строится с параметрами outlier_detection.isolation_forest."""
+        from sklearn.ensemble import IsolationForest
+
+        block = FeatureBlock.from_frame(self.df)
+        params = {"n_estimators": 20, "contamination": 0.02, "n_jobs": 1, "random_state": 7}
+        mask = block.outlier_mask(0, "isolation_forest", params)
+
+        expected = IsolationForest(**params).fit_predict(block.values[:, [0]]) == -1
+        np.testing.assert_array_equal(mask, expected)
+        self.assertLess(mask.sum(), 0.1 * block.n_rows)
+
+    def test_multivariate_isolation_forest(self):
+        """Тест: один лес на всех признаках, выбросы - строки."""
+        block = FeatureBlock.from_frame(self.df)
+        detector = fit_outlier_detector(block.features, n_estimators=50, contamination=0.05, n_jobs=2)
+        self.assertEqual(detector.n_features_in_, len(block.columns))
+        rows = detector.predict(block.features) == -1
+        self.assertTrue(rows.any())
+
+        expected = block.features[~rows].copy()
+        block.handle_outliers(method="remove", detector=detector)
+        np.testing.assert_array_equal(block.features, expected)
+
+        block = FeatureBlock.from_frame(self.df)
+        state = block.handle_outliers(method="cap", detection_method="isolation_forest", detector=detector)
+        self.assertEqual(list(state["clip_bounds"]), block.columns)
+
+    def test_engineered_features_written_in_reserve(self):
+        """Тест: новые признаки совпадают с формулами DataFrame-версии."""
+        columns = numeric_feature_columns(self.df)
+        plan = plan_feature_engineering(columns)
+        self.assertEqual(len(plan), 11)
+
+        block = FeatureBlock.from_frame(self.df, reserve=len(plan))
+        buffer = block.values
+        created = block.add_features(plan)
+        self.assertIs(block.values, buffer)
+        self.assertEqual(block.columns, columns + created)
+
+        mean_cols = [col for col in columns if col.endswith("_mean")]
+        worst_cols = [col for col in columns if col.endswith("_worst")]
+        expected = {
+            "mean_features_sum": self.df[mean_cols].sum(axis=1),
+            "mean_features_std": self.df[mean_cols].std(axis=1),
+            "worst_features_max": self.df[worst_cols].max(axis=1),
+            "area_perimeter_ratio": self.df["area_mean"] / (self.df["perimeter_mean"] + 1e-8),
+            "composite_index_1": self.df[columns[0]] * self.df[columns[1]],
+        }
+        for name, values in expected.items():
+            np.testing.assert_allclose(block.column(name), values.to_numpy(), err_msg=name)
+
+        self.assertEqual(len(plan_feature_engineering(columns, create_aggregates=False, create_ratios=False)), 2)
+        with self.assertRaises(ValueError):
+            FeatureBlock.from_frame(self.df).add_features(plan)
+
+    def test_scaling_in_place_and_memory_report(self):
+        """Тест: нормализация без копии и отчет памяти по стадиям."""
+        profiler = StageMemoryProfiler()
+        try:
+            with profiler.stage("clean"):
+                block = FeatureBlock.from_frame(self.df)
+            with profiler.stage("scaling"):
+                X_train = block.features.take(np.arange(100), axis=0)
+                X_test = block.features.take(np.arange(100, 150), axis=0)
+                expected_train = StandardScaler().fit_transform(X_train)
+                scaler = MinMaxScaler()
+                train_scaled, test_scaled = scale_in_place(StandardScaler(), X_train, X_test)
+                scale_in_place(scaler, X_train.copy())
+        finally:
+            profiler.stop()
+
+        self.assertIs(train_scaled, X_train)
+        np.testing.assert_allclose(train_scaled, expected_train)
+        self.assertTrue(scaler.get_params()["copy"])
+        self.assertEqual(list(profiler.report), ["clean", "scaling"])
+        # Блок признаков 150 x 30 float64 занимает ~35 KB
+        self.assertGreater(profiler.report["clean"]["peak_mb"], 0.03)
+
+        disabled = StageMemoryProfiler(enabled=False)
+        with disabled.stage("clean"):
+            pass
+        self.assertEqual(disabled.report, {})
+
+
+class TestFeatureKernel(unittest.TestCase):
+    """Тесты векторизованного ядра создания признаков."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.df = make_dataset()
+        self.columns = numeric_feature_columns(self.df)
+        self.plan = plan_feature_engineering(self.columns)
+        self.X = self.df[self.columns].to_numpy(dtype=np.float64)
+
+    def test_kernel_matches_pandas_and_writes_into_block(self):
+        """Тест: все признаки одним вызовом в заранее выделенный блок."""
+        out = np.empty((len(self.df), len(self.plan)), order="F")
+        result = compute_features(self.X, self.columns, self.plan, out=out)
+        self.assertIs(result, out)
+
+        se_cols = [col for col in self.columns if col.endswith("_se")]
+        expected = {
+            "mean_features_mean": self.df[[col for col in self.columns if col.endswith("_mean")]].mean(axis=1),
+            "se_features_sum": self.df[se_cols].sum(axis=1),
+            "radius_perimeter_ratio": self.df["radius_mean"] / (self.df["perimeter_mean"] + 1e-8),
+            "composite_index_2": self.df[self.columns[0]] / (self.df[self.columns[1]] + 1e-8),
+        }
+        names = [name for name, _ in self.plan]
+        for name, values in expected.items():
+            np.testing.assert_allclose(result[:, names.index(name)], values.to_numpy(), err_msg=name)
+
+        # Колонки группы не подряд: результат тот же
+        shuffled = self.columns[::-1]
+        np.testing.assert_allclose(compute_features(self.X[:, ::-1], shuffled, self.plan), result)
+
+    def test_kernel_is_stateless_and_validates_plan(self):
+        """Тест: повторный вызов и повторное планирование дают тот же результат."""
+        first = compute_features(self.X, self.columns, self.plan)
+        second = compute_features(self.X, self.columns, self.plan)
+        np.testing.assert_array_equal(first, second)
+
+        # Созданные признаки не считаются исходными при повторном планировании
+        engineered = self.df.copy()
+        engineered[[name for name, _ in self.plan]] = first
+        self.assertEqual(numeric_feature_columns(engineered), self.columns)
+
+        with self.assertRaises(ValueError):
+            compute_features(self.X, self.columns, [("x", "median(radius_mean)")])
+        with self.assertRaises(ValueError):
+            compute_features(self.X, self.columns, [("x", "sum(missing)")])
+        self.assertEqual(compute_features(self.X, self.columns, []).shape, (len(self.df), 0))
+
+if __name__ == '__main__':
+    unittest.main()
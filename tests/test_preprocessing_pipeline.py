@@ -0,0 +1,199 @@
+"""
+Тесты для обученного пайплайна предобработки.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config_schema import compile_settings
+from etl.model_serializer import clear_model_cache
+from etl.preprocessing_pipeline import PreprocessingPipeline, PIPELINE_FILENAME
+
+
+def make_dataset(n_rows: int = 200, seed: int = 42) -> pd.DataFrame:
+    """Синтетический набор в формате Wisconsin (30 признаков)."""
+    rng = np.random.default_rng(seed)
+    names = ["radius", "texture", "perimeter", "area", "smoothness",
+             "compactness", "concavity", "concave_points", "symmetry", "fractal_dimension"]
+    columns = [f"{name}_{suffix}" for suffix in ("mean", "se", "worst") for name in names]
+    df = pd.DataFrame(rng.lognormal(1.0, 0.5, size=(n_rows, 30)), columns=columns)
+    diagnosis = np.where(np.arange(n_rows) % 3 == 0, "M", "B")
+    df["radius_mean"] += np.where(diagnosis == "M", 2.0, 0.0)
+    df.insert(0, "id", np.arange(n_rows))
+    df.insert(1, "diagnosis", diagnosis)
+    return df
+
+
+def make_settings(**preprocessing):
+    """Настройки preprocessing из словаря."""
+    return compile_settings({"preprocessing": preprocessing}).preprocessing
+
+
+class TestPreprocessingPipeline(unittest.TestCase):
+    """Тесты обучения, применения и сохранения пайплайна."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.df = make_dataset()
+        self.train_rows = np.arange(150)
+        self.test_rows = np.arange(150, 200)
+        clear_model_cache()
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        clear_model_cache()
+        shutil.rmtree(self.temp_dir)
+
+    def test_fit_on_train_rows_transform_new_rows(self):
+        """Тест: обучение только по обучающим строкам, transform без переобучения."""
+        pipeline = PreprocessingPipeline(make_settings(feature_selection={"n_features": 8}))
+        X_train, y_train = pipeline.fit_transform(self.df, rows=self.train_rows)
+
+        self.assertEqual(X_train.shape, (150, 8))
+        self.assertEqual(len(pipeline.engineered_features), 11)
+        self.assertEqual(pipeline.output_columns, pipeline.selected_features)
+        self.assertIn("radius_mean", pipeline.selected_features)
+        np.testing.assert_array_equal(y_train.index, self.df.index[:150])
+        self.assertAlmostEqual(pipeline.fill_values["texture_mean"],
+                               self.df["texture_mean"].iloc[:150].median())
+
+        # Повторное применение к обучающим строкам воспроизводит fit_transform
+        np.testing.assert_allclose(pipeline.transform(self.df, rows=self.train_rows), X_train)
+
+        scaler_state = pipeline.scaler.mean_.copy()
+        X_test = pipeline.transform(self.df.iloc[150:])
+        self.assertEqual(X_test.shape, (50, 8))
+        np.testing.assert_array_equal(pipeline.scaler.mean_, scaler_state)
+
+    def test_new_data_uses_fitted_statistics(self):
+        """Тест: пропуски и выбросы новых данных обрабатываются параметрами обучения."""
+        pipeline = PreprocessingPipeline(make_settings(feature_engineering={"enabled": False},
+                                                       feature_selection={"enabled": False}))
+        pipeline.fit(self.df, rows=self.train_rows)
+        self.assertTrue(pipeline.outlier_state["clip_bounds"])
+
+        new_data = self.df.iloc[150:].drop(columns=["diagnosis"]).copy()
+        new_data = pd.concat([new_data, new_data.iloc[:1]])
+        column, (lower, upper) = next(iter(pipeline.outlier_state["clip_bounds"].items()))
+        position = pipeline.feature_columns.index(column)
+        new_data.iloc[0, new_data.columns.get_loc(column)] = upper * 100
+        new_data.iloc[1, new_data.columns.get_loc(column)] = np.nan
+
+        X_new = pipeline.transform(new_data)
+        # Строки не удаляются (включая дубликаты), выбросы ограничены границами обучения
+        self.assertEqual(X_new.shape[0], 51)
+        self.assertAlmostEqual(X_new[0, position],
+                               (upper - pipeline.scaler.mean_[position]) / pipeline.scaler.scale_[position])
+        self.assertTrue(np.isfinite(X_new[1, position]))
+
+        with self.assertRaises(ValueError):
+            pipeline.transform(new_data.drop(columns=[column]))
+        with self.assertRaises(ValueError):
+            PreprocessingPipeline().transform(new_data)
+
+    def test_isolation_forest_detector_scores_new_batches(self):
+        """Тест: многомерный IsolationForest обучается один раз и сохраняется с пайплайном."""
+        pipeline = PreprocessingPipeline(make_settings(
+            outlier_detection={"method": "isolation_forest", "action": "remove",
+                               "isolation_forest": {"n_estimators": 50, "contamination": 0.05}},
+            feature_selection={"enabled": False}))
+        X_train, _ = pipeline.fit_transform(self.df, rows=self.train_rows)
+        self.assertEqual(X_train.shape[0], 150 - int(round(150 * 0.05)))
+
+        new_data = self.df.iloc[150:].drop(columns=["diagnosis"]).copy()
+        new_data.iloc[0, 2:] = new_data.iloc[0, 2:] * 50
+        scores = pipeline.outlier_scores(new_data)
+        self.assertEqual(scores.shape, (50,))
+        self.assertLess(scores[0], 0)
+        self.assertEqual(scores.argmin(), 0)
+
+        path = os.path.join(self.temp_dir, PIPELINE_FILENAME)
+        pipeline.save(path, compression="zlib")
+        np.testing.assert_allclose(PreprocessingPipeline.load(path).outlier_scores(new_data), scores)
+
+        with self.assertRaises(ValueError):
+            PreprocessingPipeline(make_settings(feature_selection={"enabled": False})).fit(
+                self.df, rows=self.train_rows).outlier_scores(new_data)
+
+    def test_remove_outliers_only_at_fit(self):
+        """Тест: удаление выбросов сокращает обучающую выборку, но не данные для скоринга."""
+        pipeline = PreprocessingPipeline(make_settings(outlier_detection={"action": "remove"},
+                                                       feature_selection={"enabled": False}))
+        X_train, y_train = pipeline.fit_transform(self.df, rows=self.train_rows)
+
+        self.assertLess(X_train.shape[0], 150)
+        self.assertEqual(len(y_train), X_train.shape[0])
+        self.assertEqual(pipeline.transform(self.df, rows=self.test_rows).shape[0], 50)
+
+    def test_single_artifact_roundtrip(self):
+        """Тест: пайплайн сохраняется одним артефактом и дает те же преобразования."""
+        pipeline = PreprocessingPipeline(make_settings(scaling={"method": "robust"},
+                                                       feature_selection={"method": "pca", "n_features": 5}))
+        pipeline.fit(self.df, rows=self.train_rows)
+        path = os.path.join(self.temp_dir, PIPELINE_FILENAME)
+        pipeline.save(path, compression="zlib")
+
+        # Артефакт содержит только встроенные типы и объекты scikit-learn
+        self.assertIsInstance(joblib.load(path), dict)
+
+        loaded = PreprocessingPipeline.load(path)
+        self.assertEqual(loaded.settings, pipeline.settings)
+        self.assertEqual(loaded.feature_plan, pipeline.feature_plan)
+        np.testing.assert_allclose(loaded.transform(self.df.iloc[150:]), pipeline.transform(self.df.iloc[150:]))
+
+        # Отбор признаков RFE сохраняется состоянием из встроенных типов
+        rfe = PreprocessingPipeline(make_settings(feature_selection={"method": "rfe", "n_features": 6, "step": 4}))
+        rfe.fit(self.df, rows=self.train_rows)
+        self.assertIsInstance(rfe.get_state()["selector"], dict)
+        rfe.save(path, compression="zlib")
+        loaded = PreprocessingPipeline.load(path)
+        self.assertEqual(loaded.selected_features, rfe.selected_features)
+        np.testing.assert_allclose(loaded.transform(self.df.iloc[150:]), rfe.transform(self.df.iloc[150:]))
+
+        state = pipeline.get_state()
+        state["version"] = 99
+        with self.assertRaisesRegex(ValueError, "повторное обучение"):
+            PreprocessingPipeline.from_state(state)
+        # Артефакт ранней сборки той же версии без части состояния
+        state = pipeline.get_state()
+        del state["outlier_detector"]
+        with self.assertRaisesRegex(ValueError, "outlier_detector"):
+            PreprocessingPipeline.from_state(state)
+        with self.assertRaises(ValueError):
+            PreprocessingPipeline().save(path)
+
+    def test_incremental_pca_from_chunks(self):
+        """Тест: IncrementalPCA обучается по частям и сохраняется с пайплайном."""
+        pipeline = PreprocessingPipeline(make_settings(feature_selection={"enabled": False, "n_features": 4}))
+        pipeline.fit(self.df, rows=self.train_rows)
+        chunks = (self.df.iloc[start:start + 30] for start in range(0, 150, 30))
+        pipeline.fit_pca_stream(chunks)
+
+        self.assertEqual(pipeline.selected_features, ["PC_1", "PC_2", "PC_3", "PC_4"])
+        self.assertEqual(pipeline.selector.n_samples_seen_, 150)
+        X_test = pipeline.transform(self.df.iloc[150:])
+        self.assertEqual(X_test.shape, (50, 4))
+
+        path = os.path.join(self.temp_dir, PIPELINE_FILENAME)
+        pipeline.save(path, compression="zlib")
+        np.testing.assert_allclose(PreprocessingPipeline.load(path).transform(self.df.iloc[150:]), X_test)
+
+        randomized = PreprocessingPipeline(make_settings(feature_selection={"method": "pca", "n_features": 4,
+                                                                            "pca_solver": "randomized"}))
+        self.assertEqual(randomized.fit_transform(self.df, rows=self.train_rows)[0].shape, (150, 4))
+        with self.assertRaises(ValueError):
+            PreprocessingPipeline().fit_pca_stream(chunks)
+
+
+if __name__ == '__main__':
+    unittest.main()
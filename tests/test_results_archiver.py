@@ -0,0 +1,115 @@
+"""
+Тесты для модуля архивирования результатов.
+"""
+import unittest
+import tempfile
+import shutil
+import zipfile
+import json
+import os
+from unittest import mock
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.results_archiver import ResultsArchiver
+
+
+class TestResultsArchiver(unittest.TestCase):
+    """Тесты для класса ResultsArchiver."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.results_dir = os.path.join(self.temp_dir, "results")
+        os.makedirs(os.path.join(self.results_dir, "plots"))
+
+        self._write("final_metrics_20250616_000108.json", json.dumps({"accuracy": 0.97}) * 200)
+        self._write("plots/confusion_matrix.png", os.urandom(4096), mode="wb")
+        self._write("temp_scratch.json", "{}")
+        self._write("old_archive.zip", "zip")
+        self._write("final_metrics_20250616_000108.json.sha256", "0" * 64)
+
+        self.archiver = ResultsArchiver(manifest_path=os.path.join(self.results_dir, "archive_manifest.json"),
+                                        max_workers=2)
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name: str, content, mode: str = "w"):
+        """Записывает файл в тестовую директорию результатов."""
+        with open(os.path.join(self.results_dir, name), mode) as f:
+            f.write(content)
+
+    def test_full_archive_contents_and_compression(self):
+        """Тест состава архива и выбора метода сжатия."""
+        archive_path = self.archiver.create_archive(self.results_dir, incremental=False)
+
+        with zipfile.ZipFile(archive_path) as zipf:
+            self.assertIsNone(zipf.testzip())
+            infos = {info.filename: info for info in zipf.infolist()}
+            self.assertEqual(set(infos), {"results/final_metrics_20250616_000108.json",
+                                          "results/plots/confusion_matrix.png"})
+            self.assertEqual(infos["results/plots/confusion_matrix.png"].compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(infos["results/final_metrics_20250616_000108.json"].compress_type,
+                             zipfile.ZIP_DEFLATED)
+            with open(os.path.join(self.results_dir, "plots/confusion_matrix.png"), "rb") as f:
+                self.assertEqual(zipf.read("results/plots/confusion_matrix.png"), f.read())
+
+    def test_incremental_archive_contains_only_changes(self):
+        """Тест: инкрементальный архив включает только изменившиеся файлы."""
+        first = self.archiver.create_archive(self.results_dir)
+        self.assertIsNotNone(first)
+
+        # Без изменений новый архив не создается
+        self.assertIsNone(self.archiver.create_archive(self.results_dir))
+
+        self._write("pipeline_results_20250617_054048.json", json.dumps({"metrics": {"f1_score": 0.96}}))
+        second = self.archiver.create_archive(self.results_dir,
+                                              archive_path=os.path.join(self.results_dir, "second.zip"))
+        with zipfile.ZipFile(second) as zipf:
+            self.assertEqual(zipf.namelist(), ["results/pipeline_results_20250617_054048.json"])
+
+        manifest = self.archiver.load_manifest()
+        self.assertEqual(len(manifest["archives"]), 2)
+        self.assertEqual(manifest["files"]["results/pipeline_results_20250617_054048.json"]["archive"],
+                         "second.zip")
+
+    def test_touched_file_with_same_content_is_deduplicated(self):
+        """Тест: файл с новым временем изменения, но тем же содержимым, не архивируется повторно."""
+        self.archiver.create_archive(self.results_dir)
+
+        metrics_path = os.path.join(self.results_dir, "final_metrics_20250616_000108.json")
+        stat = os.stat(metrics_path)
+        os.utime(metrics_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        self.assertIsNone(self.archiver.create_archive(self.results_dir))
+        entry = self.archiver.load_manifest()["files"]["results/final_metrics_20250616_000108.json"]
+        self.assertEqual(entry["mtime_ns"], stat.st_mtime_ns + 10 ** 9)
+
+    def test_zip64_members(self):
+        """Тест: члены больше порога zip64 записываются с расширенными заголовками и читаются."""
+        content = os.urandom(8192)
+        self._write("final_model_20250616_000108.joblib", content, mode="wb")
+
+        # Порог zip64 уменьшен, чтобы не создавать файлы больше 4 GiB
+        with mock.patch.object(zipfile, "ZIP64_LIMIT", 1024):
+            archive_path = self.archiver.create_archive(self.results_dir, incremental=False)
+
+        with zipfile.ZipFile(archive_path) as zipf:
+            self.assertIsNone(zipf.testzip())
+            info = zipf.getinfo("results/final_model_20250616_000108.joblib")
+            self.assertEqual(info.compress_type, zipfile.ZIP_STORED)
+            # Поле расширенной информации zip64 (идентификатор 0x0001)
+            self.assertEqual(info.extra[:2], b"\x01\x00")
+            self.assertEqual(zipf.read(info), content)
+            metrics_info = zipf.getinfo("results/final_metrics_20250616_000108.json")
+            self.assertEqual(metrics_info.compress_type, zipfile.ZIP_DEFLATED)
+            with open(os.path.join(self.results_dir, "final_metrics_20250616_000108.json"), "rb") as f:
+                self.assertEqual(zipf.read(metrics_info), f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Тесты для модуля бинарного формата результатов запуска.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl import run_results
+from etl.run_results import RunResultsReader, save_run_results, load_run_results, encode_run_results
+
+
+class TestRunResults(unittest.TestCase):
+    """Тесты для формата результатов запуска."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.results = {
+            "pipeline_execution": {"run_id": "manual__2025-06-17", "timestamp": "20250617_054048",
+                                   "started_at": datetime(2025, 6, 17, 5, 40, 48)},
+            "data_summary": {"original_shape": (569, 32), "dtypes": {"radius_mean": np.dtype("float64")}},
+            "evaluation_summary": {"basic_metrics": {"accuracy": np.float64(0.9737), "support": np.int64(114)},
+                                   "confusion_matrix": np.array([[71, 1], [2, 40]])},
+            "feature_importance": pd.Series([0.4, 0.35], index=["radius_mean", "area_mean"], name="importance"),
+            "predictions": pd.DataFrame({"y_true": [0, 1, 1], "proba": [0.1, 0.8, 0.65]}),
+            "labels": {0: "B", 1: "M"},
+            "large_section": {"values": list(range(5000))}
+        }
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        shutil.rmtree(self.temp_dir)
+
+    def _assert_roundtrip(self, loaded):
+        """Проверяет восстановление типов после чтения."""
+        self.assertEqual(loaded["data_summary"]["original_shape"], (569, 32))
+        self.assertEqual(loaded["data_summary"]["dtypes"]["radius_mean"], np.dtype("float64"))
+        self.assertIsInstance(loaded["evaluation_summary"]["basic_metrics"]["support"], np.int64)
+        np.testing.assert_array_equal(loaded["evaluation_summary"]["confusion_matrix"], [[71, 1], [2, 40]])
+        self.assertEqual(loaded["evaluation_summary"]["confusion_matrix"].dtype,
+                         self.results["evaluation_summary"]["confusion_matrix"].dtype)
+        self.assertEqual(loaded["pipeline_execution"]["started_at"], datetime(2025, 6, 17, 5, 40, 48))
+        pd.testing.assert_series_equal(loaded["feature_importance"], self.results["feature_importance"])
+        pd.testing.assert_frame_equal(loaded["predictions"], self.results["predictions"])
+        self.assertEqual(loaded["labels"], {0: "B", 1: "M"})
+        self.assertEqual(loaded["large_section"]["values"][-1], 4999)
+
+    def test_typed_roundtrip_json_codec(self):
+        """Тест полного восстановления типов в JSON-кодеке."""
+        file_path = save_run_results(self.results, os.path.join(self.temp_dir, "run.mlrr"), codec="json")
+        self._assert_roundtrip(load_run_results(file_path))
+
+    @unittest.skipUnless(run_results.MSGPACK_AVAILABLE, "msgpack не установлен")
+    def test_typed_roundtrip_msgpack_codec(self):
+        """Тест полного восстановления типов в msgpack-кодеке."""
+        file_path = save_run_results(self.results, os.path.join(self.temp_dir, "run.mlrr"), codec="msgpack")
+        self._assert_roundtrip(load_run_results(file_path))
+
+    def test_reader_loads_selected_sections(self):
+        """Тест чтения отдельных разделов по оглавлению."""
+        file_path = save_run_results(self.results, os.path.join(self.temp_dir, "run.mlrr"))
+        reader = RunResultsReader(file_path)
+
+        self.assertEqual(reader.schema_version, run_results.SCHEMA_VERSION)
+        self.assertEqual(reader.sections, list(self.results))
+        self.assertEqual(reader.header["sections"]["large_section"]["compression"], "zlib")
+
+        subset = reader.read(["evaluation_summary", "missing_section"])
+        self.assertEqual(list(subset), ["evaluation_summary"])
+        self.assertEqual(load_run_results(file_path, "data_summary")["original_shape"], (569, 32))
+
+    def test_invalid_files_rejected(self):
+        """Тест ошибок для чужих файлов и неподдерживаемой версии формата."""
+        json_path = os.path.join(self.temp_dir, "results.json")
+        with open(json_path, "w") as f:
+            f.write('{"accuracy": 0.97}')
+        with self.assertRaises(ValueError):
+            RunResultsReader(json_path)
+
+        future_path = os.path.join(self.temp_dir, "future.mlrr")
+        payload = bytearray(encode_run_results({"a": 1}))
+        payload[4:6] = (run_results.FORMAT_VERSION + 1).to_bytes(2, "little")
+        with open(future_path, "wb") as f:
+            f.write(payload)
+        with self.assertRaises(ValueError):
+            RunResultsReader(future_path)
+
+        with self.assertRaises(ValueError):
+            encode_run_results([1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Тесты для модуля потокового расчета метрик.
+"""
+import unittest
+import numpy as np
+import os
+import pickle
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.metrics import (
+    accuracy_score, f1_score, precision_score, recall_score,
+    confusion_matrix, roc_auc_score, log_loss
+)
+
+from etl.streaming_metrics import StreamingMetricsAccumulator
+
+
+class TestStreamingMetricsAccumulator(unittest.TestCase):
+    """Тесты для класса StreamingMetricsAccumulator."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        rng = np.random.RandomState(42)
+        self.y_true = rng.randint(0, 2, size=1000)
+        noise = rng.normal(0, 0.25, size=1000)
+        self.y_proba_pos = np.clip(0.3 + 0.4 * self.y_true + noise, 0.01, 0.99)
+        self.y_pred_proba = np.column_stack([1 - self.y_proba_pos, self.y_proba_pos])
+        self.y_pred = (self.y_proba_pos >= 0.5).astype(int)
+
+    def _accumulate(self, chunk_size: int) -> StreamingMetricsAccumulator:
+        """Заполняет накопитель порциями заданного размера."""
+        accumulator = StreamingMetricsAccumulator()
+        for start in range(0, len(self.y_true), chunk_size):
+            end = start + chunk_size
+            accumulator.update(self.y_true[start:end], self.y_pred[start:end],
+                               self.y_pred_proba[start:end])
+        return accumulator
+
+    def test_basic_metrics_match_sklearn(self):
+        """Тест совпадения основных метрик с sklearn."""
+        metrics = self._accumulate(chunk_size=128).compute_basic_metrics()
+
+        self.assertAlmostEqual(metrics['accuracy'], accuracy_score(self.y_true, self.y_pred))
+        self.assertAlmostEqual(metrics['precision'],
+                               precision_score(self.y_true, self.y_pred, average='weighted'))
+        self.assertAlmostEqual(metrics['recall'],
+                               recall_score(self.y_true, self.y_pred, average='weighted'))
+        self.assertAlmostEqual(metrics['f1_score_macro'],
+                               f1_score(self.y_true, self.y_pred, average='macro'))
+        self.assertAlmostEqual(metrics['f1_score_binary'], f1_score(self.y_true, self.y_pred))
+
+    def test_confusion_matrix_matches_sklearn(self):
+        """Тест совпадения матрицы ошибок с sklearn."""
+        cm_data = self._accumulate(chunk_size=100).compute_confusion_matrix_data()
+
+        self.assertEqual(cm_data['confusion_matrix'],
+                         confusion_matrix(self.y_true, self.y_pred).tolist())
+        self.assertIn('weighted avg', cm_data['classification_report'])
+        self.assertIn('sensitivity', cm_data)
+
+    def test_probabilistic_metrics_approximate_sklearn(self):
+        """Тест приближенного ROC AUC и точного log-loss."""
+        metrics = self._accumulate(chunk_size=333).compute_probabilistic_metrics()
+
+        self.assertAlmostEqual(metrics['roc_auc'], roc_auc_score(self.y_true, self.y_proba_pos), places=2)
+        self.assertAlmostEqual(metrics['log_loss'], log_loss(self.y_true, self.y_pred_proba), places=6)
+        self.assertEqual(metrics['precision_recall_curve']['recall'][-1], 0.0)
+
+    def test_merge_equals_single_pass(self):
+        """Тест: объединение частичных накопителей равно одному проходу."""
+        full = self._accumulate(chunk_size=1000)
+
+        left = StreamingMetricsAccumulator().update(
+            self.y_true[:400], self.y_pred[:400], self.y_pred_proba[:400])
+        right = StreamingMetricsAccumulator().update(
+            self.y_true[400:], self.y_pred[400:], self.y_pred_proba[400:])
+        # Имитируем передачу состояния между процессами
+        right = pickle.loads(pickle.dumps(right))
+        merged = StreamingMetricsAccumulator.merge_all([left, StreamingMetricsAccumulator.from_dict(right.to_dict())])
+
+        np.testing.assert_array_equal(merged.confusion, full.confusion)
+        np.testing.assert_array_equal(merged.positive_hist, full.positive_hist)
+        self.assertAlmostEqual(merged.log_loss_sum, full.log_loss_sum)
+
+    def test_evaluation_results_structure(self):
+        """Тест структуры результатов для generate_evaluation_report."""
+        results = self._accumulate(chunk_size=250).to_evaluation_results()
+
+        for key in ['timestamp', 'test_samples', 'basic_metrics',
+                    'probabilistic_metrics', 'confusion_matrix_data']:
+            self.assertIn(key, results)
+        self.assertEqual(results['test_samples'], len(self.y_true))
+
+    def test_unknown_labels_raise(self):
+        """Тест ошибки при неизвестных метках."""
+        accumulator = StreamingMetricsAccumulator()
+        with self.assertRaises(ValueError):
+            accumulator.update(np.array([0, 2]), np.array([0, 1]))
+
+    def test_merge_incompatible_raises(self):
+        """Тест ошибки при объединении несовместимых накопителей."""
+        with self.assertRaises(ValueError):
+            StreamingMetricsAccumulator(n_bins=10).merge(StreamingMetricsAccumulator(n_bins=20))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Тесты для масштабирования данных по частям.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.streaming_scaler import fit_scaler_stream, transform_to_memmap, scale_out_of_core
+
+
+class TestStreamingScaler(unittest.TestCase):
+    """Тесты обучения скейлеров по частям и записи в memmap."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(42)
+        self.X = rng.lognormal(1.0, 0.7, size=(5000, 6))
+        self.X[:, 5] = 3.0
+        self.chunks = [self.X[start:start + 700] for start in range(0, len(self.X), 700)]
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_partial_fit_scalers_match_full_fit(self):
+        """Тест: StandardScaler и MinMaxScaler по частям совпадают с обучением на всех данных."""
+        for scaler_class in (StandardScaler, MinMaxScaler):
+            path = os.path.join(self.temp_dir, f"{scaler_class.__name__}.npy")
+            scaler, X_scaled = scale_out_of_core(scaler_class(), lambda: iter(self.chunks), path)
+
+            self.assertIsInstance(X_scaled, np.memmap)
+            np.testing.assert_allclose(X_scaled, scaler_class().fit_transform(self.X), atol=1e-10)
+            # Файл читается независимо от процесса
+            np.testing.assert_allclose(np.load(path, mmap_mode="r"), X_scaled)
+
+    def test_robust_scaler_approximate_quantiles(self):
+        """Тест: приближенные медиана и IQR близки к точным, постоянная колонка не делит на ноль."""
+        scaler = RobustScaler(unit_variance=True)
+        n_rows = fit_scaler_stream(scaler, self.chunks, n_bins=4096)
+        expected = RobustScaler(unit_variance=True).fit(self.X)
+
+        self.assertEqual(n_rows, len(self.X))
+        span = self.X.max(axis=0) - self.X.min(axis=0)
+        np.testing.assert_allclose(scaler.center_, expected.center_, atol=(span / 4096).max())
+        np.testing.assert_allclose(scaler.scale_, expected.scale_, rtol=0.01)
+        self.assertEqual(scaler.scale_[5], expected.scale_[5])
+
+        path = os.path.join(self.temp_dir, "robust.npy")
+        X_scaled = transform_to_memmap(scaler, self.chunks, path, n_rows)
+        np.testing.assert_allclose(X_scaled, expected.transform(self.X), atol=0.05)
+
+    def test_robust_scaler_sparse_column_with_outliers(self):
+        """Тест: колонка из нулей с редкими выбросами - центр 0 и масштаб 1, как у RobustScaler."""
+        X = np.zeros((20000, 1))
+        X[::2000] = 1e6
+        chunks = [X[start:start + 3000] for start in range(0, len(X), 3000)]
+
+        scaler = RobustScaler()
+        fit_scaler_stream(scaler, chunks, n_bins=4096)
+        expected = RobustScaler().fit(X)
+
+        np.testing.assert_array_equal(expected.center_, [0.0])
+        np.testing.assert_array_equal(expected.scale_, [1.0])
+        np.testing.assert_array_equal(scaler.center_, expected.center_)
+        np.testing.assert_array_equal(scaler.scale_, expected.scale_)
+
+    def test_dataframe_chunks_and_errors(self):
+        """Тест: части DataFrame (колонки по имени), NaN и ошибки источника."""
+        frames = [pd.DataFrame(chunk, columns=list("abcdef")) for chunk in self.chunks]
+        frames[0].iloc[0, 0] = np.nan
+        frames[0]["diagnosis"] = "M"
+
+        scaler = StandardScaler()
+        n_rows = fit_scaler_stream(scaler, lambda: iter(frames), columns=list("abcde"))
+        self.assertEqual(scaler.n_features_in_, 5)
+        self.assertEqual(n_rows, len(self.X))
+
+        with self.assertRaises(ValueError):
+            fit_scaler_stream(StandardScaler(), iter(self.chunks))
+        with self.assertRaises(ValueError):
+            transform_to_memmap(scaler, frames, os.path.join(self.temp_dir, "x.npy"), n_rows - 1,
+                                columns=list("abcde"))
+        with self.assertRaises(ValueError):
+            fit_scaler_stream(StandardScaler(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
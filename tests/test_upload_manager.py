@@ -0,0 +1,116 @@
+"""
+Тесты для модуля параллельной загрузки в облачные хранилища.
+"""
+import unittest
+import tempfile
+import shutil
+import os
+
+# Импорт тестируемого модуля
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.upload_manager import UploadManager, UploadBackend, LocalFSBackend, file_md5
+
+
+class FlakyBackend(LocalFSBackend):
+    """Файловый бэкенд, который падает на заданной части первые несколько раз."""
+
+    def __init__(self, root: str, fail_part: int = 0, failures: int = 1):
+        super().__init__(root, name="flaky")
+        self.fail_part = fail_part
+        self.failures = failures
+        self.written_parts = []
+
+    def _write_part(self, part_path: str, data: bytes, index: int) -> None:
+        if index == self.fail_part and self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("соединение сброшено")
+        self.written_parts.append(index)
+        super()._write_part(part_path, data, index)
+
+
+class TestUploadManager(unittest.TestCase):
+    """Тесты для класса UploadManager."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.delays = []
+
+        self.small_path = os.path.join(self.temp_dir, "final_metrics.json")
+        with open(self.small_path, "wb") as f:
+            f.write(b'{"accuracy": 0.97}')
+        self.large_path = os.path.join(self.temp_dir, "results.zip")
+        with open(self.large_path, "wb") as f:
+            f.write(os.urandom(10 * 1024 + 123))
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        shutil.rmtree(self.temp_dir)
+
+    def _manager(self, backends, **kwargs) -> UploadManager:
+        """Создает менеджер с маленькими частями и без реального ожидания."""
+        params = {"max_workers": 3, "multipart_threshold": 4096, "part_size": 4096,
+                  "sleep": self.delays.append}
+        params.update(kwargs)
+        return UploadManager(backends, **params)
+
+    def test_upload_to_all_backends_and_skip_unchanged(self):
+        """Тест загрузки в несколько бэкендов и пропуска совпадающих объектов."""
+        first = LocalFSBackend(os.path.join(self.temp_dir, "bucket_a"), name="gcs")
+        second = LocalFSBackend(os.path.join(self.temp_dir, "bucket_b"), name="s3")
+        manager = self._manager([first, second])
+        files = [(self.small_path, "run/final_metrics.json"), (self.large_path, "run/results.zip")]
+
+        results = manager.upload_files(files)
+        self.assertEqual(results["gcs"]["run/final_metrics.json"]["status"], "uploaded")
+        self.assertTrue(results["s3"]["run/results.zip"]["multipart"])
+        with open(os.path.join(self.temp_dir, "bucket_b", "run", "results.zip"), "rb") as f, \
+                open(self.large_path, "rb") as original:
+            self.assertEqual(f.read(), original.read())
+
+        repeated = manager.upload_files(files)
+        self.assertEqual({item["status"] for item in repeated["gcs"].values()}, {"skipped"})
+        self.assertTrue(UploadManager.backend_succeeded(repeated["s3"]))
+
+    def test_retry_resumes_multipart_upload(self):
+        """Тест: повтор продолжает multipart-загрузку с упавшей части."""
+        backend = FlakyBackend(os.path.join(self.temp_dir, "bucket"), fail_part=2, failures=1)
+        result = self._manager([backend]).upload_files([(self.large_path, "results.zip")])
+
+        self.assertEqual(result["flaky"]["results.zip"]["status"], "uploaded")
+        self.assertEqual(result["flaky"]["results.zip"]["attempts"], 2)
+        # Части 0 и 1 не передаются повторно
+        self.assertEqual(backend.written_parts, [0, 1, 2])
+        self.assertEqual(len(self.delays), 1)
+        self.assertEqual(backend.get_remote_checksum("results.zip"), file_md5(self.large_path))
+
+    def test_failure_after_retries(self):
+        """Тест: после исчерпания повторов загрузка помечается как неуспешная."""
+        backend = FlakyBackend(os.path.join(self.temp_dir, "bucket"), fail_part=0, failures=10)
+        result = self._manager([backend], max_retries=2).upload_files([(self.large_path, "results.zip")])
+
+        self.assertEqual(result["flaky"]["results.zip"]["status"], "failed")
+        self.assertEqual(result["flaky"]["results.zip"]["attempts"], 3)
+        self.assertEqual(len(self.delays), 2)
+        self.assertFalse(UploadManager.backend_succeeded(result["flaky"]))
+
+    def test_missing_files_are_ignored(self):
+        """Тест: несуществующие файлы не загружаются."""
+        backend = LocalFSBackend(os.path.join(self.temp_dir, "bucket"))
+        result = self._manager([backend]).upload_files([(os.path.join(self.temp_dir, "nope.json"), "nope.json")])
+        self.assertEqual(result, {"local": {}})
+
+    def test_backend_must_implement_interface(self):
+        """Тест: бэкенд без upload не создается."""
+        class ChecksumOnlyBackend(UploadBackend):
+            def get_remote_checksum(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            ChecksumOnlyBackend()
+
+
+if __name__ == '__main__':
+    unittest.main()